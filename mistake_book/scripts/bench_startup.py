@@ -0,0 +1,331 @@
+"""启动耗时基准测试 - 测量从启动进程到首屏卡片绘制完成的时间
+
+对每个数据库规模（合成题目数量）启动若干个子进程（Qt offscreen 平台），
+子进程按 main.py 的顺序创建应用，并记录各阶段完成的时间点：
+
+    spawn       父进程启动子进程 → 子进程开始执行
+    import      导入 PyQt6 和 mistake_book.main
+    qapp        创建 QApplication
+    db_init     DatabaseManager 初始化（建表、迁移、连接池）
+    services    创建服务层（main.create_services）
+    window      创建并显示主窗口（main.create_main_window + show）
+    first_page  后台启动加载器返回第一页（骨架卡片被替换）
+    first_paint 第一页卡片绘制完成
+
+冷启动使用新的字节码缓存目录（PYTHONPYCACHEPREFIX），所有模块重新编译；
+热启动复用冷启动留下的字节码，取多次运行的中位数。子进程以 -X importtime
+运行，结果中包含按模块和按顶层包统计的导入耗时。
+
+结果写入 JSON 文件；指定预算文件时，超出预算则以退出码 1 结束：
+
+    python mistake_book/scripts/bench_startup.py
+    python mistake_book/scripts/bench_startup.py --sizes 0,1000,20000 --repeat 5
+    python mistake_book/scripts/bench_startup.py --budget mistake_book/scripts/startup_budget.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+# 阶段顺序（子进程记录的时间点）
+PHASES = ["spawn", "import", "qapp", "db_init", "services", "window", "first_page", "first_paint"]
+
+DEFAULT_SIZES = [0, 1000, 10000]
+DEFAULT_BUDGET = Path(__file__).parent / "startup_budget.json"
+
+# 子进程等待首屏绘制的超时（秒）
+CHILD_TIMEOUT = 120
+
+
+# ==================== 子进程 ====================
+
+def run_child(db_path: Path, journal_path: Path) -> Dict[str, float]:
+    """在子进程中启动应用，返回各时间点（time.time()）"""
+    marks = {"spawn": time.time()}
+    
+    from PyQt6.QtCore import QEvent, QObject
+    from PyQt6.QtWidgets import QApplication
+    import mistake_book.main as app_main
+    from mistake_book.database.db_manager import DatabaseManager
+    marks["import"] = time.time()
+    
+    app = QApplication([sys.argv[0]])
+    marks["qapp"] = time.time()
+    
+    db_manager = DatabaseManager(db_path)
+    marks["db_init"] = time.time()
+    
+    services, event_bus, review_journal = app_main.create_services(db_manager, journal_path)
+    marks["services"] = time.time()
+    
+    window = app_main.create_main_window(services, event_bus)
+    window.show()
+    marks["window"] = time.time()
+    
+    model = window.card_panel.question_model
+    viewport = window.card_panel.question_list.viewport()
+    
+    class PaintWatcher(QObject):
+        """第一页到达后，记录卡片列表的下一次绘制"""
+        painted = False
+        
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Type.Paint and "first_page" in marks:
+                self.painted = True
+            return False
+    
+    watcher = PaintWatcher()
+    viewport.installEventFilter(watcher)
+    
+    deadline = time.time() + CHILD_TIMEOUT
+    while time.time() < deadline:
+        app.processEvents()
+        if "first_page" not in marks and not window.is_loading and not model.is_placeholder:
+            marks["first_page"] = time.time()
+            viewport.update()
+        if watcher.painted:
+            marks["first_paint"] = time.time()
+            break
+        time.sleep(0.001)
+    
+    window.close()
+    review_journal.close()
+    db_manager.dispose()
+    return marks
+
+
+# ==================== 父进程 ====================
+
+def seed_database(db_path: Path, size: int):
+    """创建含 size 道合成题目（每题平均 5 条复习记录）的数据库，种子固定"""
+    from mistake_book.core.synthetic import SyntheticProfile, generate_notebook
+    from mistake_book.database.db_manager import DatabaseManager
+    
+    db_manager = DatabaseManager(db_path)
+    try:
+        generate_notebook(db_manager, SyntheticProfile(questions=size, reviews=size * 5, seed=size))
+    finally:
+        db_manager.dispose()
+
+
+def parse_importtime(stderr: str) -> Dict[str, Any]:
+    """
+    解析 -X importtime 的输出
+    
+    Returns:
+        {total_ms, top_modules: [(模块, 累计ms)], top_packages: [(顶层包, 自身ms之和)]}
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            _, self_us, cumulative_us, name = (part.strip() for part in
+                                               line.replace("import time:", "|", 1).split("|"))
+            modules.append((name, int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue
+    
+    packages: Dict[str, int] = {}
+    for name, self_us, _ in modules:
+        top = name.split(".")[0]
+        packages[top] = packages.get(top, 0) + self_us
+    
+    top_modules = sorted(modules, key=lambda m: m[2], reverse=True)[:20]
+    top_packages = sorted(packages.items(), key=lambda p: p[1], reverse=True)[:15]
+    return {
+        "total_ms": round(sum(m[1] for m in modules) / 1000, 1),
+        "module_count": len(modules),
+        "top_modules": [(name, round(cum / 1000, 1)) for name, _, cum in top_modules],
+        "top_packages": [(name, round(us / 1000, 1)) for name, us in top_packages],
+        "modules": sorted(name for name, _, _ in modules),
+    }
+
+
+def spawn_child(db_path: Path, pycache_dir: Path, work_dir: Path) -> Dict[str, Any]:
+    """启动一次子进程，返回各阶段耗时（毫秒）和导入统计"""
+    env = dict(os.environ)
+    env["QT_QPA_PLATFORM"] = "offscreen"
+    env["PYTHONPYCACHEPREFIX"] = str(pycache_dir)
+    env.pop("MISTAKE_BOOK_EAGER_TORCH", None)
+    
+    cmd = [sys.executable, "-X", "importtime", str(Path(__file__).resolve()),
+           "--child", str(db_path), "--journal", str(work_dir / "review_journal.jsonl")]
+    start = time.time()
+    result = subprocess.run(cmd, capture_output=True, text=True, env=env,
+                            cwd=work_dir, timeout=CHILD_TIMEOUT + 30)
+    if result.returncode != 0:
+        raise RuntimeError(f"子进程失败（退出码 {result.returncode}）:\n{result.stderr[-2000:]}")
+    
+    marks = json.loads(result.stdout.strip().splitlines()[-1])
+    phases = {}
+    previous = start
+    for phase in PHASES:
+        if phase not in marks:
+            raise RuntimeError(f"子进程没有记录阶段 {phase}（超时？）")
+        phases[phase] = round((marks[phase] - previous) * 1000, 1)
+        previous = marks[phase]
+    
+    return {
+        "phases_ms": phases,
+        "first_paint_ms": round((marks["first_paint"] - start) * 1000, 1),
+        "imports": parse_importtime(result.stderr),
+    }
+
+
+def _median_run(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """多次热启动取中位数（导入统计取首屏耗时为中位数的那一次）"""
+    ordered = sorted(runs, key=lambda r: r["first_paint_ms"])
+    median = dict(ordered[len(ordered) // 2])
+    median["phases_ms"] = {
+        phase: round(statistics.median(r["phases_ms"][phase] for r in runs), 1)
+        for phase in PHASES
+    }
+    median["first_paint_ms"] = round(statistics.median(r["first_paint_ms"] for r in runs), 1)
+    median["runs_first_paint_ms"] = [r["first_paint_ms"] for r in runs]
+    return median
+
+
+def benchmark(sizes: List[int], repeat: int, work_dir: Path) -> List[Dict[str, Any]]:
+    """对每个规模测量一次冷启动和 repeat 次热启动"""
+    results = []
+    for size in sizes:
+        size_dir = work_dir / f"size_{size}"
+        size_dir.mkdir(parents=True, exist_ok=True)
+        db_path = size_dir / "mistakes.db"
+        
+        seed_start = time.perf_counter()
+        seed_database(db_path, size)
+        print(f"规模 {size}: 生成数据库 {time.perf_counter() - seed_start:.1f} 秒")
+        
+        pycache_dir = size_dir / "pycache"
+        cold = spawn_child(db_path, pycache_dir, size_dir)
+        warm = _median_run([spawn_child(db_path, pycache_dir, size_dir) for _ in range(repeat)])
+        
+        for mode, run in (("cold", cold), ("warm", warm)):
+            run = dict(run, size=size, mode=mode)
+            results.append(run)
+            print(f"  {mode:<5} 首屏 {run['first_paint_ms']:>8.1f} ms  " + "  ".join(
+                f"{phase} {run['phases_ms'][phase]:.0f}" for phase in PHASES))
+    return results
+
+
+def check_budget(results: List[Dict[str, Any]], budget: Dict[str, Any]) -> List[str]:
+    """
+    检查结果是否超出预算
+    
+    预算文件格式（各项均可省略）:
+        {
+          "first_paint_ms": {"cold": 5000, "warm": 2500},
+          "phase_ms": {"db_init": 500, "first_page": 300},
+          "import_ms": 1500,
+          "max_first_paint_growth": 1.5,
+          "forbidden_modules": ["torch", "easyocr"]
+        }
+    
+    max_first_paint_growth: 最大规模与最小规模的热启动首屏耗时之比的上限，
+    首屏耗时应与题库大小无关。
+    
+    Returns:
+        超出预算的说明列表，为空表示全部通过
+    """
+    violations = []
+    for run in results:
+        label = f"规模 {run['size']} {run['mode']}"
+        
+        limit = budget.get("first_paint_ms", {}).get(run["mode"])
+        if limit is not None and run["first_paint_ms"] > limit:
+            violations.append(f"{label}: 首屏 {run['first_paint_ms']} ms > {limit} ms")
+        
+        for phase, limit in budget.get("phase_ms", {}).items():
+            value = run["phases_ms"].get(phase)
+            if value is not None and value > limit:
+                violations.append(f"{label}: 阶段 {phase} {value} ms > {limit} ms")
+        
+        limit = budget.get("import_ms")
+        if limit is not None and run["mode"] == "warm" and run["imports"]["total_ms"] > limit:
+            violations.append(f"{label}: 导入 {run['imports']['total_ms']} ms > {limit} ms")
+        
+        imported = set(run["imports"]["modules"])
+        for module in budget.get("forbidden_modules", []):
+            if module in imported:
+                violations.append(f"{label}: 启动时导入了 {module}")
+    
+    growth = budget.get("max_first_paint_growth")
+    warm = sorted((r for r in results if r["mode"] == "warm"), key=lambda r: r["size"])
+    if growth is not None and len(warm) >= 2 and warm[0]["first_paint_ms"] > 0:
+        ratio = warm[-1]["first_paint_ms"] / warm[0]["first_paint_ms"]
+        if ratio > growth:
+            violations.append(
+                f"首屏耗时随题库增长: 规模 {warm[-1]['size']} 是规模 {warm[0]['size']} 的 "
+                f"{ratio:.2f} 倍 > {growth} 倍"
+            )
+    return violations
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="测量启动到首屏卡片绘制完成的耗时")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="合成数据库的题目数量，逗号分隔（默认 0,1000,10000）")
+    parser.add_argument("--repeat", type=int, default=3, help="每个规模的热启动次数（默认 3）")
+    parser.add_argument("--output", type=Path, default=Path("startup_bench.json"),
+                        help="结果 JSON 文件（默认 startup_bench.json）")
+    parser.add_argument("--budget", type=Path, nargs="?", const=DEFAULT_BUDGET,
+                        help=f"预算文件，超出时退出码为 1（不带路径时使用 {DEFAULT_BUDGET.name}）")
+    parser.add_argument("--work-dir", type=Path, help="存放合成数据库的目录（默认临时目录）")
+    parser.add_argument("--child", type=Path, help=argparse.SUPPRESS)
+    parser.add_argument("--journal", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        marks = run_child(args.child, args.journal)
+        print(json.dumps(marks))
+        return 0
+    
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    with tempfile.TemporaryDirectory(prefix="mistake_book_bench_") as tmp:
+        work_dir = args.work_dir or Path(tmp)
+        results = benchmark(sizes, args.repeat, work_dir)
+    
+    report = {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "sizes": sizes,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    
+    exit_code = 0
+    if args.budget:
+        budget = json.loads(args.budget.read_text(encoding="utf-8"))
+        violations = check_budget(results, budget)
+        report["budget"] = budget
+        report["violations"] = violations
+        if violations:
+            print(f"❌ 超出预算 {len(violations)} 项:")
+            for violation in violations:
+                print(f"   {violation}")
+            exit_code = 1
+        else:
+            print("✅ 全部在预算内")
+    
+    args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"结果已写入 {args.output}")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""检查/重建题目计数表 - 数据库维护工具
+
+用法:
+    python mistake_book/scripts/check_counters.py            # 只检查
+    python mistake_book/scripts/check_counters.py --rebuild  # 检查并在不一致时重建
+    python mistake_book/scripts/check_counters.py --db path/to/mistakes.db
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from mistake_book.database.counters import check_counters, rebuild_counters
+from mistake_book.database.db_manager import DatabaseManager
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="检查题目计数表与基础表是否一致")
+    parser.add_argument("--db", type=Path, help="数据库文件路径（默认使用应用数据目录中的数据库）")
+    parser.add_argument("--rebuild", action="store_true", help="不一致时根据基础表重建计数")
+    args = parser.parse_args()
+    
+    if args.db is None:
+        from mistake_book.config.paths import get_app_paths
+        args.db = get_app_paths().database_file
+    
+    if not args.db.exists():
+        print(f"❌ 数据库不存在: {args.db}")
+        return 2
+    
+    print(f"数据库: {args.db}")
+    db_manager = DatabaseManager(args.db)
+    try:
+        with db_manager.engine.connect() as conn:
+            mismatches = check_counters(conn)
+        
+        if not mismatches:
+            print("✅ 计数表与基础表一致")
+            return 0
+        
+        print(f"⚠️  发现 {len(mismatches)} 项不一致:")
+        for facet, value, expected, actual in mismatches:
+            print(f"   {facet:<14} {value!r:<24} 期望 {expected:>6}  实际 {actual:>6}")
+        
+        if not args.rebuild:
+            print("使用 --rebuild 重建计数表")
+            return 1
+        
+        with db_manager.engine.begin() as conn:
+            rebuild_counters(conn)
+        with db_manager.engine.connect() as conn:
+            remaining = check_counters(conn)
+        if remaining:
+            print(f"❌ 重建后仍有 {len(remaining)} 项不一致")
+            return 1
+        print("✅ 计数表已重建")
+        return 0
+    finally:
+        db_manager.dispose()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""生成合成错题本 - 为性能测试和性能分析准备可重复的大规模数据
+
+题目、标签、图片和复习历史的生成规则见 mistake_book.core.synthetic。
+相同的 --seed 和 --now 生成完全相同的数据。
+
+用法:
+    python mistake_book/scripts/generate_notebook.py --db big.db
+    python mistake_book/scripts/generate_notebook.py --db big.db \
+        --questions 100000 --reviews 1000000
+    python mistake_book/scripts/generate_notebook.py --db big.db \
+        --images-dir big_images --seed 7 --force
+"""
+
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from mistake_book.core.synthetic import SyntheticProfile, generate_notebook
+from mistake_book.database.db_manager import DatabaseManager
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="生成合成错题本数据库")
+    parser.add_argument("--db", type=Path, required=True, help="数据库文件路径（已存在时追加数据）")
+    parser.add_argument("--questions", type=int, default=10000, help="题目数量（默认10000）")
+    parser.add_argument("--reviews", type=int, default=100000, help="复习记录数量（默认100000）")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子（默认0）")
+    parser.add_argument("--days", type=int, default=365, help="题目创建时间分布的天数（默认365）")
+    parser.add_argument("--now", type=datetime.fromisoformat,
+                        help="数据的当前时间，如 2026-01-01T08:00（默认为运行时间）")
+    parser.add_argument("--images-dir", type=Path, help="生成题目图片的目录（不指定则不生成图片）")
+    parser.add_argument("--image-count", type=int, default=100, help="图片文件数量（默认100）")
+    parser.add_argument("--force", action="store_true", help="先删除已存在的数据库文件")
+    args = parser.parse_args()
+    
+    if args.db.exists():
+        if not args.force:
+            print(f"数据库已存在，数据将追加到其中: {args.db}（使用 --force 重新生成）")
+        else:
+            for suffix in ("", "-wal", "-shm"):
+                Path(f"{args.db}{suffix}").unlink(missing_ok=True)
+    args.db.parent.mkdir(parents=True, exist_ok=True)
+    
+    profile = SyntheticProfile(
+        questions=args.questions,
+        reviews=args.reviews,
+        seed=args.seed,
+        days=args.days,
+        image_count=args.image_count,
+        now=args.now,
+    )
+    
+    def progress(done: int, total: int):
+        print(f"\r写入题目 {done}/{total}", end="", flush=True)
+    
+    db_manager = DatabaseManager(args.db)
+    try:
+        report = generate_notebook(db_manager, profile, args.images_dir, progress)
+    finally:
+        db_manager.dispose()
+    
+    print()
+    print(f"✅ 题目 {report.questions}（id 从 {report.first_id} 开始）、复习记录 {report.reviews}、"
+          f"新标签 {report.tags}、图片 {report.images}，用时 {report.seconds:.1f} 秒")
+    print(f"数据库: {args.db}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""迁移图片到按内容寻址的图片存储 - 数据库维护工具
+
+把旧版本按 "时间戳_原文件名" 保存的图片（以及数据库中的绝对路径）存入
+按内容哈希分目录的图片存储，改写 questions.image_path，并删除已迁移的旧文件。
+相同内容的图片迁移后只保留一份。请在应用关闭时运行。
+
+用法:
+    python mistake_book/scripts/migrate_image_store.py              # 迁移
+    python mistake_book/scripts/migrate_image_store.py --gc         # 迁移并删除没有题目引用的图片
+    python mistake_book/scripts/migrate_image_store.py \
+        --db path/to/mistakes.db --images-dir path/to/images
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from mistake_book.core.data_manager import DataManager
+from mistake_book.database.db_manager import DatabaseManager
+from mistake_book.services.image_store import ImageStore, migrate_legacy_images
+
+
+def _format_size(size: int) -> str:
+    return f"{size / 1024 / 1024:.1f} MB"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="迁移图片到按内容寻址的图片存储")
+    parser.add_argument("--db", type=Path, help="数据库文件路径（默认使用应用数据目录中的数据库）")
+    parser.add_argument(
+        "--images-dir", type=Path, help="图片目录（默认使用应用数据目录中的图片目录）"
+    )
+    parser.add_argument("--gc", action="store_true", help="迁移后删除没有题目引用的图片文件")
+    args = parser.parse_args()
+    
+    if args.db is None or args.images_dir is None:
+        from mistake_book.config.paths import get_app_paths
+        paths = get_app_paths()
+        args.db = args.db or paths.database_file
+        args.images_dir = args.images_dir or paths.images_dir
+    
+    if not args.db.exists():
+        print(f"❌ 数据库不存在: {args.db}")
+        return 2
+    
+    print(f"数据库: {args.db}")
+    print(f"图片目录: {args.images_dir}")
+    db_manager = DatabaseManager(args.db)
+    try:
+        data_manager = DataManager(db_manager)
+        store = ImageStore(args.images_dir)
+        files_before, size_before = store.disk_usage()
+        
+        def progress(done: int, total: int):
+            print(f"\r迁移图片 {done}/{total}", end="", flush=True)
+        
+        report = migrate_legacy_images(store, data_manager, progress)
+        print()
+        print(f"✅ 改写 {report.migrated} 道题目的图片路径，迁移后 {report.unique} 个文件，"
+              f"删除旧文件 {report.removed} 个")
+        if report.missing:
+            print(f"⚠️  {len(report.missing)} 个图片路径找不到文件，保持不变:")
+            for path in report.missing[:20]:
+                print(f"   {path}")
+        
+        if args.gc:
+            removed = store.collect_garbage(set(data_manager.list_image_paths()))
+            print(f"🧹 删除了 {len(removed)} 个没有题目引用的图片")
+        
+        files_after, size_after = store.disk_usage()
+        print(f"图片目录: {files_before} 个文件 {_format_size(size_before)} → "
+              f"{files_after} 个文件 {_format_size(size_after)}")
+        return 1 if report.missing else 0
+    finally:
+        db_manager.dispose()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -23,6 +23,11 @@ class AppPaths:
         """数据库文件路径"""
         return self.data_dir / "mistakes.db"
     
+    @property
+    def review_journal_file(self) -> Path:
+        """复习作答日志（尚未写入数据库的作答）"""
+        return self.data_dir / "review_journal.jsonl"
+    
     @property
     def config_file(self) -> Path:
         """配置文件路径"""
@@ -46,6 +51,16 @@ class AppPaths:
         images = self.data_dir / "images"
         images.mkdir(exist_ok=True)
         return images
+    
+    @property
+    def thumbnails_dir(self) -> Path:
+        """缩略图缓存目录（可随时删除，按需重新生成）"""
+        return self.data_dir / "thumbnails"
+    
+    @property
+    def ocr_cache_file(self) -> Path:
+        """OCR识别结果缓存（可随时删除）"""
+        return self.data_dir / "ocr_cache.db"
 
 
 def get_app_paths() -> AppPaths:
@@ -2,5 +2,7 @@
 
 from .review_scheduler import ReviewScheduler
 from .data_manager import DataManager
+from .statistics import StatisticsEngine
+from .query import QuestionQuery
 
-__all__ = ["ReviewScheduler", "DataManager"]
+__all__ = ["ReviewScheduler", "DataManager", "StatisticsEngine", "QuestionQuery"]
@@ -1,9 +1,61 @@
 """业务层：封装增删改查和统计逻辑"""
 
-from typing import List, Optional, Dict, Any
-from datetime import datetime
+from typing import Callable, Iterable, List, NamedTuple, Optional, Dict, Any, Union
+from datetime import datetime, timedelta
+from sqlalchemy import text, tuple_, or_, and_, func, select, insert, update, delete
+from sqlalchemy.orm import selectinload
 from mistake_book.database.db_manager import DatabaseManager
-from mistake_book.database.models import Question, Tag
+from mistake_book.database.models import Question, Tag, ReviewRecord, question_tags
+from mistake_book.database.fts import FTS_TABLE, bm25_expression, build_match_query, pick_snippet
+from mistake_book.core.statistics import StatisticsEngine
+from mistake_book.core.query import QuestionQuery, as_query
+from mistake_book.core.review_scheduler import ReviewScheduler
+from mistake_book.config.constants import ReviewResult
+
+
+# 筛选条件：QuestionQuery，或可转换为 QuestionQuery 的筛选字典
+Filters = Union[QuestionQuery, Dict[str, Any], None]
+
+# 分页列表支持的排序字段
+SORT_COLUMNS = {
+    "created_at": Question.created_at,
+    "next_review_date": Question.next_review_date,
+    "difficulty": Question.difficulty,
+    "mastery_level": Question.mastery_level,
+}
+
+# 批量增删改时每个事务处理的题目数量
+BULK_CHUNK_SIZE = 500
+
+# 批量操作的进度回调：progress(已处理数量, 总数量)
+ProgressCallback = Callable[[int, int], None]
+
+
+class ReviewAnswer(NamedTuple):
+    """一次作答：普通的 (题目ID, 复习结果, 耗时) 三元组也可以直接使用"""
+    question_id: int
+    result: ReviewResult
+    time_spent: Optional[int] = None  # 耗时（秒）
+    reviewed_at: Optional[datetime] = None  # 作答时间，None表示写入时的时间
+    client_token: Optional[str] = None  # 作答的唯一令牌，已写入过的作答会被跳过
+
+
+# 列表摘要中题目内容预览的长度
+PREVIEW_LENGTH = 100
+
+# 列表（卡片）只需要的列，不加载题目内容、答案、解析等大字段
+SUMMARY_COLUMNS = (
+    Question.id,
+    Question.subject,
+    Question.question_type,
+    Question.difficulty,
+    Question.mastery_level,
+    Question.repetitions,
+    Question.next_review_date,
+    Question.created_at,
+    func.substr(Question.content, 1, PREVIEW_LENGTH).label("content_preview"),
+    (func.length(Question.content) > PREVIEW_LENGTH).label("content_truncated"),
+)
 
 
 class DataManager:
@@ -11,6 +63,7 @@ class DataManager:
     
     def __init__(self, db_manager: DatabaseManager):
         self.db = db_manager
+        self.statistics = StatisticsEngine(db_manager)
     
     def add_question(self, question_data: Dict[str, Any]) -> int:
         """添加错题"""
@@ -31,13 +84,325 @@ class DataManager:
             return False
     
     def delete_question(self, question_id: int) -> bool:
-        """删除错题"""
+        """删除错题（同时删除其复习记录和标签关联）"""
+        return self.delete_questions([question_id]) == 1
+    
+    def add_questions(
+        self,
+        items: Iterable[Dict[str, Any]],
+        chunk_size: int = BULK_CHUNK_SIZE,
+        progress: Optional[ProgressCallback] = None
+    ) -> List[int]:
+        """
+        批量添加错题
+        
+        每 chunk_size 道题为一个事务，事务内的题目、新标签和标签关联各用一条
+        executemany 插入。标签按名称复用已有标签，名称→id 映射在整个批次内缓存，
+        不存在的标签只创建一次。某个事务失败时，之前已提交的部分保留，异常继续抛出。
+        
+        Args:
+            items: 错题数据字典，可包含 tags（标签名列表）
+            chunk_size: 每个事务的题目数量
+            progress: 进度回调，每提交一个事务调用一次
+        
+        Returns:
+            新题目的id列表（与 items 顺序一致）
+        """
+        items = list(items)
+        question_ids: List[int] = []
+        tag_ids: Optional[Dict[str, int]] = None
+        
+        for start in range(0, len(items), chunk_size):
+            chunk = items[start:start + chunk_size]
+            with self.db.session_scope() as session:
+                if tag_ids is None:
+                    tag_ids = dict(session.execute(select(Tag.name, Tag.id)).all())
+                
+                rows = [self._column_values(item) for item in chunk]
+                new_ids = list(session.scalars(
+                    insert(Question).returning(Question.id, sort_by_parameter_order=True),
+                    rows
+                ))
+                self._link_tags(session, tag_ids, [
+                    (question_id, item.get("tags") or ())
+                    for question_id, item in zip(new_ids, chunk)
+                ])
+            
+            question_ids.extend(new_ids)
+            if progress:
+                progress(len(question_ids), len(items))
+        
+        return question_ids
+    
+    def update_questions(
+        self,
+        updates: Dict[int, Dict[str, Any]],
+        chunk_size: int = BULK_CHUNK_SIZE,
+        progress: Optional[ProgressCallback] = None
+    ) -> int:
+        """
+        批量更新错题
+        
+        每 chunk_size 道题为一个事务，按主键用 executemany 更新。
+        字段中包含 tags 时，用新的标签名列表替换原有标签。
+        
+        Args:
+            updates: {题目ID: 更新的字段}
+            chunk_size: 每个事务的题目数量
+            progress: 进度回调，每提交一个事务调用一次
+        
+        Returns:
+            实际存在并被更新的题目数量
+        """
+        entries = list(updates.items())
+        updated = 0
+        tag_ids: Optional[Dict[str, int]] = None
+        
+        for start in range(0, len(entries), chunk_size):
+            chunk = entries[start:start + chunk_size]
+            with self.db.session_scope() as session:
+                existing = set(session.scalars(
+                    select(Question.id).where(Question.id.in_([qid for qid, _ in chunk]))
+                ))
+                chunk = [(qid, fields) for qid, fields in chunk if qid in existing]
+                
+                rows = [{"id": qid, **self._column_values(fields)} for qid, fields in chunk]
+                rows = [row for row in rows if len(row) > 1]
+                if rows:
+                    session.execute(update(Question), rows)
+                
+                retagged = [
+                    (qid, fields["tags"] or ()) for qid, fields in chunk if "tags" in fields
+                ]
+                if retagged:
+                    if tag_ids is None:
+                        tag_ids = dict(session.execute(select(Tag.name, Tag.id)).all())
+                    session.execute(
+                        delete(question_tags)
+                        .where(question_tags.c.question_id.in_([qid for qid, _ in retagged]))
+                    )
+                    self._link_tags(session, tag_ids, retagged)
+            
+            updated += len(chunk)
+            if progress:
+                progress(min(start + chunk_size, len(entries)), len(entries))
+        
+        return updated
+    
+    def delete_questions(
+        self,
+        question_ids: Iterable[int],
+        chunk_size: int = BULK_CHUNK_SIZE,
+        progress: Optional[ProgressCallback] = None
+    ) -> int:
+        """
+        批量删除错题
+        
+        每 chunk_size 道题为一个事务，同时删除这些题目的复习记录和标签关联
+        （数据库未启用外键级联，需要显式删除）。
+        
+        Args:
+            question_ids: 题目ID
+            chunk_size: 每个事务的题目数量
+            progress: 进度回调，每提交一个事务调用一次
+        
+        Returns:
+            实际删除的题目数量
+        """
+        question_ids = list(dict.fromkeys(question_ids))
+        deleted = 0
+        
+        for start in range(0, len(question_ids), chunk_size):
+            chunk = question_ids[start:start + chunk_size]
+            with self.db.session_scope() as session:
+                session.execute(delete(ReviewRecord).where(ReviewRecord.question_id.in_(chunk)))
+                session.execute(delete(question_tags).where(question_tags.c.question_id.in_(chunk)))
+                result = session.execute(delete(Question).where(Question.id.in_(chunk)))
+                deleted += result.rowcount
+            
+            if progress:
+                progress(min(start + chunk_size, len(question_ids)), len(question_ids))
+        
+        return deleted
+    
+    def get_image_paths(self, question_ids: Iterable[int]) -> List[str]:
+        """获取题目引用的图片路径（去重，不含空路径）"""
+        question_ids = list(question_ids)
+        if not question_ids:
+            return []
         with self.db.session_scope() as session:
-            question = session.query(Question).filter_by(id=question_id).first()
-            if question:
-                session.delete(question)
-                return True
-            return False
+            return list(session.scalars(
+                select(Question.image_path).distinct()
+                .where(Question.id.in_(question_ids), Question.image_path.is_not(None))
+            ))
+    
+    def list_image_paths(self) -> List[str]:
+        """获取所有题目引用的图片路径（去重）"""
+        with self.db.session_scope() as session:
+            return list(session.scalars(
+                select(Question.image_path).distinct().where(Question.image_path.is_not(None))
+            ))
+    
+    def count_image_references(self, paths: Iterable[str]) -> Dict[str, int]:
+        """
+        统计引用各图片路径的题目数量
+        
+        Returns:
+            {路径: 题目数}，没有题目引用的路径不出现在结果中
+        """
+        paths = list(dict.fromkeys(paths))
+        if not paths:
+            return {}
+        with self.db.session_scope() as session:
+            rows = session.execute(
+                select(Question.image_path, func.count())
+                .where(Question.image_path.in_(paths))
+                .group_by(Question.image_path)
+            ).all()
+        return dict(rows)
+    
+    def rewrite_image_paths(self, mapping: Dict[str, str]) -> int:
+        """
+        把题目引用的图片路径批量替换为新路径（一个事务）
+        
+        Returns:
+            更新的题目数量
+        """
+        mapping = {old: new for old, new in mapping.items() if old != new}
+        if not mapping:
+            return 0
+        with self.db.session_scope() as session:
+            result = session.connection().exec_driver_sql(
+                "UPDATE questions SET image_path = ? WHERE image_path = ?",
+                [(new, old) for old, new in mapping.items()]
+            )
+            return result.rowcount
+    
+    @staticmethod
+    def _column_values(data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        取出题目数据中对应 questions 列的字段（tags 单独处理）
+        
+        批量语句会静默忽略未知的键，这里与 Question(**data) 一样拒绝它们
+        
+        Raises:
+            ValueError: 包含 questions 表中不存在的字段
+        """
+        values = {k: v for k, v in data.items() if k != "tags"}
+        unknown = set(values) - set(Question.__table__.columns.keys())
+        if unknown:
+            raise ValueError(f"不支持的题目字段: {', '.join(sorted(unknown))}")
+        return values
+    
+    def _link_tags(self, session, tag_ids: Dict[str, int], links) -> None:
+        """
+        批量写入标签关联，缺少的标签先一次性创建
+        
+        Args:
+            session: 当前会话
+            tag_ids: 标签名→id 映射，新建的标签会加入其中
+            links: [(题目ID, 标签名列表)]
+        """
+        links = [(qid, list(dict.fromkeys(names))) for qid, names in links if names]
+        missing = list(dict.fromkeys(
+            name for _, names in links for name in names if name not in tag_ids
+        ))
+        if missing:
+            new_ids = session.scalars(
+                insert(Tag).returning(Tag.id, sort_by_parameter_order=True),
+                [{"name": name} for name in missing]
+            )
+            tag_ids.update(zip(missing, new_ids))
+        
+        rows = [
+            {"question_id": qid, "tag_id": tag_ids[name]}
+            for qid, names in links for name in names
+        ]
+        if rows:
+            session.execute(insert(question_tags), rows)
+    
+    def record_reviews(
+        self,
+        answers: Iterable[ReviewAnswer],
+        scheduler: ReviewScheduler,
+        now: Optional[datetime] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        记录复习结果（一个事务内完成）
+        
+        在同一个事务中读取题目的调度字段、用 scheduler 计算下次复习、
+        更新题目并追加复习记录，中途失败时全部回滚，题目状态与复习记录不会不一致。
+        事务开始时即获取写锁，读取到的调度字段不会在写入前被其他连接修改。
+        带 client_token 的作答是幂等的：令牌已存在于复习记录中时跳过。
+        
+        Args:
+            answers: ReviewAnswer 或 (题目ID, 复习结果, 耗时) 元组，
+                同一题目出现多次时按顺序依次计算
+            scheduler: 复习调度器
+            now: 未指定作答时间的作答使用的时间（默认取系统时间）
+        
+        Returns:
+            {题目ID: 更新后的复习字段}，不存在的题目和已写入过的作答不在结果中
+        """
+        answers = [ReviewAnswer(*answer) for answer in answers]
+        if not answers:
+            return {}
+        now = now or datetime.now()
+        
+        with self.db.session_scope(immediate=True) as session:
+            tokens = [a.client_token for a in answers if a.client_token]
+            if tokens:
+                recorded = set(session.scalars(
+                    select(ReviewRecord.client_token).where(ReviewRecord.client_token.in_(tokens))
+                ))
+                answers = [a for a in answers if a.client_token not in recorded]
+                if not answers:
+                    return {}
+            
+            rows = session.execute(
+                select(
+                    Question.id, Question.interval, Question.repetitions, Question.easiness_factor
+                )
+                .where(Question.id.in_({a.question_id for a in answers}))
+            ).all()
+            state = {
+                row.id: (row.interval or 0, row.repetitions or 0, row.easiness_factor or 2.5)
+                for row in rows
+            }
+            
+            updates: Dict[int, Dict[str, Any]] = {}
+            records = []
+            for answer in answers:
+                if answer.question_id not in state:
+                    continue
+                reviewed_at = answer.reviewed_at or now
+                interval, reps, ef = scheduler.calculate_next_review(
+                    *state[answer.question_id], answer.result
+                )
+                state[answer.question_id] = (interval, reps, ef)
+                updates[answer.question_id] = {
+                    "interval": interval,
+                    "repetitions": reps,
+                    "easiness_factor": ef,
+                    "mastery_level": answer.result.value,
+                    "next_review_date": reviewed_at + timedelta(days=interval),
+                }
+                records.append({
+                    "question_id": answer.question_id,
+                    "review_date": reviewed_at,
+                    "result": answer.result.value,
+                    "time_spent": answer.time_spent,
+                    "client_token": answer.client_token,
+                })
+            
+            if updates:
+                session.execute(
+                    update(Question),
+                    [{"id": question_id, **fields} for question_id, fields in updates.items()]
+                )
+                session.execute(insert(ReviewRecord), records)
+        
+        return updates
     
     def get_question(self, question_id: int) -> Optional[Dict[str, Any]]:
         """获取单个错题（返回完整信息）"""
@@ -47,61 +412,231 @@ class DataManager:
                 return question.to_dict()
             return None
     
-    def search_questions(self, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def get_questions_by_ids(self, question_ids: List[int]) -> List[Dict[str, Any]]:
+        """按ID批量获取错题（保持传入的顺序）"""
+        if not question_ids:
+            return []
+        with self.db.session_scope() as session:
+            questions = (
+                session.query(Question)
+                .options(selectinload(Question.tags))
+                .filter(Question.id.in_(question_ids))
+                .all()
+            )
+            by_id = {q.id: q.to_dict() for q in questions}
+        return [by_id[qid] for qid in question_ids if qid in by_id]
+    
+    def _tag_names_for(self, session, question_ids: List[int]) -> Dict[int, List[str]]:
+        """一次查询获取多个题目的标签名"""
+        tag_map: Dict[int, List[str]] = {qid: [] for qid in question_ids}
+        if not question_ids:
+            return tag_map
+        rows = (
+            session.query(question_tags.c.question_id, Tag.name)
+            .join(Tag, Tag.id == question_tags.c.tag_id)
+            .filter(question_tags.c.question_id.in_(question_ids))
+            .order_by(question_tags.c.question_id, Tag.id)
+            .all()
+        )
+        for question_id, name in rows:
+            tag_map[question_id].append(name)
+        return tag_map
+    
+    def _to_summaries(self, session, rows) -> List[Dict[str, Any]]:
+        """将摘要查询结果转换为字典，并批量附加标签"""
+        summaries = [dict(row._mapping) for row in rows]
+        tag_map = self._tag_names_for(session, [s["id"] for s in summaries])
+        for summary in summaries:
+            summary["content_truncated"] = bool(summary["content_truncated"])
+            summary["tags"] = tag_map[summary["id"]]
+        return summaries
+    
+    def list_question_summaries(self, filters: Filters) -> List[Dict[str, Any]]:
+        """
+        获取错题摘要列表（用于卡片列表和统计）
+        
+        只读取卡片显示需要的列，题目内容只取前 PREVIEW_LENGTH 个字符，
+        标签通过一次批量查询获取。完整内容请使用 get_question。
+        
+        Args:
+            filters: 筛选条件（QuestionQuery 或筛选字典）
+        
+        Returns:
+            摘要列表，每项包含 id、subject、question_type、difficulty、mastery_level、
+            repetitions、next_review_date、created_at、content_preview、
+            content_truncated 和 tags
+        """
+        with self.db.session_scope() as session:
+            query = self._apply_filters(session.query(*SUMMARY_COLUMNS), filters)
+            return self._to_summaries(session, query.all())
+    
+    def get_question_summaries_by_ids(self, question_ids: List[int]) -> List[Dict[str, Any]]:
+        """按ID批量获取错题摘要（保持传入的顺序）"""
+        if not question_ids:
+            return []
+        with self.db.session_scope() as session:
+            rows = session.query(*SUMMARY_COLUMNS).filter(Question.id.in_(question_ids)).all()
+            by_id = {s["id"]: s for s in self._to_summaries(session, rows)}
+        return [by_id[qid] for qid in question_ids if qid in by_id]
+    
+    def full_text_search(
+        self,
+        query: str,
+        limit: Optional[int] = 20,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        全文检索（FTS5，按相关度排序）
+        
+        Args:
+            query: 用户输入的关键词（空格分隔表示同时包含）
+            limit: 返回数量，None 表示不限
+            offset: 跳过数量（分页）
+        
+        Returns:
+            命中列表，每项包含 id、subject、question_type、score 和高亮摘要 snippet
+        """
+        match = build_match_query(query or "")
+        if match is None:
+            return []
+        
+        sql = text(
+            f"SELECT q.id, q.subject, q.question_type, q.content, q.answer, "
+            f"q.my_answer, q.explanation, {bm25_expression()} AS score "
+            f"FROM {FTS_TABLE} JOIN questions q ON q.id = {FTS_TABLE}.rowid "
+            f"WHERE {FTS_TABLE} MATCH :match "
+            f"ORDER BY score LIMIT :limit OFFSET :offset"
+        )
+        with self.db.session_scope() as session:
+            rows = session.execute(
+                sql, {"match": match, "limit": -1 if limit is None else limit, "offset": offset}
+            ).mappings().all()
+        
+        return [
+            {
+                "id": row["id"],
+                "subject": row["subject"],
+                "question_type": row["question_type"],
+                "score": row["score"],
+                "snippet": pick_snippet(row, query),
+            }
+            for row in rows
+        ]
+    
+    def _apply_filters(self, query, filters: Filters):
+        """将筛选条件（字典或 QuestionQuery）编译为SQL条件并应用到查询上"""
+        return as_query(filters).apply(query)
+    
+    def search_questions(self, filters: Filters) -> List[Dict[str, Any]]:
         """搜索错题（确保获取最新数据）"""
         with self.db.session_scope() as session:
             # 清除会话缓存，确保获取最新数据
             session.expire_all()
             
-            query = session.query(Question)
-            
-            # 科目筛选
-            if "subject" in filters:
-                query = query.filter_by(subject=filters["subject"])
-            
-            # 掌握度筛选
-            if "mastery_level" in filters:
-                query = query.filter_by(mastery_level=filters["mastery_level"])
-            
-            # 难度筛选
-            if "difficulty" in filters:
-                query = query.filter_by(difficulty=filters["difficulty"])
-            
-            # 标签筛选
-            if "tags" in filters and filters["tags"]:
-                # 筛选包含指定标签的题目
-                for tag_name in filters["tags"]:
-                    query = query.join(Question.tags).filter(Tag.name == tag_name)
+            query = self._apply_filters(session.query(Question), filters)
+            query = query.options(selectinload(Question.tags))
             
             questions = query.all()
             return [q.to_dict() for q in questions]
     
-    def get_statistics(self) -> Dict[str, Any]:
-        """获取统计数据（实时从数据库查询）"""
+    def get_due_questions(
+        self,
+        filters: Filters = None,
+        limit: Optional[int] = None,
+        now: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        获取复习队列（到期判断、筛选、排序和数量限制都在SQL中完成）
+        
+        到期：复习日期不晚于今天，或从未安排复习。排序：从未安排复习的在前，
+        其余按复习日期从早到晚（逾期最久的优先）。按科目/题型筛选时
+        使用索引 (subject, question_type, next_review_date)。
+        
+        Args:
+            filters: 筛选条件（常用 subject、question_type）
+            limit: 最多返回的题目数量，None表示不限制
+            now: 当前时间（默认取系统时间）
+        
+        Returns:
+            题目完整数据列表
+        """
         with self.db.session_scope() as session:
-            # 清除会话缓存，确保获取最新数据
-            session.expire_all()
-            
-            total = session.query(Question).count()
-            
-            # 按掌握度统计
-            mastered = session.query(Question).filter(
-                Question.mastery_level.in_([2, 3])
-            ).count()  # 掌握 + 熟练
+            spec = as_query(filters).where(due=True, now=now)
+            query = (
+                spec.apply(session.query(Question))
+                .order_by(Question.next_review_date.asc(), Question.id.asc())
+                .options(selectinload(Question.tags))
+            )
+            if limit is not None:
+                query = query.limit(limit)
+            return [q.to_dict() for q in query.all()]
+    
+    def get_questions_page(
+        self,
+        filters: Filters,
+        sort_by: str = "created_at",
+        descending: bool = True,
+        page_size: int = 50,
+        cursor: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        分页获取错题摘要（基于游标的键集分页，排序在SQL中完成）
+        
+        每项的字段同 list_question_summaries。以 (排序字段, id) 作为游标，
+        每页只需从索引上的游标位置继续读取，与翻到第几页、题库有多大无关。
+        排序字段为空（如从未复习的题目）时，与SQLite一致：升序排在最前，降序排在最后。
+        
+        Args:
+            filters: 筛选条件（QuestionQuery 或筛选字典）
+            sort_by: 排序字段，见 SORT_COLUMNS
+            descending: 是否降序
+            page_size: 每页数量
+            cursor: 上一页返回的 next_cursor，None表示第一页
+        
+        Returns:
+            {"items": 摘要列表, "next_cursor": 下一页游标, "has_more": 是否还有下一页}
+        """
+        if sort_by not in SORT_COLUMNS:
+            raise ValueError(f"不支持的排序字段: {sort_by}")
+        column = SORT_COLUMNS[sort_by]
+        
+        with self.db.session_scope() as session:
+            query = self._apply_filters(session.query(*SUMMARY_COLUMNS), filters)
             
-            learning = session.query(Question).filter_by(mastery_level=1).count()
-            unfamiliar = session.query(Question).filter_by(mastery_level=0).count()
+            if cursor is not None:
+                query = query.filter(
+                    self._keyset_predicate(column, descending, cursor["value"], cursor["id"])
+                )
             
-            # 待复习数量
-            from datetime import datetime
-            due_count = session.query(Question).filter(
-                Question.next_review_date <= datetime.now()
-            ).count()
+            if descending:
+                query = query.order_by(column.desc(), Question.id.desc())
+            else:
+                query = query.order_by(column.asc(), Question.id.asc())
             
-            return {
-                "total_questions": total,
-                "mastered": mastered,
-                "learning": learning,
-                "unfamiliar": unfamiliar,
-                "due_count": due_count
-            }
+            # 多取一条用于判断是否还有下一页
+            rows = query.limit(page_size + 1).all()
+            has_more = len(rows) > page_size
+            items = self._to_summaries(session, rows[:page_size])
+        
+        next_cursor = None
+        if has_more and items:
+            last = items[-1]
+            next_cursor = {"value": last[sort_by], "id": last["id"]}
+        
+        return {"items": items, "next_cursor": next_cursor, "has_more": has_more}
+    
+    @staticmethod
+    def _keyset_predicate(column, descending: bool, value, last_id: int):
+        """游标之后的行的条件（NULL在升序时最前、降序时最后）"""
+        if value is None:
+            if descending:
+                return and_(column.is_(None), Question.id < last_id)
+            return or_(and_(column.is_(None), Question.id > last_id), column.isnot(None))
+        
+        if descending:
+            return or_(tuple_(column, Question.id) < tuple_(value, last_id), column.is_(None))
+        return tuple_(column, Question.id) > tuple_(value, last_id)
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """获取统计数据（实时从数据库聚合，字段见 StatisticsEngine.collect）"""
+        return self.statistics.collect()
@@ -0,0 +1,153 @@
+"""题目查询条件：可组合的筛选规格，编译为一条SQL语句的WHERE子句"""
+
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+from sqlalchemy import and_, column, not_, select, table, text
+from mistake_book.core.statistics import due_condition
+from mistake_book.database.fts import FTS_TABLE, build_match_query
+from mistake_book.database.models import Question, Tag
+
+
+@dataclass(frozen=True)
+class QuestionQuery:
+    """
+    题目筛选条件
+    
+    所有条件之间为 AND 关系，未设置（None/空）的条件不参与筛选。
+    通过 apply 附加到 SQLAlchemy 查询上，所有筛选都在数据库中完成。
+    """
+    ids: FrozenSet[int] = frozenset()  # 题目id属于其中之一
+    subject: Optional[str] = None
+    question_type: Optional[str] = None
+    difficulty_min: Optional[int] = None  # 难度下限（含）
+    difficulty_max: Optional[int] = None  # 难度上限（含）
+    mastery_levels: FrozenSet[int] = frozenset()  # 掌握度属于其中之一
+    tags_all: Tuple[str, ...] = ()  # 同时包含所有这些标签
+    tags_any: Tuple[str, ...] = ()  # 至少包含其中一个标签
+    created_from: Optional[datetime] = None  # 创建时间下限（含）
+    created_to: Optional[datetime] = None  # 创建时间上限（不含）
+    review_from: Optional[datetime] = None  # 下次复习时间下限（含）
+    review_to: Optional[datetime] = None  # 下次复习时间上限（不含）
+    keyword: Optional[str] = None  # 全文检索关键词
+    due: Optional[bool] = None  # True只要到期的，False只要未到期的
+    now: Optional[datetime] = field(default=None, compare=False)  # 判断到期的当前时间
+    
+    # 旧式筛选字典支持的键
+    FILTER_KEYS = ("subject", "question_type", "difficulty", "mastery_level", "tags",
+                   "tags_any", "keyword", "due")
+    
+    @classmethod
+    def from_filters(cls, filters: Optional[Dict[str, Any]]) -> "QuestionQuery":
+        """
+        从筛选字典构造查询条件
+        
+        Args:
+            filters: 筛选字典，支持 subject、question_type、difficulty（精确值）、
+                mastery_level（单个值）、tags（全部包含）、tags_any（任一包含）、
+                keyword、due；值为None或空时忽略
+        
+        Raises:
+            ValueError: 包含不支持的键
+        """
+        filters = filters or {}
+        unknown = set(filters) - set(cls.FILTER_KEYS)
+        if unknown:
+            raise ValueError(f"不支持的筛选条件: {', '.join(sorted(unknown))}")
+        
+        def value(key):
+            v = filters.get(key)
+            return None if v == "" or v == [] else v
+        
+        difficulty = value("difficulty")
+        mastery_level = value("mastery_level")
+        return cls(
+            subject=value("subject"),
+            question_type=value("question_type"),
+            difficulty_min=difficulty,
+            difficulty_max=difficulty,
+            mastery_levels=frozenset() if mastery_level is None else frozenset([mastery_level]),
+            tags_all=tuple(value("tags") or ()),
+            tags_any=tuple(value("tags_any") or ()),
+            keyword=value("keyword"),
+            due=value("due"),
+        )
+    
+    def where(self, **changes) -> "QuestionQuery":
+        """返回修改了部分条件的新查询条件"""
+        for key in ("ids", "mastery_levels"):
+            if key in changes:
+                changes[key] = frozenset(changes[key])
+        for key in ("tags_all", "tags_any"):
+            if key in changes:
+                changes[key] = tuple(changes[key])
+        return replace(self, **changes)
+    
+    def conditions(self) -> List[Any]:
+        """编译为SQL条件列表"""
+        conds = []
+        
+        if self.ids:
+            conds.append(Question.id.in_(sorted(self.ids)))
+        if self.subject is not None:
+            conds.append(Question.subject == self.subject)
+        if self.question_type is not None:
+            conds.append(Question.question_type == self.question_type)
+        if self.difficulty_min is not None:
+            conds.append(Question.difficulty >= self.difficulty_min)
+        if self.difficulty_max is not None:
+            conds.append(Question.difficulty <= self.difficulty_max)
+        if self.mastery_levels:
+            conds.append(Question.mastery_level.in_(sorted(self.mastery_levels)))
+        
+        # 标签：EXISTS子查询，不会因为连接产生重复行
+        for tag_name in self.tags_all:
+            conds.append(Question.tags.any(Tag.name == tag_name))
+        if self.tags_any:
+            conds.append(Question.tags.any(Tag.name.in_(self.tags_any)))
+        
+        if self.created_from is not None:
+            conds.append(Question.created_at >= self.created_from)
+        if self.created_to is not None:
+            conds.append(Question.created_at < self.created_to)
+        if self.review_from is not None:
+            conds.append(Question.next_review_date >= self.review_from)
+        if self.review_to is not None:
+            conds.append(Question.next_review_date < self.review_to)
+        
+        if self.keyword is not None and self.keyword.strip():
+            conds.append(_keyword_condition(self.keyword))
+        
+        if self.due is True:
+            conds.append(due_condition(self.now))
+        elif self.due is False:
+            conds.append(not_(due_condition(self.now)))
+        
+        return conds
+    
+    def apply(self, query):
+        """将条件附加到 SQLAlchemy 查询（Query 或 Select）上"""
+        conds = self.conditions()
+        if conds:
+            query = query.filter(and_(*conds))
+        return query
+
+
+def _keyword_condition(keyword: str):
+    """全文检索条件：题目id在FTS命中结果中"""
+    match = build_match_query(keyword)
+    if match is None:
+        # 没有可检索的内容（如只有标点），不匹配任何题目
+        return Question.id.is_(None)
+    fts = table(FTS_TABLE, column("rowid"))
+    hits = select(fts.c.rowid).where(
+        text(f"{FTS_TABLE} MATCH :keyword_match").bindparams(keyword_match=match)
+    )
+    return Question.id.in_(hits)
+
+
+def as_query(filters) -> QuestionQuery:
+    """将筛选字典或 QuestionQuery 统一转换为 QuestionQuery"""
+    if isinstance(filters, QuestionQuery):
+        return filters
+    return QuestionQuery.from_filters(filters)
@@ -1,10 +1,20 @@
 """间隔重复算法(SM-2)和复习计划生成"""
 
-from datetime import datetime, timedelta
-from typing import List, Tuple
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional, Tuple
 from mistake_book.config.constants import ReviewResult
 
 
+def due_cutoff(now: Optional[datetime] = None) -> datetime:
+    """
+    到期截止时间（次日零点）
+    
+    复习日期早于该时间的题目今天都需要复习；从未安排复习的题目（日期为空）也算到期。
+    """
+    now = now or datetime.now()
+    return datetime.combine(now.date() + timedelta(days=1), time.min)
+
+
 class ReviewScheduler:
     """基于SM-2算法的复习调度器"""
     
@@ -53,7 +63,22 @@ class ReviewScheduler:
         
         return interval, repetitions, easiness_factor
     
-    def get_due_questions(self, questions: List[dict]) -> List[dict]:
-        """获取到期需要复习的题目"""
-        today = datetime.now().date()
-        return [q for q in questions if q.get("next_review_date", today) <= today]
+    def get_due_questions(
+        self, questions: List[dict], now: Optional[datetime] = None
+    ) -> List[dict]:
+        """
+        从题目列表中筛选到期需要复习的题目（与 DataManager.get_due_questions 规则一致）
+
+        Returns:
+            到期题目列表，从未安排复习的在前，其余按复习日期从早到晚
+        """
+        cutoff = due_cutoff(now)
+        due = []
+        for q in questions:
+            next_review = q.get("next_review_date")
+            if isinstance(next_review, date) and not isinstance(next_review, datetime):
+                next_review = datetime.combine(next_review, time.min)
+            if next_review is None or next_review < cutoff:
+                due.append((next_review, q))
+        due.sort(key=lambda item: (item[0] is not None, item[0] or cutoff))
+        return [q for _, q in due]
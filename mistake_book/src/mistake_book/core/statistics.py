@@ -0,0 +1,102 @@
+"""统计引擎：汇总仪表盘需要的所有统计数据"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+from sqlalchemy import func, or_
+from mistake_book.core.review_scheduler import due_cutoff
+from mistake_book.database.counters import read_counters
+from mistake_book.database.db_manager import DatabaseManager
+from mistake_book.database.models import Question, ReviewRecord, Tag
+
+# 掌握度取值（生疏、学习中、掌握、熟练）
+MASTERY_LEVELS = (0, 1, 2, 3)
+
+
+def due_condition(now: Optional[datetime] = None):
+    """到期条件：从未安排复习（新题目）或复习日期不晚于今天"""
+    return or_(
+        Question.next_review_date.is_(None),
+        Question.next_review_date < due_cutoff(now)
+    )
+
+
+class StatisticsEngine:
+    """统计引擎"""
+    
+    def __init__(self, db_manager: DatabaseManager):
+        self.db = db_manager
+    
+    def collect(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        计算仪表盘统计数据
+        
+        总数、各掌握度、各科目、各题型和各标签的数量直接读取由触发器维护的
+        计数表（行数与分类数量相当）；到期数量和今日复习数量与时间有关，
+        分别用一条走索引的 COUNT 查询。所有查询在同一个事务中执行，结果一致。
+        
+        Args:
+            now: 当前时间（默认取系统时间）
+        
+        Returns:
+            统计数据字典：
+                - total_questions: 总题数
+                - mastery_counts: {掌握度: 数量}
+                - mastered / learning / unfamiliar: 掌握+熟练 / 学习中 / 生疏 的数量
+                - subject_counts: {科目: 数量}
+                - type_counts: {科目: {题型: 数量}}
+                - tag_counts: {标签: 数量}（只包含有题目的标签）
+                - due_count: 到期待复习的数量
+                - today_reviewed: 今日复习次数
+        """
+        now = now or datetime.now()
+        today_start = datetime.combine(now.date(), datetime.min.time())
+        tomorrow_start = today_start + timedelta(days=1)
+        
+        with self.db.session_scope() as session:
+            counters = read_counters(session.connection())
+        
+            tag_ids = list(counters["tag"])
+            tag_names = dict(
+                session.query(Tag.id, Tag.name).filter(Tag.id.in_(tag_ids)).all()
+            ) if tag_ids else {}
+            
+            due_count = (
+                session.query(func.count(Question.id))
+                .filter(due_condition(now))
+                .scalar()
+            )
+            
+            today_reviewed = (
+                session.query(func.count(ReviewRecord.id))
+                .filter(
+                    ReviewRecord.review_date >= today_start,
+                    ReviewRecord.review_date < tomorrow_start
+                )
+                .scalar()
+            )
+        
+        mastery_counts = {level: 0 for level in MASTERY_LEVELS}
+        mastery_counts.update(counters["mastery_level"])
+        
+        type_counts: Dict[str, Dict[str, int]] = {}
+        for (subject, question_type), count in counters["module"].items():
+            type_counts.setdefault(subject, {})[question_type] = count
+        
+        tag_counts = {
+            tag_names[tag_id]: count
+            for tag_id, count in counters["tag"].items()
+            if tag_id in tag_names
+        }
+        
+        return {
+            "total_questions": counters["total"].get("", 0),
+            "mastery_counts": mastery_counts,
+            "mastered": mastery_counts[2] + mastery_counts[3],  # 掌握 + 熟练
+            "learning": mastery_counts[1],
+            "unfamiliar": mastery_counts[0],
+            "subject_counts": dict(counters["subject"]),
+            "type_counts": type_counts,
+            "tag_counts": dict(sorted(tag_counts.items())),
+            "due_count": due_count or 0,
+            "today_reviewed": today_reviewed or 0,
+        }
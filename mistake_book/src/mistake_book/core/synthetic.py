@@ -0,0 +1,617 @@
+"""合成错题本数据生成器
+
+为性能基准测试和性能分析生成可重复的大规模数据：按科目、题型分布的中英文题目
+（长度不一）、长尾分布的标签、题目图片，以及按 SM-2 算法模拟的复习历史。
+相同的种子和相同的 now 生成完全相同的数据。
+
+写入时绕过 ORM，在一个事务中用 executemany 批量插入。全文索引和计数表的
+同步触发器在写入期间暂时删除，写入完成后整体重建索引和计数、再恢复触发器，
+十万道题、百万条复习记录只需数秒。
+"""
+
+import random
+import shutil
+import time
+from bisect import bisect
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import accumulate
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy.engine import Connection
+
+from mistake_book.config.constants import QuestionType, ReviewResult
+from mistake_book.core.data_manager import ProgressCallback
+from mistake_book.core.review_scheduler import ReviewScheduler
+from mistake_book.database.counters import COUNTERS_TABLE, create_counter_schema, rebuild_counters
+from mistake_book.database.db_manager import DatabaseManager
+from mistake_book.database.fts import FTS_TABLE, create_fts_schema, rebuild_fts_index
+
+
+# ========== 题库素材 ==========
+
+# 科目: (权重, 标签颜色, 题干模板, 答案模板, 标签)
+# 模板中的 {a} {b} {c} {d} 为小整数，{e} 为两位数，{big} 为三四位数
+SUBJECTS: Dict[str, Tuple[float, str, Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]] = {
+    "数学": (0.30, "#e74c3c", (
+        "已知函数 f(x) = {a}x² + {b}x - {c}，求 f(x) 在区间 [-{d}, {e}] 上的最大值和最小值。",
+        "在等差数列 {{aₙ}} 中，a₁ = {a}，公差 d = {b}，求前 {e} 项和 Sₙ。",
+        "解不等式 |x - {a}| + |x + {b}| ≥ {e}。",
+        "在三角形 ABC 中，AB = {a}，AC = {b}，∠A = 60°，求 BC 的长及三角形的面积。",
+        "设 f(x) = x³ - {a}x² + {b}x，讨论 f(x) 的单调性并求极值。",
+        "从 {e} 件产品中任取 {c} 件，其中有 {a} 件次品，求恰好取到 1 件次品的概率。",
+        "已知向量 a = ({a}, {b})，b = (-{c}, {d})，求 a 与 b 夹角的余弦值。",
+        "Given sin α = {a}/{e} with α in the second quadrant, find cos 2α.",
+    ), (
+        "最大值为 {e}，最小值为 -{c}",
+        "Sₙ = {big}",
+        "x ≤ -{b} 或 x ≥ {a}",
+        "BC = √{e}",
+        "x = {a} 处取极大值，x = {b} 处取极小值",
+        "{c}/{e}",
+    ), (
+        "函数", "导数", "数列", "不等式", "三角函数", "立体几何", "解析几何",
+        "概率统计", "向量", "复数", "集合", "排列组合",
+    )),
+    "英语": (0.20, "#3498db", (
+        "Choose the best answer: She ___ in Beijing for {a} years before she moved to Shanghai.",
+        "Fill in the blank with the proper form of the given word: The museum, ___ (build) {big} "
+        "years ago, attracts thousands of visitors every year.",
+        "Translate into English: 他每天花 {a} 个小时练习弹钢琴。",
+        "Reading comprehension: According to paragraph {a}, why did the author decide to leave the "
+        "village after {e} years?",
+        "Correct the error: Neither of the {a} students have finished their homework yet.",
+        "Cloze: It was not until midnight ___ the {e} passengers were finally "
+        "allowed to board the plane.",
+        "Writing: Write a letter of about {big} words to your pen friend "
+        "describing your school life.",
+    ), (
+        "had lived",
+        "built",
+        "He spends {a} hours practicing the piano every day.",
+        "Because the factory closed and there were no jobs left.",
+        "have → has",
+        "that",
+    ), (
+        "时态", "语法填空", "完形填空", "阅读理解", "词汇", "翻译", "写作",
+        "非谓语动词", "定语从句", "主谓一致",
+    )),
+    "物理": (0.15, "#9b59b6", (
+        "质量为 {a} kg 的物体从高 {e} m 处自由下落，不计空气阻力，求落地时的速度（g 取 10 m/s²）。",
+        "一辆汽车以 {e} m/s 的初速度做匀减速直线运动，加速度大小为 {b} m/s²，求 {c} s 内的位移。",
+        "电阻 R₁ = {a} Ω 与 R₂ = {b} Ω 并联后接在 {e} V 的电源上，求干路电流。",
+        "一列简谐横波沿 x 轴正方向传播，波速 v = {e} m/s，周期 T = {b} s，求波长。",
+        "质量为 {a} kg 的小球以 {b} m/s 的速度与静止的质量为 {c} kg 的小球发生弹性碰撞，"
+        "求碰后两球的速度。",
+        "A block of mass {a} kg slides down a frictionless incline of height {e} m. Find its speed "
+        "at the bottom.",
+    ), (
+        "v = {e} m/s",
+        "x = {big} m",
+        "I = {a}.{b} A",
+        "λ = {e} m",
+        "v₁ = -{a} m/s，v₂ = {b} m/s",
+    ), (
+        "力学", "运动学", "牛顿定律", "动量", "能量守恒", "电路", "电磁感应",
+        "机械波", "光学", "热学",
+    )),
+    "化学": (0.12, "#27ae60", (
+        "将 {a} g NaOH 溶于水配成 {big} mL 溶液，求溶液的物质的量浓度。",
+        "写出实验室用 MnO₂ 和浓盐酸制取 Cl₂ 的化学方程式，"
+        "并计算生成 {a} mol Cl₂ 需要 HCl 的物质的量。",
+        "在 {big} ℃ 时，反应 N₂ + 3H₂ ⇌ 2NH₃ 达到平衡，平衡常数 K = {a}，"
+        "判断增大压强后平衡移动的方向。",
+        "pH = {b} 的盐酸与 pH = {e} 的 NaOH 溶液等体积混合，求混合后溶液的 pH。",
+        "用惰性电极电解 {a} mol/L 的 CuSO₄ 溶液，写出阴极和阳极的电极反应式。",
+    ), (
+        "c = 0.{a} mol/L",
+        "MnO₂ + 4HCl(浓) = MnCl₂ + Cl₂↑ + 2H₂O，需要 {d} mol HCl",
+        "平衡向正反应方向移动",
+        "pH = {c}",
+        "阴极：Cu²⁺ + 2e⁻ = Cu；阳极：2H₂O - 4e⁻ = O₂↑ + 4H⁺",
+    ), (
+        "化学方程式", "物质的量", "化学平衡", "电化学", "有机化学", "离子反应",
+        "氧化还原", "元素周期律",
+    )),
+    "语文": (0.13, "#e67e22", (
+        "阅读下面的文言文，翻译画线句子：“吾尝终日而思矣，不如须臾之所学也。”",
+        "下列词语中加点字的读音全部正确的一项是（ ）",
+        "赏析诗句“大漠孤烟直，长河落日圆”中运用的表现手法及其表达效果。",
+        "根据下面的材料写一篇不少于 {big} 字的议论文，自拟题目，不得抄袭。",
+        "补写出下列句子中的空缺部分：《劝学》中用比喻说明积累重要性的句子是“______，______”。",
+        "阅读第 {a} 段，概括作者在文中表达的情感，并说明其作用。",
+    ), (
+        "我曾经整天冥思苦想，却不如片刻学到的知识多。",
+        "B",
+        "以景衬情，描绘了雄浑壮阔的边塞风光",
+        "积土成山，风雨兴焉",
+        "表达了作者对故乡的思念之情",
+    ), (
+        "文言文", "古诗词鉴赏", "现代文阅读", "字音字形", "病句", "作文", "名句默写",
+    )),
+    "生物": (0.10, "#16a085", (
+        "某植物种群中 AA 占 {e}%，aa 占 {a}%，求 A 的基因频率。",
+        "简述光合作用光反应和暗反应的场所及物质变化。",
+        "一个 DNA 分子含有 {big} 个碱基对，其中 A 占 {e}%，"
+        "求复制 {b} 次需要的游离鸟嘌呤脱氧核苷酸数。",
+        "分析某生态系统中能量沿食物链流动时逐级递减的原因，已知第一营养级同化量为 {big} kJ。",
+        "说明体液免疫和细胞免疫的主要区别。",
+    ), (
+        "A 的基因频率为 {e}%",
+        "光反应在类囊体薄膜上，暗反应在叶绿体基质中",
+        "需要 {big} 个",
+        "一部分能量通过呼吸作用以热能形式散失",
+    ), (
+        "遗传", "细胞", "光合作用", "呼吸作用", "生态系统", "基因表达", "免疫调节",
+    )),
+}
+
+# 各科通用的标签
+COMMON_TAGS = ("易错", "重点", "粗心", "期中考试", "期末考试", "不会做", "计算错误", "审题不清")
+COMMON_TAG_COLOR = "#7f8c8d"
+
+# 题型分布
+QUESTION_TYPE_WEIGHTS = {
+    QuestionType.SINGLE_CHOICE.value: 0.25,
+    QuestionType.MULTIPLE_CHOICE.value: 0.08,
+    QuestionType.TRUE_FALSE.value: 0.07,
+    QuestionType.FILL_BLANK.value: 0.20,
+    QuestionType.SHORT_ANSWER.value: 0.15,
+    QuestionType.CALCULATION.value: 0.20,
+    QuestionType.OTHER.value: 0.05,
+}
+
+# 难度1-5的分布
+DIFFICULTY_WEIGHTS = (0.08, 0.22, 0.40, 0.22, 0.08)
+
+# 每道题的标签数分布（0-4个）
+TAG_COUNT_WEIGHTS = (0.15, 0.35, 0.30, 0.15, 0.05)
+
+CHINESE_FILLERS = (
+    "请写出详细的解题过程。",
+    "（本题满分 12 分）",
+    "注意单位换算。",
+    "结果保留两位小数。",
+    "提示：可以先画出示意图再分析。",
+    "本题考查基础知识的综合运用能力。",
+    "已知条件同上题。",
+)
+ENGLISH_FILLERS = (
+    "Write your answer on the answer sheet.",
+    "Pay attention to the tense.",
+    "(10 points)",
+    "Explain your reasoning in one or two sentences.",
+    "Use no more than three words for each blank.",
+)
+CHINESE_EXPLANATIONS = (
+    "先由已知条件列出等量关系，再代入求解。",
+    "本题关键在于找准等量关系，注意分类讨论。",
+    "错因：审题不清，忽略了题目中的隐含条件。正确思路是先分析题意，再逐步计算。",
+    "可以画图辅助分析，注意特殊情况的检验。",
+    "这类题目的常见陷阱是符号错误，计算后应代回原式验证。",
+)
+ENGLISH_EXPLANATIONS = (
+    "The key is to identify the tense from the time expression in the sentence.",
+    "注意固定搭配，这里考查的是非谓语动词作定语。",
+    "The subject is singular, so the verb must agree with it.",
+    "Read the context before and after the blank to decide the logical relation.",
+)
+WRONG_ANSWERS = ("{b}", "x = {c}", "没有思路", "C", "{a}.{d}", "忘记公式了", "was living", "-{e}")
+
+
+# ========== 生成参数与结果 ==========
+
+@dataclass
+class SyntheticProfile:
+    """合成数据的规模和分布"""
+    questions: int = 1000  # 题目数量
+    reviews: int = 10000  # 复习记录数量
+    seed: int = 0  # 随机种子
+    days: int = 365  # 题目创建时间分布在最近多少天内
+    unreviewed_ratio: float = 0.2  # 从未复习的题目比例
+    explanation_ratio: float = 0.6  # 带解析的题目比例
+    image_ratio: float = 0.25  # 带图片的题目比例（需要提供图片目录）
+    image_count: int = 100  # 生成的图片文件数量
+    duplicate_image_ratio: float = 0.1  # 与其他图片内容完全相同的图片文件比例
+    chunk_size: int = 10000  # 每次 executemany 写入的题目数量
+    now: Optional[datetime] = None  # 数据的"当前时间"，None表示 datetime.now()
+
+
+@dataclass
+class SyntheticReport:
+    """生成结果"""
+    first_id: int  # 第一道新题目的id（新题目的id连续）
+    questions: int
+    reviews: int
+    tags: int  # 新建的标签数量
+    images: int  # 写入的图片文件数量
+    seconds: float
+
+
+# ========== 工具 ==========
+
+class _WeightedPicker:
+    """按权重抽取（预先计算累积权重，每次抽取只需一次二分查找）"""
+    
+    def __init__(self, items: Sequence, weights: Sequence[float]):
+        self.items = list(items)
+        self.cum_weights = list(accumulate(weights))
+        self.total = self.cum_weights[-1]
+    
+    def pick(self, rng: random.Random):
+        return self.items[bisect(self.cum_weights, rng.random() * self.total)]
+
+
+def _zipf_weights(n: int) -> List[float]:
+    """长尾分布权重：排名第 r 的项权重为 1/r"""
+    return [1.0 / (rank + 1) for rank in range(n)]
+
+
+def _sql_datetime(value: datetime) -> str:
+    """与 SQLAlchemy 在 SQLite 中保存 DateTime 的格式一致"""
+    return value.isoformat(" ", "microseconds")
+
+
+def _numbers(rng: random.Random) -> Dict[str, int]:
+    # 直接用 random() 换算，比 randint 快数倍（每道题要调用多次）
+    r = rng.random
+    return {
+        "a": 2 + int(r() * 19),
+        "b": 2 + int(r() * 11),
+        "c": 1 + int(r() * 9),
+        "d": 1 + int(r() * 9),
+        "e": 10 + int(r() * 90),
+        "big": 300 + int(r() * 2701),
+    }
+
+
+# ========== 生成器 ==========
+
+class _NotebookGenerator:
+    """按给定参数生成题目、标签关联和复习记录的行"""
+    
+    def __init__(self, profile: SyntheticProfile, now: datetime):
+        self.profile = profile
+        self.now = now
+        self.rng = random.Random(profile.seed)
+        self.scheduler = ReviewScheduler()
+        
+        self.subjects = _WeightedPicker(SUBJECTS, [spec[0] for spec in SUBJECTS.values()])
+        self.question_types = _WeightedPicker(QUESTION_TYPE_WEIGHTS, QUESTION_TYPE_WEIGHTS.values())
+        self.difficulties = _WeightedPicker(range(1, 6), DIFFICULTY_WEIGHTS)
+        self.tag_counts = _WeightedPicker(range(len(TAG_COUNT_WEIGHTS)), TAG_COUNT_WEIGHTS)
+        self.subject_tags = {
+            subject: _WeightedPicker(
+                spec[4] + COMMON_TAGS, _zipf_weights(len(spec[4] + COMMON_TAGS))
+            )
+            for subject, spec in SUBJECTS.items()
+        }
+    
+    def tag_colors(self) -> Dict[str, str]:
+        """所有可能用到的标签及其颜色"""
+        colors = {name: COMMON_TAG_COLOR for name in COMMON_TAGS}
+        for spec in SUBJECTS.values():
+            colors.update((name, spec[1]) for name in spec[4])
+        return colors
+    
+    def question_ages(self) -> List[float]:
+        """每道题创建于多少天前（从早到晚，使id顺序与创建时间一致）"""
+        days = self.profile.days
+        return sorted(
+            (self.rng.uniform(0.01, days) for _ in range(self.profile.questions)), reverse=True
+        )
+    
+    def review_counts(self, ages: List[float]) -> List[int]:
+        """把复习记录分配给题目：越早创建的题目复习越多，少数题目复习特别频繁"""
+        n, total = len(ages), self.profile.reviews
+        counts = [0] * n
+        if not n or not total:
+            return counts
+        
+        rng = self.rng
+        unreviewed = self.profile.unreviewed_ratio
+        weights = [
+            0.0 if rng.random() < unreviewed else age * rng.lognormvariate(0, 1)
+            for age in ages
+        ]
+        if not any(weights):
+            weights = [1.0] * n
+        for index in rng.choices(range(n), weights=weights, k=total):
+            counts[index] += 1
+        return counts
+    
+    def _text(self, subject: str) -> Tuple[str, str, str, Optional[str]]:
+        """生成 (题目内容, 答案, 我的答案, 解析)，内容长度从一句到多个小问不等"""
+        rng = self.rng
+        _, _, stems, answers, _ = SUBJECTS[subject]
+        english = subject == "英语"
+        fillers = ENGLISH_FILLERS if english else CHINESE_FILLERS
+        numbers = _numbers(rng)
+        
+        parts = [rng.choice(stems).format(**numbers)]
+        for i in range(int(rng.expovariate(0.7))):
+            if rng.random() < 0.4:
+                parts.append(f"（{i + 2}）" + rng.choice(stems).format(**_numbers(rng)))
+            else:
+                parts.append(rng.choice(fillers))
+        content = (" " if english else "").join(parts)
+        
+        answer = rng.choice(answers).format(**numbers)
+        my_answer = rng.choice(WRONG_ANSWERS).format(**numbers)
+        explanation = None
+        if rng.random() < self.profile.explanation_ratio:
+            explanation = rng.choice(ENGLISH_EXPLANATIONS if english else CHINESE_EXPLANATIONS)
+        return content, answer, my_answer, explanation
+    
+    def _tags(self, subject: str) -> List[str]:
+        picker = self.subject_tags[subject]
+        count = self.tag_counts.pick(self.rng)
+        return list(dict.fromkeys(picker.pick(self.rng) for _ in range(count)))
+    
+    def _result(self, repetitions: int) -> ReviewResult:
+        """作答结果：新学的题目更容易答错"""
+        roll = self.rng.random()
+        again = 0.25 if repetitions == 0 else 0.10
+        if roll < again:
+            return ReviewResult.AGAIN
+        if roll < again + 0.20:
+            return ReviewResult.HARD
+        if roll < 0.85:
+            return ReviewResult.GOOD
+        return ReviewResult.EASY
+    
+    def _history(self, created: datetime, age: float, count: int):
+        """
+        按 SM-2 模拟一道题的复习历史
+        
+        每次复习在上次安排的日期之后（通常会拖延几天）进行；模拟出的历史超出
+        当前时间时，按比例压缩到创建时间与当前时间之间。
+        
+        Returns:
+            ([复习时间], [结果], 间隔, 重复次数, 难度因子)
+        """
+        random_ = self.rng.random
+        calculate = self.scheduler.calculate_next_review
+        interval, repetitions, easiness = 0, 0, 2.5
+        offsets, results = [], []
+        offset = 0.05 + random_() * 2
+        for _ in range(count):
+            result = self._result(repetitions)
+            interval, repetitions, easiness = calculate(interval, repetitions, easiness, result)
+            offsets.append(offset)
+            results.append(result)
+            offset += interval * (0.8 + random_() * 0.8)
+        
+        limit = age * 0.98
+        if offsets[-1] > limit:
+            scale = limit / offsets[-1]
+            offsets = [o * scale for o in offsets]
+        dates = [created + timedelta(days=o) for o in offsets]
+        return dates, results, interval, repetitions, easiness
+    
+    def rows(self, question_id: int, age: float, review_count: int, image_path: Optional[str]):
+        """
+        生成一道题的行
+        
+        Returns:
+            (questions 行, 标签名列表, [review_records 行])
+        """
+        rng = self.rng
+        subject = self.subjects.pick(rng)
+        content, answer, my_answer, explanation = self._text(subject)
+        created = self.now - timedelta(days=age)
+        
+        reviews: List[Tuple] = []
+        mastery, easiness, repetitions, interval = 0, 2.5, 0, 0
+        next_review, updated = None, created
+        if review_count:
+            dates, results, interval, repetitions, easiness = self._history(
+                created, age, review_count
+            )
+            expovariate = rng.expovariate
+            reviews = [
+                (
+                    question_id,
+                    _sql_datetime(reviewed_at),
+                    result.value,
+                    10 + int(expovariate(1 / 50)),
+                )
+                for reviewed_at, result in zip(dates, results)
+            ]
+            updated = dates[-1]
+            mastery = results[-1].value
+            next_review = _sql_datetime(updated + timedelta(days=interval))
+        
+        question = (
+            question_id, subject, self.question_types.pick(rng), content, answer, my_answer,
+            explanation, self.difficulties.pick(rng), image_path, mastery, easiness,
+            repetitions, interval, next_review, _sql_datetime(created), _sql_datetime(updated),
+        )
+        return question, self._tags(subject), reviews
+
+
+_QUESTION_COLUMNS = (
+    "id", "subject", "question_type", "content", "answer", "my_answer", "explanation",
+    "difficulty", "image_path", "mastery_level", "easiness_factor", "repetitions",
+    "interval", "next_review_date", "created_at", "updated_at",
+)
+_INSERT_QUESTION = (
+    f"INSERT INTO questions ({', '.join(_QUESTION_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(_QUESTION_COLUMNS))})"
+)
+_INSERT_REVIEW = (
+    "INSERT INTO review_records (question_id, review_date, result, time_spent) "
+    "VALUES (?, ?, ?, ?)"
+)
+_INSERT_QUESTION_TAG = "INSERT INTO question_tags (question_id, tag_id) VALUES (?, ?)"
+
+
+def write_images(images_dir: Path, profile: SyntheticProfile) -> List[str]:
+    """
+    生成题目图片（模拟手机照片和截图），返回相对于 images_dir 的文件名
+    
+    图片是浅色背景上的若干行深色色块（类似文字行），约七成为 JPEG、三成为 PNG。
+    最后 duplicate_image_ratio 比例的文件是前面文件的字节级副本，模拟重复上传。
+    """
+    from PIL import Image, ImageDraw
+    
+    rng = random.Random(f"{profile.seed}-images")
+    images_dir.mkdir(parents=True, exist_ok=True)
+    count = profile.image_count
+    unique = max(1, count - int(count * profile.duplicate_image_ratio)) if count else 0
+    
+    names: List[str] = []
+    for i in range(count):
+        is_jpeg = rng.random() < 0.7
+        name = f"synthetic_{profile.seed}_{i:05d}.{'jpg' if is_jpeg else 'png'}"
+        if i >= unique:
+            source = names[rng.randrange(unique)]
+            name = f"synthetic_{profile.seed}_{i:05d}{Path(source).suffix}"
+            shutil.copyfile(images_dir / source, images_dir / name)
+            names.append(name)
+            continue
+        
+        width, height = rng.choice(((1280, 960), (960, 1280), (1080, 720), (800, 600), (640, 480)))
+        shade = rng.randint(225, 250)
+        image = Image.new("RGB", (width, height), (shade, shade, shade - rng.randint(0, 15)))
+        draw = ImageDraw.Draw(image)
+        y = rng.randint(20, 60)
+        line_height = rng.randint(28, 48)
+        while y + line_height < height - 20:
+            x = rng.randint(20, 60)
+            while x < width - 80:
+                word = rng.randint(20, 90)
+                ink = rng.randint(20, 80)
+                draw.rectangle((x, y, x + word, y + line_height // 2), fill=(ink, ink, ink))
+                x += word + rng.randint(8, 20)
+            y += line_height + rng.randint(0, 20)
+        
+        if is_jpeg:
+            image.save(images_dir / name, "JPEG", quality=85)
+        else:
+            image.save(images_dir / name, "PNG")
+        names.append(name)
+    return names
+
+
+def _drop_indexes(conn: Connection, tables: Sequence[str]) -> List[str]:
+    """
+    删除表上的二级索引，返回重建它们的SQL
+    
+    向大表写入大量数据时，先写入再一次性建索引（排序）比逐行维护索引快得多。
+    """
+    placeholders = ", ".join("?" * len(tables))
+    rows = conn.exec_driver_sql(
+        "SELECT name, sql FROM sqlite_master "
+        f"WHERE type = 'index' AND sql IS NOT NULL AND tbl_name IN ({placeholders})",
+        tuple(tables)
+    ).fetchall()
+    for name, _ in rows:
+        conn.exec_driver_sql(f"DROP INDEX {name}")
+    return [sql for _, sql in rows]
+
+
+def _drop_sync_triggers(conn: Connection):
+    """删除全文索引和计数表的同步触发器（写入后由 _restore_sync_state 重建）"""
+    names = [
+        row[0] for row in conn.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger'"
+        )
+        if row[0].startswith((f"{FTS_TABLE}_", f"{COUNTERS_TABLE}_"))
+    ]
+    for name in names:
+        conn.exec_driver_sql(f"DROP TRIGGER {name}")
+
+
+def _restore_sync_state(conn: Connection):
+    """根据基础表重建全文索引和计数，并恢复同步触发器"""
+    rebuild_fts_index(conn)
+    rebuild_counters(conn)
+    create_fts_schema(conn)
+    create_counter_schema(conn)
+
+
+def generate_notebook(
+    db_manager: DatabaseManager,
+    profile: Optional[SyntheticProfile] = None,
+    images_dir: Optional[Path] = None,
+    progress: Optional[ProgressCallback] = None
+) -> SyntheticReport:
+    """
+    向数据库写入一批合成题目、标签关联和复习记录
+    
+    已有数据保留，新题目追加在后面，同名标签复用。全部数据在一个事务中写入，
+    失败时整体回滚。写入后全文索引和计数表按整个数据库重建。
+    
+    Args:
+        db_manager: 数据库管理器
+        profile: 规模和分布参数
+        images_dir: 图片存储目录，提供时生成图片文件并让部分题目引用它们
+        progress: 进度回调，每写入一批题目调用一次
+    
+    Returns:
+        生成结果
+    """
+    profile = profile or SyntheticProfile()
+    started = time.perf_counter()
+    now = profile.now or datetime.now().replace(microsecond=0)
+    generator = _NotebookGenerator(profile, now)
+    
+    images = write_images(images_dir, profile) if images_dir and profile.image_count else []
+    image_picker = _WeightedPicker(images, _zipf_weights(len(images))) if images else None
+    
+    ages = generator.question_ages()
+    review_counts = generator.review_counts(ages)
+    
+    with db_manager.engine.begin() as conn:
+        first_id = conn.exec_driver_sql("SELECT COALESCE(MAX(id), 0) + 1 FROM questions").scalar()
+        tag_ids = dict(conn.exec_driver_sql("SELECT name, id FROM tags").fetchall())
+        new_tags = [(name, color) for name, color in generator.tag_colors().items()
+                    if name not in tag_ids]
+        if new_tags:
+            conn.exec_driver_sql("INSERT INTO tags (name, color) VALUES (?, ?)", new_tags)
+            tag_ids = dict(conn.exec_driver_sql("SELECT name, id FROM tags").fetchall())
+        
+        _drop_sync_triggers(conn)
+        index_sql = _drop_indexes(conn, ("questions", "review_records", "question_tags"))
+        
+        review_total = 0
+        for start in range(0, profile.questions, profile.chunk_size):
+            end = min(start + profile.chunk_size, profile.questions)
+            questions, links, reviews = [], [], []
+            for index in range(start, end):
+                question_id = first_id + index
+                image_path = None
+                if image_picker and generator.rng.random() < profile.image_ratio:
+                    image_path = image_picker.pick(generator.rng)
+                question, tags, question_reviews = generator.rows(
+                    question_id, ages[index], review_counts[index], image_path
+                )
+                questions.append(question)
+                links.extend((question_id, tag_ids[name]) for name in tags)
+                reviews.extend(question_reviews)
+            
+            conn.exec_driver_sql(_INSERT_QUESTION, questions)
+            if links:
+                conn.exec_driver_sql(_INSERT_QUESTION_TAG, links)
+            if reviews:
+                conn.exec_driver_sql(_INSERT_REVIEW, reviews)
+            review_total += len(reviews)
+            if progress:
+                progress(end, profile.questions)
+        
+        for sql in index_sql:
+            conn.exec_driver_sql(sql)
+        _restore_sync_state(conn)
+    
+    db_manager.checkpoint()
+    return SyntheticReport(
+        first_id=first_id,
+        questions=profile.questions,
+        reviews=review_total,
+        tags=len(new_tags),
+        images=len(images),
+        seconds=time.perf_counter() - started,
+    )
+
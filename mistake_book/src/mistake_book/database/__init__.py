@@ -1,6 +1,6 @@
 """数据持久层模块"""
 
-from .db_manager import DatabaseManager
+from .db_manager import DatabaseManager, EngineProfile
 from .models import Question, Tag, ReviewRecord
 
-__all__ = ["DatabaseManager", "Question", "Tag", "ReviewRecord"]
+__all__ = ["DatabaseManager", "EngineProfile", "Question", "Tag", "ReviewRecord"]
@@ -0,0 +1,173 @@
+"""由触发器维护的题目计数表
+
+question_counters 按 (facet, value) 保存题目数量，questions 和 question_tags
+表上的触发器在增删改时同步加减，导航树、统计面板等读取计数时只需读取
+与分类数量相当的几行，而不必扫描全部题目。
+
+计数维度（facet）：
+    - total:          总题数（value 为空字符串）
+    - subject:        科目
+    - question_type:  题型（未设置时为空字符串）
+    - mastery_level:  掌握度
+    - module:         (科目, 题型) 组合，value 为 JSON 数组（未设置的项为空字符串）
+    - tag:            标签，value 为 tag_id（即 question_tags 中的关联数）
+
+计数为0的行会被删除。check_counters 将计数表与基础表逐项比对，
+rebuild_counters 可在不一致时重建。
+"""
+
+import json
+from typing import Dict, List, Tuple
+
+from sqlalchemy.engine import Connection
+
+COUNTERS_TABLE = "question_counters"
+
+# 基于 questions 行的计数维度及其取值表达式（{row} 为 new/old/questions）
+QUESTION_FACETS = {
+    "total": "''",
+    "subject": "COALESCE({row}.subject, '')",
+    "question_type": "COALESCE({row}.question_type, '')",
+    "mastery_level": "COALESCE({row}.mastery_level, 0)",
+    "module": "json_array(COALESCE({row}.subject, ''), COALESCE({row}.question_type, ''))",
+}
+
+# 影响计数的 questions 列
+_COUNTED_COLUMNS = "subject, question_type, mastery_level"
+
+
+def _increment(facet: str, value_sql: str) -> str:
+    return (
+        f"INSERT INTO {COUNTERS_TABLE} (facet, value, count) "
+        f"VALUES ('{facet}', {value_sql}, 1) "
+        "ON CONFLICT (facet, value) DO UPDATE SET count = count + 1; "
+    )
+
+
+def _decrement(facet: str, value_sql: str) -> str:
+    return (
+        f"UPDATE {COUNTERS_TABLE} SET count = count - 1 "
+        f"WHERE facet = '{facet}' AND value = {value_sql}; "
+    )
+
+
+def _question_statements(row: str, step) -> str:
+    return "".join(
+        step(facet, expr.format(row=row)) for facet, expr in QUESTION_FACETS.items()
+    )
+
+
+_CLEANUP = f"DELETE FROM {COUNTERS_TABLE} WHERE count <= 0; "
+
+
+def create_counter_schema(conn: Connection):
+    """创建计数表和同步触发器"""
+    conn.exec_driver_sql(
+        f"CREATE TABLE IF NOT EXISTS {COUNTERS_TABLE} ("
+        "facet VARCHAR(20) NOT NULL, "
+        "value TEXT NOT NULL, "
+        "count INTEGER NOT NULL DEFAULT 0, "
+        "PRIMARY KEY (facet, value))"
+    )
+    conn.exec_driver_sql(
+        f"CREATE TRIGGER IF NOT EXISTS {COUNTERS_TABLE}_q_ai AFTER INSERT ON questions BEGIN "
+        + _question_statements("new", _increment)
+        + "END"
+    )
+    conn.exec_driver_sql(
+        f"CREATE TRIGGER IF NOT EXISTS {COUNTERS_TABLE}_q_ad AFTER DELETE ON questions BEGIN "
+        + _question_statements("old", _decrement)
+        + _CLEANUP
+        + "END"
+    )
+    conn.exec_driver_sql(
+        f"CREATE TRIGGER IF NOT EXISTS {COUNTERS_TABLE}_q_au "
+        f"AFTER UPDATE OF {_COUNTED_COLUMNS} ON questions BEGIN "
+        + _question_statements("old", _decrement)
+        + _question_statements("new", _increment)
+        + _CLEANUP
+        + "END"
+    )
+    conn.exec_driver_sql(
+        f"CREATE TRIGGER IF NOT EXISTS {COUNTERS_TABLE}_qt_ai "
+        "AFTER INSERT ON question_tags BEGIN "
+        + _increment("tag", "new.tag_id")
+        + "END"
+    )
+    conn.exec_driver_sql(
+        f"CREATE TRIGGER IF NOT EXISTS {COUNTERS_TABLE}_qt_ad "
+        "AFTER DELETE ON question_tags BEGIN "
+        + _decrement("tag", "old.tag_id")
+        + _CLEANUP
+        + "END"
+    )
+    conn.exec_driver_sql(
+        f"CREATE TRIGGER IF NOT EXISTS {COUNTERS_TABLE}_qt_au "
+        "AFTER UPDATE OF tag_id ON question_tags BEGIN "
+        + _decrement("tag", "old.tag_id")
+        + _increment("tag", "new.tag_id")
+        + _CLEANUP
+        + "END"
+    )
+
+
+def _expected_counts_sql() -> str:
+    """根据基础表计算计数的查询"""
+    parts = [
+        f"SELECT '{facet}' AS facet, {expr.format(row='questions')} AS value, COUNT(*) AS count "
+        "FROM questions GROUP BY 2"
+        for facet, expr in QUESTION_FACETS.items()
+    ]
+    parts.append("SELECT 'tag', tag_id, COUNT(*) FROM question_tags GROUP BY tag_id")
+    return " UNION ALL ".join(parts)
+
+
+def _normalize(rows) -> Dict[Tuple[str, str], int]:
+    # 计数表的 value 列是TEXT，基础表中的整数值需要统一转成字符串比较
+    return {(facet, str(value)): count for facet, value, count in rows if count}
+
+
+def rebuild_counters(conn: Connection):
+    """根据基础表重建计数"""
+    conn.exec_driver_sql(f"DELETE FROM {COUNTERS_TABLE}")
+    conn.exec_driver_sql(
+        f"INSERT INTO {COUNTERS_TABLE} (facet, value, count) {_expected_counts_sql()}"
+    )
+
+
+def check_counters(conn: Connection) -> List[Tuple[str, str, int, int]]:
+    """
+    比对计数表与基础表
+    
+    Returns:
+        不一致的项列表 [(facet, value, 期望数量, 实际数量)]，一致时为空列表
+    """
+    expected = _normalize(conn.exec_driver_sql(_expected_counts_sql()).fetchall())
+    actual = _normalize(
+        conn.exec_driver_sql(f"SELECT facet, value, count FROM {COUNTERS_TABLE}").fetchall()
+    )
+    mismatches = []
+    for key in sorted(expected.keys() | actual.keys()):
+        if expected.get(key, 0) != actual.get(key, 0):
+            mismatches.append((key[0], key[1], expected.get(key, 0), actual.get(key, 0)))
+    return mismatches
+
+
+def read_counters(conn: Connection) -> Dict[str, Dict]:
+    """
+    读取所有计数
+    
+    Returns:
+        {facet: {value: count}}，其中 mastery_level 和 tag 的键为整数，
+        module 的键为 (科目, 题型) 元组，空字符串表示未设置
+    """
+    counters: Dict[str, Dict] = {facet: {} for facet in QUESTION_FACETS}
+    counters["tag"] = {}
+    rows = conn.exec_driver_sql(f"SELECT facet, value, count FROM {COUNTERS_TABLE}").fetchall()
+    for facet, value, count in rows:
+        if facet in ("mastery_level", "tag"):
+            value = int(value)
+        elif facet == "module":
+            value = tuple(json.loads(value))
+        counters.setdefault(facet, {})[value] = count
+    return counters
@@ -1,31 +1,131 @@
 """数据库连接池、事务、初始化、备份"""
 
 from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
-from sqlalchemy import create_engine
+from typing import Optional
+import logging
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import QueuePool
 from mistake_book.database.models import Base
+from mistake_book.database.migrations import MigrationRunner
+from mistake_book.database.fts import cjk_bigrams, sync_fts_index
 import shutil
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class EngineProfile:
+    """SQLite引擎配置（每个新连接都会应用这些PRAGMA）"""
+    journal_mode: str = "WAL"  # WAL模式：读写互不阻塞
+    synchronous: str = "NORMAL"  # WAL下NORMAL即可保证一致性
+    cache_size_kb: int = 64 * 1024  # 页缓存大小（KB）
+    mmap_size: int = 256 * 1024 * 1024  # 内存映射大小（字节），0表示关闭
+    temp_store: str = "MEMORY"  # 临时表/索引放在内存中
+    busy_timeout_ms: int = 5000  # 锁等待超时（毫秒）
+    pool_size: int = 5  # 连接池常驻连接数
+    max_overflow: int = 10  # 连接池允许的额外连接数
+    pool_timeout: float = 30.0  # 获取连接的超时时间（秒）
+    echo: bool = False
+
 
 class DatabaseManager:
     """数据库管理器"""
     
-    def __init__(self, db_path: Path):
+    def __init__(self, db_path: Path, profile: Optional[EngineProfile] = None):
         self.db_path = db_path
-        self.engine = create_engine(f"sqlite:///{db_path}", echo=False)
+        self.profile = profile or EngineProfile()
+        self.engine = self._create_engine()
         self.SessionLocal = sessionmaker(bind=self.engine)
+        self._fts_ready = False  # 迁移完成前待索引表可能还不存在
         self.init_database()
     
+    def _create_engine(self):
+        """按配置创建引擎，并注册连接钩子"""
+        profile = self.profile
+        engine = create_engine(
+            f"sqlite:///{self.db_path}",
+            echo=profile.echo,
+            poolclass=QueuePool,
+            pool_size=profile.pool_size,
+            max_overflow=profile.max_overflow,
+            pool_timeout=profile.pool_timeout,
+            connect_args={
+                # 连接由连接池在线程间复用，每个会话同一时间只在一个线程中使用
+                "check_same_thread": False,
+                "timeout": profile.busy_timeout_ms / 1000,
+            },
+        )
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "begin", self._on_begin)
+        event.listen(engine, "commit", self._on_commit)
+        return engine
+    
+    def _on_connect(self, dbapi_connection, connection_record):
+        """新连接建立时应用PRAGMA配置并注册自定义SQL函数"""
+        profile = self.profile
+        # 关闭pysqlite的隐式事务管理，由 _on_begin 显式开始事务，
+        # 这样DDL（迁移）也能包含在事务中
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f"PRAGMA journal_mode={profile.journal_mode}")
+            cursor.execute(f"PRAGMA synchronous={profile.synchronous}")
+            # 负数表示以KB为单位
+            cursor.execute(f"PRAGMA cache_size=-{int(profile.cache_size_kb)}")
+            cursor.execute(f"PRAGMA mmap_size={int(profile.mmap_size)}")
+            cursor.execute(f"PRAGMA temp_store={profile.temp_store}")
+            cursor.execute(f"PRAGMA busy_timeout={int(profile.busy_timeout_ms)}")
+        finally:
+            cursor.close()
+        # 全文索引的分词函数（sync_fts_index 使用，触发器不调用）
+        dbapi_connection.create_function("cjk_bigrams", 1, cjk_bigrams, deterministic=True)
+    
+    def _on_begin(self, conn):
+        """SQLAlchemy开始事务时发出BEGIN（要求立即获取写锁时发出BEGIN IMMEDIATE）"""
+        if conn.get_execution_options().get("begin_immediate"):
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+        else:
+            conn.exec_driver_sql("BEGIN")
+        conn.info["changes_at_begin"] = conn.connection.dbapi_connection.total_changes
+    
+    def _on_commit(self, conn):
+        """写事务提交前为新增、修改的题目建立全文索引（只读事务跳过）"""
+        if not self._fts_ready:
+            return
+        if conn.connection.dbapi_connection.total_changes == conn.info.get("changes_at_begin"):
+            return
+        try:
+            sync_fts_index(conn)
+        except OperationalError as e:
+            # 索引表缺失或损坏时不影响本次写入，待索引的题目留到下次启动时处理
+            logger.warning(f"更新全文索引失败: {e}")
+    
     def init_database(self):
-        """初始化数据库表"""
+        """初始化数据库表并执行结构迁移"""
         Base.metadata.create_all(self.engine)
+        MigrationRunner(self.engine).run()
+        self._fts_ready = True
+        # 为其他程序（不会建立索引）写入的题目建立索引
+        with self.engine.begin() as conn:
+            sync_fts_index(conn)
     
     @contextmanager
-    def session_scope(self) -> Session:
-        """提供事务会话上下文"""
+    def session_scope(self, immediate: bool = False) -> Session:
+        """
+        提供事务会话上下文
+        
+        Args:
+            immediate: 事务开始时即获取写锁。先读后写的事务需要这样做，
+                否则读取之后其他连接提交的写入会使本事务的写入失败
+        """
         session = self.SessionLocal()
+        if immediate:
+            session.connection(execution_options={"begin_immediate": True})
         try:
             yield session
             session.commit()
@@ -39,13 +139,30 @@ class DatabaseManager:
         """获取新的会话（用于确保数据最新）"""
         return self.SessionLocal()
     
+    def checkpoint(self):
+        """将WAL日志合并回主数据库文件"""
+        with self.engine.connect() as conn:
+            conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+    
+    def dispose(self):
+        """关闭连接池中的所有连接"""
+        self.engine.dispose()
+    
     def backup(self, backup_dir: Path) -> Path:
         """备份数据库"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_path = backup_dir / f"backup_{timestamp}.db"
+        # WAL模式下未合并的数据在-wal文件中，复制前先合并
+        self.checkpoint()
         shutil.copy2(self.db_path, backup_path)
         return backup_path
     
     def restore(self, backup_path: Path):
         """恢复数据库"""
+        # 先关闭所有连接并清理旧的WAL文件，避免旧日志覆盖恢复的数据
+        self.dispose()
+        for suffix in ("-wal", "-shm"):
+            sidecar = Path(f"{self.db_path}{suffix}")
+            if sidecar.exists():
+                sidecar.unlink()
         shutil.copy2(backup_path, self.db_path)
@@ -0,0 +1,222 @@
+"""全文检索（SQLite FTS5）
+
+FTS5 内置的 unicode61 分词器会把一整段连续的中文当作一个词，无法按词检索。
+这里在写入索引前把中日韩文字展开为二元组（bigram），再交给 unicode61 分词：
+
+    "二次函数" -> "二次 次函 函数 数"
+
+查询时对关键词做同样的展开，并作为短语（phrase）匹配，因此任意长度
+不少于两个字的中文片段都能命中；单个汉字使用前缀匹配。
+
+展开函数 cjk_bigrams 是 Python 函数，只有本程序的连接（DatabaseManager）注册了它。
+同步触发器因此不调用它，只使用普通SQL，任何连接（sqlite3 命令行、备份恢复工具、
+脚本中直接 sqlite3.connect）都能正常写入 questions：
+    - 删除或修改题目时删除其索引行
+    - 新增或修改的题目id记入待索引表 questions_fts_pending
+本程序的连接在提交写事务前调用 sync_fts_index，用 cjk_bigrams 为待索引的题目
+建立索引（启动时也会同步一次，补上其他程序写入的题目）。
+"""
+
+import html
+import re
+from typing import Optional
+
+from sqlalchemy.engine import Connection
+
+FTS_TABLE = "questions_fts"
+
+# 待建立索引的题目id（由触发器写入，sync_fts_index 处理后清空）
+FTS_PENDING_TABLE = "questions_fts_pending"
+
+# 参与索引的列（顺序与 FTS_WEIGHTS 对应）
+FTS_COLUMNS = ("subject", "question_type", "content", "answer", "my_answer", "explanation")
+
+# bm25 列权重：题目内容最重要，其次是解析和答案
+FTS_WEIGHTS = (2.0, 2.0, 10.0, 4.0, 1.0, 3.0)
+
+# 生成摘要时依次尝试的字段
+SNIPPET_FIELDS = ("content", "explanation", "answer", "my_answer")
+
+_CJK_RUN = re.compile(
+    "[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af]+"
+)
+_TOKEN = re.compile(r"\w+")
+
+
+def _expand_run(run: str, trailing_unigram: bool) -> str:
+    if len(run) == 1:
+        return run
+    grams = [run[i:i + 2] for i in range(len(run) - 1)]
+    if trailing_unigram:
+        # 末尾单字，使单字查询也能命中位于词尾的汉字
+        grams.append(run[-1])
+    return " ".join(grams)
+
+
+def cjk_bigrams(text: Optional[str]) -> str:
+    """将文本中的中日韩文字展开为二元组，其他文字保持不变（用于写入索引）"""
+    if not text:
+        return ""
+    return _CJK_RUN.sub(lambda m: f" {_expand_run(m.group(), True)} ", text)
+
+
+def _quote(token: str) -> str:
+    return '"' + token.replace('"', '""') + '"'
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """
+    将用户输入转换为 FTS5 MATCH 表达式
+    
+    多个关键词（空格分隔）之间为 AND 关系；最后一个关键词使用前缀匹配，
+    以支持边输入边搜索。
+    
+    Returns:
+        MATCH表达式，没有可检索的内容时返回None
+    """
+    terms = []
+    raw_terms = query.split()
+    for i, raw in enumerate(raw_terms):
+        expanded = _CJK_RUN.sub(lambda m: f" {_expand_run(m.group(), False)} ", raw)
+        tokens = _TOKEN.findall(expanded)
+        if not tokens:
+            continue
+        phrase = _quote(" ".join(tokens))
+        is_last = i == len(raw_terms) - 1
+        is_single_char = len(tokens) == 1 and len(tokens[0]) == 1
+        if is_last or is_single_char:
+            phrase += " *"
+        terms.append(phrase)
+    
+    if not terms:
+        return None
+    return " AND ".join(terms)
+
+
+def make_snippet(
+    text: Optional[str],
+    query: str,
+    width: int = 60,
+    start_mark: str = "<b>",
+    end_mark: str = "</b>"
+) -> str:
+    """
+    生成带高亮的摘要（HTML转义后，用标记包裹匹配的关键词）
+    
+    Args:
+        text: 原文
+        query: 用户输入的查询
+        width: 摘要的大致字符数
+        start_mark: 高亮开始标记
+        end_mark: 高亮结束标记
+    """
+    if not text:
+        return ""
+    
+    terms = sorted({t for t in query.split() if t}, key=len, reverse=True)
+    if not terms:
+        return html.escape(text[:width])
+    
+    pattern = re.compile("|".join(re.escape(t) for t in terms), re.IGNORECASE)
+    first = pattern.search(text)
+    if first is None:
+        snippet_start = 0
+    else:
+        snippet_start = max(0, first.start() - width // 3)
+    snippet_end = min(len(text), snippet_start + width)
+    window = text[snippet_start:snippet_end]
+    
+    parts = []
+    pos = 0
+    for m in pattern.finditer(window):
+        parts.append(html.escape(window[pos:m.start()]))
+        parts.append(f"{start_mark}{html.escape(m.group())}{end_mark}")
+        pos = m.end()
+    parts.append(html.escape(window[pos:]))
+    
+    snippet = "".join(parts)
+    if snippet_start > 0:
+        snippet = "…" + snippet
+    if snippet_end < len(text):
+        snippet += "…"
+    return snippet
+
+
+def pick_snippet(row: dict, query: str, width: int = 60) -> str:
+    """在多个字段中选择第一个包含关键词的字段生成摘要"""
+    lowered = [t.lower() for t in query.split() if t]
+    for field in SNIPPET_FIELDS:
+        value = row.get(field)
+        if value and any(t in value.lower() for t in lowered):
+            return make_snippet(value, query, width)
+    return make_snippet(row.get("content"), query, width)
+
+
+def create_fts_schema(conn: Connection):
+    """创建全文索引表、待索引表和同步触发器（触发器不调用自定义函数）"""
+    columns = ", ".join(FTS_COLUMNS)
+    
+    conn.exec_driver_sql(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        f"{columns}, tokenize = 'unicode61 remove_diacritics 2')"
+    )
+    conn.exec_driver_sql(
+        f"CREATE TABLE IF NOT EXISTS {FTS_PENDING_TABLE} (id INTEGER PRIMARY KEY)"
+    )
+    conn.exec_driver_sql(
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON questions BEGIN "
+        f"INSERT OR IGNORE INTO {FTS_PENDING_TABLE} (id) VALUES (new.id); "
+        "END"
+    )
+    conn.exec_driver_sql(
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON questions BEGIN "
+        f"DELETE FROM {FTS_TABLE} WHERE rowid = old.id; "
+        f"DELETE FROM {FTS_PENDING_TABLE} WHERE id = old.id; "
+        "END"
+    )
+    conn.exec_driver_sql(
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au "
+        f"AFTER UPDATE OF {columns} ON questions BEGIN "
+        f"DELETE FROM {FTS_TABLE} WHERE rowid = old.id; "
+        f"INSERT OR IGNORE INTO {FTS_PENDING_TABLE} (id) VALUES (new.id); "
+        "END"
+    )
+
+
+def sync_fts_index(conn: Connection) -> int:
+    """
+    为待索引表中的题目建立索引（需要连接上注册了 cjk_bigrams）
+    
+    触发器在修改、删除题目时已删除旧的索引行，这里只需插入。
+    没有待索引的题目时只执行一条语句。
+    
+    Returns:
+        建立索引的题目数量
+    """
+    columns = ", ".join(FTS_COLUMNS)
+    values = ", ".join(f"cjk_bigrams({c})" for c in FTS_COLUMNS)
+    result = conn.exec_driver_sql(
+        f"INSERT INTO {FTS_TABLE} (rowid, {columns}) "
+        f"SELECT id, {values} FROM questions WHERE id IN (SELECT id FROM {FTS_PENDING_TABLE})"
+    )
+    if result.rowcount:
+        conn.exec_driver_sql(f"DELETE FROM {FTS_PENDING_TABLE}")
+    return result.rowcount
+
+
+def rebuild_fts_index(conn: Connection):
+    """根据 questions 表重建全文索引"""
+    columns = ", ".join(FTS_COLUMNS)
+    values = ", ".join(f"cjk_bigrams({c})" for c in FTS_COLUMNS)
+    conn.exec_driver_sql(f"DELETE FROM {FTS_TABLE}")
+    conn.exec_driver_sql(
+        f"INSERT INTO {FTS_TABLE} (rowid, {columns}) SELECT id, {values} FROM questions"
+    )
+    conn.exec_driver_sql(f"DELETE FROM {FTS_PENDING_TABLE}")
+
+
+def bm25_expression() -> str:
+    """带列权重的bm25排序表达式（值越小越相关）"""
+    weights = ", ".join(str(w) for w in FTS_WEIGHTS)
+    return f"bm25({FTS_TABLE}, {weights})"
+
@@ -0,0 +1,217 @@
+"""版本化的数据库结构迁移
+
+每个迁移有唯一的递增版本号，启动时按顺序执行尚未应用的迁移。
+每个迁移连同版本记录在同一个事务中提交，失败时整体回滚。
+迁移必须是幂等的：新建的数据库已经由 create_all 建好了最新结构。
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, List, Optional
+import logging
+
+from sqlalchemy.engine import Connection, Engine
+
+from mistake_book.database.fts import create_fts_schema, rebuild_fts_index
+from mistake_book.database.counters import create_counter_schema, rebuild_counters
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Migration:
+    """单个迁移步骤"""
+    version: int
+    name: str
+    upgrade: Callable[[Connection], None]
+
+
+MIGRATIONS: List[Migration] = []
+
+
+def migration(version: int, name: str):
+    """注册迁移的装饰器"""
+    def decorator(func: Callable[[Connection], None]):
+        MIGRATIONS.append(Migration(version, name, func))
+        return func
+    return decorator
+
+
+# ========== 迁移定义 ==========
+
+@migration(1, "add_hot_column_indexes")
+def _add_hot_column_indexes(conn: Connection):
+    """为筛选和排序常用的列添加二级索引"""
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_questions_subject_type "
+        "ON questions (subject, question_type)"
+    )
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_questions_mastery_level "
+        "ON questions (mastery_level)"
+    )
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_questions_next_review_date "
+        "ON questions (next_review_date)"
+    )
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_review_records_question_date "
+        "ON review_records (question_id, review_date)"
+    )
+
+
+@migration(2, "question_tags_composite_primary_key")
+def _question_tags_composite_primary_key(conn: Connection):
+    """为 question_tags 添加 (question_id, tag_id) 复合主键，并去除重复行"""
+    columns = conn.exec_driver_sql("PRAGMA table_info(question_tags)").fetchall()
+    pk_columns = {row[1] for row in columns if row[5]}
+    if pk_columns != {"question_id", "tag_id"}:
+        # SQLite 不支持给已有表添加主键，只能重建
+        conn.exec_driver_sql(
+            "CREATE TABLE question_tags_new ("
+            "question_id INTEGER NOT NULL REFERENCES questions (id), "
+            "tag_id INTEGER NOT NULL REFERENCES tags (id), "
+            "PRIMARY KEY (question_id, tag_id))"
+        )
+        conn.exec_driver_sql(
+            "INSERT OR IGNORE INTO question_tags_new (question_id, tag_id) "
+            "SELECT question_id, tag_id FROM question_tags "
+            "WHERE question_id IS NOT NULL AND tag_id IS NOT NULL"
+        )
+        conn.exec_driver_sql("DROP TABLE question_tags")
+        conn.exec_driver_sql("ALTER TABLE question_tags_new RENAME TO question_tags")
+    # 主键索引以 question_id 开头，按标签反查需要单独的索引
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_question_tags_tag_id ON question_tags (tag_id)"
+    )
+
+
+@migration(3, "questions_full_text_index")
+def _questions_full_text_index(conn: Connection):
+    """
+    创建FTS5全文索引及同步触发器，并为已有题目建立索引
+    
+    分词函数 cjk_bigrams 只在本程序的连接上注册，触发器因此不调用它，
+    只把题目id记入待索引表；其他连接（sqlite3 命令行、脚本）也能写入 questions。
+    建立索引需要 cjk_bigrams，由本程序提交写事务前的 sync_fts_index 完成。
+    """
+    create_fts_schema(conn)
+    rebuild_fts_index(conn)
+
+
+@migration(4, "add_sort_column_indexes")
+def _add_sort_column_indexes(conn: Connection):
+    """为分页列表的排序字段添加索引（索引隐含rowid，即 (列, id) 顺序）"""
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_questions_created_at ON questions (created_at)"
+    )
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_questions_difficulty ON questions (difficulty)"
+    )
+
+
+@migration(5, "add_review_date_index")
+def _add_review_date_index(conn: Connection):
+    """为按日期统计复习记录（今日复习、最近复习）添加索引"""
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_review_records_review_date "
+        "ON review_records (review_date)"
+    )
+
+
+@migration(6, "question_counters")
+def _question_counters(conn: Connection):
+    """创建由触发器维护的计数表，并根据已有数据初始化"""
+    create_counter_schema(conn)
+    rebuild_counters(conn)
+
+
+@migration(7, "due_queue_index")
+def _due_queue_index(conn: Connection):
+    """复习队列索引 (科目, 题型, 复习日期)，替代其前缀索引 ix_questions_subject_type"""
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_questions_subject_type_due "
+        "ON questions (subject, question_type, next_review_date)"
+    )
+    conn.exec_driver_sql("DROP INDEX IF EXISTS ix_questions_subject_type")
+
+
+@migration(8, "review_record_client_token")
+def _review_record_client_token(conn: Connection):
+    """为复习记录添加客户端令牌（唯一），重放复习日志时据此跳过已写入的作答"""
+    columns = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info(review_records)")}
+    if "client_token" not in columns:
+        conn.exec_driver_sql("ALTER TABLE review_records ADD COLUMN client_token VARCHAR(32)")
+    conn.exec_driver_sql(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_review_records_client_token "
+        "ON review_records (client_token)"
+    )
+
+
+@migration(9, "image_path_index")
+def _image_path_index(conn: Connection):
+    """为图片路径添加索引：按内容寻址存储的图片由引用它的题目数决定是否删除"""
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_questions_image_path ON questions (image_path)"
+    )
+
+
+# ========== 迁移执行 ==========
+
+class MigrationRunner:
+    """迁移执行器"""
+    
+    VERSION_TABLE = "schema_version"
+    
+    def __init__(self, engine: Engine, migrations: Optional[List[Migration]] = None):
+        self.engine = engine
+        self.migrations = sorted(
+            migrations if migrations is not None else MIGRATIONS,
+            key=lambda m: m.version
+        )
+    
+    def _ensure_version_table(self):
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql(
+                f"CREATE TABLE IF NOT EXISTS {self.VERSION_TABLE} ("
+                "version INTEGER PRIMARY KEY, "
+                "name VARCHAR(100) NOT NULL, "
+                "applied_at DATETIME NOT NULL)"
+            )
+    
+    def current_version(self) -> int:
+        """获取当前数据库结构版本（0表示尚未执行任何迁移）"""
+        self._ensure_version_table()
+        with self.engine.connect() as conn:
+            version = conn.exec_driver_sql(
+                f"SELECT MAX(version) FROM {self.VERSION_TABLE}"
+            ).scalar()
+        return version or 0
+    
+    def pending(self) -> List[Migration]:
+        """获取待执行的迁移"""
+        current = self.current_version()
+        return [m for m in self.migrations if m.version > current]
+    
+    def run(self) -> List[int]:
+        """
+        执行所有待执行的迁移
+        
+        Returns:
+            本次应用的迁移版本号列表
+        """
+        applied = []
+        for m in self.pending():
+            logger.info(f"执行数据库迁移 {m.version}: {m.name}")
+            with self.engine.begin() as conn:
+                m.upgrade(conn)
+                conn.exec_driver_sql(
+                    f"INSERT INTO {self.VERSION_TABLE} (version, name, applied_at) "
+                    "VALUES (?, ?, ?)",
+                    (m.version, m.name, datetime.now().isoformat(" "))
+                )
+            applied.append(m.version)
+        
+        if applied:
+            logger.info(f"数据库结构已升级到版本 {applied[-1]}")
+        return applied
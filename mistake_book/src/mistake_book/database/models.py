@@ -1,7 +1,7 @@
 """SQLAlchemy ORM模型"""
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, Float, DateTime, ForeignKey, Table
+from sqlalchemy import Column, Integer, String, Text, Float, DateTime, ForeignKey, Table, Index
 from sqlalchemy.orm import declarative_base, relationship
 
 Base = declarative_base()
@@ -10,14 +10,25 @@ Base = declarative_base()
 question_tags = Table(
     "question_tags",
     Base.metadata,
-    Column("question_id", Integer, ForeignKey("questions.id")),
-    Column("tag_id", Integer, ForeignKey("tags.id"))
+    Column("question_id", Integer, ForeignKey("questions.id"), primary_key=True),
+    Column("tag_id", Integer, ForeignKey("tags.id"), primary_key=True),
+    Index("ix_question_tags_tag_id", "tag_id")
 )
 
 
 class Question(Base):
     """错题模型"""
     __tablename__ = "questions"
+    __table_args__ = (
+        # 复习队列：按模块筛选后按复习日期排序（前缀同时服务于科目/题型筛选）
+        Index("ix_questions_subject_type_due", "subject", "question_type", "next_review_date"),
+        Index("ix_questions_mastery_level", "mastery_level"),
+        Index("ix_questions_next_review_date", "next_review_date"),
+        Index("ix_questions_created_at", "created_at"),
+        Index("ix_questions_difficulty", "difficulty"),
+        # 图片引用计数：统计引用某个图片文件的题目
+        Index("ix_questions_image_path", "image_path"),
+    )
     
     id = Column(Integer, primary_key=True)
     subject = Column(String(50), nullable=False)  # 学科
@@ -41,7 +52,7 @@ class Question(Base):
     
     # 关系
     tags = relationship("Tag", secondary=question_tags, back_populates="questions")
-    reviews = relationship("ReviewRecord", back_populates="question")
+    reviews = relationship("ReviewRecord", back_populates="question", cascade="all, delete-orphan")
     
     def to_dict(self):
         """转换为字典"""
@@ -80,11 +91,17 @@ class Tag(Base):
 class ReviewRecord(Base):
     """复习记录"""
     __tablename__ = "review_records"
+    __table_args__ = (
+        Index("ix_review_records_question_date", "question_id", "review_date"),
+        Index("ix_review_records_review_date", "review_date"),
+        Index("ix_review_records_client_token", "client_token", unique=True),
+    )
     
     id = Column(Integer, primary_key=True)
     question_id = Column(Integer, ForeignKey("questions.id"))
     review_date = Column(DateTime, default=datetime.now)
     result = Column(Integer)  # ReviewResult枚举值
     time_spent = Column(Integer)  # 耗时（秒）
+    client_token = Column(String(32))  # 客户端生成的作答令牌，用于幂等写入
     
     question = relationship("Question", back_populates="reviews")
@@ -2,6 +2,8 @@
 
 import sys
 import os
+from pathlib import Path
+from typing import Any, Dict, Tuple
 
 # ===== 配置模型存储路径（在导入任何库之前） =====
 # 将EasyOCR模型和PyTorch缓存移到D盘，节省C盘空间
@@ -16,67 +18,99 @@ os.environ['PYTORCH_ENABLE_MPS_FALLBACK'] = '1'
 import warnings
 warnings.filterwarnings('ignore', category=UserWarning, message='.*pin_memory.*')
 
-# 重要：在导入PyQt6之前先导入torch
-# 这可以避免PyQt6和torch的DLL冲突问题
-try:
-    import torch
-    _TORCH_AVAILABLE = True
-except ImportError:
-    _TORCH_AVAILABLE = False
-except Exception:
-    _TORCH_AVAILABLE = False
+# 启动路径上不导入torch/EasyOCR：它们由 services.ocr_loader 在需要OCR时
+# （打开添加错题对话框，或程序空闲 OCR_PRELOAD_IDLE_MS 毫秒后）在后台导入，
+# PyQt6 与 torch 的 DLL 冲突也在那里处理。
+# 如果某台机器上后台导入 torch 仍然失败，可以设置环境变量
+# MISTAKE_BOOK_EAGER_TORCH=1，恢复在导入PyQt6之前先导入torch的做法（启动会慢数秒）
+if os.environ.get('MISTAKE_BOOK_EAGER_TORCH') == '1':
+    try:
+        import torch
+    except Exception:
+        pass
 
 from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QTimer
 from mistake_book.config.paths import get_app_paths
 from mistake_book.database.db_manager import DatabaseManager
 from mistake_book.core.data_manager import DataManager
 from mistake_book.core.review_scheduler import ReviewScheduler
-from mistake_book.services import QuestionService, ReviewService, UIService
+from mistake_book.services import (
+    QuestionService, ReviewService, UIService, ReviewJournal, QueryCache, OCRCache
+)
 from mistake_book.ui.main_window.window import MainWindow
 from mistake_book.ui.main_window.controller import MainWindowController
 from mistake_book.ui.factories.dialog_factory import DialogFactory
 from mistake_book.ui.events.event_bus import EventBus
 from mistake_book.utils.logger import setup_logger
+from mistake_book.utils.import_audit import startup_import_summary
 
 logger = setup_logger()
 
+# 程序空闲多久后在后台预加载OCR（毫秒）
+OCR_PRELOAD_IDLE_MS = 30_000
+
 
 def exception_hook(exc_type, exc_value, exc_traceback):
     """全局异常处理"""
     logger.error("未捕获的异常", exc_info=(exc_type, exc_value, exc_traceback))
 
 
-def main():
-    """应用程序入口"""
-    sys.excepthook = exception_hook
+def create_services(
+    db_manager: DatabaseManager,
+    review_journal_file: Path
+) -> Tuple[Dict[str, Any], EventBus, ReviewJournal]:
+    """
+    创建服务层和事件总线（scripts/bench_startup.py 也用它测量启动耗时）
     
-    app = QApplication(sys.argv)
-    app.setApplicationName("错题本")
-    app.setOrganizationName("MistakeBook")
+    Args:
+        db_manager: 数据库管理器
+        review_journal_file: 复习作答日志文件
     
-    # 初始化数据层
-    paths = get_app_paths()
-    db_manager = DatabaseManager(paths.database_file)
+    Returns:
+        (服务集合, 事件总线, 复习作答后写队列)
+    """
     data_manager = DataManager(db_manager)
     scheduler = ReviewScheduler()
     
-    # 初始化服务层
-    # OCR引擎将在后台异步初始化，不阻塞UI
+    # 只创建OCR引擎，不导入torch/EasyOCR，也不加载模型
     from mistake_book.services.ocr_engine import create_ocr_engine
-    ocr_engine = create_ocr_engine(async_init=True)
-    question_service = QuestionService(data_manager, ocr_engine)
-    review_service = ReviewService(data_manager, scheduler)
-    ui_service = UIService(data_manager)
+    ocr_engine = create_ocr_engine()
+    # OCR结果缓存首次识别时才打开
+    ocr_cache = OCRCache(get_app_paths().ocr_cache_file)
+    question_service = QuestionService(data_manager, ocr_engine, ocr_cache=ocr_cache)
+    # 复习作答由后台线程写入；补写上次异常退出时未写入的作答
+    review_journal = ReviewJournal(data_manager, scheduler, review_journal_file)
+    review_journal.start()
+    review_service = ReviewService(data_manager, scheduler, review_journal)
+    
+    # 创建事件总线
+    event_bus = EventBus()
+    
+    # 查询结果缓存：先于其他订阅者绑定事件，数据变化时先失效再刷新界面
+    query_cache = QueryCache()
+    query_cache.bind(event_bus)
+    ui_service = UIService(data_manager, query_cache)
     
     services = {
         'question_service': question_service,
         'review_service': review_service,
         'ui_service': ui_service
     }
+    return services, event_bus, review_journal
+
+
+def create_main_window(services: Dict[str, Any], event_bus: EventBus) -> MainWindow:
+    """
+    创建主窗口（首屏数据在后台加载）
     
-    # 创建事件总线
-    event_bus = EventBus()
+    Args:
+        services: create_services 返回的服务集合
+        event_bus: 事件总线
     
+    Returns:
+        尚未显示的主窗口
+    """
     # 创建对话框工厂
     dialog_factory = DialogFactory(services, event_bus)
     
@@ -84,10 +118,35 @@ def main():
     controller = MainWindowController(services, dialog_factory, event_bus)
     
     # 创建主窗口
-    window = MainWindow(controller)
+    return MainWindow(controller)
+
+
+def main():
+    """应用程序入口"""
+    sys.excepthook = exception_hook
+    
+    app = QApplication(sys.argv)
+    app.setApplicationName("错题本")
+    app.setOrganizationName("MistakeBook")
+    
+    # 初始化数据层
+    paths = get_app_paths()
+    db_manager = DatabaseManager(paths.database_file)
+    
+    # 初始化服务层
+    services, event_bus, review_journal = create_services(db_manager, paths.review_journal_file)
+    app.aboutToQuit.connect(review_journal.close)
+    
+    window = create_main_window(services, event_bus)
     window.show()
     
     logger.info("应用程序启动成功")
+    logger.info(startup_import_summary())
+    
+    # 空闲一段时间后在后台预加载OCR（添加错题对话框打开时也会触发）
+    ocr_engine = services['question_service'].ocr_engine
+    if ocr_engine:
+        QTimer.singleShot(OCR_PRELOAD_IDLE_MS, ocr_engine.preload)
     
     sys.exit(app.exec())
 
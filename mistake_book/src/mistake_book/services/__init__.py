@@ -2,16 +2,22 @@
 
 from .question_service import QuestionService
 from .review_service import ReviewService
+from .review_journal import ReviewJournal
 from .ui_service import UIService
+from .query_cache import QueryCache
 from .notification import NotificationService
 from .ocr_engine import OCREngine, EasyOCREngine, create_ocr_engine
+from .ocr_cache import OCRCache
 
 __all__ = [
     "QuestionService",
     "ReviewService",
+    "ReviewJournal",
     "UIService",
+    "QueryCache",
     "NotificationService",
     "OCREngine",
     "EasyOCREngine",
     "create_ocr_engine",
+    "OCRCache",
 ]
@@ -0,0 +1,385 @@
+"""按内容寻址的图片存储
+
+图片按内容的 SHA-256 命名，存放在两级哈希前缀目录中：
+
+    images/ab/cd/abcd…(64位十六进制).jpg
+
+questions.image_path 保存相对于图片目录的路径（如 "ab/cd/abcd….jpg"）。
+相同内容的图片只保存一份，重复上传时直接复用已有文件；文件名与上传时间无关，
+不会冲突。每层最多 256 个子目录，单个目录中的文件数不会随图片总数线性增长。
+
+引用计数就是 image_path 等于该路径的题目数量，由数据库统计，不单独保存。
+删除题目或替换图片后，调用方用 release_unreferenced 删除已没有题目引用的文件。
+add 返回的路径处于保留（pin）状态，在题目写入数据库之前不会被并发的清理删除，
+写入后调用 unpin。
+
+旧版本以 "时间戳_原文件名" 保存在图片目录根部的文件，或数据库中的绝对路径，
+由 migrate_legacy_images 迁移为内容寻址路径。
+"""
+
+import hashlib
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 计算哈希和复制时每次读取的字节数
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# 写入中的临时文件目录（位于图片目录内，保证与目标在同一文件系统，可以原子重命名）
+INCOMING_DIR = ".incoming"
+
+_CONTENT_PATH = re.compile(r"^([0-9a-f]{2})/([0-9a-f]{2})/([0-9a-f]{64})(\.[a-z0-9]+)?$")
+
+# 按文件头识别格式，同一内容总是得到同一扩展名（与上传时的文件名无关）
+_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"GIF87a", ".gif"),
+    (b"GIF89a", ".gif"),
+    (b"BM", ".bmp"),
+)
+
+# 统计数据库中各路径被多少道题目引用：counts(paths) -> {路径: 题目数}
+ReferenceCounter = Callable[[List[str]], Dict[str, int]]
+
+
+def is_content_path(relative_path: Optional[str]) -> bool:
+    """是否为内容寻址路径（"ab/cd/<sha256>.ext"）"""
+    return bool(relative_path) and _CONTENT_PATH.match(relative_path) is not None
+
+
+def content_hash_of(relative_path: Optional[str]) -> Optional[str]:
+    """从内容寻址路径中取出 SHA-256，其他路径返回 None"""
+    match = _CONTENT_PATH.match(relative_path or "")
+    return match.group(3) if match else None
+
+
+def _suffix_for(head: bytes, fallback: str) -> str:
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ".webp"
+    for signature, suffix in _SIGNATURES:
+        if head.startswith(signature):
+            return suffix
+    fallback = fallback.lower()
+    return ".jpg" if fallback == ".jpeg" else fallback
+
+
+def hash_file(path: Path) -> Tuple[str, bytes]:
+    """
+    流式计算文件的 SHA-256
+    
+    Returns:
+        (十六进制摘要, 文件头若干字节)
+    """
+    digest = hashlib.sha256()
+    head = b""
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            if not head:
+                head = chunk[:16]
+            digest.update(chunk)
+    return digest.hexdigest(), head
+
+
+class ImageStore:
+    """按内容寻址、自动去重的图片存储"""
+    
+    def __init__(self, root: Path):
+        """
+        Args:
+            root: 图片目录（AppPaths.images_dir）
+        """
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self._pins: Dict[str, int] = {}
+    
+    @staticmethod
+    def relative_path_for(content_hash: str, suffix: str = "") -> str:
+        """内容哈希对应的相对路径"""
+        return f"{content_hash[:2]}/{content_hash[2:4]}/{content_hash}{suffix}"
+    
+    @staticmethod
+    def hash_of_path(path: Path) -> Optional[str]:
+        """文件路径以内容寻址路径（"ab/cd/<sha256>.ext"）结尾时返回其中的 SHA-256，否则返回 None"""
+        path = Path(path)
+        return content_hash_of(f"{path.parent.parent.name}/{path.parent.name}/{path.name}")
+    
+    def full_path(self, relative_path: str) -> Path:
+        """相对路径对应的文件路径"""
+        return self.root / relative_path
+    
+    def add(self, source: Path, link: bool = False) -> str:
+        """
+        存入图片，已有相同内容时复用已有文件
+        
+        复制的同时计算哈希，源文件只读取一次。返回的路径处于保留状态，
+        题目写入数据库后调用 unpin；写入失败时调用 release_unreferenced。
+        
+        Args:
+            source: 源图片路径
+            link: 用硬链接代替复制（源文件与图片目录在同一文件系统时，
+                迁移旧文件不需要复制数据；不能建立硬链接时退回复制）
+        
+        Returns:
+            相对于图片目录的路径
+        
+        Raises:
+            OSError: 读取源文件或写入图片目录失败
+        """
+        source = Path(source)
+        incoming = self.root / INCOMING_DIR
+        incoming.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(dir=incoming, suffix=".part")
+        os.close(fd)
+        temp_path = Path(temp_name)
+        
+        try:
+            if link and self._try_link(source, temp_path):
+                content_hash, head = hash_file(source)
+            else:
+                content_hash, head = self._copy_hashing(source, temp_path)
+            relative_path = self.relative_path_for(content_hash, _suffix_for(head, source.suffix))
+            self._commit(temp_path, relative_path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+        return relative_path
+    
+    def add_bytes(self, data: bytes, fallback_suffix: str = "") -> str:
+        """
+        存入内存中的图片内容（入库处理后的编码结果），已有相同内容时复用已有文件
+        
+        Args:
+            data: 图片文件内容
+            fallback_suffix: 无法从文件头识别格式时使用的扩展名
+        
+        Returns:
+            相对于图片目录的路径（处于保留状态，同 add）
+        
+        Raises:
+            OSError: 写入图片目录失败
+        """
+        relative_path = self.relative_path_for(
+            hashlib.sha256(data).hexdigest(), _suffix_for(data[:16], fallback_suffix)
+        )
+        incoming = self.root / INCOMING_DIR
+        incoming.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(dir=incoming, suffix=".part")
+        temp_path = Path(temp_name)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            self._commit(temp_path, relative_path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+        return relative_path
+    
+    @staticmethod
+    def _copy_hashing(source: Path, temp_path: Path) -> Tuple[str, bytes]:
+        digest = hashlib.sha256()
+        head = b""
+        with open(source, "rb") as src, open(temp_path, "wb") as dst:
+            while True:
+                chunk = src.read(HASH_CHUNK_SIZE)
+                if not chunk:
+                    break
+                if not head:
+                    head = chunk[:16]
+                digest.update(chunk)
+                dst.write(chunk)
+        return digest.hexdigest(), head
+    
+    @staticmethod
+    def _try_link(source: Path, temp_path: Path) -> bool:
+        temp_path.unlink()
+        try:
+            os.link(source, temp_path)
+            return True
+        except OSError:
+            return False
+    
+    def _commit(self, temp_path: Path, relative_path: str):
+        """把临时文件放到内容寻址路径上（已存在时丢弃临时文件），并保留该路径"""
+        target = self.full_path(relative_path)
+        with self._lock:
+            if target.exists():
+                temp_path.unlink()
+                logger.debug(f"图片已存在，复用: {relative_path}")
+            else:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(temp_path, target)
+                logger.info(f"图片已存入: {relative_path}")
+            self._pins[relative_path] = self._pins.get(relative_path, 0) + 1
+    
+    def unpin(self, relative_path: Optional[str]):
+        """解除 add 返回路径的保留状态"""
+        if not relative_path:
+            return
+        with self._lock:
+            count = self._pins.get(relative_path, 0) - 1
+            if count > 0:
+                self._pins[relative_path] = count
+            else:
+                self._pins.pop(relative_path, None)
+    
+    def release_unreferenced(
+        self, paths: Iterable[Optional[str]], counter: ReferenceCounter
+    ) -> List[str]:
+        """
+        删除已经没有题目引用的图片文件
+        
+        只处理本存储的内容寻址路径；旧格式路径和外部绝对路径不受影响。
+        
+        Args:
+            paths: 可能不再被引用的路径（删除或替换图片前题目引用的路径）
+            counter: 统计各路径引用数的函数（DataManager.count_image_references）
+        
+        Returns:
+            被删除的路径
+        """
+        candidates = [p for p in dict.fromkeys(paths) if is_content_path(p)]
+        if not candidates:
+            return []
+        
+        removed = []
+        with self._lock:
+            counts = counter(candidates)
+            for relative_path in candidates:
+                if counts.get(relative_path, 0) or relative_path in self._pins:
+                    continue
+                target = self.full_path(relative_path)
+                try:
+                    target.unlink()
+                except FileNotFoundError:
+                    continue
+                removed.append(relative_path)
+                self._remove_empty_dirs(target.parent)
+        if removed:
+            logger.info(f"删除了 {len(removed)} 个不再被引用的图片")
+        return removed
+    
+    def _remove_empty_dirs(self, directory: Path):
+        """删除空的哈希前缀目录（两级）"""
+        for folder in (directory, directory.parent):
+            if folder == self.root:
+                break
+            try:
+                folder.rmdir()
+            except OSError:
+                break
+    
+    def iter_content_paths(self):
+        """遍历存储中的所有内容寻址文件（相对路径）"""
+        if not self.root.is_dir():
+            return
+        for first in sorted(self.root.iterdir()):
+            if not first.is_dir() or len(first.name) != 2:
+                continue
+            for second in sorted(first.iterdir()):
+                if not second.is_dir():
+                    continue
+                for path in sorted(second.iterdir()):
+                    relative_path = f"{first.name}/{second.name}/{path.name}"
+                    if is_content_path(relative_path):
+                        yield relative_path
+    
+    def collect_garbage(self, referenced: Set[str]) -> List[str]:
+        """
+        删除没有被引用的内容寻址文件和遗留的临时文件
+        
+        Args:
+            referenced: 数据库中所有题目引用的路径
+        
+        Returns:
+            被删除的路径
+        """
+        removed = []
+        with self._lock:
+            for relative_path in list(self.iter_content_paths()):
+                if relative_path in referenced or relative_path in self._pins:
+                    continue
+                target = self.full_path(relative_path)
+                target.unlink(missing_ok=True)
+                removed.append(relative_path)
+                self._remove_empty_dirs(target.parent)
+            shutil.rmtree(self.root / INCOMING_DIR, ignore_errors=True)
+        return removed
+    
+    def disk_usage(self) -> Tuple[int, int]:
+        """图片目录中的 (文件数, 总字节数)"""
+        files = size = 0
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                files += 1
+                size += os.path.getsize(os.path.join(dirpath, name))
+        return files, size
+
+
+@dataclass
+class ImageMigrationReport:
+    """旧图片迁移结果"""
+    migrated: int = 0  # 改写的路径数
+    unique: int = 0  # 迁移后的不同文件数
+    removed: int = 0  # 删除的旧文件数
+    missing: List[str] = field(default_factory=list)  # 找不到文件的旧路径
+
+
+def migrate_legacy_images(store: ImageStore, data_manager, progress=None) -> ImageMigrationReport:
+    """
+    把数据库中的旧格式图片路径迁移为内容寻址路径
+    
+    图片目录中的旧文件先以硬链接存入（不复制数据），数据库改写成功后再删除；
+    外部绝对路径的文件复制到存储中，原文件保留。找不到文件的路径保持不变。
+    应在应用关闭时运行（scripts/migrate_image_store.py）。
+    
+    Args:
+        store: 图片存储
+        data_manager: 数据管理器
+        progress: 进度回调 progress(已处理数量, 总数量)
+    """
+    report = ImageMigrationReport()
+    legacy = [p for p in data_manager.list_image_paths() if not is_content_path(p)]
+    root = store.root.resolve()
+    mapping: Dict[str, str] = {}
+    owned: List[Path] = []
+    
+    try:
+        for index, old_path in enumerate(legacy, 1):
+            source = Path(old_path)
+            if not source.is_absolute():
+                source = store.full_path(old_path)
+            if source.is_file():
+                inside = source.resolve().is_relative_to(root)
+                mapping[old_path] = store.add(source, link=inside)
+                if inside:
+                    owned.append(source)
+            else:
+                report.missing.append(old_path)
+            if progress:
+                progress(index, len(legacy))
+        
+        report.migrated = data_manager.rewrite_image_paths(mapping)
+    finally:
+        for new_path in mapping.values():
+            store.unpin(new_path)
+    
+    report.unique = len(set(mapping.values()))
+    for source in owned:
+        try:
+            source.unlink()
+            report.removed += 1
+        except OSError as e:
+            logger.warning(f"删除旧图片失败 {source}: {e}")
+    return report
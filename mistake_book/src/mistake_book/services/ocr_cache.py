@@ -0,0 +1,296 @@
+"""OCR识别结果缓存
+
+同一张图片再次识别时（重新打开添加对话框、点击"重新识别"、重复导入），
+直接返回上次的识别结果，不再运行 EasyOCR（CPU 上每张图片要几秒钟）。
+
+结果保存在单独的 SQLite 文件中，键由以下内容计算：
+    - 图片内容的 SHA-256（与文件名和路径无关）
+    - 引擎标识：引擎名、版本、语言和 readtext 参数（OCREngine.cache_signature）
+    - 识别方式：是否预处理
+
+缓存完整的结构化结果（每行的位置、文字和置信度）。结果总大小超过上限时
+按最近最少使用（LRU）淘汰。引擎版本变化后，旧版本的结果不会再命中，
+并在新版本首次读写缓存时删除。
+
+缓存文件可以随时删除；读写出错时只记录日志并按未命中处理，不影响识别。
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from mistake_book.services.image_store import ImageStore, hash_file
+from mistake_book.services.ocr_engine import OCRDetection
+
+logger = logging.getLogger(__name__)
+
+# 缓存结果总大小上限（结果 JSON 的字节数）
+OCR_CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+# 缓存表结构变化时加一，旧的缓存表整个重建
+OCR_CACHE_SCHEMA = 1
+
+_SCHEMA = """
+CREATE TABLE ocr_results (
+    key TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    engine TEXT NOT NULL,
+    engine_version TEXT NOT NULL,
+    result TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used INTEGER NOT NULL
+);
+CREATE INDEX ix_ocr_results_last_used ON ocr_results (last_used);
+"""
+
+
+def image_content_hash(image) -> str:
+    """
+    图片来源的 SHA-256
+    
+    图片存储中的文件从路径取得哈希，其他文件读取内容计算；
+    图片数据直接计算；已解码的图片按模式、尺寸和像素计算。
+    
+    Raises:
+        OSError: 文件无法读取
+        TypeError: 不支持的图片来源
+    """
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        return hashlib.sha256(image).hexdigest()
+    if isinstance(image, (str, Path)):
+        path = Path(image)
+        return ImageStore.hash_of_path(path) or hash_file(path)[0]
+    
+    from PIL import Image
+    if isinstance(image, Image.Image):
+        digest = hashlib.sha256(f"{image.mode}:{image.width}x{image.height}:".encode("ascii"))
+        digest.update(image.tobytes())
+        return digest.hexdigest()
+    raise TypeError(f"不支持的图片来源: {type(image).__name__}")
+
+
+def _dump(detections: List[OCRDetection]) -> str:
+    return json.dumps(
+        [
+            {"box": [list(point) for point in d.box], "text": d.text, "confidence": d.confidence}
+            for d in detections
+        ],
+        ensure_ascii=False, separators=(",", ":")
+    )
+
+
+def _load(result: str) -> List[OCRDetection]:
+    return [
+        OCRDetection(
+            box=[tuple(point) for point in item["box"]],
+            text=item["text"],
+            confidence=item["confidence"]
+        )
+        for item in json.loads(result)
+    ]
+
+
+class OCRCache:
+    """按图片内容和引擎参数缓存识别结果（SQLite，线程安全）"""
+    
+    def __init__(self, path: Path, max_bytes: int = OCR_CACHE_MAX_BYTES):
+        """
+        初始化缓存（首次读写时才打开数据库文件）
+        
+        Args:
+            path: 缓存数据库文件
+            max_bytes: 缓存结果总大小上限（字节）
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._clock = 0  # 最近使用序号，越大越新
+        self._current_versions: Set[Tuple[str, str]] = set()  # 已清除过旧版本结果的 (引擎, 版本)
+        
+        # 命中统计
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def make_key(content_hash: str, signature: Dict[str, Any],
+                 options: Optional[Dict[str, Any]] = None) -> str:
+        """由图片哈希、引擎标识和识别方式计算缓存键（字典按键排序，顺序无关）"""
+        payload = json.dumps(
+            {"image": content_hash, "engine": signature, "options": options or {}},
+            sort_keys=True, ensure_ascii=False, separators=(",", ":")
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def get(self, content_hash: str, signature: Dict[str, Any],
+            options: Optional[Dict[str, Any]] = None) -> Optional[List[OCRDetection]]:
+        """
+        读取缓存的识别结果
+        
+        Args:
+            content_hash: 图片内容的 SHA-256
+            signature: 引擎标识（OCREngine.cache_signature）
+            options: 识别方式（如是否预处理）
+        
+        Returns:
+            识别结果（可能为空列表，表示上次没有识别到文字）；未命中时返回 None
+        """
+        key = self.make_key(content_hash, signature, options)
+        try:
+            with self._lock:
+                conn = self._connect()
+                self._drop_stale_versions(conn, signature)
+                row = conn.execute(
+                    "SELECT result FROM ocr_results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                self._clock += 1
+                with conn:
+                    conn.execute(
+                        "UPDATE ocr_results SET last_used = ? WHERE key = ?", (self._clock, key)
+                    )
+                self.hits += 1
+            return _load(row[0])
+        except (sqlite3.Error, OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"读取OCR缓存失败: {e}")
+            return None
+    
+    def put(self, content_hash: str, signature: Dict[str, Any], detections: List[OCRDetection],
+            options: Optional[Dict[str, Any]] = None):
+        """
+        保存识别结果，超出大小上限时淘汰最久未使用的结果
+        
+        Args:
+            content_hash: 图片内容的 SHA-256
+            signature: 引擎标识（OCREngine.cache_signature）
+            detections: 识别结果
+            options: 识别方式（如是否预处理）
+        """
+        key = self.make_key(content_hash, signature, options)
+        result = _dump(detections)
+        size = len(result.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        try:
+            with self._lock:
+                conn = self._connect()
+                self._drop_stale_versions(conn, signature)
+                self._clock += 1
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO ocr_results "
+                        "(key, content_hash, engine, engine_version, result, size, last_used) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (key, content_hash, str(signature.get("engine", "")),
+                         str(signature.get("version", "")), result, size, self._clock)
+                    )
+                    self._evict(conn)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"写入OCR缓存失败: {e}")
+    
+    def invalidate(self, engine: Optional[str] = None) -> int:
+        """
+        删除缓存的识别结果
+        
+        Args:
+            engine: 只删除该引擎的结果，None 表示全部删除
+        
+        Returns:
+            删除的结果数
+        """
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                if engine is None:
+                    cursor = conn.execute("DELETE FROM ocr_results")
+                else:
+                    cursor = conn.execute("DELETE FROM ocr_results WHERE engine = ?", (engine,))
+            return cursor.rowcount
+    
+    def total_bytes(self) -> int:
+        """缓存结果的总大小（字节）"""
+        with self._lock:
+            return self._connect().execute(
+                "SELECT COALESCE(SUM(size), 0) FROM ocr_results"
+            ).fetchone()[0]
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM ocr_results").fetchone()[0]
+    
+    def close(self):
+        """关闭数据库连接（之后读写时重新打开）"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+    
+    def _connect(self) -> sqlite3.Connection:
+        """打开数据库（调用方持有锁）；文件损坏时删除重建"""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                self._conn = self._open()
+            except sqlite3.DatabaseError as e:
+                logger.warning(f"OCR缓存文件损坏，重新创建: {e}")
+                for suffix in ("", "-wal", "-shm"):
+                    Path(f"{self.path}{suffix}").unlink(missing_ok=True)
+                self._conn = self._open()
+        return self._conn
+    
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            if conn.execute("PRAGMA user_version").fetchone()[0] != OCR_CACHE_SCHEMA:
+                with conn:
+                    conn.execute("DROP TABLE IF EXISTS ocr_results")
+                conn.executescript(_SCHEMA)
+                conn.execute(f"PRAGMA user_version = {OCR_CACHE_SCHEMA}")
+            self._clock = conn.execute(
+                "SELECT COALESCE(MAX(last_used), 0) FROM ocr_results"
+            ).fetchone()[0]
+        except sqlite3.DatabaseError:
+            conn.close()
+            raise
+        self._current_versions.clear()
+        return conn
+    
+    def _drop_stale_versions(self, conn: sqlite3.Connection, signature: Dict[str, Any]):
+        """引擎版本变化后删除旧版本的结果（每个进程每个版本只检查一次）"""
+        current = (str(signature.get("engine", "")), str(signature.get("version", "")))
+        if current in self._current_versions:
+            return
+        with conn:
+            cursor = conn.execute(
+                "DELETE FROM ocr_results WHERE engine = ? AND engine_version != ?", current
+            )
+        if cursor.rowcount:
+            logger.info(f"OCR引擎版本变化，已清除 {cursor.rowcount} 条旧的识别结果")
+        self._current_versions.add(current)
+    
+    def _evict(self, conn: sqlite3.Connection):
+        """总大小超过上限时按最近使用顺序淘汰（在写入事务中调用）"""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM ocr_results").fetchone()[0]
+        excess = total - self.max_bytes
+        if excess <= 0:
+            return
+        victims = []
+        cursor = conn.execute("SELECT key, size FROM ocr_results ORDER BY last_used")
+        for key, size in cursor:
+            victims.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        cursor.close()
+        conn.executemany("DELETE FROM ocr_results WHERE key = ?", victims)
+        self.evictions += len(victims)
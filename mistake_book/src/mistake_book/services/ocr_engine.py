@@ -2,22 +2,89 @@
 
 from pathlib import Path
 from abc import ABC, abstractmethod
-from typing import Optional
+from dataclasses import dataclass
+from importlib import metadata
+from typing import Any, Dict, List, Optional, Tuple
 import logging
 import threading
 import os
 
+from mistake_book.services import ocr_loader
+from mistake_book.utils.image_processor import open_image
+
 logger = logging.getLogger(__name__)
 
+# readtext 参数（使用更宽松的参数以提高识别率），也是识别结果缓存键的一部分
+READTEXT_PARAMS: Dict[str, Any] = {
+    "detail": 1,  # 返回详细信息（包括位置和置信度）
+    "paragraph": False,  # 不合并段落，保持原始行
+    "min_size": 10,  # 最小文字尺寸（像素）
+    "text_threshold": 0.5,  # 文字检测阈值（降低以检测更多文字）
+    "low_text": 0.3,  # 低置信度文字阈值
+    "link_threshold": 0.3,  # 文字连接阈值
+    "canvas_size": 2560,  # 画布大小（增大以处理高分辨率图片）
+    "mag_ratio": 1.5,  # 放大比例
+}
+
+# 置信度高于此值的行才计入识别文字（降低阈值，保留更多结果）
+MIN_CONFIDENCE = 0.1
+
+
+@dataclass
+class OCRDetection:
+    """一行识别结果"""
+    box: List[Tuple[float, float]]  # 文字区域四个角的坐标
+    text: str  # 文字内容
+    confidence: float  # 置信度
+
+
+def detections_to_text(detections: List[OCRDetection]) -> str:
+    """识别结果转为文字：每行一条，忽略置信度过低的行"""
+    lines = []
+    for detection in detections:
+        if detection.confidence > MIN_CONFIDENCE:
+            lines.append(detection.text)
+            logger.debug(f"识别: {detection.text} (置信度: {detection.confidence:.2f})")
+    return "\n".join(lines)
+
+
+def _to_array(image):
+    """
+    转为 EasyOCR 读取的 numpy 数组（已是数组时原样返回）
+    
+    PIL 图片通过数组接口只复制一次像素数据；路径和图片数据先由 PIL 解码，
+    避免中文路径问题，也不需要写临时文件。
+    """
+    import numpy as np
+    
+    if isinstance(image, np.ndarray):
+        return image
+    img = open_image(image)
+    if img.mode not in ("L", "RGB"):
+        img = img.convert("RGB")
+    return np.asarray(img)
+
 
 class OCREngine(ABC):
     """OCR引擎抽象基类"""
     
     @abstractmethod
-    def recognize(self, image_path: Path) -> str:
-        """识别图片中的文字"""
+    def recognize(self, image) -> str:
+        """识别图片中的文字（图片路径、编码后的图片数据、PIL 图片或 numpy 数组）"""
         pass
     
+    def recognize_detailed(self, image) -> List[OCRDetection]:
+        """识别图片，返回每一行的位置、文字和置信度（不支持的引擎抛出 NotImplementedError）"""
+        raise NotImplementedError
+    
+    def cache_signature(self) -> Optional[Dict[str, Any]]:
+        """
+        识别结果缓存中的引擎标识：引擎名、版本、语言和识别参数
+        
+        任何一项变化都会得到不同的缓存键。返回 None 表示识别结果不缓存。
+        """
+        return None
+    
     @abstractmethod
     def is_available(self) -> bool:
         """检查引擎是否可用"""
@@ -41,6 +108,44 @@ class EasyOCREngine(OCREngine):
         self._init_lock = threading.Lock()  # 线程锁，防止重复初始化
         self._init_thread = None  # 初始化线程
     
+    def _create_reader(self):
+        """导入OCR依赖并创建 reader（首次使用会下载模型）"""
+        easyocr = ocr_loader.import_ocr_stack()
+        
+        # 获取模型存储路径（优先使用环境变量）
+        model_storage_directory = os.environ.get('EASYOCR_MODULE_PATH')
+        if model_storage_directory:
+            # 确保路径存在
+            model_path = Path(model_storage_directory)
+            model_path.mkdir(parents=True, exist_ok=True)
+            logger.info(f"使用自定义模型路径: {model_storage_directory}")
+        else:
+            model_storage_directory = None
+            logger.info("使用默认模型路径")
+        
+        logger.info("正在初始化EasyOCR...")
+        logger.info("提示：首次使用需要下载模型文件（约100-200MB），请耐心等待")
+        
+        if model_storage_directory:
+            self.reader = easyocr.Reader(
+                self.langs, 
+                gpu=False, 
+                verbose=False,
+                model_storage_directory=model_storage_directory
+            )
+        else:
+            self.reader = easyocr.Reader(self.langs, gpu=False, verbose=False)
+        
+        self._initialized = True
+        logger.info(f"✅ EasyOCR初始化成功 (语言: {self.langs})")
+    
+    def _log_init_error(self, e: Exception):
+        logger.error(f"❌ EasyOCR初始化失败: {e}")
+        logger.error("可能的原因：")
+        logger.error("  1. 网络连接问题，无法下载模型")
+        logger.error("  2. 磁盘空间不足")
+        logger.error("  3. 模型文件损坏，请删除模型目录后重试")
+    
     def _lazy_init(self):
         """延迟初始化 - 只在第一次使用时才加载模型"""
         with self._init_lock:
@@ -50,48 +155,14 @@ class EasyOCREngine(OCREngine):
             self._init_attempted = True
         
         try:
-            import easyocr
-            import os
-            
-            # 获取模型存储路径（优先使用环境变量）
-            model_storage_directory = os.environ.get('EASYOCR_MODULE_PATH')
-            if model_storage_directory:
-                # 确保路径存在
-                model_path = Path(model_storage_directory)
-                model_path.mkdir(parents=True, exist_ok=True)
-                logger.info(f"使用自定义模型路径: {model_storage_directory}")
-            else:
-                model_storage_directory = None
-                logger.info("使用默认模型路径")
-            
-            # 创建reader,首次使用会下载模型
-            logger.info("正在初始化EasyOCR...")
-            logger.info("提示：首次使用需要下载模型文件（约100-200MB），请耐心等待")
-            logger.info("如果下载失败，请检查网络连接或手动下载模型")
-            
-            if model_storage_directory:
-                self.reader = easyocr.Reader(
-                    self.langs, 
-                    gpu=False, 
-                    verbose=False,
-                    model_storage_directory=model_storage_directory
-                )
-            else:
-                self.reader = easyocr.Reader(self.langs, gpu=False, verbose=False)
-            
-            self._initialized = True
-            logger.info(f"✅ EasyOCR初始化成功 (语言: {self.langs})")
+            self._create_reader()
         except ImportError:
             logger.error("❌ EasyOCR未安装,请运行: pip install easyocr")
         except KeyboardInterrupt:
             logger.warning("⚠️  用户中断了模型下载")
             raise
         except Exception as e:
-            logger.error(f"❌ EasyOCR初始化失败: {e}")
-            logger.error("可能的原因：")
-            logger.error("  1. 网络连接问题，无法下载模型")
-            logger.error("  2. 磁盘空间不足")
-            logger.error("  3. 模型文件损坏，请删除模型目录后重试")
+            self._log_init_error(e)
     
     def _lazy_init_async(self):
         """异步延迟初始化 - 在后台线程中加载模型，不阻塞UI"""
@@ -111,38 +182,18 @@ class EasyOCREngine(OCREngine):
             self._init_thread.start()
             logger.info("🔄 OCR模型正在后台加载，不会影响程序使用...")
     
+    def preload(self):
+        """
+        在后台线程中预加载OCR依赖和模型（已开始加载时不重复加载）
+        
+        打开添加错题对话框或程序空闲时调用，用户拖入图片前模型多半已经就绪。
+        """
+        self._lazy_init_async()
+    
     def _lazy_init_worker(self):
         """后台线程工作函数 - 实际执行初始化"""
         try:
-            import easyocr
-            import os
-            
-            # 获取模型存储路径（优先使用环境变量）
-            model_storage_directory = os.environ.get('EASYOCR_MODULE_PATH')
-            if model_storage_directory:
-                # 确保路径存在
-                model_path = Path(model_storage_directory)
-                model_path.mkdir(parents=True, exist_ok=True)
-                logger.info(f"使用自定义模型路径: {model_storage_directory}")
-            else:
-                model_storage_directory = None
-                logger.info("使用默认模型路径")
-            
-            logger.info("正在后台初始化EasyOCR...")
-            logger.info("提示：首次使用需要下载模型文件（约100-200MB）")
-            
-            if model_storage_directory:
-                self.reader = easyocr.Reader(
-                    self.langs, 
-                    gpu=False, 
-                    verbose=False,
-                    model_storage_directory=model_storage_directory
-                )
-            else:
-                self.reader = easyocr.Reader(self.langs, gpu=False, verbose=False)
-            
-            self._initialized = True
-            logger.info(f"✅ EasyOCR后台初始化成功 (语言: {self.langs})")
+            self._create_reader()
             
             # 触发初始化完成回调
             if hasattr(self, '_on_init_complete') and self._on_init_complete:
@@ -151,11 +202,7 @@ class EasyOCREngine(OCREngine):
         except ImportError:
             logger.error("❌ EasyOCR未安装,请运行: pip install easyocr")
         except Exception as e:
-            logger.error(f"❌ EasyOCR后台初始化失败: {e}")
-            logger.error("可能的原因：")
-            logger.error("  1. 网络连接问题，无法下载模型")
-            logger.error("  2. 磁盘空间不足")
-            logger.error("  3. 模型文件损坏，请删除模型目录后重试")
+            self._log_init_error(e)
     
     def set_init_complete_callback(self, callback):
         """设置初始化完成回调函数"""
@@ -172,16 +219,16 @@ class EasyOCREngine(OCREngine):
         if self._init_attempted:
             return self._initialized and self.reader is not None
         
-        # 如果还没尝试初始化，检查easyocr是否已安装
-        try:
-            import easyocr
-            return True  # easyocr已安装，认为可用
-        except ImportError:
-            return False  # easyocr未安装，不可用
+        # 如果还没尝试初始化，只检查easyocr是否已安装（不导入）
+        return ocr_loader.is_installed()
     
     def is_initializing(self) -> bool:
-        """检查是否正在初始化"""
-        return self._init_attempted and not self._initialized
+        """检查是否正在后台初始化"""
+        return (
+            self._init_thread is not None
+            and self._init_thread.is_alive()
+            and not self._initialized
+        )
     
     def wait_for_init(self, timeout: float = None) -> bool:
         """
@@ -197,16 +244,45 @@ class EasyOCREngine(OCREngine):
             self._init_thread.join(timeout)
         return self._initialized
     
-    def recognize(self, image_path: Path) -> str:
+    def cache_signature(self) -> Optional[Dict[str, Any]]:
+        """识别结果缓存中的引擎标识（读取安装信息，不导入easyocr）"""
+        try:
+            version = metadata.version("easyocr")
+        except metadata.PackageNotFoundError:
+            version = "unknown"
+        return {
+            "engine": "easyocr",
+            "version": version,
+            "langs": list(self.langs),
+            "params": READTEXT_PARAMS,
+        }
+    
+    def recognize(self, image) -> str:
         """
         识别图片中的文字
         
         Args:
-            image_path: 图片路径
-            
+            image: 图片路径、编码后的图片数据（bytes）、PIL 图片或 numpy 数组，
+                后三种直接在内存中识别
+        
         Returns:
             识别出的文字
         """
+        recognized_text = detections_to_text(self.recognize_detailed(image))
+        if recognized_text:
+            logger.info(f"识别成功,共{len(recognized_text.splitlines())}行文字")
+        return recognized_text
+    
+    def recognize_detailed(self, image) -> List[OCRDetection]:
+        """
+        识别图片，返回每一行的位置、文字和置信度
+        
+        Args:
+            image: 同 recognize
+        
+        Returns:
+            识别结果（未识别到文字时为空列表）
+        """
         # 延迟初始化：只在真正使用时才加载模型
         if not self._init_attempted:
             # 同步初始化（阻塞式）
@@ -225,47 +301,25 @@ class EasyOCREngine(OCREngine):
         
         try:
             # 使用numpy数组而不是文件路径，避免中文路径问题
-            import numpy as np
-            from PIL import Image
-            
-            # 读取图片为numpy数组
-            img = Image.open(image_path)
-            img_array = np.array(img)
+            img_array = _to_array(image)
             
             # 执行OCR识别（传入numpy数组而不是路径）
-            # 使用更宽松的参数以提高识别率
-            result = self.reader.readtext(
-                img_array,
-                detail=1,  # 返回详细信息（包括位置和置信度）
-                paragraph=False,  # 不合并段落，保持原始行
-                min_size=10,  # 最小文字尺寸（像素）
-                text_threshold=0.5,  # 文字检测阈值（降低以检测更多文字）
-                low_text=0.3,  # 低置信度文字阈值
-                link_threshold=0.3,  # 文字连接阈值
-                canvas_size=2560,  # 画布大小（增大以处理高分辨率图片）
-                mag_ratio=1.5,  # 放大比例
-            )
+            result = self.reader.readtext(img_array, **READTEXT_PARAMS)
             
             if not result:
                 logger.warning("未识别到任何文字")
-                return ""
-            
-            # 提取文字内容
-            lines = []
-            for detection in result:
-                bbox = detection[0]  # 边界框坐标
-                text = detection[1]  # 文字内容
-                confidence = detection[2]  # 置信度
-                
-                # 降低置信度阈值，保留更多结果
-                if confidence > 0.1:  # 从0.3降低到0.1
-                    lines.append(text)
-                    logger.debug(f"识别: {text} (置信度: {confidence:.2f})")
-            
-            recognized_text = "\n".join(lines)
-            logger.info(f"识别成功,共{len(lines)}行文字")
-            return recognized_text
+                return []
             
+            # 边界框坐标可能是numpy数值，转为普通数值以便缓存
+            return [
+                OCRDetection(
+                    box=[(float(x), float(y)) for x, y in bbox],
+                    text=str(text),
+                    confidence=float(confidence)
+                )
+                for bbox, text, confidence in result
+            ]
+        
         except Exception as e:
             logger.error(f"OCR识别失败: {e}")
             raise
@@ -282,8 +336,9 @@ def create_ocr_engine(async_init: bool = False) -> Optional[OCREngine]:
         EasyOCR引擎实例（未初始化，将在首次使用时初始化）
     """
     try:
-        # 只检查easyocr是否已安装，不立即初始化
-        import easyocr
+        # 只检查easyocr是否已安装，不导入也不初始化
+        if not ocr_loader.is_installed():
+            raise ImportError("easyocr")
         # 使用中文+英文模型以支持中英文混合识别
         engine = EasyOCREngine(langs=['ch_sim', 'en'])
         
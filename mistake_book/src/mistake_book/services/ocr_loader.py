@@ -0,0 +1,99 @@
+"""OCR 依赖的隔离加载器
+
+torch 和 EasyOCR 导入需要数秒、占用数百MB内存，启动路径上不导入它们。
+只有 OCR 真正需要时（打开添加错题对话框，或程序空闲一段时间后）
+才由 import_ocr_stack 在后台线程中导入，并且只导入一次。
+
+Windows 上 PyQt6 已加载的 DLL 可能与 torch 自带的同名 DLL 冲突，
+过去的做法是在导入 PyQt6 之前先导入 torch。现在 torch 在 PyQt6 之后导入，
+所以导入前先把 torch 的 lib 目录加入 DLL 搜索路径，让 torch 优先加载自己的 DLL。
+"""
+
+import importlib
+import importlib.util
+import logging
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+from mistake_book.utils.import_audit import ImportTimer
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_easyocr: Optional[Any] = None
+_import_error: Optional[BaseException] = None
+_report: Optional[str] = None
+
+
+def is_installed() -> bool:
+    """检查 EasyOCR 是否已安装（只查找模块，不导入）"""
+    try:
+        return importlib.util.find_spec("easyocr") is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def is_loaded() -> bool:
+    """OCR 依赖是否已经导入"""
+    return _easyocr is not None
+
+
+def import_report() -> Optional[str]:
+    """OCR 依赖的导入耗时摘要，尚未导入时返回 None"""
+    return _report
+
+
+def _prepare_dll_search_path():
+    """Windows：把 torch 的 lib 目录加入 DLL 搜索路径，避免与 PyQt6 的 DLL 冲突"""
+    if sys.platform != "win32" or "torch" in sys.modules:
+        return
+    try:
+        spec = importlib.util.find_spec("torch")
+    except (ImportError, ValueError):
+        return
+    if spec is None or not spec.origin:
+        return
+    
+    lib_dir = Path(spec.origin).parent / "lib"
+    if lib_dir.is_dir():
+        os.add_dll_directory(str(lib_dir))
+        logger.debug(f"已加入 DLL 搜索路径: {lib_dir}")
+
+
+def import_ocr_stack():
+    """
+    导入 torch 和 EasyOCR（线程安全，只导入一次）
+    
+    Returns:
+        easyocr 模块
+    
+    Raises:
+        ImportError: EasyOCR 未安装或导入失败（之后的调用抛出同样的错误）
+    """
+    global _easyocr, _import_error, _report
+    
+    with _lock:
+        if _easyocr is not None:
+            return _easyocr
+        if _import_error is not None:
+            raise ImportError(str(_import_error)) from _import_error
+        
+        try:
+            with ImportTimer("导入OCR依赖") as timer:
+                _prepare_dll_search_path()
+                try:
+                    importlib.import_module("torch")
+                except ImportError:
+                    logger.debug("torch 导入失败，交给 easyocr 报告缺少的依赖")
+                _easyocr = importlib.import_module("easyocr")
+        except Exception as e:
+            _import_error = e
+            logger.error(f"OCR依赖导入失败: {e}")
+            raise ImportError(str(e)) from e
+        
+        _report = timer.summary()
+        logger.info(_report)
+        return _easyocr
@@ -0,0 +1,223 @@
+"""查询结果缓存
+
+主窗口一次刷新会多次读取相同的数据（题目列表、导航树、统计面板、筛选选项），
+UIService 通过本缓存复用查询结果，数据没有变化时刷新不访问数据库。
+
+失效由事件总线上的事件驱动：
+    - QuestionAddedEvent / QuestionUpdatedEvent / QuestionDeletedEvent：
+      清除所有列表和统计结果，以及该题目的详情
+    - ReviewCompletedEvent：复习会改变掌握度和复习日期，清除全部结果
+
+缓存按最近最少使用（LRU）淘汰，同时限制条目数和估算的内存占用。
+"""
+
+import copy
+import logging
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import fields, is_dataclass
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Callable, Dict, Hashable, Optional, Set
+
+from mistake_book.ui.events.events import (
+    QuestionAddedEvent,
+    QuestionUpdatedEvent,
+    QuestionDeletedEvent,
+    ReviewCompletedEvent
+)
+
+logger = logging.getLogger(__name__)
+
+
+class QueryCache:
+    """按查询条件缓存查询结果的 LRU 缓存"""
+    
+    def __init__(self, max_entries: int = 256, max_bytes: int = 32 * 1024 * 1024):
+        """
+        初始化缓存
+        
+        Args:
+            max_entries: 最多缓存的结果数量
+            max_bytes: 所有结果估算内存占用的上限（字节）
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._question_keys: Dict[int, Set[Hashable]] = {}  # 题目详情的键，按题目ID
+        self._key_question: Dict[Hashable, int] = {}
+        self._bytes = 0
+        self._generation = 0  # 每次失效加一，查询期间发生失效的结果不写入缓存
+        self._lock = threading.RLock()
+        self._event_bus = None
+        
+        # 命中统计
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def make_key(name: str, *args, **kwargs) -> Hashable:
+        """
+        由查询名称和参数生成规范化的缓存键
+        
+        字典按键排序，列表转为元组，参数顺序相同、取值相同的查询得到相同的键。
+        """
+        return (name, _freeze(args), _freeze(kwargs))
+    
+    def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        question_id: Optional[int] = None
+    ) -> Any:
+        """
+        读取缓存结果，未命中时调用 loader 查询并缓存
+        
+        返回结果的副本，调用方可以随意修改。
+        
+        Args:
+            key: 缓存键（由 make_key 生成）
+            loader: 执行查询的函数
+            question_id: 结果只与这道题目有关时（如题目详情）传入，
+                题目增删改时只清除这道题目的结果
+        
+        Returns:
+            查询结果
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(self._entries[key])
+            self.misses += 1
+            generation = self._generation
+        
+        value = loader()
+        self._put(key, value, question_id, generation)
+        return copy.deepcopy(value)
+    
+    def _put(self, key: Hashable, value: Any, question_id: Optional[int], generation: int):
+        """写入一个结果，超出上限时淘汰最久未使用的结果"""
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            logger.debug(f"查询结果过大，不缓存: {key[0]} ({size} 字节)")
+            return
+        
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._discard(key)
+            self._entries[key] = value
+            self._sizes[key] = size
+            self._bytes += size
+            if question_id is not None:
+                self._question_keys.setdefault(question_id, set()).add(key)
+                self._key_question[key] = question_id
+            
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+                self.evictions += 1
+    
+    def _discard(self, key: Hashable):
+        """移除一个结果（需持有锁）"""
+        if key not in self._entries:
+            return
+        del self._entries[key]
+        self._bytes -= self._sizes.pop(key)
+        question_id = self._key_question.pop(key, None)
+        if question_id is not None:
+            keys = self._question_keys[question_id]
+            keys.discard(key)
+            if not keys:
+                del self._question_keys[question_id]
+    
+    def invalidate_question(self, question_id: int):
+        """题目增删改：清除所有列表和统计结果，以及这道题目的详情"""
+        with self._lock:
+            self._generation += 1
+            keys = [key for key in self._entries if key not in self._key_question]
+            keys.extend(self._question_keys.get(question_id, ()))
+            for key in keys:
+                self._discard(key)
+        logger.debug(f"题目 {question_id} 变化，清除 {len(keys)} 个缓存结果")
+    
+    def clear(self):
+        """清除全部结果"""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._sizes.clear()
+            self._question_keys.clear()
+            self._key_question.clear()
+            self._bytes = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    @property
+    def size_bytes(self) -> int:
+        """当前缓存结果估算的内存占用（字节）"""
+        return self._bytes
+    
+    def bind(self, event_bus):
+        """
+        订阅事件总线上的数据变化事件
+        
+        需要在其他订阅者（如主窗口控制器）之前绑定，
+        这样它们在事件处理中重新查询时缓存已经失效。
+        """
+        self.unbind()
+        self._event_bus = event_bus
+        event_bus.subscribe(QuestionAddedEvent, self._on_question_changed)
+        event_bus.subscribe(QuestionUpdatedEvent, self._on_question_changed)
+        event_bus.subscribe(QuestionDeletedEvent, self._on_question_changed)
+        event_bus.subscribe(ReviewCompletedEvent, self._on_review_completed)
+    
+    def unbind(self):
+        """取消订阅事件"""
+        if self._event_bus is None:
+            return
+        self._event_bus.unsubscribe(QuestionAddedEvent, self._on_question_changed)
+        self._event_bus.unsubscribe(QuestionUpdatedEvent, self._on_question_changed)
+        self._event_bus.unsubscribe(QuestionDeletedEvent, self._on_question_changed)
+        self._event_bus.unsubscribe(ReviewCompletedEvent, self._on_review_completed)
+        self._event_bus = None
+    
+    def _on_question_changed(self, event):
+        self.invalidate_question(event.question_id)
+    
+    def _on_review_completed(self, event: ReviewCompletedEvent):
+        logger.debug(f"复习了 {event.reviewed_count} 道题目，清除全部缓存结果")
+        self.clear()
+
+
+def _freeze(value: Any) -> Hashable:
+    """把查询参数转换为可哈希的规范形式"""
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted((_freeze(v) for v in value), key=repr))
+    if is_dataclass(value) and not isinstance(value, type):
+        return (type(value).__name__,) + tuple(
+            (f.name, _freeze(getattr(value, f.name))) for f in fields(value)
+        )
+    if isinstance(value, (str, int, float, bool, type(None), datetime, date, Enum)):
+        return value
+    return repr(value)
+
+
+def _estimate_size(value: Any) -> int:
+    """粗略估算查询结果占用的内存（字节）"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_estimate_size(k) + _estimate_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(_estimate_size(v) for v in value)
+    return size
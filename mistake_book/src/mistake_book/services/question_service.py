@@ -1,69 +1,154 @@
 """错题服务 - 处理错题相关的业务逻辑"""
 
-from typing import Dict, Any, Optional
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 from mistake_book.core.data_manager import DataManager
-from mistake_book.services.ocr_engine import OCREngine
+from mistake_book.services.ocr_engine import OCREngine, detections_to_text
+from mistake_book.services.ocr_cache import OCRCache, image_content_hash
+from mistake_book.services.image_store import ImageStore, is_content_path
 from mistake_book.utils.validators import validate_question
-from mistake_book.utils.image_processor import ImageProcessor
+from mistake_book.utils.image_processor import (
+    ImageProcessor, ImageSource, IngestOptions, IngestResult
+)
 from mistake_book.config.paths import get_app_paths
 import logging
-import shutil
-from datetime import datetime
+import threading
 
 logger = logging.getLogger(__name__)
 
+# 最多保留多少个预先处理的图片结果（选择图片后没有保存题目时，旧结果被丢弃）
+MAX_PREPARED_IMAGES = 4
+
 
 class QuestionService:
     """错题服务类 - 封装错题相关的业务逻辑"""
     
-    def __init__(self, data_manager: DataManager, ocr_engine: Optional[OCREngine] = None):
+    def __init__(
+        self,
+        data_manager: DataManager,
+        ocr_engine: Optional[OCREngine] = None,
+        image_store: Optional[ImageStore] = None,
+        ingest_options: Optional[IngestOptions] = None,
+        ocr_cache: Optional[OCRCache] = None
+    ):
         """
         初始化错题服务
         
         Args:
             data_manager: 数据管理器
             ocr_engine: OCR引擎（可选）
+            image_store: 图片存储（默认使用应用图片目录）
+            ingest_options: 图片入库处理参数（默认 IngestOptions()）
+            ocr_cache: OCR识别结果缓存（可选，不提供时每次都重新识别）
         """
         self.data_manager = data_manager
         self.ocr_engine = ocr_engine
         self.image_processor = ImageProcessor()
         self.app_paths = get_app_paths()
+        self.image_store = image_store or ImageStore(self.app_paths.images_dir)
+        self.ingest_options = ingest_options or IngestOptions()
+        self.ocr_cache = ocr_cache
+        
+        # 选择图片后在后台预先进行的入库处理，键为 (路径, 修改时间, 大小)
+        self._prepared: "OrderedDict[Tuple[str, int, int], Future]" = OrderedDict()
+        self._prepared_lock = threading.Lock()
+        self._ingest_executor: Optional[ThreadPoolExecutor] = None
     
-    def _copy_image_to_storage(self, source_path: str) -> Optional[str]:
+    def _store_image(self, source_path: str) -> Optional[str]:
         """
-        将图片复制到应用的图片存储目录
+        将图片经入库处理后存入按内容寻址的图片存储（相同内容只保存一份）
+        
+        入库处理失败（如格式无法识别）时保存原文件。
         
         Args:
             source_path: 源图片路径
         
         Returns:
-            存储后的相对路径，失败返回None
+            存储后的相对路径（处于保留状态，题目写入后需要 unpin），失败返回None
         """
+        source = Path(source_path)
+        if not source.is_file():
+            logger.error(f"源图片不存在: {source_path}")
+            return None
         try:
-            source = Path(source_path)
-            if not source.exists():
-                logger.error(f"源图片不存在: {source_path}")
-                return None
-            
-            # 生成唯一的文件名：时间戳_原文件名
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            new_filename = f"{timestamp}_{source.name}"
-            
-            # 目标路径
-            dest_path = self.app_paths.images_dir / new_filename
-            
-            # 复制文件
-            shutil.copy2(source, dest_path)
-            logger.info(f"图片已复制到: {dest_path}")
-            
-            # 返回相对于images_dir的文件名（便于数据库存储）
-            return new_filename
-            
+            ingested = self._ingested(source)
+            if ingested is not None:
+                return self.image_store.add_bytes(ingested.data, ingested.suffix)
+            return self.image_store.add(source)
+        except OSError as e:
+            logger.error(f"保存图片失败: {e}")
+            return None
+    
+    def prepare_image(self, source_path: str) -> Optional[Future]:
+        """
+        在后台线程中预先进行图片的入库处理（选择图片后、保存前调用）
+        
+        解码、缩小和编码手机照片需要数百毫秒。选择图片后立即开始处理，
+        与OCR识别和填写表单同时进行，保存题目时直接使用处理结果。
+        界面保存题目前等待返回的 Future 完成，create_question 就不会在界面线程中处理图片。
+        
+        Args:
+            source_path: 源图片路径
+        
+        Returns:
+            入库处理的 Future（已经开始处理时返回同一个）；文件不存在时返回 None
+        """
+        source = Path(source_path)
+        if not source_path or not source.is_file():
+            return None
+        try:
+            key = self._prepared_key(source)
+        except OSError:
+            return None
+        with self._prepared_lock:
+            future = self._prepared.get(key)
+            if future is not None and not future.cancelled():
+                return future
+            if self._ingest_executor is None:
+                self._ingest_executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="image-ingest"
+                )
+            future = self._prepared[key] = self._ingest_executor.submit(self._ingest, source)
+            while len(self._prepared) > MAX_PREPARED_IMAGES:
+                _, stale = self._prepared.popitem(last=False)
+                stale.cancel()
+            return future
+    
+    @staticmethod
+    def _prepared_key(source: Path) -> Tuple[str, int, int]:
+        stat = source.stat()
+        return str(source.resolve()), stat.st_mtime_ns, stat.st_size
+    
+    def _ingested(self, source: Path) -> Optional[IngestResult]:
+        """
+        取出预先处理的结果（尚未完成时等待），没有预先处理时在当前线程中处理
+        
+        界面先等待 prepare_image 完成再保存，此处直接取到结果；
+        脚本等非界面调用方没有预先处理，在调用线程中处理。
+        """
+        with self._prepared_lock:
+            future = self._prepared.pop(self._prepared_key(source), None)
+        if future is not None and not future.cancelled():
+            return future.result()
+        return self._ingest(source)
+    
+    def _ingest(self, source: Path) -> Optional[IngestResult]:
+        """入库处理，失败时返回None（调用方保存原文件）"""
+        try:
+            return self.image_processor.prepare_for_storage(source, self.ingest_options)
         except Exception as e:
-            logger.error(f"复制图片失败: {e}")
+            logger.warning(f"图片入库处理失败，保存原文件: {e}")
             return None
     
+    def _release_images(self, paths):
+        """删除已经没有题目引用的图片文件（失败只记录日志）"""
+        try:
+            self.image_store.release_unreferenced(paths, self.data_manager.count_image_references)
+        except Exception as e:
+            logger.warning(f"清理图片失败: {e}")
+    
     def get_image_full_path(self, relative_path: Optional[str]) -> Optional[Path]:
         """
         根据相对路径获取图片的完整路径
@@ -82,8 +167,8 @@ class QuestionService:
         if path.is_absolute():
             return path if path.exists() else None
         
-        # 相对路径，拼接images_dir
-        full_path = self.app_paths.images_dir / relative_path
+        # 相对路径（内容寻址路径或旧版本的文件名），位于图片目录中
+        full_path = self.image_store.full_path(relative_path)
         return full_path if full_path.exists() else None
     
     def create_question(self, question_data: Dict[str, Any]) -> tuple[bool, str, Optional[int]]:
@@ -101,14 +186,16 @@ class QuestionService:
         if not is_valid:
             return False, error_msg, None
         
+        stored_path = None
+        question_id = None
         try:
-            # 处理图片：如果有图片路径，复制到专门的文件夹
+            # 处理图片：如果有图片路径，存入图片存储
             if question_data.get("image_path"):
-                relative_path = self._copy_image_to_storage(question_data["image_path"])
-                if relative_path:
+                stored_path = self._store_image(question_data["image_path"])
+                if stored_path:
                     # 保存相对路径到数据库
-                    question_data["image_path"] = relative_path
-                    logger.info(f"图片已保存，相对路径: {relative_path}")
+                    question_data["image_path"] = stored_path
+                    logger.info(f"图片已保存，相对路径: {stored_path}")
                 else:
                     # 复制失败，保留原路径（兼容性）
                     logger.warning("图片复制失败，使用原路径")
@@ -119,13 +206,23 @@ class QuestionService:
         except Exception as e:
             logger.error(f"保存错题失败: {e}")
             return False, f"保存失败: {str(e)}", None
+        finally:
+            if stored_path:
+                self.image_store.unpin(stored_path)
+                if question_id is None:
+                    # 题目没有写入，没有其他题目引用的图片随之删除
+                    self._release_images([stored_path])
     
-    def recognize_image(self, image_path: Path, preprocess: bool = True) -> tuple[bool, str, Optional[str]]:
+    def recognize_image(
+        self, image: ImageSource, preprocess: bool = True
+    ) -> tuple[bool, str, Optional[str]]:
         """
         识别图片中的文字
         
+        预处理结果留在内存中直接交给OCR引擎，不写临时文件。
+        
         Args:
-            image_path: 图片路径
+            image: 图片路径、编码后的图片数据（剪贴板、拖放）或已解码的图片
             preprocess: 是否进行预处理
         
         Returns:
@@ -138,22 +235,29 @@ class QuestionService:
             return False, "OCR引擎不可用\n\n请检查依赖是否正确安装", None
         
         try:
-            # 图像预处理
-            processed_path = image_path
-            if preprocess:
-                logger.info("开始图像预处理...")
-                processed_path = self.image_processor.preprocess_for_ocr(image_path, enhance=True)
-            
-            # OCR识别
-            logger.info("开始OCR识别...")
-            recognized_text = self.ocr_engine.recognize(processed_path)
+            # 同一图片、同样的引擎参数识别过时直接使用缓存的结果
+            cache_key = self._ocr_cache_key(image)
+            options = {"preprocess": preprocess}
+            detections = self.ocr_cache.get(*cache_key, options) if cache_key else None
             
-            # 清理临时文件
-            if preprocess and processed_path != image_path:
-                try:
-                    processed_path.unlink()
-                except Exception:
-                    pass
+            if detections is not None:
+                logger.info("使用缓存的OCR识别结果")
+                recognized_text = detections_to_text(detections)
+            else:
+                # 图像预处理
+                processed = image
+                if preprocess:
+                    logger.info("开始图像预处理...")
+                    processed = self.image_processor.preprocess_for_ocr(image, enhance=True)
+                
+                # OCR识别
+                logger.info("开始OCR识别...")
+                if cache_key:
+                    detections = self.ocr_engine.recognize_detailed(processed)
+                    self.ocr_cache.put(*cache_key, detections, options)
+                    recognized_text = detections_to_text(detections)
+                else:
+                    recognized_text = self.ocr_engine.recognize(processed)
             
             if recognized_text and recognized_text.strip():
                 return True, "识别成功", recognized_text
@@ -164,25 +268,42 @@ class QuestionService:
             logger.error(f"OCR识别失败: {e}")
             return False, f"OCR识别失败\n\n错误信息:\n{str(e)}", None
     
-    def recognize_image_with_retry(self, image_path: Path) -> tuple[bool, str, Optional[str]]:
+    def _ocr_cache_key(self, image: ImageSource) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        识别结果缓存的 (图片哈希, 引擎标识)
+        
+        未启用缓存、引擎不支持缓存或无法计算图片哈希时返回 None（不使用缓存）。
+        """
+        if self.ocr_cache is None:
+            return None
+        signature = self.ocr_engine.cache_signature()
+        if signature is None:
+            return None
+        try:
+            return image_content_hash(image), signature
+        except (OSError, TypeError) as e:
+            logger.debug(f"无法计算图片哈希，不使用OCR缓存: {e}")
+            return None
+    
+    def recognize_image_with_retry(self, image: ImageSource) -> tuple[bool, str, Optional[str]]:
         """
         识别图片 - 失败时自动重试(不预处理)
         
         Args:
-            image_path: 图片路径
+            image: 图片路径、编码后的图片数据或已解码的图片
         
         Returns:
             (成功标志, 消息, 识别文本)
         """
         # 第一次尝试:使用预处理
-        success, message, text = self.recognize_image(image_path, preprocess=True)
+        success, message, text = self.recognize_image(image, preprocess=True)
         
         if success:
             return success, message, text
         
         # 第二次尝试:不预处理（降低日志级别，避免误导用户）
         logger.debug("预处理识别失败,尝试直接识别...")
-        success, message, text = self.recognize_image(image_path, preprocess=False)
+        success, message, text = self.recognize_image(image, preprocess=False)
         
         return success, message, text
     
@@ -197,7 +318,19 @@ class QuestionService:
         Returns:
             (成功标志, 消息)
         """
+        old_paths: List[str] = []
+        stored_path = None
+        success = False
         try:
+            if "image_path" in updates:
+                old_paths = self.data_manager.get_image_paths([question_id])
+                new_image = updates["image_path"]
+                # 新选择的图片文件先存入图片存储
+                if new_image and new_image not in old_paths and not is_content_path(new_image):
+                    stored_path = self._store_image(new_image)
+                    if stored_path:
+                        updates["image_path"] = stored_path
+            
             success = self.data_manager.update_question(question_id, updates)
             if success:
                 return True, "更新成功"
@@ -206,6 +339,11 @@ class QuestionService:
         except Exception as e:
             logger.error(f"更新错题失败: {e}")
             return False, f"更新失败: {str(e)}"
+        finally:
+            if stored_path:
+                self.image_store.unpin(stored_path)
+            # 更新成功时清理被替换的旧图片，失败时清理刚存入的新图片
+            self._release_images(old_paths if success else [stored_path])
     
     def delete_question(self, question_id: int) -> tuple[bool, str]:
         """
@@ -218,8 +356,10 @@ class QuestionService:
             (成功标志, 消息)
         """
         try:
+            image_paths = self.data_manager.get_image_paths([question_id])
             success = self.data_manager.delete_question(question_id)
             if success:
+                self._release_images(image_paths)
                 return True, "删除成功"
             else:
                 return False, "题目不存在"
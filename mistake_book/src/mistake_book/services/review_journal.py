@@ -0,0 +1,284 @@
+"""复习作答的后写日志（write-behind）
+
+评分按钮点击后作答只追加到日志文件并放入内存队列，立即返回；
+后台线程从队列中取出作答，攒批后在一个事务中提交（group commit）。
+
+持久性保证：
+    - 作答写入日志文件后才返回，进程崩溃时日志中的作答不会丢失，
+      下次启动时 replay 会补写（每条作答带唯一令牌，已提交过的不会重复写入）
+    - 提交时不调用 fsync（不阻塞界面）；flush 先把日志文件同步到磁盘，
+      因此系统崩溃或断电时可能丢失的只有最近一次 flush 之后的作答
+    - flush 等待队列中的作答全部处理完（可设超时），用于复习会话结束和应用退出
+    - 一批作答连续提交失败 max_retries 次后放弃，不再阻塞队列；
+      日志文件保留，下次启动时补写。之后的作答也不再写入数据库，只保留在日志中，
+      保证补写时按作答顺序计算复习间隔（后面的作答不会先于前面的写入）
+    - 队列中的作答全部提交后清空日志文件
+"""
+
+import json
+import logging
+import os
+import queue
+import threading
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+from mistake_book.config.constants import ReviewResult
+from mistake_book.core.data_manager import DataManager, ReviewAnswer
+from mistake_book.core.review_scheduler import ReviewScheduler
+
+logger = logging.getLogger(__name__)
+
+# 队列结束标记
+_STOP = object()
+
+
+class ReviewJournal:
+    """复习作答的后写队列"""
+    
+    def __init__(
+        self,
+        data_manager: DataManager,
+        scheduler: ReviewScheduler,
+        journal_path: Path,
+        max_batch: int = 64,
+        batch_window: float = 0.05,
+        retry_delay: float = 1.0,
+        max_retries: int = 3
+    ):
+        """
+        初始化后写队列（需调用 start 启动后台线程）
+        
+        Args:
+            data_manager: 数据管理器
+            scheduler: 复习调度器
+            journal_path: 日志文件路径
+            max_batch: 每个事务最多提交的作答数量
+            batch_window: 取到第一条作答后继续等待后续作答的时间（秒）
+            retry_delay: 提交失败后重试的间隔（秒）
+            max_retries: 一批作答提交失败后最多重试的次数，仍失败时留给下次启动补写
+        """
+        self.data_manager = data_manager
+        self.scheduler = scheduler
+        self.journal_path = journal_path
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self.retry_delay = retry_delay
+        self.max_retries = max_retries
+        
+        self._queue: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()  # 保护日志文件和未处理计数
+        self._idle = threading.Condition(self._lock)  # 未处理的作答全部处理完时通知
+        self._pending = 0  # 已写入日志但后台线程尚未处理完的作答数量
+        self._retain = False  # 有作答未能写入：保留日志文件，之后的作答也留给下次启动
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self) -> int:
+        """
+        补写上次未提交的作答，然后启动后台线程
+        
+        Returns:
+            补写的作答数量
+        """
+        try:
+            replayed = self.replay()
+        except Exception as e:
+            logger.error(f"补写复习日志失败，将在下次启动时重试: {e}")
+            self._retain = True
+            replayed = 0
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="ReviewJournalWriter", daemon=True
+        )
+        self._thread.start()
+        return replayed
+    
+    def submit(
+        self,
+        question_id: int,
+        result: ReviewResult,
+        time_spent: Optional[int] = None
+    ) -> str:
+        """
+        提交一次作答（写入日志后立即返回，由后台线程写入数据库）
+        
+        Args:
+            question_id: 题目ID
+            result: 复习结果
+            time_spent: 耗时（秒）
+        
+        Returns:
+            作答令牌
+        
+        Raises:
+            RuntimeError: 后台线程未启动
+        """
+        if self._thread is None or not self._thread.is_alive():
+            raise RuntimeError("复习日志未启动")
+        
+        answer = ReviewAnswer(
+            question_id, result, time_spent, datetime.now(), uuid.uuid4().hex
+        )
+        with self._lock:
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write(_encode(answer) + "\n")
+            self._pending += 1
+        self._queue.put(answer)
+        return answer.client_token
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        把日志文件同步到磁盘，然后等待已提交的作答全部处理完
+        
+        处理完包括写入数据库，以及多次重试仍失败、留给下次启动补写。
+        
+        Args:
+            timeout: 最多等待的秒数，None 表示一直等待
+        
+        Returns:
+            是否全部处理完（超时返回 False，作答仍在日志中，不会丢失）
+        """
+        with self._lock:
+            self._sync_journal()
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+    
+    def close(self, timeout: Optional[float] = 10.0):
+        """
+        写入剩余作答并停止后台线程
+        
+        Args:
+            timeout: 等待剩余作答写入的秒数；超时后停止重试，
+                未写入的作答保留在日志中，下次启动时补写
+        """
+        if self._thread is None:
+            return
+        if not self.flush(timeout):
+            logger.warning("复习作答未能在退出前全部写入，将在下次启动时补写")
+        # 先设置停止标记再等待线程结束：正在重试的批次立即放弃，不会阻塞退出
+        self._stopping.set()
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+    
+    def replay(self) -> int:
+        """
+        补写日志文件中的作答（已写入数据库的作答按令牌跳过）
+        
+        Returns:
+            日志中的作答数量（包括之前已经写入、本次跳过的）
+        """
+        with self._lock:
+            if not self.journal_path.exists():
+                return 0
+            answers = _read_journal(self.journal_path)
+            if answers:
+                self.data_manager.record_reviews(answers, self.scheduler)
+                logger.info(f"已补写复习日志中的 {len(answers)} 条作答")
+            if self._pending == 0:
+                self.journal_path.unlink()
+            self._retain = False
+            return len(answers)
+    
+    def _run(self):
+        """后台线程：攒批提交队列中的作答"""
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                return
+            
+            batch = [item]
+            stop_after = False
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get(timeout=self.batch_window)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop_after = True
+                    break
+                batch.append(item)
+            
+            self._commit(batch)
+            for _ in batch:
+                self._queue.task_done()
+            if stop_after:
+                self._queue.task_done()
+                return
+    
+    def _commit(self, batch: List[ReviewAnswer]):
+        """
+        在一个事务中提交一批作答，失败时重试
+        
+        重试 max_retries 次仍失败或正在停止时放弃：保留日志文件，下次启动时补写。
+        已有作答留给下次启动补写时，这一批也不写入数据库，只保留在日志中。
+        """
+        committed = False
+        for attempt in range(0 if self._retain else self.max_retries + 1):
+            try:
+                self.data_manager.record_reviews(batch, self.scheduler)
+                committed = True
+                break
+            except Exception as e:
+                logger.error(f"提交复习作答失败（{len(batch)} 条，第 {attempt + 1} 次）: {e}")
+                if attempt == self.max_retries or self._stopping.wait(self.retry_delay):
+                    break
+        
+        with self._idle:
+            self._pending -= len(batch)
+            if not committed:
+                logger.warning(
+                    f"{len(batch)} 条复习作答未能写入数据库，保留在日志中，下次启动时补写"
+                )
+                self._retain = True
+                self._sync_journal()
+            elif self._pending == 0 and not self._retain and self.journal_path.exists():
+                # 日志中的作答都已提交
+                self.journal_path.unlink()
+            if self._pending == 0:
+                self._idle.notify_all()
+    
+    def _sync_journal(self):
+        """把日志文件同步到磁盘（调用方持有锁）"""
+        if not self.journal_path.exists():
+            return
+        try:
+            with open(self.journal_path, "rb") as f:
+                os.fsync(f.fileno())
+        except OSError as e:
+            logger.warning(f"同步复习日志失败: {e}")
+
+
+def _encode(answer: ReviewAnswer) -> str:
+    return json.dumps({
+        "question_id": answer.question_id,
+        "result": answer.result.value,
+        "time_spent": answer.time_spent,
+        "reviewed_at": answer.reviewed_at.isoformat(),
+        "client_token": answer.client_token,
+    }, ensure_ascii=False)
+
+
+def _read_journal(path: Path) -> List[ReviewAnswer]:
+    """读取日志文件，跳过无法解析的行（如崩溃时写了一半的最后一行）"""
+    answers = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+                answers.append(ReviewAnswer(
+                    data["question_id"],
+                    ReviewResult(data["result"]),
+                    data.get("time_spent"),
+                    datetime.fromisoformat(data["reviewed_at"]),
+                    data["client_token"],
+                ))
+            except (ValueError, KeyError, TypeError) as e:
+                logger.warning(f"跳过无法解析的复习日志第 {line_no} 行: {e}")
+    return answers
@@ -1,43 +1,56 @@
 """复习服务 - 处理复习相关的业务逻辑"""
 
-from typing import List, Dict, Any, Optional
+import logging
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from mistake_book.core.data_manager import DataManager
 from mistake_book.core.review_scheduler import ReviewScheduler
 from mistake_book.config.constants import ReviewResult
+from mistake_book.services.review_journal import ReviewJournal
+
+logger = logging.getLogger(__name__)
+
+# 复习会话结束时等待作答写入数据库的最长时间（秒）
+REVIEW_FLUSH_TIMEOUT = 10.0
 
 
 class ReviewService:
     """复习服务类 - 封装复习相关的业务逻辑"""
     
-    def __init__(self, data_manager: DataManager, scheduler: ReviewScheduler):
+    def __init__(
+        self,
+        data_manager: DataManager,
+        scheduler: ReviewScheduler,
+        journal: Optional[ReviewJournal] = None
+    ):
         """
         初始化复习服务
         
         Args:
             data_manager: 数据管理器
             scheduler: 复习调度器
+            journal: 复习作答后写队列（可选，未提供时作答同步写入）
         """
         self.data_manager = data_manager
         self.scheduler = scheduler
+        self.journal = journal
     
-    def get_due_questions(self, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    def get_due_questions(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
         """
-        获取需要复习的题目
+        获取需要复习的题目（逾期最久的优先）
         
         Args:
-            filters: 筛选条件（可选）
+            filters: 筛选条件（可选，如 subject、question_type）
+            limit: 最多返回的题目数量，None表示返回全部到期题目
         
         Returns:
             到期题目列表
         """
-        # 获取所有题目
-        all_questions = self.data_manager.search_questions(filters or {})
-        
-        # 筛选到期题目
-        due_questions = self.scheduler.get_due_questions(all_questions)
-        
-        return due_questions
+        return self.data_manager.get_due_questions(filters or {}, limit=limit)
     
     def process_review_result(
         self, 
@@ -46,7 +59,7 @@ class ReviewService:
         time_spent: Optional[int] = None
     ) -> tuple[bool, str, Dict[str, Any]]:
         """
-        处理复习结果
+        处理复习结果（更新调度数据并保存复习记录，在一个事务中完成）
         
         Args:
             question_id: 题目ID
@@ -57,70 +70,87 @@ class ReviewService:
             (成功标志, 消息, 更新后的数据)
         """
         try:
-            # 获取题目当前数据
-            question = self.data_manager.get_question(question_id)
-            if not question:
-                return False, "题目不存在", {}
-            
-            # 计算新的复习数据
-            interval, reps, ef = self.scheduler.calculate_next_review(
-                question.get('interval', 0),
-                question.get('repetitions', 0),
-                question.get('easiness_factor', 2.5),
-                result
+            updates = self.data_manager.record_reviews(
+                [(question_id, result, time_spent)], self.scheduler
             )
-            
-            # 计算下次复习日期
-            next_review = datetime.now() + timedelta(days=interval)
-            
-            # 准备更新数据
-            updates = {
-                'interval': interval,
-                'repetitions': reps,
-                'easiness_factor': ef,
-                'mastery_level': result.value,
-                'next_review_date': next_review
-            }
-            
-            # 保存到数据库
-            success = self.data_manager.update_question(question_id, updates)
-            
-            if success:
-                # 保存复习记录
-                self._save_review_record(question_id, result, time_spent)
-                return True, "复习数据已更新", updates
-            else:
-                return False, "更新失败", {}
-                
+            if question_id not in updates:
+                return False, "题目不存在", {}
+            return True, "复习数据已更新", updates[question_id]
         except Exception as e:
+            logger.error(f"处理复习结果失败: {e}")
             return False, f"处理失败: {str(e)}", {}
     
-    def _save_review_record(self, question_id: int, result: ReviewResult, time_spent: Optional[int] = None):
+    def submit_review_result(
+        self,
+        question_id: int,
+        result: ReviewResult,
+        time_spent: Optional[int] = None
+    ) -> tuple[bool, str]:
         """
-        保存复习记录
+        提交复习结果（复习界面使用，不等待磁盘写入）
+        
+        有后写队列时写入日志后立即返回，由后台线程写入数据库；
+        会话结束时调用 flush_reviews 确保全部写入。没有后写队列时同步写入。
         
         Args:
             question_id: 题目ID
             result: 复习结果
             time_spent: 耗时（秒）
+        
+        Returns:
+            (成功标志, 消息)
         """
+        if self.journal is None:
+            success, message, _ = self.process_review_result(question_id, result, time_spent)
+            return success, message
         try:
-            from mistake_book.database.models import ReviewRecord
-            
-            with self.data_manager.db.session_scope() as session:
-                # 创建复习记录
-                record = ReviewRecord(
-                    question_id=question_id,
-                    review_date=datetime.now(),
-                    result=result.value,
-                    time_spent=time_spent
-                )
-                
-                session.add(record)
-            
+            self.journal.submit(question_id, result, time_spent)
+            return True, "复习结果已加入保存队列"
         except Exception as e:
-            import logging
-            logging.error(f"保存复习记录失败: {e}")
+            logger.error(f"提交复习结果失败: {e}")
+            return False, f"提交失败: {str(e)}"
+    
+    def flush_reviews(self, timeout: Optional[float] = REVIEW_FLUSH_TIMEOUT) -> bool:
+        """
+        等待已提交的复习结果全部写入数据库（复习会话结束时调用）
+        
+        Args:
+            timeout: 最多等待的秒数（在界面线程调用，不无限阻塞）
+        
+        Returns:
+            是否全部处理完；超时时作答仍在日志中，由后台继续写入或下次启动补写
+        """
+        if self.journal is None:
+            return True
+        done = self.journal.flush(timeout)
+        if not done:
+            logger.warning("复习结果尚未全部写入数据库，将在后台继续写入")
+        return done
+    
+    def process_review_results(
+        self,
+        answers: List[Tuple[int, ReviewResult, Optional[int]]]
+    ) -> tuple[bool, str, Dict[int, Dict[str, Any]]]:
+        """
+        批量处理一次复习会话的结果（全部在一个事务中提交）
+        
+        Args:
+            answers: [(题目ID, 复习结果, 耗时秒数或None)]，按作答顺序排列
+        
+        Returns:
+            (成功标志, 消息, {题目ID: 更新后的数据})，不存在的题目被跳过
+        """
+        try:
+            updates = self.data_manager.record_reviews(answers, self.scheduler)
+            # 作答可以是三元组或 ReviewAnswer（带作答时间和令牌），题目ID都在第一项
+            skipped = len({answer[0] for answer in answers} - set(updates))
+            message = f"已保存 {len(updates)} 道题目的复习结果"
+            if skipped:
+                message += f"，{skipped} 道题目不存在"
+            return True, message, updates
+        except Exception as e:
+            logger.error(f"批量处理复习结果失败: {e}")
+            return False, f"处理失败: {str(e)}", {}
     
     def get_review_statistics(self) -> Dict[str, Any]:
         """
@@ -130,17 +160,8 @@ class ReviewService:
             统计数据字典
         """
         try:
-            # 获取基础统计
-            stats = self.data_manager.get_statistics()
-            
-            # 获取到期题目数量
-            due_questions = self.get_due_questions()
-            stats['due_count'] = len(due_questions)
-            
-            # 计算今日复习数量（可以从复习记录表查询）
-            stats['today_reviewed'] = 0  # TODO: 实现
-            
-            return stats
+            # 到期数量和今日复习数量由统计引擎在数据库中聚合
+            return self.data_manager.get_statistics()
         except Exception as e:
             return {
                 'total_questions': 0,
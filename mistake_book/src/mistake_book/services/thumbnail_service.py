@@ -0,0 +1,169 @@
+"""多尺寸缩略图缓存
+
+界面只显示缩小后的图片（上传预览、复习和详情、查看大图），
+不需要每次都完整解码原图。手机拍摄的原图动辄上千万像素，完整解码要几百毫秒。
+
+每张图片按固定的几种尺寸生成缩略图，保存在缩略图目录中，以内容哈希为键：
+
+    thumbnails/v1/<尺寸名>/<哈希前两位>/<sha256>.jpg
+
+图片存储中的内容寻址路径直接从路径中取得哈希，不需要读取原图；
+其他路径（尚未存入的上传文件、旧数据）读取文件计算哈希。
+内容相同的图片共用缩略图，原图内容变化后自然对应新的缩略图。
+
+生成时 JPEG 使用 draft 模式，解码器直接按 1/2、1/4、1/8 缩小解码，
+只在此基础上做最后一次高质量缩放。缩略图目录只是缓存，可以随时删除。
+"""
+
+import logging
+import os
+import re
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from mistake_book.services.image_store import ImageStore, hash_file
+
+logger = logging.getLogger(__name__)
+
+# 缩略图尺寸：名称 -> 最大 (宽, 高)，按比例缩放到框内，不放大
+THUMBNAIL_SIZES: Dict[str, Tuple[int, int]] = {
+    "preview": (400, 280),    # 上传预览
+    "review": (800, 400),     # 复习、详情
+    "viewer": (1200, 900),    # 查看大图
+}
+
+# 生成方式变化时加一，旧缩略图不再使用
+THUMBNAIL_VERSION = 1
+
+# 缩略图 JPEG 质量（题目图片多为文字，质量不宜过低）
+THUMBNAIL_QUALITY = 88
+
+_HASH = re.compile(r"^[0-9a-f]{64}$")
+
+# EXIF 中表示图片需要旋转 90° 的方向值（宽高互换）
+_TRANSPOSED_ORIENTATIONS = (5, 6, 7, 8)
+
+
+def read_image_size(source: Path) -> Tuple[int, int]:
+    """
+    只读取文件头，返回图片的 (宽, 高)
+    
+    Raises:
+        OSError: 文件不存在或不是可识别的图片（PIL.UnidentifiedImageError 是 OSError 的子类）
+    """
+    from PIL import Image
+    
+    with Image.open(source) as image:
+        return image.size
+
+
+def render_thumbnail(source: Path, size: Tuple[int, int]):
+    """
+    解码并缩小图片，返回 RGB 模式的 PIL 图片
+    
+    按 EXIF 方向摆正；带透明通道的图片合成到白色背景上。
+    
+    Args:
+        source: 原图路径
+        size: 最大 (宽, 高)
+    """
+    from PIL import Image, ImageOps
+    
+    with Image.open(source) as image:
+        width, height = size
+        if image.getexif().get(0x0112) in _TRANSPOSED_ORIENTATIONS:
+            width, height = height, width
+        # 只对 JPEG 生效：解码时直接缩小到不小于目标尺寸的 1/2、1/4 或 1/8
+        image.draft("RGB", (width, height))
+        image = ImageOps.exif_transpose(image)
+        
+        if image.mode in ("RGBA", "LA", "P"):
+            image = image.convert("RGBA")
+            background = Image.new("RGB", image.size, "white")
+            background.paste(image, mask=image.getchannel("A"))
+            image = background
+        elif image.mode != "RGB":
+            image = image.convert("RGB")
+        
+        image.thumbnail(size, Image.Resampling.LANCZOS, reducing_gap=3.0)
+        return image
+
+
+class ThumbnailStore:
+    """缩略图的磁盘缓存（线程安全，可以在后台线程中调用）"""
+    
+    def __init__(self, root: Path):
+        """
+        Args:
+            root: 缩略图目录（AppPaths.thumbnails_dir）
+        """
+        self.root = Path(root)
+    
+    @staticmethod
+    def cache_key(source: Path) -> str:
+        """
+        图片内容的 SHA-256
+        
+        图片存储中的文件从路径取得哈希，其他文件读取内容计算。
+        """
+        source = Path(source)
+        content_hash = ImageStore.hash_of_path(source)
+        if content_hash:
+            return content_hash
+        return hash_file(source)[0]
+    
+    def path_for(self, key: str, size_name: str) -> Path:
+        """缩略图文件路径"""
+        if not _HASH.match(key) or size_name not in THUMBNAIL_SIZES:
+            raise ValueError(f"无效的缩略图: {key} {size_name}")
+        return self.root / f"v{THUMBNAIL_VERSION}" / size_name / key[:2] / f"{key}.jpg"
+    
+    def load(self, source: Path, size_name: str, key: Optional[str] = None):
+        """
+        读取缩略图，不存在时生成并保存
+        
+        Args:
+            source: 原图路径
+            size_name: THUMBNAIL_SIZES 中的尺寸名
+            key: 内容哈希（调用方已知时传入，省去计算）
+        
+        Returns:
+            RGB 模式的 PIL 图片
+        
+        Raises:
+            OSError: 原图不存在或无法解码
+        """
+        from PIL import Image
+        
+        target = self.path_for(key or self.cache_key(source), size_name)
+        try:
+            with Image.open(target) as cached:
+                cached.load()
+                return cached
+        except OSError:
+            pass
+        
+        image = render_thumbnail(source, THUMBNAIL_SIZES[size_name])
+        self._save(image, target)
+        return image
+    
+    def _save(self, image, target: Path):
+        """原子地写入缩略图；写入失败只记录日志（缩略图只是缓存）"""
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_name = tempfile.mkstemp(dir=target.parent, suffix=".part")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    image.save(f, "JPEG", quality=THUMBNAIL_QUALITY, optimize=True)
+                os.replace(temp_name, target)
+            except BaseException:
+                Path(temp_name).unlink(missing_ok=True)
+                raise
+        except OSError as e:
+            logger.warning(f"保存缩略图失败 {target}: {e}")
+    
+    def clear(self):
+        """删除所有缩略图"""
+        shutil.rmtree(self.root, ignore_errors=True)
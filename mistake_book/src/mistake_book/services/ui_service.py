@@ -1,71 +1,166 @@
 """UI服务 - 处理UI相关的业务逻辑"""
 
-from typing import List, Dict, Any, Optional
+from datetime import date
+from typing import Callable, List, Dict, Any, Optional
 from mistake_book.core.data_manager import DataManager
+from mistake_book.core.query import QuestionQuery
+from mistake_book.services.query_cache import QueryCache
 
 
 class UIService:
     """UI服务类 - 封装UI层需要的业务逻辑"""
     
-    def __init__(self, data_manager: DataManager):
+    def __init__(self, data_manager: DataManager, cache: Optional[QueryCache] = None):
         """
         初始化UI服务
         
         Args:
             data_manager: 数据管理器
+            cache: 查询结果缓存（可选，需绑定到事件总线才能在数据变化时失效）
         """
         self.data_manager = data_manager
+        self.cache = cache
+    
+    def _cached(self, key, loader: Callable[[], Any], question_id: Optional[int] = None):
+        """有缓存时通过缓存读取查询结果"""
+        if self.cache is None:
+            return loader()
+        return self.cache.get_or_load(key, loader, question_id)
     
     def get_all_questions(self) -> List[Dict[str, Any]]:
         """
-        获取所有错题
+        获取所有错题（摘要，不含完整内容）
+        
+        Returns:
+            错题摘要列表
+        """
+        return self._cached(
+            QueryCache.make_key("all_questions"),
+            lambda: self.data_manager.list_question_summaries({})
+        )
+    
+    def get_question_detail(self, question_id: int) -> Optional[Dict[str, Any]]:
+        """
+        获取题目的完整信息（用于详情对话框）
+        
+        Args:
+            question_id: 题目ID
+        
+        Returns:
+            题目完整数据，不存在时返回None
+        """
+        return self._cached(
+            QueryCache.make_key("question_detail", question_id),
+            lambda: self.data_manager.get_question(question_id),
+            question_id=question_id
+        )
+    
+    def get_questions_page(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        sort_by: str = "created_at",
+        descending: bool = True,
+        cursor: Optional[Dict[str, Any]] = None,
+        page_size: int = 50
+    ) -> Dict[str, Any]:
+        """
+        分页获取错题（用于主列表按需加载）
+        
+        Args:
+            filters: 筛选条件字典（subject、difficulty、mastery_level、tags）
+            sort_by: 排序字段（created_at、next_review_date、difficulty、mastery_level）
+            descending: 是否降序
+            cursor: 上一页返回的游标，None表示第一页
+            page_size: 每页数量
+        
+        Returns:
+            {"items": 题目列表, "next_cursor": 下一页游标, "has_more": 是否还有下一页}
+        """
+        db_filters = self._db_filters(filters, ('subject', 'difficulty', 'mastery_level', 'tags'))
+        
+        return self._cached(
+            QueryCache.make_key(
+                "questions_page", db_filters, sort_by, descending, cursor, page_size
+            ),
+            lambda: self.data_manager.get_questions_page(
+                db_filters,
+                sort_by=sort_by,
+                descending=descending,
+                page_size=page_size,
+                cursor=cursor
+            )
+        )
+    
+    def get_question_summary(
+        self,
+        question_id: int,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        获取单个题目的摘要，并检查它是否符合筛选条件（用于增量更新列表）
+        
+        Args:
+            question_id: 题目ID
+            filters: 当前视图的筛选条件（subject、difficulty、mastery_level、tags、keyword）
         
         Returns:
-            错题列表
+            题目摘要；题目不存在或不符合筛选条件时返回None
         """
-        return self.data_manager.search_questions({})
+        db_filters = self._db_filters(
+            filters, ('subject', 'difficulty', 'mastery_level', 'tags', 'keyword')
+        )
+        query = QuestionQuery.from_filters(db_filters).where(ids=[question_id])
+        summaries = self._cached(
+            QueryCache.make_key("question_summary", question_id, db_filters),
+            lambda: self.data_manager.list_question_summaries(query),
+            question_id=question_id
+        )
+        return summaries[0] if summaries else None
+    
+    @staticmethod
+    def _db_filters(filters: Optional[Dict[str, Any]], keys) -> Dict[str, Any]:
+        """只保留数据库查询支持的、非空的筛选条件"""
+        db_filters = {}
+        for key in keys:
+            value = (filters or {}).get(key)
+            if value is not None and value != '' and value != []:
+                db_filters[key] = value
+        return db_filters
     
-    def search_questions(self, keyword: str) -> List[Dict[str, Any]]:
+    def search_questions(self, keyword: str, limit: Optional[int] = None,
+                         offset: int = 0) -> List[Dict[str, Any]]:
         """
-        搜索错题（按关键词）
+        搜索错题（按关键词，全文索引）
+        
+        在科目、题型、题目内容、答案和解析中检索，按相关度排序。
         
         Args:
             keyword: 搜索关键词
+            limit: 最多返回的题目数量，None 表示返回全部匹配（分页显示时传入每页数量）
+            offset: 跳过的题目数量（分页）
         
         Returns:
-            匹配的错题列表
+            匹配的错题摘要列表（附带高亮摘要 snippet）
         """
         if not keyword or not keyword.strip():
             return self.get_all_questions()
         
-        # 搜索题目内容、答案、解析中包含关键词的题目
-        all_questions = self.get_all_questions()
-        keyword_lower = keyword.lower().strip()
-        
-        filtered = []
-        for q in all_questions:
-            # 搜索内容
-            if keyword_lower in q.get('content', '').lower():
-                filtered.append(q)
-                continue
-            # 搜索答案
-            if keyword_lower in q.get('answer', '').lower():
-                filtered.append(q)
-                continue
-            # 搜索解析
-            if keyword_lower in q.get('explanation', '').lower():
-                filtered.append(q)
-                continue
-            # 搜索科目
-            if keyword_lower in q.get('subject', '').lower():
-                filtered.append(q)
-                continue
-            # 搜索题型
-            if keyword_lower in q.get('question_type', '').lower():
-                filtered.append(q)
-                continue
-        
-        return filtered
+        keyword = keyword.strip()
+        return self._cached(
+            QueryCache.make_key("search", keyword, limit, offset),
+            lambda: self._search(keyword, limit, offset)
+        )
+    
+    def _search(self, keyword: str, limit: Optional[int], offset: int) -> List[Dict[str, Any]]:
+        """执行全文检索并附加高亮摘要"""
+        hits = self.data_manager.full_text_search(keyword, limit=limit, offset=offset)
+        snippets = {hit['id']: hit['snippet'] for hit in hits}
+        
+        questions = self.data_manager.get_question_summaries_by_ids([hit['id'] for hit in hits])
+        for q in questions:
+            q['snippet'] = snippets.get(q['id'], '')
+        
+        return questions
     
     def filter_questions(self, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
@@ -81,32 +176,28 @@ class UIService:
         Returns:
             筛选后的错题列表
         """
-        # 构建数据库查询条件
-        db_filters = {}
-        
-        # 科目筛选
-        if 'subject' in filters and filters['subject']:
-            db_filters['subject'] = filters['subject']
-        
-        # 掌握度筛选
-        if 'mastery_level' in filters and filters['mastery_level'] is not None:
-            db_filters['mastery_level'] = filters['mastery_level']
-        
-        # 从数据库获取
-        questions = self.data_manager.search_questions(db_filters)
-        
-        # 难度筛选（内存过滤）
-        if 'difficulty' in filters and filters['difficulty'] is not None:
-            questions = [q for q in questions if q.get('difficulty') == filters['difficulty']]
-        
-        # 标签筛选（内存过滤）
-        if 'tags' in filters and filters['tags']:
-            questions = [
-                q for q in questions 
-                if any(tag in q.get('tags', []) for tag in filters['tags'])
-            ]
-        
-        return questions
+        # 所有条件都在数据库中筛选；多个标签为"任一包含"
+        difficulty = filters.get('difficulty')
+        mastery_level = filters.get('mastery_level')
+        query = QuestionQuery(
+            subject=filters.get('subject') or None,
+            difficulty_min=difficulty,
+            difficulty_max=difficulty,
+            mastery_levels=frozenset() if mastery_level is None else frozenset([mastery_level]),
+            tags_any=tuple(filters.get('tags') or ()),
+        )
+        return self._cached(
+            QueryCache.make_key("filter", query),
+            lambda: self.data_manager.list_question_summaries(query)
+        )
+    
+    def _get_statistics(self) -> Dict[str, Any]:
+        """统计数据（导航树、筛选选项和统计面板共用一次查询）"""
+        # 到期数量和今日复习数量按天计算，日期变化后重新统计
+        return self._cached(
+            QueryCache.make_key("statistics", date.today()),
+            self.data_manager.get_statistics
+        )
     
     def get_navigation_data(self) -> Dict[str, Any]:
         """
@@ -115,25 +206,20 @@ class UIService:
         Returns:
             导航树数据结构
         """
-        # 获取所有科目（从数据库中的实际数据）
-        all_questions = self.get_all_questions()
-        subjects = sorted(set(q.get('subject', '') for q in all_questions if q.get('subject')))
+        stats = self._get_statistics()
+        
+        # 所有科目（从数据库中的实际数据）
+        subjects = sorted(s for s in stats['subject_counts'] if s)
         
         # 如果没有数据，使用默认科目列表
         if not subjects:
             subjects = ["数学", "物理", "化学", "英语", "语文"]
         
-        # 获取所有标签
-        tags = set()
-        for q in all_questions:
-            tags.update(q.get('tags', []))
-        tags = sorted(tags)
+        # 所有标签
+        tags = sorted(stats['tag_counts'])
         
-        # 统计各掌握度的题目数量
-        mastery_counts = {0: 0, 1: 0, 2: 0, 3: 0}
-        for q in all_questions:
-            level = q.get('mastery_level', 0)
-            mastery_counts[level] = mastery_counts.get(level, 0) + 1
+        # 各掌握度的题目数量
+        mastery_counts = stats['mastery_counts']
         
         return {
             'subjects': subjects,
@@ -209,27 +295,13 @@ class UIService:
         Returns:
             统计数据字典
         """
-        all_questions = self.get_all_questions()
-        
-        # 按掌握度统计
-        mastery_counts = {0: 0, 1: 0, 2: 0, 3: 0}
-        for q in all_questions:
-            level = q.get('mastery_level', 0)
-            mastery_counts[level] = mastery_counts.get(level, 0) + 1
-        
-        # 待复习数量（这里简化处理，实际应该检查 next_review_date）
-        from datetime import datetime
-        due_count = 0
-        for q in all_questions:
-            next_review = q.get('next_review_date')
-            if next_review and isinstance(next_review, datetime):
-                if next_review <= datetime.now():
-                    due_count += 1
+        stats = self._get_statistics()
         
         return {
-            'total_questions': len(all_questions),
-            'mastered': mastery_counts[2] + mastery_counts[3],  # 掌握 + 熟练
-            'learning': mastery_counts[1],  # 学习中
-            'unfamiliar': mastery_counts[0],  # 生疏
-            'due_count': due_count  # 待复习
+            'total_questions': stats['total_questions'],
+            'mastered': stats['mastered'],  # 掌握 + 熟练
+            'learning': stats['learning'],  # 学习中
+            'unfamiliar': stats['unfamiliar'],  # 生疏
+            'due_count': stats['due_count'],  # 待复习
+            'today_reviewed': stats['today_reviewed']  # 今日复习
         }
@@ -6,6 +6,7 @@ from .question_form import QuestionForm
 from .filter_panel import FilterPanel
 from .statistics_panel import StatisticsPanel
 from .navigation_tree import NavigationTree
+from .thumbnail_loader import ThumbnailLoader, get_thumbnail_loader
 
 __all__ = [
     'ImageUploader',
@@ -13,5 +14,7 @@ __all__ = [
     'QuestionForm',
     'FilterPanel',
     'StatisticsPanel',
-    'NavigationTree'
+    'NavigationTree',
+    'ThumbnailLoader',
+    'get_thumbnail_loader'
 ]
@@ -4,7 +4,7 @@ from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QComboBox, QGroupBox
 )
 from PyQt6.QtCore import pyqtSignal
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 
 class FilterPanel(QWidget):
@@ -13,18 +13,20 @@ class FilterPanel(QWidget):
     # 信号
     filter_changed = pyqtSignal(dict)  # 筛选条件变化
     
-    def __init__(self, ui_service, parent=None):
+    def __init__(self, ui_service, parent=None, load_options: bool = True):
         """
         初始化筛选面板
         
         Args:
             ui_service: UI服务实例
+            load_options: 是否立即加载筛选选项；为 False 时筛选框先禁用，
+                之后由 set_filter_options 填充（数据在后台加载时）
         """
         super().__init__(parent)
         self._ui_service = ui_service
-        self._init_ui()
+        self._init_ui(load_options)
     
-    def _init_ui(self):
+    def _init_ui(self, load_options: bool = True):
         """初始化UI"""
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -33,32 +35,50 @@ class FilterPanel(QWidget):
         filter_group = QGroupBox("🔧 筛选")
         filter_layout = QVBoxLayout()
         
-        # 从服务获取筛选选项
-        filter_options = self._ui_service.get_filter_options()
-        
         # 科目筛选
         filter_layout.addWidget(QLabel("科目:"))
         self._subject_filter = QComboBox()
-        self._subject_filter.addItems(filter_options['subjects'])
         self._subject_filter.currentTextChanged.connect(self._on_filter_changed)
         filter_layout.addWidget(self._subject_filter)
         
         # 难度筛选
         filter_layout.addWidget(QLabel("难度:"))
         self._difficulty_filter = QComboBox()
-        self._difficulty_filter.addItems(filter_options['difficulties'])
         self._difficulty_filter.currentTextChanged.connect(self._on_filter_changed)
         filter_layout.addWidget(self._difficulty_filter)
         
         # 掌握度筛选
         filter_layout.addWidget(QLabel("掌握度:"))
         self._mastery_filter = QComboBox()
-        self._mastery_filter.addItems(filter_options['mastery_levels'])
         self._mastery_filter.currentTextChanged.connect(self._on_filter_changed)
         filter_layout.addWidget(self._mastery_filter)
         
         filter_group.setLayout(filter_layout)
         layout.addWidget(filter_group)
+        
+        if load_options:
+            # 从服务获取筛选选项
+            self.set_filter_options(self._ui_service.get_filter_options())
+        else:
+            self.setEnabled(False)
+    
+    def set_filter_options(self, filter_options: Dict[str, List[str]]):
+        """
+        填充筛选选项（不触发 filter_changed）
+        
+        Args:
+            filter_options: UIService.get_filter_options 的返回值
+        """
+        for combo, key in (
+            (self._subject_filter, 'subjects'),
+            (self._difficulty_filter, 'difficulties'),
+            (self._mastery_filter, 'mastery_levels'),
+        ):
+            combo.blockSignals(True)
+            combo.clear()
+            combo.addItems(filter_options[key])
+            combo.blockSignals(False)
+        self.setEnabled(True)
     
     def get_filters(self) -> Dict[str, Any]:
         """获取当前筛选条件"""
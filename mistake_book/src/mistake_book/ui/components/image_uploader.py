@@ -5,9 +5,13 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QPixmap, QDragEnterEvent, QDropEvent
+from pathlib import Path
 from typing import Optional
 import logging
 
+from mistake_book.services.thumbnail_service import read_image_size
+from mistake_book.ui.components.thumbnail_loader import get_thumbnail_loader
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,10 +22,17 @@ class ImageUploader(QWidget):
     image_selected = pyqtSignal(str)  # 图片路径
     image_cleared = pyqtSignal()      # 清空图片
     
-    def __init__(self, parent=None):
-        """初始化组件"""
+    def __init__(self, parent=None, thumbnail_loader=None):
+        """
+        初始化组件
+        
+        Args:
+            parent: 父组件
+            thumbnail_loader: 缩略图加载器（默认使用应用共用的加载器）
+        """
         super().__init__(parent)
         self._current_image_path: Optional[str] = None
+        self._thumbnails = thumbnail_loader or get_thumbnail_loader()
         self._init_ui()
     
     def _init_ui(self):
@@ -152,6 +163,8 @@ class ImageUploader(QWidget):
         """
         加载图片预览
         
+        只读取文件头检查图片是否有效，预览缩略图在后台生成，生成后显示。
+        
         Args:
             path: 图片路径
             
@@ -159,57 +172,42 @@ class ImageUploader(QWidget):
             是否加载成功
         """
         try:
-            # 使用PIL加载图片，避免QPixmap的中文路径问题
-            from PIL import Image
-            import numpy as np
-            from PyQt6.QtGui import QImage
-            
-            # 使用PIL读取图片
-            pil_image = Image.open(path)
-            
-            # 转换为RGB模式（如果是RGBA或其他模式）
-            if pil_image.mode != 'RGB':
-                pil_image = pil_image.convert('RGB')
-            
-            # 转换为numpy数组
-            img_array = np.array(pil_image)
-            
-            # 转换为QImage
-            height, width, channel = img_array.shape
-            bytes_per_line = 3 * width
-            q_image = QImage(
-                img_array.data, width, height, 
-                bytes_per_line, QImage.Format.Format_RGB888
-            )
-            
-            # 转换为QPixmap
-            pixmap = QPixmap.fromImage(q_image)
-            
-            # 缩放图片以适应预览区域
-            scaled = pixmap.scaled(
-                400, 280, 
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation
-            )
-            
-            self._image_label.setPixmap(scaled)
-            self._image_label.setVisible(True)
-            self._view_btn.setVisible(True)
-            self._hint_label.setText("✅ 图片已加载")
-            self._upload_btn.setText("📁 更换图片")
-            
-            self._current_image_path = path
-            return True
-            
+            # 使用PIL读取文件头，避免QPixmap的中文路径问题
+            read_image_size(Path(path))
         except Exception as e:
             logger.error(f"图片加载失败: {e}", exc_info=True)
             self._hint_label.setText(f"❌ 图片加载失败\n{str(e)}")
             self._current_image_path = None
             return False
+        
+        self._image_label.clear()
+        self._image_label.setText("⏳ 正在生成预览...")
+        self._image_label.setVisible(True)
+        self._view_btn.setVisible(True)
+        self._hint_label.setText("✅ 图片已加载")
+        self._upload_btn.setText("📁 更换图片")
+        
+        self._current_image_path = path
+        self._thumbnails.request(
+            path, "preview",
+            lambda pixmap, error: self._on_preview_ready(path, pixmap, error)
+        )
+        return True
+    
+    def _on_preview_ready(self, path: str, pixmap: Optional[QPixmap], error: str):
+        """预览缩略图生成完成"""
+        if path != self._current_image_path:
+            return  # 已更换或清空图片
+        
+        if pixmap is None:
+            logger.error(f"图片预览生成失败: {error}")
+            self._image_label.setText(f"❌ 无法显示预览\n{error}")
+            return
+        self._image_label.setPixmap(pixmap)
     
     def _view_full_image(self):
         """查看完整图片"""
         if self._current_image_path:
             from mistake_book.ui.dialogs.image_viewer import ImageViewerDialog
-            viewer = ImageViewerDialog(self._current_image_path, self)
+            viewer = ImageViewerDialog(self._current_image_path, self, self._thumbnails)
             viewer.exec()
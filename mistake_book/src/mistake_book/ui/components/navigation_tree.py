@@ -14,17 +14,22 @@ class NavigationTree(QWidget):
     # 信号
     item_selected = pyqtSignal(dict)  # 选中项变化 {type, value}
     
-    def __init__(self, ui_service, parent=None):
+    def __init__(self, ui_service, parent=None, load_data: bool = True):
         """
         初始化导航树
         
         Args:
             ui_service: UI服务实例
+            load_data: 是否立即加载数据；为 False 时显示加载中，
+                之后由 set_navigation_data 填充（数据在后台加载时）
         """
         super().__init__(parent)
         self._ui_service = ui_service
         self._init_ui()
-        self._load_data()
+        if load_data:
+            self._load_data()
+        else:
+            self.show_loading()
     
     def _init_ui(self):
         """初始化UI"""
@@ -45,8 +50,17 @@ class NavigationTree(QWidget):
     def _load_data(self):
         """加载导航数据"""
         # 从服务获取导航数据
-        nav_data = self._ui_service.get_navigation_data()
-        
+        self._populate(self._ui_service.get_navigation_data())
+    
+    def show_loading(self):
+        """显示加载中的占位节点"""
+        self._tree.clear()
+        item = QTreeWidgetItem(["加载中…"])
+        item.setFlags(Qt.ItemFlag.NoItemFlags)
+        self._tree.addTopLevelItem(item)
+    
+    def _populate(self, nav_data: Dict[str, Any]):
+        """根据导航数据创建节点"""
         # 添加科目节点
         for subject in nav_data['subjects']:
             item = QTreeWidgetItem([subject])
@@ -75,6 +89,15 @@ class NavigationTree(QWidget):
     
     def refresh(self):
         """刷新导航树数据"""
+        self.set_navigation_data(self._ui_service.get_navigation_data())
+    
+    def set_navigation_data(self, nav_data: Dict[str, Any]):
+        """
+        用给定的导航数据重建导航树，保持选中项
+        
+        Args:
+            nav_data: UIService.get_navigation_data 的返回值
+        """
         # 保存当前选中项的数据
         current_item = self._tree.currentItem()
         selected_data = None
@@ -84,8 +107,8 @@ class NavigationTree(QWidget):
         # 清空导航树
         self._tree.clear()
         
-        # 重新加载数据
-        self._load_data()
+        # 重新创建节点
+        self._populate(nav_data)
         
         # 恢复选中状态
         if selected_data:
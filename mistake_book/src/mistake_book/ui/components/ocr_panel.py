@@ -121,6 +121,10 @@ class OCRPanel(QWidget):
         ocr_engine = self._question_service.ocr_engine
         
         if not ocr_engine._initialized:
+            if not ocr_engine.is_initializing() and hasattr(ocr_engine, 'preload'):
+                # 还未开始加载：OCR依赖在后台导入，加载完成后自动识别
+                ocr_engine.preload()
+            
             if ocr_engine.is_initializing():
                 # 正在初始化
                 self.set_status("⏳ OCR模型正在后台加载中...")
@@ -148,11 +152,11 @@ class OCRPanel(QWidget):
                 QTimer.singleShot(1000, check_init_status)
                 return
             else:
-                # 还未开始初始化
-                self.set_status("⏳ OCR模型正在后台加载中...")
-                self._recognize_btn.setText("⏳ 加载中...")
-                self._recognize_btn.setEnabled(False)
-                self.recognition_failed.emit("OCR模型正在加载中，请稍后重试")
+                # 加载失败
+                self.set_status("❌ 模型加载失败")
+                self._recognize_btn.setText("🔄 重新识别")
+                self._recognize_btn.setEnabled(True)
+                self.recognition_failed.emit("模型加载失败")
                 return
         
         # 引擎已初始化，开始识别
@@ -2,6 +2,7 @@
 
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QGroupBox
 from PyQt6.QtCore import Qt
+from typing import Dict, Any
 
 
 class StatisticsPanel(QWidget):
@@ -31,20 +32,38 @@ class StatisticsPanel(QWidget):
         self._mastered_label = QLabel("已掌握: 0")
         self._learning_label = QLabel("学习中: 0")
         self._review_due_label = QLabel("待复习: 0")
+        self._today_reviewed_label = QLabel("今日复习: 0")
         
         stats_layout.addWidget(self._total_label)
         stats_layout.addWidget(self._mastered_label)
         stats_layout.addWidget(self._learning_label)
         stats_layout.addWidget(self._review_due_label)
+        stats_layout.addWidget(self._today_reviewed_label)
         
         stats_group.setLayout(stats_layout)
         layout.addWidget(stats_group)
     
     def update_statistics(self):
         """更新统计数据"""
-        stats = self._ui_service.get_statistics_summary()
+        self.set_statistics(self._ui_service.get_statistics_summary())
+    
+    def show_loading(self):
+        """显示加载中的占位文字（统计数据在后台加载时）"""
+        self._total_label.setText("总题数: …")
+        self._mastered_label.setText("已掌握: …")
+        self._learning_label.setText("学习中: …")
+        self._review_due_label.setText("待复习: …")
+        self._today_reviewed_label.setText("今日复习: …")
+    
+    def set_statistics(self, stats: Dict[str, Any]):
+        """
+        显示给定的统计数据
         
+        Args:
+            stats: UIService.get_statistics_summary 的返回值
+        """
         self._total_label.setText(f"总题数: {stats.get('total_questions', 0)}")
         self._mastered_label.setText(f"已掌握: {stats.get('mastered', 0)}")
         self._learning_label.setText(f"学习中: {stats.get('learning', 0)}")
         self._review_due_label.setText(f"待复习: {stats.get('due_count', 0)}")
+        self._today_reviewed_label.setText(f"今日复习: {stats.get('today_reviewed', 0)}")
@@ -0,0 +1,209 @@
+"""缩略图加载器 - 后台线程池生成缩略图，界面线程缓存 QPixmap
+
+界面需要显示图片时调用 request：
+    - 内存中已有该尺寸的 QPixmap 时立即回调
+    - 否则在线程池中读取（或生成）磁盘缩略图并转换为 QImage，
+      完成后在界面线程中转为 QPixmap、放入内存缓存并回调
+
+同一图片同一尺寸的并发请求只生成一次。内存缓存按最近最少使用（LRU）淘汰，
+限制 QPixmap 占用的总字节数。QPixmap 只在界面线程中创建和使用。
+"""
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Hashable, List, Optional
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt6.QtGui import QImage, QPixmap
+from PyQt6 import sip
+import logging
+
+from mistake_book.services.image_store import ImageStore
+from mistake_book.services.thumbnail_service import ThumbnailStore
+
+logger = logging.getLogger(__name__)
+
+# 内存中缓存的 QPixmap 总字节数上限
+THUMBNAIL_MEMORY_BYTES = 64 * 1024 * 1024
+
+# 生成缩略图的后台线程数
+THUMBNAIL_THREADS = 2
+
+# 回调参数：(QPixmap，失败时为 None；错误信息)
+ThumbnailCallback = Callable[[Optional[QPixmap], str], None]
+
+
+def _to_qimage(image) -> QImage:
+    """RGB 模式的 PIL 图片转为 QImage（复制数据，不依赖 PIL 图片的生命周期）"""
+    width, height = image.size
+    data = image.tobytes("raw", "RGB")
+    return QImage(data, width, height, 3 * width, QImage.Format.Format_RGB888).copy()
+
+
+class _ThumbnailTask(QRunnable):
+    """在线程池中读取或生成一个缩略图"""
+    
+    def __init__(self, loader: "ThumbnailLoader", memory_key: Hashable,
+                 source: Path, size_name: str, content_hash: Optional[str]):
+        super().__init__()
+        self.loader = loader
+        self.memory_key = memory_key
+        self.source = source
+        self.size_name = size_name
+        self.content_hash = content_hash
+    
+    def run(self):
+        try:
+            image = self.loader.store.load(self.source, self.size_name, self.content_hash)
+            self.loader._task_finished.emit(self.memory_key, _to_qimage(image), "")
+        except Exception as e:
+            logger.warning(f"生成缩略图失败 {self.source}: {e}")
+            self.loader._task_finished.emit(self.memory_key, QImage(), str(e))
+
+
+class ThumbnailLoader(QObject):
+    """缩略图加载器 - 磁盘缓存 + 内存 LRU + 后台生成"""
+    
+    _task_finished = pyqtSignal(object, QImage, str)  # 内存键, 缩略图, 错误信息
+    
+    def __init__(self, store: ThumbnailStore, max_bytes: int = THUMBNAIL_MEMORY_BYTES,
+                 max_threads: int = THUMBNAIL_THREADS, parent=None):
+        """
+        初始化加载器（在界面线程中创建）
+        
+        Args:
+            store: 缩略图磁盘缓存
+            max_bytes: 内存中 QPixmap 总字节数上限
+            max_threads: 生成缩略图的后台线程数
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.store = store
+        self.max_bytes = max_bytes
+        
+        self._pixmaps: "OrderedDict[Hashable, QPixmap]" = OrderedDict()
+        self._bytes = 0
+        self._waiting: Dict[Hashable, List[ThumbnailCallback]] = {}
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max_threads)
+        self._task_finished.connect(self._on_task_finished)
+        
+        # 命中统计
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def _memory_key(source: Path, size_name: str) -> Hashable:
+        """
+        内存缓存的键
+        
+        图片存储中的文件以内容哈希为键；其他文件用路径、修改时间和大小
+        （不在界面线程中读取文件内容），文件被替换后得到新的键。
+        
+        Raises:
+            OSError: 文件不存在
+        """
+        content_hash = ImageStore.hash_of_path(source)
+        if content_hash:
+            return (content_hash, size_name)
+        stat = source.stat()
+        return (str(source), stat.st_mtime_ns, stat.st_size, size_name)
+    
+    def cached(self, source, size_name: str) -> Optional[QPixmap]:
+        """内存中已有的缩略图，没有时返回 None（不生成）"""
+        try:
+            key = self._memory_key(Path(source), size_name)
+        except OSError:
+            return None
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(key)
+        return pixmap
+    
+    def request(self, source, size_name: str, callback: ThumbnailCallback):
+        """
+        请求缩略图，就绪后在界面线程中回调 callback(pixmap, error)
+        
+        内存命中时在本次调用中立即回调。回调的控件可能已经被删除
+        （例如复习时已切换到下一题），此时忽略。
+        
+        Args:
+            source: 原图完整路径
+            size_name: THUMBNAIL_SIZES 中的尺寸名
+            callback: 回调函数
+        """
+        source = Path(source)
+        try:
+            key = self._memory_key(source, size_name)
+        except OSError as e:
+            self._invoke(callback, None, str(e))
+            return
+        
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self.hits += 1
+            self._pixmaps.move_to_end(key)
+            self._invoke(callback, pixmap, "")
+            return
+        
+        self.misses += 1
+        waiting = self._waiting.setdefault(key, [])
+        waiting.append(callback)
+        if len(waiting) == 1:
+            content_hash = key[0] if len(key) == 2 else None
+            self._pool.start(_ThumbnailTask(self, key, source, size_name, content_hash))
+    
+    def wait(self, timeout_ms: int = 5000) -> bool:
+        """等待所有后台生成结束（用于关闭程序和测试；结果仍需事件循环派发）"""
+        return self._pool.waitForDone(timeout_ms)
+    
+    def clear_memory(self):
+        """清空内存缓存"""
+        self._pixmaps.clear()
+        self._bytes = 0
+    
+    def memory_usage(self) -> int:
+        """内存中 QPixmap 的估算总字节数"""
+        return self._bytes
+    
+    def _on_task_finished(self, key: Hashable, image: QImage, error: str):
+        """界面线程：缓存生成的缩略图并回调等待者"""
+        pixmap = None
+        if not image.isNull():
+            pixmap = QPixmap.fromImage(image)
+            self._remember(key, pixmap)
+        for callback in self._waiting.pop(key, []):
+            self._invoke(callback, pixmap, error)
+    
+    def _remember(self, key: Hashable, pixmap: QPixmap):
+        size = pixmap.width() * pixmap.height() * 4
+        if size > self.max_bytes:
+            return
+        old = self._pixmaps.pop(key, None)
+        if old is not None:
+            self._bytes -= old.width() * old.height() * 4
+        self._pixmaps[key] = pixmap
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, evicted = self._pixmaps.popitem(last=False)
+            self._bytes -= evicted.width() * evicted.height() * 4
+    
+    @staticmethod
+    def _invoke(callback: ThumbnailCallback, pixmap: Optional[QPixmap], error: str):
+        try:
+            callback(pixmap, error)
+        except RuntimeError as e:
+            # 控件已被删除（wrapped C/C++ object has been deleted）
+            logger.debug(f"缩略图回调的控件已删除: {e}")
+
+
+_shared_loader: Optional[ThumbnailLoader] = None
+
+
+def get_thumbnail_loader() -> ThumbnailLoader:
+    """应用共用的缩略图加载器（首次调用时在界面线程中创建）"""
+    global _shared_loader
+    # QApplication 销毁时 PyQt 会删除所有 QObject（测试中会重新创建 QApplication）
+    if _shared_loader is None or sip.isdeleted(_shared_loader):
+        from mistake_book.config.paths import get_app_paths
+        _shared_loader = ThumbnailLoader(ThumbnailStore(get_app_paths().thumbnails_dir))
+    return _shared_loader
@@ -1,5 +1,6 @@
 """添加错题对话框控制器 - 业务逻辑"""
 
+from concurrent.futures import Future
 from typing import Dict, Any, Tuple, Optional
 import logging
 
@@ -30,6 +31,30 @@ class AddQuestionController:
         """
         self._current_image_path = image_path
         logger.info(f"图片已选择: {image_path}")
+        # 在后台开始图片入库处理（解码、缩小、编码），保存时直接使用结果
+        if image_path:
+            self.question_service.prepare_image(image_path)
+    
+    def pending_image(self, data: Dict[str, Any]) -> Optional[Future]:
+        """
+        保存前需要等待的图片入库处理
+        
+        图片尚未处理时在后台开始处理。对话框等返回的 Future 完成后再调用 save_question，
+        保存时不在界面线程中解码和编码图片。
+        
+        Args:
+            data: 题目数据
+        
+        Returns:
+            尚未完成的入库处理；没有图片或已经处理完时返回 None
+        """
+        image_path = (data or {}).get('image_path')
+        if not image_path:
+            return None
+        future = self.question_service.prepare_image(image_path)
+        if isinstance(future, Future) and not future.done():
+            return future
+        return None
     
     def on_ocr_completed(self, text: str) -> str:
         """
@@ -4,13 +4,19 @@ from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QPushButton, 
     QGroupBox, QMessageBox, QScrollArea, QWidget
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, pyqtSignal
 from mistake_book.ui.components import ImageUploader, OCRPanel, QuestionForm
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class AddQuestionDialog(QDialog):
     """添加错题对话框 - 使用可复用组件"""
     
+    # 图片入库处理在后台线程完成（跨线程发出，在界面线程中继续保存）
+    _image_prepared = pyqtSignal()
+    
     def __init__(self, controller, parent=None):
         """
         初始化对话框
@@ -27,10 +33,16 @@ class AddQuestionDialog(QDialog):
         self.image_uploader = ImageUploader()
         self.ocr_panel = OCRPanel(controller.question_service)
         self.question_form = QuestionForm()
+        self._pending_save = None  # 等待图片入库处理完成后保存的题目数据
         
         self._init_ui()
         self._connect_signals()
         
+        # 首次打开时在后台加载OCR依赖，用户选好图片时模型多半已经就绪
+        ocr_engine = controller.question_service.ocr_engine
+        if ocr_engine and hasattr(ocr_engine, 'preload'):
+            ocr_engine.preload()
+        
         # 更新OCR状态提示
         self._update_ocr_hint()
     
@@ -103,6 +115,9 @@ class AddQuestionDialog(QDialog):
         self.ocr_panel.recognition_failed.connect(
             self._on_ocr_failed
         )
+        
+        # 图片入库处理完成 -> 保存
+        self._image_prepared.connect(self._on_image_prepared)
     
     def _on_image_selected(self, image_path: str):
         """图片选择事件"""
@@ -144,18 +159,43 @@ class AddQuestionDialog(QDialog):
         self.save_btn.setEnabled(False)
         self.save_btn.setText("保存中...")
         
+        # 验证表单
+        valid, error_msg = self.question_form.validate()
+        if not valid:
+            QMessageBox.warning(self, "验证失败", error_msg)
+            self._restore_save_button()
+            return
+        
+        # 获取表单数据
+        data = self.question_form.get_data()
+        data['image_path'] = self.image_uploader.get_image_path()
+        
+        # 图片还在后台处理时等处理完成再保存，不阻塞界面
+        pending = self.controller.pending_image(data)
+        if pending is not None:
+            self._pending_save = data
+            pending.add_done_callback(self._notify_image_prepared)
+            return
+        
+        self._save(data)
+    
+    def _notify_image_prepared(self, future):
+        """后台线程：图片入库处理完成"""
+        try:
+            self._image_prepared.emit()
+        except RuntimeError:
+            # 对话框已被删除
+            pass
+    
+    def _on_image_prepared(self):
+        """图片入库处理完成后保存（对话框已关闭时放弃）"""
+        data, self._pending_save = self._pending_save, None
+        if data is not None:
+            self._save(data)
+    
+    def _save(self, data):
+        """调用控制器保存，成功时关闭对话框"""
         try:
-            # 验证表单
-            valid, error_msg = self.question_form.validate()
-            if not valid:
-                QMessageBox.warning(self, "验证失败", error_msg)
-                return
-            
-            # 获取表单数据
-            data = self.question_form.get_data()
-            data['image_path'] = self.image_uploader.get_image_path()
-            
-            # 调用控制器保存
             success, message = self.controller.save_question(data)
             
             if success:
@@ -166,9 +206,17 @@ class AddQuestionDialog(QDialog):
                 QMessageBox.warning(self, "保存失败", message)
                 
         finally:
-            # 恢复按钮状态
-            self.save_btn.setEnabled(True)
-            self.save_btn.setText("💾 保存")
+            self._restore_save_button()
+    
+    def _restore_save_button(self):
+        """恢复按钮状态"""
+        self.save_btn.setEnabled(True)
+        self.save_btn.setText("💾 保存")
+    
+    def done(self, result):
+        """关闭对话框时放弃等待中的保存"""
+        self._pending_save = None
+        super().done(result)
     
     def _update_ocr_hint(self):
         """更新OCR状态提示"""
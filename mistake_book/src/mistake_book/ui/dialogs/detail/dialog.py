@@ -8,6 +8,7 @@ from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QPixmap
 from pathlib import Path
 from typing import Dict, Any, Optional
+from mistake_book.ui.components.thumbnail_loader import get_thumbnail_loader
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,16 +17,18 @@ logger = logging.getLogger(__name__)
 class DetailDialog(QDialog):
     """详情对话框 - 使用Controller模式"""
     
-    def __init__(self, controller, parent=None):
+    def __init__(self, controller, parent=None, thumbnail_loader=None):
         """
         初始化对话框
         
         Args:
             controller: DetailDialogController实例
             parent: 父窗口
+            thumbnail_loader: 缩略图加载器（默认使用应用共用的加载器）
         """
         super().__init__(parent)
         self.controller = controller
+        self._thumbnails = thumbnail_loader or get_thumbnail_loader()
         self.question_data = controller.question_data
         
         # 存储可编辑控件的引用
@@ -318,32 +321,31 @@ class DetailDialog(QDialog):
             group = QGroupBox("🖼️ 题目图片")
             group_layout = QVBoxLayout()
             
-            # 使用PIL加载图片，避免中文路径问题
-            try:
-                from PIL import Image
-                import numpy as np
-                from PyQt6.QtGui import QImage
-                
-                pil_image = Image.open(full_path)
-                if pil_image.mode != 'RGB':
-                    pil_image = pil_image.convert('RGB')
-                
-                img_array = np.array(pil_image)
-                height, width, channel = img_array.shape
-                bytes_per_line = 3 * width
-                q_image = QImage(img_array.data, width, height, bytes_per_line, QImage.Format.Format_RGB888)
-                pixmap = QPixmap.fromImage(q_image)
-                
-                image_label = QLabel()
-                scaled = pixmap.scaled(700, 400, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-                image_label.setPixmap(scaled)
-                image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                group_layout.addWidget(image_label)
-                
-                group.setLayout(group_layout)
-                layout.addWidget(group)
-            except Exception as e:
-                logger.error(f"加载图片失败: {e}")
+            # 缩略图在后台生成（PIL解码，没有中文路径问题），生成后显示
+            image_label = QLabel("⏳ 加载图片...")
+            image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            group_layout.addWidget(image_label)
+            
+            group.setLayout(group_layout)
+            layout.addWidget(group)
+            self._thumbnails.request(
+                full_path, "review",
+                lambda pixmap, error: self._on_image_ready(image_label, pixmap, error)
+            )
+    
+    def _on_image_ready(self, image_label: QLabel, pixmap: Optional[QPixmap], error: str):
+        """题目图片缩略图生成完成"""
+        if pixmap is None:
+            logger.error(f"加载图片失败: {error}")
+            image_label.setText("❌ 无法加载图片")
+            return
+        if pixmap.width() > 700:
+            pixmap = pixmap.scaled(
+                700, 400,
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation
+            )
+        image_label.setPixmap(pixmap)
     
     def _add_buttons(self, layout):
         """添加底部按钮"""
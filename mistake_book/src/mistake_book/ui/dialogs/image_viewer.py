@@ -7,14 +7,19 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QPixmap
 from pathlib import Path
+from typing import Optional
+
+from mistake_book.services.thumbnail_service import read_image_size
+from mistake_book.ui.components.thumbnail_loader import get_thumbnail_loader
 
 
 class ImageViewerDialog(QDialog):
     """图片查看器 - 显示完整图片"""
     
-    def __init__(self, image_path: str, parent=None):
+    def __init__(self, image_path: str, parent=None, thumbnail_loader=None):
         super().__init__(parent)
         self.image_path = image_path
+        self._thumbnails = thumbnail_loader or get_thumbnail_loader()
         self.setWindowTitle("查看图片")
         self.setMinimumSize(800, 600)
         
@@ -55,35 +60,29 @@ class ImageViewerDialog(QDialog):
         layout.addLayout(btn_layout)
     
     def load_image(self):
-        """加载图片"""
+        """加载图片（显示缩略图，不完整解码原图）"""
+        path = Path(self.image_path)
         try:
-            pixmap = QPixmap(self.image_path)
-            
-            if pixmap.isNull():
-                self.image_label.setText("❌ 无法加载图片")
-                return
-            
-            # 显示原始大小，但限制最大尺寸
-            max_width = 1200
-            max_height = 900
-            
-            if pixmap.width() > max_width or pixmap.height() > max_height:
-                pixmap = pixmap.scaled(
-                    max_width, max_height,
-                    Qt.AspectRatioMode.KeepAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation
-                )
-            
-            self.image_label.setPixmap(pixmap)
-            
-            # 显示文件信息
-            path = Path(self.image_path)
+            width, height = read_image_size(path)
             file_size = path.stat().st_size / 1024  # KB
-            self.info_label.setText(
-                f"📁 {path.name} | "
-                f"📏 {pixmap.width()}×{pixmap.height()} | "
-                f"💾 {file_size:.1f} KB"
-            )
-            
         except Exception as e:
             self.image_label.setText(f"❌ 加载失败: {e}")
+            return
+        
+        # 显示文件信息（原图尺寸）
+        self.info_label.setText(
+            f"📁 {path.name} | "
+            f"📏 {width}×{height} | "
+            f"💾 {file_size:.1f} KB"
+        )
+        
+        # 显示缩略图，最大 1200×900
+        self.image_label.setText("⏳ 加载中...")
+        self._thumbnails.request(path, "viewer", self._on_image_ready)
+    
+    def _on_image_ready(self, pixmap: Optional[QPixmap], error: str):
+        """缩略图生成完成"""
+        if pixmap is None:
+            self.image_label.setText(f"❌ 无法加载图片: {error}")
+            return
+        self.image_label.setPixmap(pixmap)
@@ -1,5 +1,6 @@
 """复习对话框控制器 - 业务逻辑"""
 
+from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 from mistake_book.config.constants import ReviewResult
 import logging
@@ -10,7 +11,8 @@ logger = logging.getLogger(__name__)
 class ReviewDialogController:
     """复习对话框控制器 - 处理复习业务逻辑"""
     
-    def __init__(self, review_service, questions: List[Dict[str, Any]], event_bus=None):
+    def __init__(self, review_service, questions: List[Dict[str, Any]], event_bus=None,
+                 question_service=None):
         """
         初始化控制器
         
@@ -18,12 +20,15 @@ class ReviewDialogController:
             review_service: ReviewService实例
             questions: 待复习题目列表
             event_bus: 事件总线（可选）
+            question_service: QuestionService实例（可选，用于解析题目图片路径）
         """
         self.review_service = review_service
+        self.question_service = question_service
         self.questions = questions
         self.current_index = 0
         self.reviewed_count = 0
         self.event_bus = event_bus
+        self._published_count = 0  # 已通过 ReviewCompletedEvent 通知的作答数量
         
         logger.info(f"初始化复习控制器，共 {len(questions)} 道题目")
     
@@ -68,15 +73,13 @@ class ReviewDialogController:
         
         logger.info(f"提交复习结果: question_id={question_id}, quality={quality}, result={result}")
         
-        # 调用服务层更新复习数据
-        success, message, updates = self.review_service.process_review_result(
-            question_id, result
-        )
+        # 提交到服务层（由后写队列在后台写入数据库，不阻塞下一题的显示）
+        success, message = self.review_service.submit_review_result(question_id, result)
         
         if success:
-            logger.info(f"复习数据更新成功: {message}")
+            logger.info(f"复习结果已提交: {message}")
         else:
-            logger.error(f"复习数据更新失败: {message}")
+            logger.error(f"复习结果提交失败: {message}")
         
         # 无论保存是否成功，都继续下一题
         self.reviewed_count += 1
@@ -86,16 +89,45 @@ class ReviewDialogController:
         has_next = self.current_index < len(self.questions)
         
         if not has_next:
-            # 所有题目复习完成，发布事件
+            # 所有题目复习完成，写入作答并发布事件
             logger.info(f"复习完成，共复习 {self.reviewed_count} 道题目")
-            if self.event_bus:
-                from mistake_book.ui.events.events import ReviewCompletedEvent
-                self.event_bus.publish(ReviewCompletedEvent(
-                    reviewed_count=self.reviewed_count
-                ))
+            self.finish_session()
         
         return has_next
     
+    def finish_session(self):
+        """
+        结束复习会话：等待已提交的复习结果全部写入数据库
+        
+        有新的作答时发布 ReviewCompletedEvent（包括中途结束的会话），
+        确保之后刷新的统计数据和缓存的查询结果是最新的。
+        """
+        self.review_service.flush_reviews()
+        if self.event_bus and self.reviewed_count > self._published_count:
+            from mistake_book.ui.events.events import ReviewCompletedEvent
+            self._published_count = self.reviewed_count
+            self.event_bus.publish(ReviewCompletedEvent(
+                reviewed_count=self.reviewed_count
+            ))
+    
+    def get_image_full_path(self, question: Dict[str, Any]) -> Optional[Path]:
+        """
+        获取题目图片的完整路径
+        
+        数据库中保存的是相对于图片目录的路径，需要由QuestionService解析。
+        
+        Returns:
+            图片文件路径，没有图片或文件不存在时返回None
+        """
+        image_path = question.get('image_path')
+        if not image_path:
+            return None
+        if self.question_service:
+            return self.question_service.get_image_full_path(image_path)
+        # 兼容旧代码，直接使用路径
+        path = Path(image_path)
+        return path if path.exists() else None
+    
     def get_progress(self) -> Tuple[int, int]:
         """
         获取复习进度
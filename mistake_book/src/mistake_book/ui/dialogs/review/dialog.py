@@ -6,8 +6,9 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QPixmap
-from pathlib import Path
+from typing import Optional
 from mistake_book.config.constants import ReviewResult
+from mistake_book.ui.components.thumbnail_loader import get_thumbnail_loader
 import logging
 
 logger = logging.getLogger(__name__)
@@ -19,16 +20,18 @@ class ReviewDialog(QDialog):
     # 信号：复习完成，请求返回模块选择器
     review_completed = pyqtSignal()
     
-    def __init__(self, controller, parent=None):
+    def __init__(self, controller, parent=None, thumbnail_loader=None):
         """
         初始化对话框
         
         Args:
             controller: ReviewDialogController实例
             parent: 父窗口
+            thumbnail_loader: 缩略图加载器（默认使用应用共用的加载器）
         """
         super().__init__(parent)
         self.controller = controller
+        self._thumbnails = thumbnail_loader or get_thumbnail_loader()
         
         self.setWindowTitle("📚 复习模式")
         self.setMinimumSize(900, 700)
@@ -253,9 +256,9 @@ class ReviewDialog(QDialog):
         self.content_layout.addWidget(info_card)
     
     def _display_question_image(self, question):
-        """显示题目图片"""
-        image_path = question.get('image_path')
-        if not image_path or not Path(image_path).exists():
+        """显示题目图片（缩略图在后台生成，生成后显示）"""
+        image_path = self.controller.get_image_full_path(question)
+        if not image_path:
             return
         
         image_frame = QFrame()
@@ -269,18 +272,22 @@ class ReviewDialog(QDialog):
         """)
         image_layout = QVBoxLayout(image_frame)
         
-        image_label = QLabel()
-        pixmap = QPixmap(image_path)
-        scaled = pixmap.scaled(
-            800, 400,
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
-        )
-        image_label.setPixmap(scaled)
+        image_label = QLabel("⏳ 加载图片...")
         image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         image_layout.addWidget(image_label)
         
         self.content_layout.addWidget(image_frame)
+        self._thumbnails.request(
+            image_path, "review",
+            lambda pixmap, error: self._on_question_image_ready(image_label, pixmap, error)
+        )
+    
+    def _on_question_image_ready(self, image_label: QLabel, pixmap: Optional[QPixmap], error: str):
+        """题目图片缩略图生成完成（切换题目后标签已删除时由加载器忽略）"""
+        if pixmap is None:
+            image_label.setText(f"❌ 无法加载图片: {error}")
+            return
+        image_label.setPixmap(pixmap)
     
     def _display_question_content(self, question):
         """显示题目内容"""
@@ -549,6 +556,11 @@ class ReviewDialog(QDialog):
         
         parent_layout.addLayout(button_layout)
     
+    def done(self, result: int):
+        """关闭对话框前确保复习结果全部写入（包括中途结束和直接关闭）"""
+        self.controller.finish_session()
+        super().done(result)
+    
     def _on_continue_review(self):
         """继续复习 - 返回模块选择器"""
         # 发出信号通知主窗口
@@ -38,28 +38,20 @@ class ReviewModuleSelectorDialog(QDialog):
     
     def load_modules(self):
         """加载所有可用的模块（科目和题型）"""
-        # 获取所有题目
-        all_questions = self.data_manager.search_questions({})
+        # 各科目、题型的题目数量（数据库聚合）
+        type_counts = self.data_manager.get_statistics()['type_counts']
         
-        # 统计科目和题型
         subject_types: Dict[str, set] = {}
         counts: Dict[str, Dict[str, int]] = {}
         
-        for q in all_questions:
-            subject = q.get('subject', '未分类')
-            q_type = q.get('question_type', '其他')
-            
-            # 收集科目和题型
-            if subject not in subject_types:
-                subject_types[subject] = set()
-                counts[subject] = {}
-            
-            subject_types[subject].add(q_type)
-            
-            # 统计数量
-            if q_type not in counts[subject]:
-                counts[subject][q_type] = 0
-            counts[subject][q_type] += 1
+        for subject, types in type_counts.items():
+            subject = subject or '未分类'
+            subject_types.setdefault(subject, set())
+            counts.setdefault(subject, {})
+            for q_type, count in types.items():
+                q_type = q_type or '其他'
+                subject_types[subject].add(q_type)
+                counts[subject][q_type] = counts[subject].get(q_type, 0) + count
         
         # 转换为列表
         self.subjects = sorted(subject_types.keys())
@@ -68,7 +68,8 @@ class DialogFactory:
         controller = ReviewDialogController(
             self.review_service,
             questions,
-            self.event_bus
+            self.event_bus,
+            self.question_service
         )
         return ReviewDialog(controller, parent)
     
@@ -117,12 +118,12 @@ class DialogFactory:
                 review_dialog.exec()
                 return
             else:
-                # 正常复习模式
-                questions = data_manager.search_questions(filters)
+                # 正常复习模式 - 只加载该模块中到期的题目
+                questions = self.review_service.get_due_questions(filters)
             
             if not questions:
                 from PyQt6.QtWidgets import QMessageBox
-                QMessageBox.information(parent, "提示", "没有符合条件的题目")
+                QMessageBox.information(parent, "提示", "该模块暂时没有需要复习的题目")
                 return
             
             # 创建并显示复习对话框
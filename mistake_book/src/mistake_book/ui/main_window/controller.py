@@ -1,16 +1,36 @@
 """主窗口控制器 - 业务逻辑"""
 
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Callable, Dict, Any, List, NamedTuple, Tuple, Optional
 import logging
 
 from mistake_book.ui.events.events import (
     QuestionAddedEvent,
     QuestionUpdatedEvent,
-    QuestionDeletedEvent
+    QuestionDeletedEvent,
+    ReviewCompletedEvent
 )
 
 logger = logging.getLogger(__name__)
 
+# 主列表每页加载的题目数量
+PAGE_SIZE = 50
+
+# 排序选项：(显示名称, 排序字段, 是否降序)
+SORT_OPTIONS = [
+    ("最新添加", "created_at", True),
+    ("最早添加", "created_at", False),
+    ("复习日期", "next_review_date", False),
+    ("难度从高到低", "difficulty", True),
+    ("掌握度从低到高", "mastery_level", False),
+]
+
+
+class ViewDelta(NamedTuple):
+    """当前题目列表的一次变化，视图据此只更新受影响的卡片"""
+    action: str  # insert、update、remove，或 reset（列表整体重新加载）
+    index: int = -1  # 受影响的位置（insert 为插入后的位置）
+    question: Optional[Dict[str, Any]] = None  # insert/update 后的题目摘要
+
 
 class MainWindowController:
     """主窗口控制器 - 处理主窗口的业务逻辑"""
@@ -35,6 +55,15 @@ class MainWindowController:
         self.current_filters: Dict[str, Any] = {}
         self.current_questions: List[Dict[str, Any]] = []
         
+        # 分页状态
+        self.sort_by = "created_at"
+        self.sort_descending = True
+        self.has_more = False
+        self._next_cursor: Optional[Any] = None  # 列表视图为排序游标，搜索视图为偏移量
+        
+        # 列表变化的监听者（视图），参数为 ViewDelta
+        self._view_listeners: List[Callable[[ViewDelta], None]] = []
+        
         # 订阅事件
         self._subscribe_events()
         
@@ -46,11 +75,58 @@ class MainWindowController:
             self.event_bus.subscribe(QuestionAddedEvent, self._on_question_added)
             self.event_bus.subscribe(QuestionUpdatedEvent, self._on_question_updated)
             self.event_bus.subscribe(QuestionDeletedEvent, self._on_question_deleted)
+            self.event_bus.subscribe(ReviewCompletedEvent, self._on_review_completed)
             logger.debug("已订阅题目相关事件")
     
+    def add_view_listener(self, listener: Callable[[ViewDelta], None]):
+        """
+        注册列表变化的监听者
+        
+        题目增删改事件只修改 current_questions 中受影响的一项，
+        然后以 ViewDelta 通知监听者。
+        
+        Args:
+            listener: 回调函数，参数为 ViewDelta
+        """
+        self._view_listeners.append(listener)
+    
+    def _notify(self, delta: ViewDelta):
+        """通知所有监听者"""
+        for listener in self._view_listeners:
+            listener(delta)
+    
+    def fetch_first_page(self, filters: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        按当前排序查询第一页（不修改视图状态，可以在后台线程中调用）
+        
+        Args:
+            filters: 筛选条件
+        
+        Returns:
+            get_questions_page 的返回值 {items, next_cursor, has_more}
+        """
+        return self.ui_service.get_questions_page(
+            filters,
+            sort_by=self.sort_by,
+            descending=self.sort_descending,
+            cursor=None,
+            page_size=PAGE_SIZE
+        )
+    
+    def _load_first_page(self, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """按当前排序加载第一页"""
+        return self._apply_page(self.fetch_first_page(filters))
+    
+    def _apply_page(self, page: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """使用查询到的第一页作为当前列表"""
+        self.current_questions = list(page['items'])
+        self._next_cursor = page['next_cursor']
+        self.has_more = page['has_more']
+        return self.current_questions
+    
     def load_questions(self) -> List[Dict[str, Any]]:
         """
-        加载所有题目
+        加载所有题目（第一页）
         
         Returns:
             题目列表
@@ -58,10 +134,80 @@ class MainWindowController:
         logger.info("加载所有题目")
         self.current_view_type = "all"
         self.current_filters = {}
-        self.current_questions = self.ui_service.get_all_questions()
+        self._load_first_page({})
         logger.debug(f"加载了 {len(self.current_questions)} 个题目")
         return self.current_questions
     
+    def apply_initial_page(self, page: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        切换到全部题目视图并使用后台查询到的第一页（启动时）
+        
+        Args:
+            page: fetch_first_page({}) 的返回值
+        
+        Returns:
+            题目列表
+        """
+        self.current_view_type = "all"
+        self.current_filters = {}
+        self._apply_page(page)
+        logger.debug(f"启动加载了 {len(self.current_questions)} 个题目")
+        return self.current_questions
+    
+    def load_more_questions(self) -> List[Dict[str, Any]]:
+        """
+        加载下一页（滚动到底部时调用）
+        
+        Returns:
+            新加载的题目列表，没有更多时返回空列表
+        """
+        if not self.has_more:
+            return []
+        
+        if self.current_view_type == "search":
+            page = self._search_page(
+                self.ui_service.search_questions(
+                    self.current_filters.get('keyword', ''),
+                    limit=PAGE_SIZE + 1,
+                    offset=self._next_cursor
+                ),
+                self._next_cursor
+            )
+            # 新增的题目追加在列表末尾，其排名可能在偏移量之后，翻页时会再次查到
+            loaded = {q.get('id') for q in self.current_questions}
+            page['items'] = [q for q in page['items'] if q.get('id') not in loaded]
+        else:
+            filters = self.current_filters if self.current_view_type != "all" else {}
+            page = self.ui_service.get_questions_page(
+                filters,
+                sort_by=self.sort_by,
+                descending=self.sort_descending,
+                cursor=self._next_cursor,
+                page_size=PAGE_SIZE
+            )
+        new_items = list(page['items'])
+        self.current_questions.extend(new_items)
+        self._next_cursor = page['next_cursor']
+        self.has_more = page['has_more']
+        logger.debug(f"加载下一页: {len(new_items)} 个题目，共 {len(self.current_questions)} 个")
+        return new_items
+    
+    def set_sort(self, sort_by: str, descending: bool) -> List[Dict[str, Any]]:
+        """
+        修改排序方式并重新加载当前视图
+        
+        Args:
+            sort_by: 排序字段
+            descending: 是否降序
+        
+        Returns:
+            重新加载后的题目列表
+        """
+        logger.info(f"修改排序: {sort_by}, 降序={descending}")
+        self.sort_by = sort_by
+        self.sort_descending = descending
+        return self.refresh_current_view()
+    
     def on_search(self, keyword: str) -> List[Dict[str, Any]]:
         """
         搜索事件处理
@@ -78,12 +224,51 @@ class MainWindowController:
             # 空搜索，返回所有题目
             return self.load_questions()
         
+        return self.apply_search_results(keyword, self.search_questions(keyword))
+    
+    def search_questions(self, keyword: str) -> List[Dict[str, Any]]:
+        """
+        查询搜索结果的第一页（不修改视图状态，可以在后台线程中调用）
+        
+        多取一个题目，用于判断是否还有下一页。
+        
+        Args:
+            keyword: 搜索关键词
+        
+        Returns:
+            搜索结果列表（最多 PAGE_SIZE + 1 个）
+        """
+        return self.ui_service.search_questions(keyword, limit=PAGE_SIZE + 1)
+    
+    def apply_search_results(
+        self, keyword: str, questions: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        切换到搜索视图并使用给定的搜索结果（第一页，滚动到底部时继续加载）
+        
+        Args:
+            keyword: 搜索关键词
+            questions: search_questions 返回的搜索结果
+        
+        Returns:
+            当前显示的搜索结果列表
+        """
         self.current_view_type = "search"
         self.current_filters = {'keyword': keyword}
-        self.current_questions = self.ui_service.search_questions(keyword)
+        self._apply_page(self._search_page(questions, 0))
         logger.debug(f"搜索到 {len(self.current_questions)} 个题目")
         return self.current_questions
     
+    @staticmethod
+    def _search_page(questions: List[Dict[str, Any]], offset: int) -> Dict[str, Any]:
+        """把多取一个的搜索结果转换为 {items, next_cursor, has_more}（游标为下一页的偏移量）"""
+        items = list(questions[:PAGE_SIZE])
+        return {
+            'items': items,
+            'next_cursor': offset + len(items),
+            'has_more': len(questions) > PAGE_SIZE,
+        }
+    
     def on_nav_filter_changed(self, filter_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         导航筛选变化事件处理
@@ -110,7 +295,7 @@ class MainWindowController:
             filters['tags'] = [filter_value]
         
         self.current_filters = filters
-        self.current_questions = self.ui_service.filter_questions(filters)
+        self._load_first_page(filters)
         logger.debug(f"筛选到 {len(self.current_questions)} 个题目")
         return self.current_questions
     
@@ -127,7 +312,7 @@ class MainWindowController:
         logger.info(f"筛选条件变化: {filters}")
         self.current_view_type = "filter"
         self.current_filters = filters
-        self.current_questions = self.ui_service.filter_questions(filters)
+        self._load_first_page(filters)
         logger.debug(f"筛选到 {len(self.current_questions)} 个题目")
         return self.current_questions
     
@@ -146,12 +331,24 @@ class MainWindowController:
             keyword = self.current_filters.get('keyword', '')
             return self.on_search(keyword)
         elif self.current_view_type in ("nav_filter", "filter"):
-            self.current_questions = self.ui_service.filter_questions(self.current_filters)
+            self._load_first_page(self.current_filters)
             logger.debug(f"刷新后有 {len(self.current_questions)} 个题目")
             return self.current_questions
         
         return self.current_questions
     
+    def get_question_detail(self, question_id: int) -> Optional[Dict[str, Any]]:
+        """
+        获取题目完整信息（列表中只有摘要，打开详情时再读取）
+        
+        Args:
+            question_id: 题目ID
+        
+        Returns:
+            题目完整数据，不存在时返回None
+        """
+        return self.ui_service.get_question_detail(question_id)
+    
     def show_add_dialog(self, parent=None):
         """
         显示添加错题对话框
@@ -193,32 +390,124 @@ class MainWindowController:
         
         return success, message
     
+    def _index_of(self, question_id: int) -> int:
+        """题目在当前列表中的位置，不在列表中时返回-1"""
+        for index, question in enumerate(self.current_questions):
+            if question.get('id') == question_id:
+                return index
+        return -1
+    
+    def _sort_key(self, question: Dict[str, Any]) -> Tuple:
+        """与数据库排序一致的排序键：空值在升序时最前、降序时最后，相同时按id"""
+        value = question.get(self.sort_by)
+        return (value is not None, value if value is not None else 0, question.get('id', 0))
+    
+    def _insert_position(self, question: Dict[str, Any]) -> int:
+        """
+        新题目在当前列表中应插入的位置
+        
+        Returns:
+            插入位置；排在已加载的最后一项之后、且还有下一页时返回-1（翻页时会加载到）
+        """
+        if self.current_view_type == "search":
+            # 搜索结果按相关度排序，新题目放在最后
+            return len(self.current_questions)
+        
+        key = self._sort_key(question)
+        for index, existing in enumerate(self.current_questions):
+            existing_key = self._sort_key(existing)
+            if (key > existing_key) if self.sort_descending else (key < existing_key):
+                return index
+        return -1 if self.has_more else len(self.current_questions)
+    
+    def _match_current_view(self, question_id: int) -> Optional[Dict[str, Any]]:
+        """重新读取题目摘要，不符合当前视图的筛选条件时返回None"""
+        filters = self.current_filters if self.current_view_type != "all" else {}
+        return self.ui_service.get_question_summary(question_id, filters)
+    
+    def _insert_question(self, question: Dict[str, Any]):
+        """按排序位置插入题目（位置在未加载的页中时忽略）"""
+        index = self._insert_position(question)
+        if index < 0:
+            return
+        self.current_questions.insert(index, question)
+        self._notify(ViewDelta("insert", index, question))
+    
+    def _remove_at(self, index: int):
+        """移除指定位置的题目"""
+        del self.current_questions[index]
+        if self.current_view_type == "search":
+            # 移除的题目在已加载的范围内，下一页的偏移量随之前移
+            self._next_cursor -= 1
+        self._notify(ViewDelta("remove", index))
+    
     def _on_question_added(self, event: QuestionAddedEvent):
         """
-        题目添加事件处理
+        题目添加事件处理：符合当前视图时插入到排序位置
         
         Args:
             event: 题目添加事件
         """
         logger.info(f"处理题目添加事件: {event.question_id}")
-        self.refresh_current_view()
+        if self._index_of(event.question_id) >= 0:
+            return
+        question = self._match_current_view(event.question_id)
+        if question is not None:
+            self._insert_question(question)
     
     def _on_question_updated(self, event: QuestionUpdatedEvent):
         """
-        题目更新事件处理
+        题目更新事件处理：原地更新、移动到新的排序位置，或不再符合筛选时移除
         
         Args:
             event: 题目更新事件
         """
         logger.info(f"处理题目更新事件: {event.question_id}")
-        self.refresh_current_view()
+        index = self._index_of(event.question_id)
+        question = self._match_current_view(event.question_id)
+        
+        if question is None:
+            if index >= 0:
+                self._remove_at(index)
+            return
+        
+        if index < 0:
+            self._insert_question(question)
+            return
+        
+        if self.current_view_type != "search":
+            # 排序字段可能变化：不在原位置时移除后重新插入
+            del self.current_questions[index]
+            new_index = self._insert_position(question)
+            self.current_questions.insert(index, question)
+            if new_index != index:
+                self._remove_at(index)
+                self._insert_question(question)
+                return
+        else:
+            self.current_questions[index] = question
+        
+        self._notify(ViewDelta("update", index, question))
     
     def _on_question_deleted(self, event: QuestionDeletedEvent):
         """
-        题目删除事件处理
+        题目删除事件处理：从当前列表中移除
         
         Args:
             event: 题目删除事件
         """
         logger.info(f"处理题目删除事件: {event.question_id}")
+        index = self._index_of(event.question_id)
+        if index >= 0:
+            self._remove_at(index)
+    
+    def _on_review_completed(self, event: ReviewCompletedEvent):
+        """
+        复习完成事件处理：复习会改变多道题目的掌握度和复习日期，重新加载当前视图
+        
+        Args:
+            event: 复习完成事件
+        """
+        logger.info(f"处理复习完成事件: 复习了 {event.reviewed_count} 道题目")
         self.refresh_current_view()
+        self._notify(ViewDelta("reset"))
@@ -1,13 +1,16 @@
 """面板工厂 - 创建主窗口的各个面板"""
 
 from typing import TYPE_CHECKING
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLineEdit, QScrollArea
-from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QComboBox
+)
 import logging
 
 from mistake_book.ui.components.navigation_tree import NavigationTree
 from mistake_book.ui.components.filter_panel import FilterPanel
 from mistake_book.ui.components.statistics_panel import StatisticsPanel
+from mistake_book.ui.main_window.controller import SORT_OPTIONS
+from mistake_book.ui.widgets.question_list import QuestionListModel, QuestionListView
 
 if TYPE_CHECKING:
     from mistake_book.ui.main_window.controller import MainWindowController
@@ -28,15 +31,18 @@ class PanelFactory:
         self.controller = controller
         logger.debug("PanelFactory 初始化完成")
     
-    def create_navigation_panel(self) -> NavigationTree:
+    def create_navigation_panel(self, load_data: bool = True) -> NavigationTree:
         """
         创建导航面板
         
+        Args:
+            load_data: 是否立即加载数据（为 False 时先显示加载中）
+        
         Returns:
             NavigationTree组件实例
         """
         logger.debug("创建导航面板")
-        nav_tree = NavigationTree(self.controller.ui_service)
+        nav_tree = NavigationTree(self.controller.ui_service, load_data=load_data)
         return nav_tree
     
     def create_card_panel(self) -> QWidget:
@@ -44,7 +50,7 @@ class PanelFactory:
         创建卡片流面板
         
         Returns:
-            包含搜索框和卡片容器的面板
+            包含搜索框和卡片列表的面板
         """
         logger.debug("创建卡片流面板")
         
@@ -53,40 +59,45 @@ class PanelFactory:
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(10)
         
-        # 搜索框
+        # 搜索框和排序方式
+        top_layout = QHBoxLayout()
         search_input = QLineEdit()
         search_input.setPlaceholderText("🔍 搜索错题...")
         search_input.setMinimumHeight(35)
-        layout.addWidget(search_input)
-        
-        # 滚动区域
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        
-        # 卡片容器
-        cards_container = QWidget()
-        cards_layout = QVBoxLayout(cards_container)
-        cards_layout.setContentsMargins(5, 5, 5, 5)
-        cards_layout.setSpacing(10)
-        cards_layout.addStretch()
-        
-        scroll.setWidget(cards_container)
-        layout.addWidget(scroll)
+        top_layout.addWidget(search_input, 1)
+        
+        sort_combo = QComboBox()
+        sort_combo.setMinimumHeight(35)
+        for label, sort_by, descending in SORT_OPTIONS:
+            sort_combo.addItem(label, (sort_by, descending))
+        top_layout.addWidget(sort_combo)
+        layout.addLayout(top_layout)
+        
+        # 卡片列表：只绘制可见的卡片，滚动到底部时加载下一页
+        question_model = QuestionListModel(
+            fetch_more=self.controller.load_more_questions,
+            can_fetch_more=lambda: self.controller.has_more,
+            parent=panel
+        )
+        question_list = QuestionListView(question_model)
+        layout.addWidget(question_list)
         
         # 保存引用，方便外部访问
         panel.search_input = search_input
-        panel.cards_container = cards_container
-        panel.cards_layout = cards_layout
-        panel.scroll_area = scroll
+        panel.sort_combo = sort_combo
+        panel.question_model = question_model
+        panel.question_list = question_list
         
         logger.debug("卡片流面板创建完成")
         return panel
     
-    def create_right_panel(self) -> QWidget:
+    def create_right_panel(self, load_data: bool = True) -> QWidget:
         """
         创建右侧面板（筛选+统计）
         
+        Args:
+            load_data: 是否立即加载筛选选项（为 False 时先禁用筛选、统计显示加载中）
+        
         Returns:
             包含筛选面板和统计面板的组合面板
         """
@@ -98,11 +109,13 @@ class PanelFactory:
         layout.setSpacing(10)
         
         # 筛选面板
-        filter_panel = FilterPanel(self.controller.ui_service)
+        filter_panel = FilterPanel(self.controller.ui_service, load_options=load_data)
         layout.addWidget(filter_panel)
         
         # 统计面板
         stats_panel = StatisticsPanel(self.controller.ui_service)
+        if not load_data:
+            stats_panel.show_loading()
         layout.addWidget(stats_panel)
         
         # 添加弹性空间
@@ -0,0 +1,141 @@
+"""搜索管道 - 防抖 + 后台线程查询
+
+搜索框每次输入只重新计时，停止输入 delay_ms 毫秒后才发起一次查询；
+查询在后台线程中执行，不阻塞界面。
+
+每次输入都会使之前的请求过期：
+    - 尚未开始的查询不再执行（计时器重新计时）
+    - 正在执行的查询完成后结果被丢弃；同一时间最多只有一个查询在执行，
+      它完成后再执行最新的关键词
+    - 只有仍是最新请求的结果才通过 results_ready 发出
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+from PyQt6.QtCore import QObject, QThread, QTimer, pyqtSignal
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 停止输入后发起查询的延迟（毫秒）
+SEARCH_DELAY_MS = 300
+
+
+class SearchWorker(QThread):
+    """搜索工作线程"""
+    results_ready = pyqtSignal(int, str, list)  # generation, keyword, results
+    search_failed = pyqtSignal(int, str)  # generation, message
+    
+    def __init__(self, search_fn: Callable[[str], List[Dict[str, Any]]],
+                 generation: int, keyword: str):
+        super().__init__()
+        self.search_fn = search_fn
+        self.generation = generation
+        self.keyword = keyword
+    
+    def run(self):
+        """在后台线程中执行查询"""
+        try:
+            results = self.search_fn(self.keyword)
+            self.results_ready.emit(self.generation, self.keyword, list(results))
+        except Exception as e:
+            logger.error(f"搜索失败: {e}", exc_info=True)
+            self.search_failed.emit(self.generation, str(e))
+
+
+class SearchPipeline(QObject):
+    """搜索管道 - 防抖、后台查询、丢弃过期结果"""
+    
+    results_ready = pyqtSignal(str, list)  # 最新关键词的搜索结果
+    search_failed = pyqtSignal(str)  # 最新关键词的查询失败信息
+    
+    def __init__(self, search_fn: Callable[[str], List[Dict[str, Any]]],
+                 delay_ms: int = SEARCH_DELAY_MS, parent=None):
+        """
+        初始化搜索管道
+        
+        Args:
+            search_fn: 查询函数，参数为关键词，返回结果列表（在后台线程中调用）
+            delay_ms: 停止输入后发起查询的延迟（毫秒）
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self._search_fn = search_fn
+        self._generation = 0  # 每次请求加一，结果的代数不同时即为过期
+        self._keyword = ""
+        self._worker: Optional[SearchWorker] = None
+        self._pending = False  # 有查询在执行时，是否还有更新的请求等待执行
+        
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self._start)
+    
+    def request(self, keyword: str):
+        """
+        请求搜索（使之前的请求过期，停止输入 delay_ms 后才查询）
+        
+        Args:
+            keyword: 搜索关键词
+        """
+        self._generation += 1
+        self._keyword = keyword
+        self._timer.start()
+    
+    def cancel(self):
+        """取消尚未返回的请求（切换到其他视图时调用）"""
+        self._generation += 1
+        self._timer.stop()
+        self._pending = False
+    
+    def is_busy(self) -> bool:
+        """是否有请求尚未返回结果"""
+        return self._timer.isActive() or self._worker is not None
+    
+    def wait(self, timeout_ms: Optional[int] = None) -> bool:
+        """
+        等待正在执行的查询结束（用于关闭窗口和测试）
+        
+        Args:
+            timeout_ms: 最长等待时间（毫秒），None 表示一直等到查询结束
+        
+        Returns:
+            查询是否已结束
+        """
+        if self._worker is None:
+            return True
+        if timeout_ms is None:
+            return self._worker.wait()
+        return self._worker.wait(timeout_ms)
+    
+    def _start(self):
+        """计时结束：发起最新关键词的查询"""
+        if self._worker is not None:
+            # 同一时间只执行一个查询，当前查询完成后再执行最新的关键词
+            self._pending = True
+            return
+        
+        worker = SearchWorker(self._search_fn, self._generation, self._keyword)
+        worker.results_ready.connect(self._on_results)
+        worker.search_failed.connect(self._on_failed)
+        worker.finished.connect(self._on_worker_finished)
+        self._worker = worker
+        logger.debug(f"开始搜索: {self._keyword}")
+        worker.start()
+    
+    def _on_results(self, generation: int, keyword: str, results: list):
+        if generation != self._generation:
+            logger.debug(f"丢弃过期的搜索结果: {keyword}")
+            return
+        self.results_ready.emit(keyword, results)
+    
+    def _on_failed(self, generation: int, message: str):
+        if generation == self._generation:
+            self.search_failed.emit(message)
+    
+    def _on_worker_finished(self):
+        worker, self._worker = self._worker, None
+        if worker is not None:
+            worker.deleteLater()
+        if self._pending:
+            self._pending = False
+            self._start()
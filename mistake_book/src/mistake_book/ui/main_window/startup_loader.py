@@ -0,0 +1,63 @@
+"""启动加载器 - 在后台线程中加载主窗口的首屏数据
+
+主窗口创建后立即显示骨架占位，首屏数据按以下顺序分块查询，
+每查到一块就通过信号交给界面线程填充：
+    1. 题目列表第一页（键集分页，只与页大小有关）
+    2. 导航树数据
+    3. 筛选选项（与导航树共用统计查询，命中缓存）
+    4. 统计面板数据
+
+每次查询都在本线程中通过 session_scope 创建独立的数据库会话，
+连接来自连接池，不与界面线程共享会话。
+
+关闭窗口时调用 requestInterruption()，当前这块查询完成后不再查询后面的块。
+"""
+
+from typing import TYPE_CHECKING
+from PyQt6.QtCore import QThread, pyqtSignal
+import logging
+
+if TYPE_CHECKING:
+    from mistake_book.ui.main_window.controller import MainWindowController
+
+logger = logging.getLogger(__name__)
+
+
+class StartupLoader(QThread):
+    """启动加载工作线程"""
+    
+    first_page_ready = pyqtSignal(dict)  # 第一页 {items, next_cursor, has_more}
+    navigation_ready = pyqtSignal(dict)  # 导航树数据
+    filter_options_ready = pyqtSignal(dict)  # 筛选选项
+    statistics_ready = pyqtSignal(dict)  # 统计数据
+    load_failed = pyqtSignal(str)  # 错误信息
+    
+    def __init__(self, controller: 'MainWindowController', parent=None):
+        """
+        初始化启动加载器
+        
+        Args:
+            controller: MainWindowController实例
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.controller = controller
+    
+    def run(self):
+        """在后台线程中依次查询首屏数据"""
+        ui_service = self.controller.ui_service
+        steps = [
+            (self.first_page_ready, lambda: self.controller.fetch_first_page({})),
+            (self.navigation_ready, ui_service.get_navigation_data),
+            (self.filter_options_ready, ui_service.get_filter_options),
+            (self.statistics_ready, ui_service.get_statistics_summary),
+        ]
+        try:
+            for signal, load in steps:
+                if self.isInterruptionRequested():
+                    logger.debug("启动加载已取消")
+                    return
+                signal.emit(dict(load()))
+        except Exception as e:
+            logger.error(f"启动加载失败: {e}", exc_info=True)
+            self.load_failed.emit(str(e))
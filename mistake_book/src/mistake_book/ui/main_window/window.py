@@ -9,13 +9,17 @@ from PyQt6.QtGui import QAction, QKeySequence
 import logging
 
 from mistake_book.ui.main_window.panels import PanelFactory
-from mistake_book.ui.widgets.question_card import QuestionCard
+from mistake_book.ui.main_window.search_pipeline import SearchPipeline
+from mistake_book.ui.main_window.startup_loader import StartupLoader
 
 if TYPE_CHECKING:
     from mistake_book.ui.main_window.controller import MainWindowController
 
 logger = logging.getLogger(__name__)
 
+# 首屏数据加载前显示的骨架卡片数量
+SKELETON_CARDS = 4
+
 
 class MainWindow(QMainWindow):
     """主窗口 - UI组装器"""
@@ -35,14 +39,16 @@ class MainWindow(QMainWindow):
         # 创建面板工厂
         self.panel_factory = PanelFactory(controller)
         
-        # 当前显示的卡片列表
-        self.current_cards = []
+        # 搜索管道：防抖后在后台线程查询
+        self.search_pipeline = SearchPipeline(controller.search_questions, parent=self)
         
         # 初始化UI
         self._init_ui()
         self._connect_signals()
         
-        # 初始加载
+        # 初始加载（后台线程，窗口先显示骨架占位）
+        self._startup_loader = None
+        self._startup_page_pending = False
         self._load_initial_data()
         
         logger.info("MainWindow 初始化完成")
@@ -61,7 +67,7 @@ class MainWindow(QMainWindow):
         splitter = QSplitter(Qt.Orientation.Horizontal)
         
         # 左栏：导航树
-        self.nav_tree = self.panel_factory.create_navigation_panel()
+        self.nav_tree = self.panel_factory.create_navigation_panel(load_data=False)
         splitter.addWidget(self.nav_tree)
         
         # 中栏：卡片流
@@ -69,7 +75,7 @@ class MainWindow(QMainWindow):
         splitter.addWidget(self.card_panel)
         
         # 右栏：筛选和统计
-        self.right_panel = self.panel_factory.create_right_panel()
+        self.right_panel = self.panel_factory.create_right_panel(load_data=False)
         splitter.addWidget(self.right_panel)
         
         # 设置分割比例 (1:3:1)
@@ -79,7 +85,7 @@ class MainWindow(QMainWindow):
         self.setCentralWidget(central_widget)
         
         # 状态栏
-        self.statusBar().showMessage("就绪")
+        self.statusBar().showMessage("正在加载...")
         
         logger.debug("UI初始化完成")
     
@@ -124,20 +130,78 @@ class MainWindow(QMainWindow):
         
         # 搜索
         self.card_panel.search_input.textChanged.connect(self._on_search_changed)
+        self.search_pipeline.results_ready.connect(self._on_search_results)
+        self.search_pipeline.search_failed.connect(self._on_search_failed)
+        
+        # 排序
+        self.card_panel.sort_combo.currentIndexChanged.connect(self._on_sort_changed)
+        
+        # 卡片点击和删除
+        delegate = self.card_panel.question_list.card_delegate
+        delegate.clicked.connect(lambda q: self._on_view_question(q.get('id')))
+        delegate.delete_requested.connect(lambda q: self._on_delete_question(q.get('id')))
+        
+        # 滚动到底部时列表自动加载下一页，之后更新状态栏
+        self.card_panel.question_model.rowsInserted.connect(self._update_status)
+        
+        # 题目增删改后只更新受影响的卡片
+        self.controller.add_view_listener(self._on_view_delta)
         
         logger.debug("信号连接完成")
     
     def _load_initial_data(self):
-        """加载初始数据"""
-        questions = self.controller.load_questions()
-        self._display_questions(questions)
-        
-        # 刷新导航树和统计
-        self.nav_tree.refresh()
-        self.right_panel.stats_panel.update_statistics()
+        """在后台线程中加载首屏数据，先显示骨架卡片"""
+        self.card_panel.question_model.show_placeholders(SKELETON_CARDS)
+        self._startup_page_pending = True
+        
+        loader = StartupLoader(self.controller, self)
+        loader.first_page_ready.connect(self._on_first_page_loaded)
+        loader.navigation_ready.connect(self.nav_tree.set_navigation_data)
+        loader.filter_options_ready.connect(self.right_panel.filter_panel.set_filter_options)
+        loader.statistics_ready.connect(self.right_panel.stats_panel.set_statistics)
+        loader.load_failed.connect(self._on_startup_failed)
+        loader.finished.connect(self._on_startup_finished)
+        self._startup_loader = loader
+        loader.start()
+    
+    @property
+    def is_loading(self) -> bool:
+        """首屏数据是否仍在后台加载"""
+        return self._startup_loader is not None
+    
+    def _on_first_page_loaded(self, page):
+        """
+        第一页加载完成
         
+        Args:
+            page: {items, next_cursor, has_more}
+        """
+        if not self._startup_page_pending:
+            # 加载期间用户已经切换了视图，丢弃启动时的第一页
+            return
+        self._startup_page_pending = False
+        questions = self.controller.apply_initial_page(page)
+        self._display_questions(questions)
         logger.debug(f"初始加载了 {len(questions)} 个题目")
     
+    def _on_startup_failed(self, message: str):
+        """启动加载失败"""
+        if self._startup_page_pending:
+            self._startup_page_pending = False
+            self._display_questions([])
+        self.right_panel.filter_panel.setEnabled(True)
+        self.statusBar().showMessage(f"加载失败: {message}")
+    
+    def _on_startup_finished(self):
+        """启动加载线程结束"""
+        loader, self._startup_loader = self._startup_loader, None
+        if loader is not None:
+            loader.deleteLater()
+    
+    def _view_changed_by_user(self):
+        """用户切换了视图：启动时的第一页到达后不再覆盖当前视图"""
+        self._startup_page_pending = False
+    
     def _display_questions(self, questions):
         """
         显示题目列表
@@ -145,40 +209,53 @@ class MainWindow(QMainWindow):
         Args:
             questions: 题目列表
         """
-        # 清空现有卡片
-        self._clear_cards()
-        
-        # 创建新卡片
-        for question in questions:
-            card = QuestionCard(question)
-            card.clicked.connect(lambda q: self._on_view_question(q.get('id')))
-            card.delete_requested.connect(lambda q: self._on_delete_question(q.get('id')))
-            
-            # 插入到布局中（在stretch之前）
-            self.card_panel.cards_layout.insertWidget(
-                self.card_panel.cards_layout.count() - 1,
-                card
-            )
-            self.current_cards.append(card)
+        self.card_panel.question_model.set_questions(questions)
+        self.card_panel.question_list.scrollToTop()
+        self._update_status()
         
-        # 更新状态栏
-        self.statusBar().showMessage(f"显示 {len(questions)} 个题目")
+        logger.debug(f"显示了 {len(questions)} 个题目")
+    
+    def _on_view_delta(self, delta):
+        """
+        当前列表变化：只更新受影响的卡片，然后刷新导航树和统计
+        
+        Args:
+            delta: ViewDelta
+        """
+        model = self.card_panel.question_model
+        if delta.action == "insert":
+            model.insert_question(delta.index, delta.question)
+        elif delta.action == "update":
+            model.update_question(delta.index, delta.question)
+        elif delta.action == "remove":
+            model.remove_question(delta.index)
+        else:
+            self._display_questions(self.controller.current_questions)
+        self._update_status()
         
-        logger.debug(f"显示了 {len(questions)} 个题目卡片")
+        self.nav_tree.refresh()
+        self.right_panel.stats_panel.update_statistics()
     
-    def _clear_cards(self):
-        """清空所有卡片"""
-        for card in self.current_cards:
-            self.card_panel.cards_layout.removeWidget(card)
-            card.deleteLater()
-        self.current_cards.clear()
+    def _update_status(self):
+        """更新状态栏"""
+        count = self.card_panel.question_model.rowCount()
+        if self.controller.has_more:
+            self.statusBar().showMessage(f"显示 {count} 个题目（滚动加载更多）")
+        else:
+            self.statusBar().showMessage(f"显示 {count} 个题目")
+    
+    def _on_sort_changed(self, index: int):
+        """排序方式改变"""
+        sort_by, descending = self.card_panel.sort_combo.itemData(index)
+        self._view_changed_by_user()
+        questions = self.controller.set_sort(sort_by, descending)
+        self._display_questions(questions)
     
     def _on_add_clicked(self):
         """添加按钮点击"""
         logger.info("点击添加错题按钮")
+        # 添加成功时由 QuestionAddedEvent 插入新卡片
         self.controller.show_add_dialog(self)
-        # 刷新视图
-        self._refresh_view()
     
     def _on_review_clicked(self):
         """复习按钮点击"""
@@ -198,9 +275,30 @@ class MainWindow(QMainWindow):
             keyword: 搜索关键词
         """
         logger.debug(f"搜索: {keyword}")
-        questions = self.controller.on_search(keyword)
+        self._view_changed_by_user()
+        if not keyword.strip():
+            # 清空搜索框：取消未返回的搜索，立即回到全部题目
+            self.search_pipeline.cancel()
+            questions = self.controller.on_search(keyword)
+            self._display_questions(questions)
+            return
+        self.search_pipeline.request(keyword)
+    
+    def _on_search_results(self, keyword: str, questions):
+        """
+        搜索结果返回（只有最新关键词的结果会到达这里）
+        
+        Args:
+            keyword: 搜索关键词
+            questions: 搜索结果
+        """
+        questions = self.controller.apply_search_results(keyword, questions)
         self._display_questions(questions)
     
+    def _on_search_failed(self, message: str):
+        """搜索失败"""
+        self.statusBar().showMessage(f"搜索失败: {message}", 3000)
+    
     def _on_nav_filter_changed(self, filter_data):
         """
         导航筛选变化
@@ -209,6 +307,8 @@ class MainWindow(QMainWindow):
             filter_data: 筛选条件
         """
         logger.debug(f"导航筛选: {filter_data}")
+        self._view_changed_by_user()
+        self.search_pipeline.cancel()
         questions = self.controller.on_nav_filter_changed(filter_data)
         self._display_questions(questions)
     
@@ -220,6 +320,8 @@ class MainWindow(QMainWindow):
             filters: 筛选条件字典
         """
         logger.debug(f"筛选条件: {filters}")
+        self._view_changed_by_user()
+        self.search_pipeline.cancel()
         questions = self.controller.on_filter_changed(filters)
         self._display_questions(questions)
     
@@ -232,20 +334,15 @@ class MainWindow(QMainWindow):
         """
         logger.info(f"查看题目详情: {question_id}")
         
-        # 获取题目数据
-        question_data = None
-        for q in self.controller.current_questions:
-            if q.get('id') == question_id:
-                question_data = q
-                break
+        # 列表中只有摘要，打开详情时读取完整数据
+        question_data = self.controller.get_question_detail(question_id)
         
         if question_data:
             dialog = self.controller.dialog_factory.create_detail_dialog(
                 question_data, self
             )
+            # 修改后由 QuestionUpdatedEvent 更新对应的卡片
             dialog.exec()
-            # 刷新视图
-            self._refresh_view()
     
     def _on_delete_question(self, question_id: int):
         """
@@ -266,15 +363,16 @@ class MainWindow(QMainWindow):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
+            # 删除成功时由 QuestionDeletedEvent 移除对应的卡片
             success, message = self.controller.delete_question(question_id)
             if success:
                 self.statusBar().showMessage("删除成功", 3000)
-                self._refresh_view()
             else:
                 QMessageBox.warning(self, "删除失败", message)
     
     def _refresh_view(self):
         """刷新当前视图"""
+        self._view_changed_by_user()
         questions = self.controller.refresh_current_view()
         self._display_questions(questions)
         
@@ -283,3 +381,13 @@ class MainWindow(QMainWindow):
         self.right_panel.stats_panel.update_statistics()
         
         logger.debug("视图刷新完成")
+    
+    def closeEvent(self, event):
+        """关闭窗口：取消搜索并等待后台查询结束（不设超时，线程结束前不销毁窗口）"""
+        self.search_pipeline.cancel()
+        self.search_pipeline.wait()
+        if self._startup_loader is not None:
+            # 当前查询完成后停止加载，等线程结束后再销毁窗口
+            self._startup_loader.requestInterruption()
+            self._startup_loader.wait()
+        super().closeEvent(event)
@@ -0,0 +1,369 @@
+"""错题卡片列表 - 基于 Qt 模型/视图
+
+列表只保存题目摘要，卡片由委托在绘制时按需画出，只绘制可见的行；
+滚动到底部时视图通过 canFetchMore/fetchMore 加载下一页。
+内存和绘制时间只与可见区域大小有关，与题库大小无关。
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+from PyQt6.QtWidgets import QListView, QStyledItemDelegate, QStyle, QAbstractItemView
+from PyQt6.QtCore import (
+    Qt, QAbstractListModel, QModelIndex, QRect, QRectF, QSize, QEvent, pyqtSignal
+)
+from PyQt6.QtGui import QColor, QFont, QPainter, QPen
+
+# 卡片高度（所有卡片大小一致）和卡片之间的间距
+CARD_HEIGHT = 180
+CARD_MARGIN = 5
+
+# 卡片内边距
+PADDING = 18
+
+# 掌握度色标颜色和文字
+MASTERY_COLORS = {
+    0: "#e74c3c",  # 生疏 - 红色
+    1: "#f39c12",  # 学习中 - 橙色
+    2: "#27ae60",  # 掌握 - 绿色
+    3: "#3498db",  # 熟练 - 蓝色
+}
+MASTERY_TEXT = ["🔴 生疏", "🟡 学习中", "🟢 掌握", "🔵 熟练"]
+
+# 删除按钮大小
+DELETE_BUTTON_SIZE = QSize(80, 35)
+
+# 题目摘要数据所在的角色
+QuestionRole = Qt.ItemDataRole.UserRole
+
+
+class QuestionListModel(QAbstractListModel):
+    """错题列表模型 - 保存题目摘要，滚动到底部时按需加载下一页"""
+    
+    def __init__(
+        self,
+        fetch_more: Optional[Callable[[], List[Dict[str, Any]]]] = None,
+        can_fetch_more: Optional[Callable[[], bool]] = None,
+        parent=None
+    ):
+        """
+        初始化模型
+        
+        Args:
+            fetch_more: 加载下一页的函数，返回新加载的题目列表
+            can_fetch_more: 判断是否还有下一页的函数
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self._questions: List[Dict[str, Any]] = []
+        self._placeholders = 0  # 数据加载前显示的骨架卡片数量
+        self._fetch_more = fetch_more
+        self._can_fetch_more = can_fetch_more
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._questions) or self._placeholders
+    
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._questions):
+            # 骨架卡片没有数据，委托据此绘制占位
+            return None
+        question = self._questions[index.row()]
+        if role == QuestionRole:
+            return question
+        if role == Qt.ItemDataRole.DisplayRole:
+            return question.get('subject', '')
+        return None
+    
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        if parent.isValid() or self._can_fetch_more is None or self._placeholders:
+            return False
+        return bool(self._can_fetch_more())
+    
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._fetch_more is None:
+            return
+        questions = self._fetch_more()
+        if questions:
+            self._append(questions)
+    
+    def question_at(self, row: int) -> Optional[Dict[str, Any]]:
+        """获取指定行的题目摘要"""
+        if 0 <= row < len(self._questions):
+            return self._questions[row]
+        return None
+    
+    @property
+    def is_placeholder(self) -> bool:
+        """当前是否显示骨架卡片"""
+        return self._placeholders > 0
+    
+    def show_placeholders(self, count: int):
+        """清空题目，显示 count 张骨架卡片（第一页在后台加载时）"""
+        self.beginResetModel()
+        self._questions = []
+        self._placeholders = count
+        self.endResetModel()
+    
+    def set_questions(self, questions: List[Dict[str, Any]]):
+        """替换全部题目（切换视图、筛选、排序时）"""
+        self.beginResetModel()
+        self._questions = list(questions)
+        self._placeholders = 0
+        self.endResetModel()
+    
+    def _append(self, questions: List[Dict[str, Any]]):
+        """在末尾追加题目"""
+        first = len(self._questions)
+        self.beginInsertRows(QModelIndex(), first, first + len(questions) - 1)
+        self._questions.extend(questions)
+        self.endInsertRows()
+    
+    def insert_question(self, row: int, question: Dict[str, Any]):
+        """在指定行插入一道题目"""
+        if self._placeholders:
+            self.set_questions([question])
+            return
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._questions.insert(row, question)
+        self.endInsertRows()
+    
+    def update_question(self, row: int, question: Dict[str, Any]):
+        """替换指定行的题目，只重绘这一行"""
+        self._questions[row] = question
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+    
+    def remove_question(self, row: int):
+        """移除指定行的题目"""
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._questions[row]
+        self.endRemoveRows()
+
+
+def _font(point_size: int, weight=QFont.Weight.Normal) -> QFont:
+    font = QFont()
+    font.setPointSize(point_size)
+    font.setWeight(weight)
+    return font
+
+
+def _summary_text(question: Dict[str, Any]) -> str:
+    """卡片上显示的题目摘要（列表数据中已由数据库截取好）"""
+    if 'content_preview' in question:
+        summary = question['content_preview'] or ''
+        if question.get('content_truncated'):
+            summary += "..."
+        return summary
+    content = question.get('content', '') or ''
+    return content[:100] + "..." if len(content) > 100 else content
+
+
+class QuestionCardDelegate(QStyledItemDelegate):
+    """错题卡片委托 - 按需绘制带掌握度色标的卡片，处理点击和删除"""
+    
+    clicked = pyqtSignal(dict)  # 点击卡片(查看详情)
+    delete_requested = pyqtSignal(dict)  # 点击删除按钮
+    
+    @staticmethod
+    def card_rect(option_rect: QRect) -> QRect:
+        """卡片区域（行区域去掉间距）"""
+        return option_rect.adjusted(CARD_MARGIN, CARD_MARGIN, -CARD_MARGIN, -CARD_MARGIN)
+    
+    @classmethod
+    def delete_button_rect(cls, option_rect: QRect) -> QRect:
+        """删除按钮区域（卡片右下角）"""
+        card = cls.card_rect(option_rect)
+        return QRect(
+            card.right() - PADDING - DELETE_BUTTON_SIZE.width(),
+            card.bottom() - PADDING - DELETE_BUTTON_SIZE.height(),
+            DELETE_BUTTON_SIZE.width(),
+            DELETE_BUTTON_SIZE.height()
+        )
+    
+    def sizeHint(self, option, index) -> QSize:
+        return QSize(option.rect.width(), CARD_HEIGHT + 2 * CARD_MARGIN)
+    
+    def paint(self, painter: QPainter, option, index):
+        question = index.data(QuestionRole)
+        if not question:
+            self._paint_skeleton(painter, option)
+            return
+        
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        
+        card = self.card_rect(option.rect)
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+        
+        # 卡片背景和边框（悬停时高亮）
+        if hovered:
+            painter.setPen(QPen(QColor("#3498db"), 2))
+            painter.setBrush(QColor("#f8f9fa"))
+        else:
+            painter.setPen(QPen(QColor("#dcdde1"), 1))
+            painter.setBrush(QColor("white"))
+        painter.drawRoundedRect(QRectF(card), 10, 10)
+        
+        inner = card.adjusted(PADDING, PADDING, -PADDING, -PADDING)
+        
+        # 左侧：掌握度色标
+        mastery_level = question.get('mastery_level', 0) or 0
+        color = QColor(MASTERY_COLORS.get(mastery_level, "#95a5a6"))
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(color)
+        painter.drawRoundedRect(QRectF(inner.left(), inner.top(), 10, inner.height()), 5, 5)
+        
+        # 右侧：掌握度、复习次数、删除按钮
+        action_width = DELETE_BUTTON_SIZE.width()
+        action = QRect(inner.right() - action_width + 1, inner.top(), action_width, inner.height())
+        
+        painter.setPen(color)
+        painter.setFont(_font(11, QFont.Weight.Bold))
+        painter.drawText(
+            QRect(action.left(), action.top(), action.width(), 24),
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            MASTERY_TEXT[mastery_level] if 0 <= mastery_level < len(MASTERY_TEXT) else ""
+        )
+        painter.setPen(QColor("#7f8c8d"))
+        painter.setFont(_font(10, QFont.Weight.Medium))
+        painter.drawText(
+            QRect(action.left(), action.top() + 34, action.width(), 20),
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            f"已复习 {question.get('repetitions', 0) or 0} 次"
+        )
+        
+        delete_rect = self.delete_button_rect(option.rect)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor("#e74c3c"))
+        painter.drawRoundedRect(QRectF(delete_rect), 6, 6)
+        painter.setPen(QColor("white"))
+        painter.setFont(_font(10, QFont.Weight.Bold))
+        painter.drawText(delete_rect, Qt.AlignmentFlag.AlignCenter, "🗑️ 删除")
+        
+        # 中间：内容区
+        content = QRect(inner.left() + 25, inner.top(),
+                        action.left() - 15 - (inner.left() + 25), inner.height())
+        
+        # 标题行：科目 + 题型 + 难度星级
+        title = QRect(content.left(), content.top(), content.width(), 26)
+        painter.setPen(QColor("#2c3e50"))
+        painter.setFont(_font(13, QFont.Weight.Bold))
+        subject_text = f"📚 {question.get('subject', '')}"
+        painter.drawText(
+            title, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, subject_text
+        )
+        subject_width = painter.fontMetrics().horizontalAdvance(subject_text)
+        
+        painter.setPen(QColor("#5a6c7d"))
+        painter.setFont(_font(12, QFont.Weight.Medium))
+        painter.drawText(
+            title.adjusted(subject_width + 10, 0, 0, 0),
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            f"• {question.get('question_type', '')}"
+        )
+        painter.setFont(_font(12))
+        painter.drawText(
+            title, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
+            "⭐" * (question.get('difficulty', 3) or 0)
+        )
+        
+        # 题目摘要（约3行，超出部分裁掉）
+        tags = question.get('tags') or []
+        summary_bottom = content.bottom() - (34 if tags else 0)
+        summary = QRect(content.left(), title.bottom() + 10,
+                        content.width(), summary_bottom - title.bottom() - 10)
+        painter.setPen(QColor("#2c3e50"))
+        painter.setFont(_font(12, QFont.Weight.Medium))
+        painter.save()
+        painter.setClipRect(summary)
+        painter.drawText(
+            summary,
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop | Qt.TextFlag.TextWordWrap,
+            _summary_text(question)
+        )
+        painter.restore()
+        
+        # 标签（最多显示3个）
+        if tags:
+            painter.setFont(_font(10, QFont.Weight.Medium))
+            metrics = painter.fontMetrics()
+            x = content.left()
+            y = content.bottom() - 28
+            for tag in tags[:3]:
+                text = f"🏷️ {tag}"
+                width = metrics.horizontalAdvance(text) + 24
+                if x + width > content.right():
+                    break
+                pill = QRect(x, y, width, 28)
+                painter.setPen(Qt.PenStyle.NoPen)
+                painter.setBrush(QColor("#e3f2fd"))
+                painter.drawRoundedRect(QRectF(pill), 12, 12)
+                painter.setPen(QColor("#1976d2"))
+                painter.drawText(pill, Qt.AlignmentFlag.AlignCenter, text)
+                x += width + 6
+        
+        painter.restore()
+    
+    def _paint_skeleton(self, painter: QPainter, option):
+        """绘制骨架卡片：与真实卡片布局相同的灰色色块"""
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        
+        card = self.card_rect(option.rect)
+        painter.setPen(QPen(QColor("#ecf0f1"), 1))
+        painter.setBrush(QColor("white"))
+        painter.drawRoundedRect(QRectF(card), 10, 10)
+        
+        inner = card.adjusted(PADDING, PADDING, -PADDING, -PADDING)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor("#ecf0f1"))
+        painter.drawRoundedRect(QRectF(inner.left(), inner.top(), 10, inner.height()), 5, 5)
+        
+        left = inner.left() + 25
+        width = inner.width() - 25 - DELETE_BUTTON_SIZE.width() - 15
+        for top, ratio in ((0, 0.35), (40, 1.0), (66, 0.9), (92, 0.6)):
+            bar = QRectF(left, inner.top() + top, width * ratio, 16)
+            painter.drawRoundedRect(bar, 6, 6)
+        painter.drawRoundedRect(QRectF(self.delete_button_rect(option.rect)), 6, 6)
+        
+        painter.restore()
+    
+    def editorEvent(self, event, model, option, index) -> bool:
+        """点击删除按钮时请求删除，点击卡片其他位置时查看详情"""
+        if (event.type() == QEvent.Type.MouseButtonRelease
+                and event.button() == Qt.MouseButton.LeftButton):
+            question = index.data(QuestionRole)
+            if question:
+                if self.delete_button_rect(option.rect).contains(event.position().toPoint()):
+                    self.delete_requested.emit(question)
+                else:
+                    self.clicked.emit(question)
+                return True
+        return super().editorEvent(event, model, option, index)
+
+
+class QuestionListView(QListView):
+    """错题卡片列表视图"""
+    
+    def __init__(self, model: QuestionListModel, parent=None):
+        """
+        初始化列表视图
+        
+        Args:
+            model: 错题列表模型
+            parent: 父组件
+        """
+        super().__init__(parent)
+        self.card_delegate = QuestionCardDelegate(self)
+        self.setItemDelegate(self.card_delegate)
+        self.setModel(model)
+        
+        # 所有卡片高度一致，视图不必逐行计算大小
+        self.setUniformItemSizes(True)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.verticalScrollBar().setSingleStep(20)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setMouseTracking(True)
+        self.setStyleSheet("QListView { background: transparent; border: none; }")
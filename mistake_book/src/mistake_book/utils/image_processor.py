@@ -1,13 +1,80 @@
-"""截图压缩和OCR预处理"""
+"""截图压缩、入库处理和OCR预处理"""
 
+from dataclasses import dataclass
 from pathlib import Path
-from PIL import Image, ImageEnhance, ImageFilter
+from typing import Optional, Tuple, Union
+from PIL import Image, ImageEnhance, ImageFilter, ImageOps
+import io
 import logging
 import tempfile
 import uuid
 
 logger = logging.getLogger(__name__)
 
+# 入库编码最低质量仍超出大小上限时，每次至少缩小到的比例和最多缩小次数
+_DOWNSCALE_RATIO = 0.75
+_MAX_DOWNSCALE_STEPS = 4
+
+# 可直接交给OCR的图片来源：文件路径、编码后的图片数据（剪贴板、拖放）或已解码的图片
+ImageSource = Union[str, Path, bytes, Image.Image]
+
+# 灰度值不低于此值视为背景（白色或接近白色），裁剪空白时使用
+_BACKGROUND_LEVEL = 235
+
+
+@dataclass
+class IngestOptions:
+    """图片入库处理参数"""
+    max_dimension: int = 2048  # 长边最大像素，超出时等比缩小
+    format: str = "WEBP"  # 编码格式：WEBP 或 JPEG
+    max_bytes: int = 400 * 1024  # 编码后大小上限（先降质量，仍超出时缩小尺寸）
+    quality: int = 85  # 起始编码质量
+    min_quality: int = 50  # 最低编码质量
+    auto_crop: bool = False  # 裁掉四周的空白
+    crop_border: int = 10  # 裁剪时保留的边距
+
+
+@dataclass
+class IngestResult:
+    """图片入库处理结果"""
+    data: bytes  # 要保存的文件内容
+    suffix: str  # 文件扩展名（.webp / .jpg，保留原文件时为原扩展名）
+    size: Tuple[int, int]  # 处理后的 (宽, 高)
+    original_bytes: int  # 原文件大小
+    transcoded: bool  # 是否重新编码（False 表示原文件已足够小，原样保存）
+
+
+def _content_bbox(img: Image.Image, border: int) -> Optional[Tuple[int, int, int, int]]:
+    """四周空白（接近白色）以内的内容区域，加上边距；整张都是空白时返回 None"""
+    gray = img.convert("L")
+    # 背景变为0，内容变为255，getbbox 取非零区域
+    mask = gray.point(lambda v: 255 if v < _BACKGROUND_LEVEL else 0)
+    bbox = mask.getbbox()
+    if not bbox:
+        return None
+    return (
+        max(0, bbox[0] - border),
+        max(0, bbox[1] - border),
+        min(img.width, bbox[2] + border),
+        min(img.height, bbox[3] + border)
+    )
+
+
+def open_image(source: ImageSource) -> Image.Image:
+    """
+    打开图片来源（已解码的图片原样返回）
+    
+    路径由 PIL 打开（支持中文路径），图片数据从内存中读取，不写临时文件。
+    
+    Raises:
+        OSError: 文件不存在或不是图片
+    """
+    if isinstance(source, Image.Image):
+        return source
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return Image.open(io.BytesIO(source))
+    return Image.open(source)
+
 
 class ImageProcessor:
     """图片处理器 - 提供压缩和OCR预处理功能"""
@@ -44,19 +111,157 @@ class ImageProcessor:
             logger.error(f"图片压缩失败: {e}")
             return image_path
     
-    def preprocess_for_ocr(self, image_path: Path, enhance: bool = True) -> Path:
+    def prepare_for_storage(
+        self, image_path: Path, options: Optional[IngestOptions] = None
+    ) -> IngestResult:
         """
-        OCR预处理 - 提高识别准确率
+        入库处理 - 只读取和解码一次，得到要保存的文件内容
+        
+        依次：按EXIF方向摆正、（可选）裁掉四周空白、长边缩小到 max_dimension、
+        编码为 WebP 或 JPEG 并尽量不超过 max_bytes。不保留EXIF（方向已应用，
+        也不保存拍摄位置等信息）。JPEG 原图使用 draft 模式按比例缩小解码。
+        
+        原图不需要摆正、裁剪和缩小，且重新编码后不会更小时，原样保存原文件；
+        动图原样保存。
         
         Args:
             image_path: 原图路径
-            enhance: 是否进行增强处理
+            options: 处理参数（默认 IngestOptions()）
+        
+        Returns:
+            处理结果
+        
+        Raises:
+            OSError: 文件无法读取或不是可识别的图片
+        """
+        options = options or IngestOptions()
+        raw = Path(image_path).read_bytes()
+        original_suffix = Path(image_path).suffix.lower()
+        
+        with Image.open(io.BytesIO(raw)) as img:
+            if getattr(img, "is_animated", False):
+                return IngestResult(raw, original_suffix, img.size, len(raw), False)
+            
+            orientation = img.getexif().get(0x0112, 1)
+            if not options.auto_crop:
+                # 只对 JPEG 生效：解码时直接缩小到不小于目标尺寸（裁剪前不缩小，保留细节）
+                img.draft(img.mode, self._scaled_size(img.size, options.max_dimension))
+            img = ImageOps.exif_transpose(img)
+            changed = orientation != 1
+            
+            if options.auto_crop:
+                bbox = _content_bbox(img, options.crop_border)
+                if bbox and bbox != (0, 0, img.width, img.height):
+                    img = img.crop(bbox)
+                    changed = True
+            
+            if max(img.size) > options.max_dimension:
+                size = self._scaled_size(img.size, options.max_dimension)
+                img = img.resize(size, Image.Resampling.LANCZOS)
+                changed = True
+            
+            fmt = options.format.upper()
+            img = self._to_encodable(img, keep_alpha=(fmt == "WEBP"))
+            data, img = self._encode_within_budget(img, fmt, options)
+        
+        if not changed and len(data) >= len(raw):
+            logger.info(f"原图已足够小，原样保存: {len(raw)} 字节")
+            return IngestResult(raw, original_suffix, img.size, len(raw), False)
+        
+        suffix = ".webp" if fmt == "WEBP" else ".jpg"
+        logger.info(
+            f"图片入库处理: {len(raw)} → {len(data)} 字节，{img.width}×{img.height}{suffix}"
+        )
+        return IngestResult(data, suffix, img.size, len(raw), True)
+    
+    @staticmethod
+    def _scaled_size(size: Tuple[int, int], max_dimension: int) -> Tuple[int, int]:
+        """等比缩放到长边不超过 max_dimension 的尺寸"""
+        width, height = size
+        scale = min(1.0, max_dimension / max(width, height))
+        return max(1, round(width * scale)), max(1, round(height * scale))
+    
+    @staticmethod
+    def _to_encodable(img: Image.Image, keep_alpha: bool) -> Image.Image:
+        """转换为编码器支持的模式；不保留透明通道时合成到白色背景"""
+        if img.mode in ("RGBA", "LA", "P", "PA"):
+            img = img.convert("RGBA")
+            if keep_alpha and img.getchannel("A").getextrema()[0] < 255:
+                return img
+            background = Image.new("RGB", img.size, "white")
+            background.paste(img, mask=img.getchannel("A"))
+            return background
+        if img.mode not in ("RGB", "L"):
+            return img.convert("RGB")
+        if keep_alpha and img.mode == "L":
+            return img.convert("RGB")
+        return img
+    
+    @staticmethod
+    def _encode(img: Image.Image, fmt: str, quality: int) -> bytes:
+        buffer = io.BytesIO()
+        if fmt == "WEBP":
+            img.save(buffer, "WEBP", quality=quality, method=4)
+        else:
+            img.save(buffer, "JPEG", quality=quality, optimize=True, progressive=True)
+        return buffer.getvalue()
+    
+    def _encode_within_budget(self, img: Image.Image, fmt: str, options: IngestOptions):
+        """
+        编码并尽量不超过大小上限
+        
+        先用起始质量编码；超出时检查最低质量，最低质量满足上限则在两者之间
+        二分查找满足上限的最高质量，否则按超出的比例估算缩小尺寸后重试。
+        
+        Returns:
+            (编码结果, 实际编码的图片)
+        """
+        for step in range(_MAX_DOWNSCALE_STEPS + 1):
+            data = self._encode(img, fmt, options.quality)
+            if len(data) <= options.max_bytes:
+                return data, img
             
+            smallest = self._encode(img, fmt, options.min_quality)
+            if len(smallest) <= options.max_bytes:
+                best = smallest
+                low, high = options.min_quality + 1, options.quality - 1
+                while low <= high:
+                    quality = (low + high) // 2
+                    candidate = self._encode(img, fmt, quality)
+                    if len(candidate) <= options.max_bytes:
+                        best, low = candidate, quality + 1
+                    else:
+                        high = quality - 1
+                return best, img
+            
+            # 编码大小大致与像素数成正比
+            ratio = min(_DOWNSCALE_RATIO, 0.95 * (options.max_bytes / len(smallest)) ** 0.5)
+            smaller = (round(img.width * ratio), round(img.height * ratio))
+            if step == _MAX_DOWNSCALE_STEPS or min(smaller) < 1:
+                break
+            img = img.resize(smaller, Image.Resampling.LANCZOS)
+        
+        logger.warning(f"图片编码后仍超过大小上限: {len(smallest)} > {options.max_bytes}")
+        return smallest, img
+    
+    def preprocess_for_ocr(self, source: ImageSource, enhance: bool = True) -> Image.Image:
+        """
+        OCR预处理 - 提高识别准确率
+        
+        全程在内存中处理，不写临时文件。JPEG 直接解码为灰度，省去彩色解码和转换。
+        
+        Args:
+            source: 原图路径、编码后的图片数据或已解码的图片
+            enhance: 是否进行增强处理
+        
         Returns:
-            处理后的图片路径（使用临时文件，避免中文路径问题）
+            处理后的灰度图片（OCR引擎直接读取其像素数据）；
+            预处理失败时返回 source 本身，由OCR引擎按原图识别
         """
         try:
-            img = Image.open(image_path)
+            img = open_image(source)
+            if img.mode != "L":
+                img.draft("L", img.size)
             
             # 1. 转为灰度图
             img = img.convert("L")
@@ -72,20 +277,12 @@ class ImageProcessor:
                 # 4. 去噪
                 img = img.filter(ImageFilter.MedianFilter(size=3))
             
-            # 使用临时文件，避免中文路径问题
-            # 生成唯一的临时文件名
-            temp_dir = Path(tempfile.gettempdir())
-            temp_filename = f"ocr_processed_{uuid.uuid4().hex}{image_path.suffix}"
-            output_path = temp_dir / temp_filename
-            
-            img.save(output_path)
-            
-            logger.info(f"图片预处理成功: {output_path}")
-            return output_path
+            logger.info(f"图片预处理成功: {img.size[0]}x{img.size[1]}")
+            return img
             
         except Exception as e:
             logger.error(f"图片预处理失败: {e}")
-            return image_path
+            return source
     
     def auto_rotate(self, image_path: Path) -> Path:
         """
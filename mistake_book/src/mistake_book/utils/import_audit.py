@@ -0,0 +1,63 @@
+"""导入耗时统计
+
+记录一段代码导入了哪些模块、用了多少时间，以及启动路径上是否已经导入了
+torch、EasyOCR 等重型依赖。更细的逐模块耗时可以用
+``python -X importtime -m mistake_book.main`` 查看。
+"""
+
+import sys
+import time
+from typing import List, Optional
+
+# 启动路径上不应出现的重型模块（只在需要 OCR 时加载）
+HEAVY_MODULES = ("torch", "easyocr", "cv2", "scipy", "skimage", "torchvision")
+
+
+def loaded_heavy_modules() -> List[str]:
+    """返回已经导入的重型模块"""
+    return [name for name in HEAVY_MODULES if name in sys.modules]
+
+
+class ImportTimer:
+    """
+    统计 with 代码块内导入的模块数和耗时
+    
+    用法:
+        with ImportTimer("OCR") as timer:
+            import easyocr
+        logger.info(timer.summary())
+    """
+    
+    def __init__(self, label: str):
+        self.label = label
+        self.seconds = 0.0
+        self.new_modules: List[str] = []
+        self._start: Optional[float] = None
+        self._before = set()
+    
+    def __enter__(self) -> "ImportTimer":
+        self._before = set(sys.modules)
+        self._start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.seconds = time.perf_counter() - self._start
+        self.new_modules = sorted(set(sys.modules) - self._before)
+        return False
+    
+    def summary(self) -> str:
+        """一行摘要：耗时、新导入的模块数和其中的重型模块"""
+        heavy = [name for name in HEAVY_MODULES if name in self.new_modules]
+        text = f"{self.label}: {self.seconds:.2f} 秒，导入 {len(self.new_modules)} 个模块"
+        if heavy:
+            text += f"（重型: {', '.join(heavy)}）"
+        return text
+
+
+def startup_import_summary() -> str:
+    """启动完成时的导入情况：已导入的模块总数和重型模块"""
+    heavy = loaded_heavy_modules()
+    return (
+        f"启动时已导入 {len(sys.modules)} 个模块，"
+        f"重型模块: {', '.join(heavy) if heavy else '无'}"
+    )
@@ -0,0 +1,537 @@
+"""DataManager 单元测试"""
+
+import sys
+import pytest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from mistake_book.core.data_manager import DataManager
+from mistake_book.database.db_manager import DatabaseManager
+from mistake_book.database.models import Question, Tag
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    """创建临时数据库"""
+    manager = DatabaseManager(tmp_path / "test.db")
+    yield manager
+    manager.dispose()
+
+
+@pytest.fixture
+def data_manager(db_manager):
+    """创建数据管理器"""
+    return DataManager(db_manager)
+
+
+@pytest.fixture
+def sample_questions(db_manager):
+    """创建一批题目：部分题目没有复习日期，部分创建时间相同"""
+    base = datetime(2024, 1, 1, 8, 0, 0)
+    important = Tag(name="重点")
+    with db_manager.session_scope() as session:
+        for i in range(23):
+            question = Question(
+                subject="数学" if i % 2 == 0 else "物理",
+                content=f"题目{i}",
+                difficulty=i % 5 + 1,
+                mastery_level=i % 4,
+                # 每3个题目共用一个创建时间，检验同值时按id继续
+                created_at=base + timedelta(hours=i // 3),
+                next_review_date=None if i % 4 == 0 else base + timedelta(days=i % 7),
+            )
+            if i % 3 == 0:
+                question.tags.append(important)
+            session.add(question)
+
+
+def _collect_pages(data_manager, page_size, **kwargs):
+    """依次翻页直到末尾，返回所有题目id"""
+    ids = []
+    cursor = None
+    while True:
+        page = data_manager.get_questions_page(
+            page_size=page_size, cursor=cursor, **kwargs
+        )
+        ids.extend(q["id"] for q in page["items"])
+        if not page["has_more"]:
+            assert page["next_cursor"] is None
+            return ids
+        cursor = page["next_cursor"]
+
+
+def _expected_ids(db_manager, sort_by, descending, filters=None):
+    """在Python中按 (排序字段, id) 排序得到期望顺序（NULL视为最小值）"""
+    filters = filters or {}
+    with db_manager.session_scope() as session:
+        rows = [
+            (getattr(q, sort_by), q.id)
+            for q in session.query(Question).all()
+            if all(getattr(q, k) == v for k, v in filters.items())
+        ]
+    rows.sort(key=lambda r: (r[0] is not None, r[0] or 0, r[1]), reverse=descending)
+    return [r[1] for r in rows]
+
+
+class TestQuestionsPage:
+    """测试键集分页"""
+    
+    @pytest.mark.parametrize(
+        "sort_by", ["created_at", "next_review_date", "difficulty", "mastery_level"]
+    )
+    @pytest.mark.parametrize("descending", [True, False])
+    def test_pages_cover_all_rows_in_order(
+        self, data_manager, db_manager, sample_questions, sort_by, descending
+    ):
+        """测试逐页读取的结果与整体排序一致，不重复不遗漏"""
+        ids = _collect_pages(data_manager, 5, filters={}, sort_by=sort_by, descending=descending)
+        
+        assert ids == _expected_ids(db_manager, sort_by, descending)
+    
+    def test_page_size_and_has_more(self, data_manager, sample_questions):
+        """测试页大小和是否还有下一页"""
+        page = data_manager.get_questions_page({}, page_size=10)
+        
+        assert len(page["items"]) == 10
+        assert page["has_more"] is True
+        assert page["next_cursor"]["id"] == page["items"][-1]["id"]
+    
+    def test_exact_multiple_of_page_size(self, data_manager, db_manager):
+        """测试总数恰好是页大小的整数倍时最后一页没有多余的游标"""
+        with db_manager.session_scope() as session:
+            for i in range(4):
+                session.add(Question(subject="数学", content=f"题目{i}"))
+        
+        first = data_manager.get_questions_page({}, page_size=2)
+        second = data_manager.get_questions_page({}, page_size=2, cursor=first["next_cursor"])
+        
+        assert first["has_more"] is True
+        assert len(second["items"]) == 2
+        assert second["has_more"] is False
+    
+    def test_filters_applied(self, data_manager, db_manager, sample_questions):
+        """测试分页时应用筛选条件"""
+        ids = _collect_pages(
+            data_manager, 3, filters={"subject": "数学"},
+            sort_by="difficulty", descending=False
+        )
+        
+        assert ids == _expected_ids(db_manager, "difficulty", False, {"subject": "数学"})
+    
+    def test_tag_filter(self, data_manager, sample_questions):
+        """测试按标签筛选分页"""
+        ids = _collect_pages(data_manager, 3, filters={"tags": ["重点"]})
+        
+        assert len(ids) == 8
+        assert len(set(ids)) == 8
+    
+    def test_empty_result(self, data_manager):
+        """测试没有题目时返回空页"""
+        page = data_manager.get_questions_page({})
+        
+        assert page == {"items": [], "next_cursor": None, "has_more": False}
+    
+    def test_unknown_sort_key(self, data_manager):
+        """测试不支持的排序字段"""
+        with pytest.raises(ValueError):
+            data_manager.get_questions_page({}, sort_by="content")
+
+
+class TestQuestionSummaries:
+    """测试列表摘要投影"""
+    
+    @pytest.fixture
+    def long_question_id(self, db_manager):
+        """创建一个内容很长、带两个标签的题目"""
+        with db_manager.session_scope() as session:
+            question = Question(
+                subject="数学",
+                question_type="解答题",
+                content="长" * 150,
+                answer="答案" * 500,
+                explanation="解析" * 500,
+            )
+            question.tags.append(Tag(name="函数"))
+            question.tags.append(Tag(name="重点"))
+            session.add(question)
+            session.add(Question(subject="物理", content="短题目"))
+            session.flush()
+            return question.id
+    
+    def test_summary_has_card_fields_only(self, data_manager, long_question_id):
+        """测试摘要只包含卡片需要的字段，不包含大字段"""
+        summaries = data_manager.list_question_summaries({"subject": "数学"})
+        
+        assert len(summaries) == 1
+        summary = summaries[0]
+        assert summary["id"] == long_question_id
+        assert summary["question_type"] == "解答题"
+        assert summary["tags"] == ["函数", "重点"]
+        for field in ("content", "answer", "my_answer", "explanation"):
+            assert field not in summary
+    
+    def test_content_preview_truncated_in_sql(self, data_manager, long_question_id):
+        """测试内容预览在数据库中截取"""
+        by_subject = {s["subject"]: s for s in data_manager.list_question_summaries({})}
+        
+        assert by_subject["数学"]["content_preview"] == "长" * 100
+        assert by_subject["数学"]["content_truncated"] is True
+        assert by_subject["物理"]["content_preview"] == "短题目"
+        assert by_subject["物理"]["content_truncated"] is False
+        assert by_subject["物理"]["tags"] == []
+    
+    def test_summaries_by_ids_keep_order(self, data_manager, long_question_id):
+        """测试按ID获取摘要时保持传入顺序"""
+        other_id = long_question_id + 1
+        
+        summaries = data_manager.get_question_summaries_by_ids([other_id, 999, long_question_id])
+        
+        assert [s["id"] for s in summaries] == [other_id, long_question_id]
+    
+    def test_detail_has_full_content(self, data_manager, long_question_id):
+        """测试详情返回完整内容"""
+        detail = data_manager.get_question(long_question_id)
+        
+        assert detail["content"] == "长" * 150
+        assert detail["answer"] == "答案" * 500
+    
+    def test_tags_loaded_in_one_query(self, data_manager, db_manager, sample_questions):
+        """测试标签通过一次批量查询获取（不随题目数量增加查询次数）"""
+        from sqlalchemy import event
+        
+        statements = []
+        
+        def count(conn, cursor, statement, *args):
+            statements.append(statement)
+        
+        event.listen(db_manager.engine, "before_cursor_execute", count)
+        try:
+            summaries = data_manager.list_question_summaries({})
+        finally:
+            event.remove(db_manager.engine, "before_cursor_execute", count)
+        
+        assert len(summaries) == 23
+        # BEGIN + 摘要查询 + 标签查询
+        assert len([s for s in statements if s.startswith("SELECT")]) == 2
+
+
+class TestDueQueue:
+    """测试复习队列"""
+    
+    NOW = datetime(2024, 5, 10, 9, 0, 0)
+    
+    @pytest.fixture
+    def due_data(self, db_manager):
+        """创建不同复习日期的题目，返回 {名称: id}"""
+        dates = {
+            "never": None,
+            "overdue_week": self.NOW - timedelta(days=7),
+            "overdue_day": self.NOW - timedelta(days=1),
+            "later_today": self.NOW.replace(hour=23, minute=30),
+            "tomorrow": self.NOW + timedelta(days=1),
+            "next_week": self.NOW + timedelta(days=7),
+        }
+        ids = {}
+        with db_manager.session_scope() as session:
+            for name, next_review in dates.items():
+                question = Question(subject="数学", question_type="选择题",
+                                    content=name, next_review_date=next_review)
+                session.add(question)
+                session.flush()
+                ids[name] = question.id
+            session.add(Question(subject="数学", question_type="填空题", content="其他题型",
+                                 next_review_date=self.NOW - timedelta(days=30)))
+            session.add(Question(subject="物理", question_type="选择题", content="其他科目",
+                                 next_review_date=self.NOW - timedelta(days=30)))
+        return ids
+    
+    def test_due_until_end_of_today_most_overdue_first(self, data_manager, due_data):
+        """测试到期截止到今天结束，未安排复习的在前，其余逾期最久的优先"""
+        due = data_manager.get_due_questions(
+            {"subject": "数学", "question_type": "选择题"}, now=self.NOW
+        )
+        
+        assert [q["id"] for q in due] == [
+            due_data["never"],
+            due_data["overdue_week"],
+            due_data["overdue_day"],
+            due_data["later_today"],
+        ]
+    
+    def test_limit(self, data_manager, due_data):
+        """测试数量限制"""
+        due = data_manager.get_due_questions(
+            {"subject": "数学", "question_type": "选择题"}, limit=2, now=self.NOW
+        )
+        
+        assert [q["id"] for q in due] == [due_data["never"], due_data["overdue_week"]]
+    
+    def test_without_filters(self, data_manager, due_data):
+        """测试不筛选时包含所有模块的到期题目"""
+        due = data_manager.get_due_questions({}, now=self.NOW)
+        
+        assert len(due) == 6
+        assert due[0]["id"] == due_data["never"]
+        assert {q["content"] for q in due[1:3]} == {"其他题型", "其他科目"}
+    
+    def test_returns_full_question(self, data_manager, due_data):
+        """测试返回复习需要的完整数据"""
+        due = data_manager.get_due_questions({"subject": "物理"}, now=self.NOW)
+        
+        assert due[0]["content"] == "其他科目"
+        assert due[0]["tags"] == []
+    
+    @pytest.mark.parametrize("filters,index", [
+        ({"subject": "数学", "question_type": "选择题"}, "ix_questions_subject_type_due"),
+        ({}, "ix_questions_next_review_date"),
+    ])
+    def test_query_uses_index(self, data_manager, db_manager, filters, index):
+        """测试队列查询使用索引且不需要额外排序"""
+        from sqlalchemy import event
+        
+        statements = []
+        
+        def capture(conn, cursor, statement, parameters, *args):
+            if statement.startswith("SELECT questions"):
+                statements.append((statement, parameters))
+        
+        event.listen(db_manager.engine, "before_cursor_execute", capture)
+        try:
+            data_manager.get_due_questions(filters, limit=10, now=self.NOW)
+        finally:
+            event.remove(db_manager.engine, "before_cursor_execute", capture)
+        
+        statement, parameters = statements[0]
+        with db_manager.engine.connect() as conn:
+            plan = " ".join(
+                row[-1] for row in
+                conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+            )
+        assert index in plan
+        assert "TEMP B-TREE" not in plan
+
+
+class TestBulkOperations:
+    """测试批量增删改"""
+    
+    @staticmethod
+    def _count_commits(db_manager, action):
+        """执行操作并统计提交的事务数"""
+        from sqlalchemy import event
+        
+        commits = []
+        
+        def on_commit(conn):
+            commits.append(conn)
+        
+        event.listen(db_manager.engine, "commit", on_commit)
+        try:
+            result = action()
+        finally:
+            event.remove(db_manager.engine, "commit", on_commit)
+        return result, len(commits)
+    
+    def test_add_in_chunked_transactions(self, data_manager, db_manager):
+        """测试批量添加：每个分块一个事务，进度按分块回调"""
+        items = [
+            {
+                "subject": "数学" if i % 2 else "物理",
+                "content": f"题目{i}",
+                "tags": ["重点"] if i % 3 == 0 else [],
+            }
+            for i in range(1200)
+        ]
+        calls = []
+        
+        ids, commits = self._count_commits(
+            db_manager,
+            lambda: data_manager.add_questions(
+                items, chunk_size=500, progress=lambda done, total: calls.append((done, total))
+            )
+        )
+        
+        assert commits == 3
+        assert calls == [(500, 1200), (1000, 1200), (1200, 1200)]
+        assert len(ids) == len(set(ids)) == 1200
+        
+        questions = data_manager.get_questions_by_ids([ids[0], ids[1], ids[-1]])
+        assert [q["content"] for q in questions] == ["题目0", "题目1", "题目1199"]
+        assert questions[0]["tags"] == ["重点"]
+        assert questions[1]["tags"] == []
+        # 未提供的字段使用模型默认值
+        assert questions[0]["difficulty"] == 3
+        assert questions[0]["created_at"] is not None
+    
+    def test_add_reuses_and_creates_tags_once(self, data_manager, db_manager):
+        """测试标签按名称复用，新标签只创建一次"""
+        with db_manager.session_scope() as session:
+            session.add(Tag(name="重点"))
+        
+        ids = data_manager.add_questions([
+            {"subject": "数学", "content": "1", "tags": ["重点", "易错", "重点"]},
+            {"subject": "数学", "content": "2", "tags": ["易错"]},
+        ], chunk_size=1)
+        
+        with db_manager.session_scope() as session:
+            assert sorted(name for (name,) in session.query(Tag.name)) == ["易错", "重点"]
+        questions = data_manager.get_questions_by_ids(ids)
+        assert [q["tags"] for q in questions] == [["重点", "易错"], ["易错"]]
+    
+    def test_add_rejects_unknown_fields(self, data_manager):
+        """测试未知字段会报错，而不是被静默忽略"""
+        with pytest.raises(ValueError):
+            data_manager.add_questions([{"subject": "数学", "content": "1", "subjet": "物理"}])
+    
+    def test_update(self, data_manager):
+        """测试批量更新字段和替换标签，不存在的题目被跳过"""
+        ids = data_manager.add_questions([
+            {"subject": "数学", "content": "1", "tags": ["重点"]},
+            {"subject": "数学", "content": "2", "tags": ["重点"]},
+        ])
+        calls = []
+        
+        updated = data_manager.update_questions({
+            ids[0]: {"difficulty": 5},
+            ids[1]: {"content": "新内容", "tags": ["易错"]},
+            ids[1] + 100: {"difficulty": 1},
+        }, progress=lambda done, total: calls.append((done, total)))
+        
+        assert updated == 2
+        assert calls == [(3, 3)]
+        first, second = data_manager.get_questions_by_ids(ids)
+        assert (first["difficulty"], first["tags"]) == (5, ["重点"])
+        assert (second["content"], second["tags"]) == ("新内容", ["易错"])
+    
+    def test_delete_cascades(self, data_manager, db_manager):
+        """测试批量删除同时删除复习记录和标签关联，计数与全文索引保持一致"""
+        from mistake_book.database.counters import check_counters
+        from mistake_book.database.models import ReviewRecord, question_tags
+        
+        ids = data_manager.add_questions(
+            [{"subject": "数学", "content": f"函数题{i}", "tags": ["重点"]} for i in range(10)]
+        )
+        with db_manager.session_scope() as session:
+            session.add_all(ReviewRecord(question_id=qid, result=1) for qid in ids)
+        
+        deleted, commits = self._count_commits(
+            db_manager,
+            lambda: data_manager.delete_questions(ids[:7] + [ids[0], 9999], chunk_size=4),
+        )
+        
+        assert deleted == 7
+        assert commits == 2  # 去重后8个id，分两个事务
+        with db_manager.session_scope() as session:
+            assert session.query(ReviewRecord).count() == 3
+            assert session.query(question_tags).count() == 3
+        with db_manager.engine.connect() as conn:
+            assert check_counters(conn) == []
+        assert {q["id"] for q in data_manager.search_questions({"keyword": "函数"})} == set(ids[7:])
+    
+    def test_delete_single_question_cascades(self, data_manager, db_manager):
+        """测试删除单个题目时不留下孤立的复习记录"""
+        from mistake_book.database.models import ReviewRecord
+        
+        question_id = data_manager.add_question({"subject": "数学", "content": "1"})
+        with db_manager.session_scope() as session:
+            session.add(ReviewRecord(question_id=question_id, result=1))
+        
+        assert data_manager.delete_question(question_id) is True
+        assert data_manager.delete_question(question_id) is False
+        with db_manager.session_scope() as session:
+            assert session.query(ReviewRecord).count() == 0
+
+
+class TestRecordReviews:
+    """测试在一个事务中记录复习结果"""
+    
+    NOW = datetime(2024, 5, 10, 9, 0, 0)
+    
+    def test_updates_schedule_and_appends_records(self, data_manager, db_manager):
+        """测试更新调度字段并追加复习记录"""
+        from mistake_book.config.constants import ReviewResult
+        from mistake_book.core.review_scheduler import ReviewScheduler
+        from mistake_book.database.models import ReviewRecord
+        
+        ids = data_manager.add_questions([
+            {"subject": "数学", "content": "1"},
+            {
+                "subject": "数学",
+                "content": "2",
+                "interval": 6,
+                "repetitions": 2,
+                "easiness_factor": 2.5,
+            },
+        ])
+        
+        updates = data_manager.record_reviews([
+            (ids[0], ReviewResult.GOOD, 30),
+            (ids[1], ReviewResult.AGAIN, None),
+            (ids[0], ReviewResult.GOOD, 20),
+            (9999, ReviewResult.GOOD, None),
+        ], ReviewScheduler(), now=self.NOW)
+        
+        # 同一题目的多次作答按顺序计算：第一次1天，第二次6天
+        assert updates[ids[0]]["repetitions"] == 2
+        assert updates[ids[0]]["next_review_date"] == self.NOW + timedelta(days=6)
+        assert updates[ids[1]]["repetitions"] == 0
+        assert 9999 not in updates
+        
+        first, second = data_manager.get_questions_by_ids(ids)
+        assert (first["interval"], first["repetitions"], first["mastery_level"]) == (6, 2, 2)
+        assert (second["interval"], second["repetitions"], second["mastery_level"]) == (1, 0, 0)
+        with db_manager.session_scope() as session:
+            records = session.query(ReviewRecord.question_id, ReviewRecord.time_spent).all()
+        assert sorted(records, key=lambda r: (r[0], r[1] or 0)) == [
+            (ids[0], 20), (ids[0], 30), (ids[1], None)
+        ]
+    
+    def test_single_transaction(self, data_manager, db_manager):
+        """测试整批结果只用一个事务，且以 BEGIN IMMEDIATE 开始"""
+        from sqlalchemy import event
+        from mistake_book.config.constants import ReviewResult
+        from mistake_book.core.review_scheduler import ReviewScheduler
+        
+        ids = data_manager.add_questions(
+            [{"subject": "数学", "content": str(i)} for i in range(20)]
+        )
+        statements = []
+        
+        def capture(conn, cursor, statement, *args):
+            statements.append(statement)
+        
+        event.listen(db_manager.engine, "before_cursor_execute", capture)
+        try:
+            data_manager.record_reviews(
+                [(qid, ReviewResult.GOOD, None) for qid in ids], ReviewScheduler(), now=self.NOW
+            )
+        finally:
+            event.remove(db_manager.engine, "before_cursor_execute", capture)
+        
+        assert statements[0] == "BEGIN IMMEDIATE"
+        assert len([s for s in statements if s.startswith("BEGIN")]) == 1
+        assert len([s for s in statements if s.startswith("SELECT")]) == 1
+    
+    def test_failure_rolls_back_everything(self, data_manager, db_manager):
+        """测试中途失败时题目和复习记录都不变"""
+        from mistake_book.config.constants import ReviewResult
+        from mistake_book.core.review_scheduler import ReviewScheduler
+        from mistake_book.database.models import ReviewRecord
+        
+        class FailingScheduler(ReviewScheduler):
+            def calculate_next_review(self, *args):
+                raise RuntimeError("scheduler failed")
+        
+        question_id = data_manager.add_question({"subject": "数学", "content": "1"})
+        
+        with pytest.raises(RuntimeError):
+            data_manager.record_reviews(
+                [(question_id, ReviewResult.GOOD, None)], FailingScheduler()
+            )
+        
+        assert data_manager.get_question(question_id)["repetitions"] == 0
+        with db_manager.session_scope() as session:
+            assert session.query(ReviewRecord).count() == 0
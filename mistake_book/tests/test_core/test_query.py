@@ -0,0 +1,185 @@
+"""QuestionQuery 单元测试"""
+
+import sys
+import pytest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from sqlalchemy import event
+
+from mistake_book.core.data_manager import DataManager
+from mistake_book.core.query import QuestionQuery
+from mistake_book.database.db_manager import DatabaseManager
+from mistake_book.database.models import Question, Tag
+
+NOW = datetime(2024, 5, 10, 9, 0, 0)
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    """创建临时数据库"""
+    manager = DatabaseManager(tmp_path / "test.db")
+    yield manager
+    manager.dispose()
+
+
+@pytest.fixture
+def questions(db_manager):
+    """创建测试题目，返回 {名称: id}"""
+    important = Tag(name="重点")
+    tricky = Tag(name="易错")
+    rows = {
+        "math_choice": dict(subject="数学", question_type="选择题", difficulty=1, mastery_level=0,
+                            content="二次函数的最值", created_at=NOW - timedelta(days=10),
+                            next_review_date=None, tags=[important, tricky]),
+        "math_blank": dict(subject="数学", question_type="填空题", difficulty=3, mastery_level=1,
+                           content="三角函数化简", created_at=NOW - timedelta(days=5),
+                           next_review_date=NOW - timedelta(days=1), tags=[important]),
+        "math_proof": dict(subject="数学", question_type="解答题", difficulty=5, mastery_level=3,
+                           content="数列求和证明", created_at=NOW - timedelta(days=1),
+                           next_review_date=NOW + timedelta(days=5), tags=[tricky]),
+        "physics": dict(subject="物理", question_type="选择题", difficulty=4, mastery_level=2,
+                        content="牛顿第二定律", created_at=NOW,
+                        next_review_date=NOW + timedelta(days=2), tags=[]),
+    }
+    ids = {}
+    with db_manager.session_scope() as session:
+        for name, data in rows.items():
+            question = Question(**data)
+            session.add(question)
+            session.flush()
+            ids[name] = question.id
+    return ids
+
+
+def _run(db_manager, spec):
+    """执行查询，返回题目id集合"""
+    with db_manager.session_scope() as session:
+        return {qid for (qid,) in spec.apply(session.query(Question.id)).all()}
+
+
+class TestConditions:
+    """测试各筛选条件"""
+    
+    @pytest.mark.parametrize("spec,expected", [
+        (QuestionQuery(), {"math_choice", "math_blank", "math_proof", "physics"}),
+        (QuestionQuery(subject="数学"), {"math_choice", "math_blank", "math_proof"}),
+        (QuestionQuery(subject="数学", question_type="选择题"), {"math_choice"}),
+        (QuestionQuery(difficulty_min=3), {"math_blank", "math_proof", "physics"}),
+        (QuestionQuery(difficulty_min=2, difficulty_max=4), {"math_blank", "physics"}),
+        (QuestionQuery(mastery_levels=frozenset({0, 3})), {"math_choice", "math_proof"}),
+        (QuestionQuery(tags_all=("重点", "易错")), {"math_choice"}),
+        (QuestionQuery(tags_any=("重点", "易错")), {"math_choice", "math_blank", "math_proof"}),
+        (QuestionQuery(created_from=NOW - timedelta(days=5), created_to=NOW),
+         {"math_blank", "math_proof"}),
+        (QuestionQuery(review_from=NOW, review_to=NOW + timedelta(days=3)), {"physics"}),
+        (QuestionQuery(keyword="函数"), {"math_choice", "math_blank"}),
+        (QuestionQuery(keyword="函数", tags_all=("易错",)), {"math_choice"}),
+        (QuestionQuery(due=True, now=NOW), {"math_choice", "math_blank"}),
+        (QuestionQuery(due=False, now=NOW), {"math_proof", "physics"}),
+    ])
+    def test_condition(self, db_manager, questions, spec, expected):
+        """测试筛选结果"""
+        assert _run(db_manager, spec) == {questions[name] for name in expected}
+    
+    def test_ids(self, db_manager, questions):
+        """测试按题目id限定，与其他条件同时生效"""
+        ids = [questions["math_choice"], questions["physics"]]
+        assert _run(db_manager, QuestionQuery(ids=frozenset(ids))) == set(ids)
+        assert _run(db_manager, QuestionQuery(subject="数学").where(ids=ids)) == {
+            questions["math_choice"]
+        }
+    
+    def test_keyword_without_searchable_text(self, db_manager, questions):
+        """测试关键词只有标点时不匹配任何题目"""
+        assert _run(db_manager, QuestionQuery(keyword="？！")) == set()
+    
+    def test_compiles_to_single_statement(self, db_manager, questions):
+        """测试所有条件编译为一条SQL语句"""
+        spec = QuestionQuery(
+            subject="数学", difficulty_min=1, mastery_levels=frozenset({0, 1}),
+            tags_all=("重点",), tags_any=("易错", "重点"), keyword="函数",
+            created_from=NOW - timedelta(days=30), due=True, now=NOW,
+        )
+        statements = []
+        
+        def capture(conn, cursor, statement, *args):
+            if statement.startswith("SELECT"):
+                statements.append(statement)
+        
+        event.listen(db_manager.engine, "before_cursor_execute", capture)
+        try:
+            result = _run(db_manager, spec)
+        finally:
+            event.remove(db_manager.engine, "before_cursor_execute", capture)
+        
+        assert result == {questions["math_choice"], questions["math_blank"]}
+        assert len(statements) == 1
+
+
+class TestFromFilters:
+    """测试从筛选字典构造"""
+    
+    def test_legacy_keys(self):
+        """测试旧式筛选字典的键"""
+        spec = QuestionQuery.from_filters({
+            "subject": "数学", "question_type": "选择题", "difficulty": 3,
+            "mastery_level": 0, "tags": ["重点"],
+        })
+        
+        assert spec == QuestionQuery(
+            subject="数学", question_type="选择题", difficulty_min=3, difficulty_max=3,
+            mastery_levels=frozenset({0}), tags_all=("重点",),
+        )
+    
+    def test_empty_values_ignored(self):
+        """测试空值不参与筛选"""
+        filters = {"subject": "", "tags": [], "difficulty": None}
+        assert QuestionQuery.from_filters(filters) == QuestionQuery()
+        assert QuestionQuery.from_filters(None) == QuestionQuery()
+    
+    def test_unknown_key_rejected(self):
+        """测试不支持的键会报错，而不是被静默忽略"""
+        with pytest.raises(ValueError):
+            QuestionQuery.from_filters({"subjet": "数学"})
+    
+    def test_where_returns_new_query(self):
+        """测试 where 返回新对象"""
+        base = QuestionQuery(subject="数学")
+        narrowed = base.where(mastery_levels=[1, 2], tags_any=["重点"])
+        
+        assert base.mastery_levels == frozenset()
+        assert narrowed.mastery_levels == frozenset({1, 2})
+        assert narrowed.tags_any == ("重点",)
+
+
+class TestFilteringPaths:
+    """测试业务层的筛选都通过 QuestionQuery 在数据库中完成"""
+    
+    def test_module_filter_honours_question_type(self, db_manager, questions):
+        """测试按模块（科目+题型）筛选"""
+        data_manager = DataManager(db_manager)
+        
+        result = data_manager.search_questions({"subject": "数学", "question_type": "填空题"})
+        
+        assert [q["id"] for q in result] == [questions["math_blank"]]
+    
+    def test_ui_filter_questions(self, db_manager, questions):
+        """测试UI筛选：难度精确匹配，多个标签为任一包含"""
+        # services 包导入通知模块，依赖 plyer
+        pytest.importorskip("plyer")
+        from mistake_book.services.ui_service import UIService
+        
+        ui_service = UIService(DataManager(db_manager))
+        
+        by_difficulty = ui_service.filter_questions({"subject": "数学", "difficulty": 3})
+        by_tags = ui_service.filter_questions({"tags": ["重点", "易错"], "mastery_level": None})
+        
+        assert [q["id"] for q in by_difficulty] == [questions["math_blank"]]
+        assert {q["id"] for q in by_tags} == {
+            questions["math_choice"], questions["math_blank"], questions["math_proof"]
+        }
@@ -0,0 +1,43 @@
+"""ReviewScheduler 单元测试"""
+
+import sys
+import pytest
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from mistake_book.core.review_scheduler import ReviewScheduler, due_cutoff
+
+NOW = datetime(2024, 5, 10, 9, 0, 0)
+
+
+@pytest.fixture
+def scheduler():
+    """创建调度器"""
+    return ReviewScheduler()
+
+
+class TestDueQuestions:
+    """测试到期判断"""
+    
+    def test_due_cutoff_is_start_of_tomorrow(self):
+        """测试截止时间为次日零点"""
+        assert due_cutoff(NOW) == datetime(2024, 5, 11)
+    
+    def test_mixed_date_types_and_missing_dates(self, scheduler):
+        """测试datetime、date和空日期混合时不报错且规则一致"""
+        questions = [
+            {"id": 1, "next_review_date": NOW + timedelta(days=1)},
+            {"id": 2, "next_review_date": NOW.replace(hour=22)},
+            {"id": 3, "next_review_date": date(2024, 5, 1)},
+            {"id": 4, "next_review_date": None},
+            {"id": 5},
+            {"id": 6, "next_review_date": date(2024, 5, 11)},
+        ]
+        
+        due = scheduler.get_due_questions(questions, now=NOW)
+        
+        assert [q["id"] for q in due] == [4, 5, 3, 2]
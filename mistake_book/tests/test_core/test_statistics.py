@@ -0,0 +1,130 @@
+"""StatisticsEngine 单元测试"""
+
+import sys
+import pytest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from sqlalchemy import event
+
+from mistake_book.core.statistics import StatisticsEngine
+from mistake_book.database.db_manager import DatabaseManager
+from mistake_book.database.models import Question, ReviewRecord, Tag
+
+NOW = datetime(2024, 5, 10, 15, 0, 0)
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    """创建临时数据库"""
+    manager = DatabaseManager(tmp_path / "test.db")
+    yield manager
+    manager.dispose()
+
+
+@pytest.fixture
+def engine(db_manager):
+    """创建统计引擎"""
+    return StatisticsEngine(db_manager)
+
+
+@pytest.fixture
+def sample_data(db_manager):
+    """创建题目、标签和复习记录"""
+    important = Tag(name="重点")
+    function = Tag(name="函数")
+    unused = Tag(name="未使用")
+    with db_manager.session_scope() as session:
+        session.add(unused)
+        q1 = Question(subject="数学", question_type="选择题", content="1", mastery_level=0,
+                      next_review_date=None)
+        q1.tags.extend([important, function])
+        q2 = Question(subject="数学", question_type="选择题", content="2", mastery_level=2,
+                      next_review_date=NOW - timedelta(days=1))
+        q2.tags.append(important)
+        q3 = Question(subject="数学", question_type="解答题", content="3", mastery_level=3,
+                      next_review_date=NOW + timedelta(days=3))
+        q4 = Question(subject="物理", question_type="填空题", content="4", mastery_level=1,
+                      next_review_date=NOW)
+        session.add_all([q1, q2, q3, q4])
+        session.flush()
+        session.add_all([
+            ReviewRecord(question_id=q2.id, review_date=NOW - timedelta(hours=2), result=2),
+            ReviewRecord(question_id=q4.id, review_date=NOW.replace(hour=0, minute=0), result=1),
+            ReviewRecord(question_id=q4.id, review_date=NOW - timedelta(days=1), result=0),
+        ])
+
+
+class TestStatisticsEngine:
+    """测试统计聚合"""
+    
+    def test_empty_database(self, engine):
+        """测试空数据库"""
+        stats = engine.collect(NOW)
+        
+        assert stats["total_questions"] == 0
+        assert stats["mastery_counts"] == {0: 0, 1: 0, 2: 0, 3: 0}
+        assert stats["subject_counts"] == {}
+        assert stats["tag_counts"] == {}
+        assert stats["due_count"] == 0
+        assert stats["today_reviewed"] == 0
+    
+    def test_totals_and_mastery(self, engine, sample_data):
+        """测试总数和掌握度统计"""
+        stats = engine.collect(NOW)
+        
+        assert stats["total_questions"] == 4
+        assert stats["mastery_counts"] == {0: 1, 1: 1, 2: 1, 3: 1}
+        assert stats["mastered"] == 2
+        assert stats["learning"] == 1
+        assert stats["unfamiliar"] == 1
+    
+    def test_subject_and_type_counts(self, engine, sample_data):
+        """测试科目和题型统计"""
+        stats = engine.collect(NOW)
+        
+        assert stats["subject_counts"] == {"数学": 3, "物理": 1}
+        assert stats["type_counts"] == {
+            "数学": {"选择题": 2, "解答题": 1},
+            "物理": {"填空题": 1},
+        }
+    
+    def test_tag_counts_exclude_unused_tags(self, engine, sample_data):
+        """测试标签统计（不包含没有题目的标签）"""
+        stats = engine.collect(NOW)
+        
+        assert stats["tag_counts"] == {"函数": 1, "重点": 2}
+    
+    def test_due_count_includes_never_scheduled(self, engine, sample_data):
+        """测试到期数量：未安排复习的新题目和已到期的题目"""
+        stats = engine.collect(NOW)
+        
+        # q1（未安排）、q2（昨天到期）、q4（恰好现在到期）
+        assert stats["due_count"] == 3
+    
+    def test_today_reviewed(self, engine, sample_data):
+        """测试今日复习次数只统计当天的记录"""
+        stats = engine.collect(NOW)
+        
+        assert stats["today_reviewed"] == 2
+        assert engine.collect(NOW + timedelta(days=1))["today_reviewed"] == 0
+    
+    def test_fixed_number_of_queries(self, engine, db_manager, sample_data):
+        """测试查询次数与题目数量无关"""
+        statements = []
+        
+        def count(conn, cursor, statement, *args):
+            statements.append(statement)
+        
+        event.listen(db_manager.engine, "before_cursor_execute", count)
+        try:
+            engine.collect(NOW)
+        finally:
+            event.remove(db_manager.engine, "before_cursor_execute", count)
+        
+        # 计数表、标签名、到期数量、今日复习
+        assert len([s for s in statements if s.startswith("SELECT")]) == 4
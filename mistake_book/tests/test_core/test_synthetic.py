@@ -0,0 +1,134 @@
+"""合成错题本生成器测试"""
+
+import sys
+import pytest
+from datetime import datetime
+from pathlib import Path
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from mistake_book.core.data_manager import DataManager
+from mistake_book.core.synthetic import SyntheticProfile, generate_notebook
+from mistake_book.database.counters import check_counters
+from mistake_book.database.db_manager import DatabaseManager
+
+NOW = datetime(2026, 3, 1, 8, 0, 0)
+
+
+def _profile(**overrides):
+    values = dict(questions=300, reviews=3000, seed=7, chunk_size=64, now=NOW)
+    values.update(overrides)
+    return SyntheticProfile(**values)
+
+
+def _dump(manager: DatabaseManager):
+    with manager.engine.connect() as conn:
+        return [
+            conn.exec_driver_sql(f"SELECT * FROM {table} ORDER BY 1, 2").fetchall()
+            for table in ("questions", "tags", "question_tags", "review_records")
+        ]
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    """创建临时数据库"""
+    manager = DatabaseManager(tmp_path / "test.db")
+    yield manager
+    manager.dispose()
+
+
+class TestGenerateNotebook:
+    """generate_notebook测试类"""
+    
+    def test_same_seed_same_data(self, tmp_path, db_manager):
+        """测试相同种子生成完全相同的数据，不同种子不同"""
+        generate_notebook(db_manager, _profile())
+        
+        same = DatabaseManager(tmp_path / "same.db")
+        other = DatabaseManager(tmp_path / "other.db")
+        try:
+            generate_notebook(same, _profile())
+            generate_notebook(other, _profile(seed=8))
+            assert _dump(same) == _dump(db_manager)
+            assert _dump(other)[0] != _dump(db_manager)[0]
+        finally:
+            same.dispose()
+            other.dispose()
+    
+    def test_counts_and_derived_tables(self, db_manager):
+        """测试数量正确，计数表、全文索引与基础表一致"""
+        progress = []
+        report = generate_notebook(db_manager, _profile(), progress=lambda d, t: progress.append(d))
+        
+        assert (report.questions, report.reviews, report.first_id) == (300, 3000, 1)
+        assert progress[-1] == 300
+        with db_manager.engine.connect() as conn:
+            assert conn.exec_driver_sql("SELECT COUNT(*) FROM review_records").scalar() == 3000
+            assert check_counters(conn) == []
+            indexed = conn.exec_driver_sql("SELECT COUNT(*) FROM questions_fts").scalar()
+            assert indexed == 300
+            subjects = conn.exec_driver_sql(
+                "SELECT COUNT(DISTINCT subject) FROM questions"
+            ).scalar()
+            assert subjects > 3
+        
+        hits = DataManager(db_manager).full_text_search("函数", limit=5)
+        assert hits and all("函数" in hit["snippet"] for hit in hits)
+    
+    def test_review_histories_follow_sm2(self, db_manager):
+        """测试复习历史按时间递增，题目的复习状态与最后一次复习一致"""
+        generate_notebook(db_manager, _profile())
+        data_manager = DataManager(db_manager)
+        
+        with db_manager.engine.connect() as conn:
+            histories = {}
+            for question_id, review_date, result in conn.exec_driver_sql(
+                "SELECT question_id, review_date, result FROM review_records ORDER BY id"
+            ):
+                histories.setdefault(question_id, []).append((review_date, result))
+            unreviewed = conn.exec_driver_sql(
+                "SELECT COUNT(*) FROM questions WHERE id NOT IN "
+                "(SELECT question_id FROM review_records) AND next_review_date IS NULL"
+            ).scalar()
+        
+        assert histories and unreviewed > 0
+        for question_id in list(histories)[:50]:
+            question = data_manager.get_question(question_id)
+            dates = [date for date, _ in histories[question_id]]
+            assert dates == sorted(dates)
+            assert question["created_at"].isoformat(" ") <= dates[0] and dates[-1] <= str(NOW)
+            assert question["repetitions"] <= len(dates)
+            assert question["mastery_level"] == histories[question_id][-1][1]
+            assert question["next_review_date"].isoformat(" ") > dates[-1]
+    
+    def test_appends_and_restores_triggers(self, db_manager):
+        """测试追加到已有数据之后，生成后新增题目仍然更新计数和全文索引"""
+        data_manager = DataManager(db_manager)
+        existing = data_manager.add_question({"subject": "数学", "content": "已有题目"})
+        
+        report = generate_notebook(db_manager, _profile(questions=50, reviews=100))
+        assert report.first_id == existing + 1
+        
+        data_manager.add_question({"subject": "历史", "content": "辛亥革命的意义"})
+        with db_manager.engine.connect() as conn:
+            assert check_counters(conn) == []
+        assert [hit["subject"] for hit in data_manager.full_text_search("辛亥")] == ["历史"]
+    
+    def test_images_written_and_referenced(self, tmp_path, db_manager):
+        """测试生成图片文件（含重复内容的副本），题目引用的图片都存在"""
+        pytest.importorskip("PIL")
+        images_dir = tmp_path / "images"
+        report = generate_notebook(
+            db_manager, _profile(image_count=10, image_ratio=0.5), images_dir=images_dir
+        )
+        
+        assert report.images == 10
+        contents = [path.read_bytes() for path in sorted(images_dir.iterdir())]
+        assert len(contents) == 10 and len(set(contents)) < 10
+        with db_manager.engine.connect() as conn:
+            paths = [row[0] for row in conn.exec_driver_sql(
+                "SELECT image_path FROM questions WHERE image_path IS NOT NULL"
+            )]
+        assert paths and all((images_dir / path).exists() for path in paths)
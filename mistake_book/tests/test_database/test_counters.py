@@ -0,0 +1,234 @@
+"""题目计数表（触发器维护）测试"""
+
+import sys
+import random
+import pytest
+from pathlib import Path
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from mistake_book.database.db_manager import DatabaseManager
+from mistake_book.database.counters import (
+    COUNTERS_TABLE, check_counters, read_counters, rebuild_counters
+)
+from mistake_book.database.models import Question, Tag
+
+SUBJECTS = ["数学", "物理", "化学"]
+QUESTION_TYPES = ["选择题", "填空题", "解答题", None]
+TAG_NAMES = ["重点", "易错", "函数", "力学"]
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    """创建临时数据库"""
+    manager = DatabaseManager(tmp_path / "test.db")
+    yield manager
+    manager.dispose()
+
+
+def _check(db_manager):
+    with db_manager.engine.connect() as conn:
+        return check_counters(conn)
+
+
+def _counters(db_manager):
+    with db_manager.engine.connect() as conn:
+        return read_counters(conn)
+
+
+def _random_question(rng, tags):
+    question = Question(
+        subject=rng.choice(SUBJECTS),
+        question_type=rng.choice(QUESTION_TYPES),
+        content="题目",
+        mastery_level=rng.randint(0, 3),
+    )
+    question.tags.extend(rng.sample(tags, rng.randint(0, 2)))
+    return question
+
+
+def _random_mutation(rng, session, tags):
+    """对数据库执行一次随机修改"""
+    ids = [qid for (qid,) in session.query(Question.id).all()]
+    action = rng.choice(["add", "add", "update", "delete", "tag", "untag", "raw_update"])
+    
+    if action == "add" or not ids:
+        session.add(_random_question(rng, tags))
+        return
+    
+    question = session.get(Question, rng.choice(ids))
+    if action == "update":
+        field = rng.choice(["subject", "question_type", "mastery_level", "content"])
+        if field == "subject":
+            question.subject = rng.choice(SUBJECTS)
+        elif field == "question_type":
+            question.question_type = rng.choice(QUESTION_TYPES)
+        elif field == "mastery_level":
+            question.mastery_level = rng.randint(0, 3)
+        else:
+            question.content = "修改后的题目"
+    elif action == "delete":
+        session.delete(question)
+    elif action == "tag":
+        missing = [t for t in tags if t not in question.tags]
+        if missing:
+            question.tags.append(rng.choice(missing))
+    elif action == "untag":
+        if question.tags:
+            question.tags.remove(rng.choice(question.tags))
+    else:
+        # 绕过ORM的批量更新也应被触发器计入
+        session.execute(
+            Question.__table__.update()
+            .where(Question.subject == rng.choice(SUBJECTS))
+            .values(mastery_level=rng.randint(0, 3))
+        )
+
+
+class TestCounterTriggers:
+    """测试触发器维护计数"""
+    
+    def test_insert_update_delete(self, db_manager):
+        """测试基本的增删改"""
+        with db_manager.session_scope() as session:
+            tag = Tag(name="重点")
+            question = Question(subject="数学", question_type="选择题", content="1")
+            question.tags.append(tag)
+            session.add(question)
+            session.add(
+                Question(subject="数学", question_type="解答题", content="2", mastery_level=2)
+            )
+            session.flush()
+            question_id, tag_id = question.id, tag.id
+        
+        counters = _counters(db_manager)
+        assert counters["total"] == {"": 2}
+        assert counters["subject"] == {"数学": 2}
+        assert counters["mastery_level"] == {0: 1, 2: 1}
+        assert counters["module"] == {("数学", "选择题"): 1, ("数学", "解答题"): 1}
+        assert counters["tag"] == {tag_id: 1}
+        
+        with db_manager.session_scope() as session:
+            session.get(Question, question_id).subject = "物理"
+        
+        counters = _counters(db_manager)
+        assert counters["subject"] == {"数学": 1, "物理": 1}
+        assert counters["module"] == {("物理", "选择题"): 1, ("数学", "解答题"): 1}
+        
+        with db_manager.session_scope() as session:
+            session.delete(session.get(Question, question_id))
+        
+        counters = _counters(db_manager)
+        assert counters["total"] == {"": 1}
+        # 计数为0的行被删除
+        assert "物理" not in counters["subject"]
+        assert counters["tag"] == {}
+    
+    def test_unset_question_type_reads_as_empty_string(self, db_manager):
+        """测试未设置题型的题目按空字符串计入 (科目, 题型) 组合，修改后正确加减"""
+        with db_manager.session_scope() as session:
+            question = Question(subject="数学", question_type=None, content="1")
+            session.add(question)
+            session.flush()
+            question_id = question.id
+        
+        counters = _counters(db_manager)
+        assert counters["question_type"] == {"": 1}
+        assert counters["module"] == {("数学", ""): 1}
+        
+        with db_manager.session_scope() as session:
+            session.get(Question, question_id).question_type = "选择题"
+        
+        assert _counters(db_manager)["module"] == {("数学", "选择题"): 1}
+        with db_manager.engine.begin() as conn:
+            conn.exec_driver_sql("UPDATE questions SET question_type = NULL")
+            rebuild_counters(conn)
+        assert _counters(db_manager)["module"] == {("数学", ""): 1}
+        assert _check(db_manager) == []
+    
+    def test_unrelated_update_does_not_change_counters(self, db_manager):
+        """测试修改不参与计数的列时计数不变"""
+        with db_manager.session_scope() as session:
+            question = Question(subject="数学", content="1")
+            session.add(question)
+            session.flush()
+            question_id = question.id
+        
+        with db_manager.session_scope() as session:
+            session.get(Question, question_id).content = "新内容"
+        
+        assert _counters(db_manager)["total"] == {"": 1}
+        assert _check(db_manager) == []
+    
+    @pytest.mark.parametrize("seed", range(5))
+    def test_random_mutation_sequences(self, db_manager, seed):
+        """测试随机修改序列后计数与基础表一致"""
+        rng = random.Random(seed)
+        with db_manager.session_scope() as session:
+            for name in TAG_NAMES:
+                session.add(Tag(name=name))
+        
+        for _ in range(20):
+            with db_manager.session_scope() as session:
+                tags = session.query(Tag).all()
+                for _ in range(rng.randint(1, 5)):
+                    _random_mutation(rng, session, tags)
+                    session.flush()
+            assert _check(db_manager) == []
+    
+    def test_rolled_back_transaction(self, db_manager):
+        """测试回滚的修改不影响计数"""
+        with pytest.raises(RuntimeError):
+            with db_manager.session_scope() as session:
+                session.add(Question(subject="数学", content="1"))
+                session.flush()
+                raise RuntimeError("rollback")
+        
+        assert _counters(db_manager)["total"] == {}
+        assert _check(db_manager) == []
+
+
+class TestCheckAndRebuild:
+    """测试一致性检查和重建"""
+    
+    def test_check_detects_and_rebuild_repairs(self, db_manager):
+        """测试检查能发现不一致，重建后恢复一致"""
+        with db_manager.session_scope() as session:
+            session.add(Question(subject="数学", content="1"))
+            session.add(Question(subject="物理", content="2"))
+        
+        with db_manager.engine.begin() as conn:
+            conn.exec_driver_sql(
+                f"UPDATE {COUNTERS_TABLE} SET count = 5 WHERE facet = 'subject' AND value = '数学'"
+            )
+            conn.exec_driver_sql(f"DELETE FROM {COUNTERS_TABLE} WHERE facet = 'total'")
+        
+        mismatches = _check(db_manager)
+        assert ("subject", "数学", 1, 5) in mismatches
+        assert ("total", "", 2, 0) in mismatches
+        
+        with db_manager.engine.begin() as conn:
+            rebuild_counters(conn)
+        
+        assert _check(db_manager) == []
+        assert _counters(db_manager)["total"] == {"": 2}
+    
+    def test_migration_backfills_existing_rows(self, db_manager):
+        """测试迁移为已有数据初始化计数"""
+        from mistake_book.database.migrations import MigrationRunner
+        
+        # 模拟升级前的数据库：没有计数表
+        with db_manager.engine.begin() as conn:
+            for suffix in ("q_ai", "q_ad", "q_au", "qt_ai", "qt_ad", "qt_au"):
+                conn.exec_driver_sql(f"DROP TRIGGER {COUNTERS_TABLE}_{suffix}")
+            conn.exec_driver_sql(f"DROP TABLE {COUNTERS_TABLE}")
+            conn.exec_driver_sql("DELETE FROM schema_version WHERE version >= 6")
+        with db_manager.session_scope() as session:
+            session.add(Question(subject="数学", content="1"))
+        
+        MigrationRunner(db_manager.engine).run()
+        
+        assert _counters(db_manager)["subject"] == {"数学": 1}
+        assert _check(db_manager) == []
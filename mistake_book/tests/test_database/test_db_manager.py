@@ -0,0 +1,149 @@
+"""DatabaseManager 单元测试"""
+
+import sys
+import threading
+import pytest
+from pathlib import Path
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from mistake_book.database.db_manager import DatabaseManager, EngineProfile
+from mistake_book.database.models import Question
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    """创建临时数据库"""
+    manager = DatabaseManager(tmp_path / "test.db")
+    yield manager
+    manager.dispose()
+
+
+def _pragma(manager, name):
+    with manager.engine.connect() as conn:
+        return conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+
+class TestEngineProfile:
+    """测试引擎配置"""
+    
+    def test_default_pragmas_applied(self, db_manager):
+        """测试默认PRAGMA在连接上生效"""
+        assert _pragma(db_manager, "journal_mode").lower() == "wal"
+        assert _pragma(db_manager, "synchronous") == 1  # NORMAL
+        assert _pragma(db_manager, "cache_size") == -64 * 1024
+        assert _pragma(db_manager, "temp_store") == 2  # MEMORY
+        assert _pragma(db_manager, "busy_timeout") == 5000
+    
+    def test_custom_profile(self, tmp_path):
+        """测试自定义配置"""
+        profile = EngineProfile(cache_size_kb=2048, mmap_size=0, busy_timeout_ms=1234)
+        manager = DatabaseManager(tmp_path / "custom.db", profile)
+        try:
+            assert _pragma(manager, "cache_size") == -2048
+            assert _pragma(manager, "mmap_size") == 0
+            assert _pragma(manager, "busy_timeout") == 1234
+        finally:
+            manager.dispose()
+    
+    def test_pragmas_applied_to_every_pooled_connection(self, db_manager):
+        """测试连接池中的每个连接都应用了配置"""
+        conns = [db_manager.engine.connect() for _ in range(3)]
+        try:
+            for conn in conns:
+                assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000
+        finally:
+            for conn in conns:
+                conn.close()
+
+
+class TestConcurrency:
+    """测试并发读写"""
+    
+    def test_session_usable_from_worker_thread(self, db_manager):
+        """测试后台线程可以使用连接池中的连接"""
+        with db_manager.session_scope() as session:
+            session.add(Question(subject="数学", content="1+1=?"))
+        
+        results = []
+        
+        def worker():
+            with db_manager.session_scope() as session:
+                results.append(session.query(Question).count())
+        
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        
+        assert results == [1]
+    
+    def test_reader_not_blocked_by_open_write(self, db_manager):
+        """测试写事务未提交时读取不被阻塞（WAL）"""
+        with db_manager.session_scope() as session:
+            session.add(Question(subject="数学", content="旧题目"))
+        
+        writer = db_manager.get_fresh_session()
+        try:
+            writer.add(Question(subject="物理", content="新题目"))
+            writer.flush()
+            
+            with db_manager.session_scope() as reader:
+                assert reader.query(Question).count() == 1
+            
+            writer.commit()
+        finally:
+            writer.close()
+        
+        with db_manager.session_scope() as reader:
+            assert reader.query(Question).count() == 2
+
+    def test_immediate_scope_takes_write_lock(self, tmp_path):
+        """测试 immediate 事务开始时即获取写锁，其他写事务要等它结束"""
+        manager = DatabaseManager(tmp_path / "lock.db", EngineProfile(busy_timeout_ms=100))
+        try:
+            with manager.session_scope(immediate=True):
+                other = manager.get_fresh_session()
+                try:
+                    other.add(Question(subject="数学", content="1"))
+                    with pytest.raises(Exception, match="locked"):
+                        other.flush()
+                finally:
+                    other.close()
+        finally:
+            manager.dispose()
+
+
+class TestBackup:
+    """测试备份与恢复"""
+    
+    def test_backup_contains_uncheckpointed_data(self, db_manager, tmp_path):
+        """测试备份包含WAL中的数据"""
+        with db_manager.session_scope() as session:
+            session.add(Question(subject="数学", content="备份题目"))
+        
+        backup_dir = tmp_path / "backups"
+        backup_dir.mkdir()
+        backup_path = db_manager.backup(backup_dir)
+        
+        restored = DatabaseManager(backup_path)
+        try:
+            with restored.session_scope() as session:
+                assert session.query(Question).count() == 1
+        finally:
+            restored.dispose()
+    
+    def test_restore(self, db_manager, tmp_path):
+        """测试恢复备份"""
+        backup_dir = tmp_path / "backups"
+        backup_dir.mkdir()
+        backup_path = db_manager.backup(backup_dir)
+        
+        with db_manager.session_scope() as session:
+            session.add(Question(subject="数学", content="备份后添加"))
+        
+        db_manager.restore(backup_path)
+        
+        with db_manager.session_scope() as session:
+            assert session.query(Question).count() == 0
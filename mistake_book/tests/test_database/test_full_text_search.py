@@ -0,0 +1,182 @@
+"""全文检索测试"""
+
+import sqlite3
+import sys
+import pytest
+from pathlib import Path
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from mistake_book.database.db_manager import DatabaseManager
+from mistake_book.database.fts import cjk_bigrams, build_match_query, make_snippet
+from mistake_book.core.data_manager import DataManager
+
+
+@pytest.fixture
+def data_manager(tmp_path):
+    """创建带临时数据库的DataManager"""
+    db_manager = DatabaseManager(tmp_path / "test.db")
+    yield DataManager(db_manager)
+    db_manager.dispose()
+
+
+def _ids(hits):
+    return [hit['id'] for hit in hits]
+
+
+class TestTokenizer:
+    """测试中文分词展开"""
+    
+    def test_cjk_bigrams(self):
+        """测试中文展开为二元组，英文保持不变"""
+        assert cjk_bigrams("二次函数").split() == ["二次", "次函", "函数", "数"]
+        assert cjk_bigrams("solve x") == "solve x"
+        assert cjk_bigrams(None) == ""
+    
+    def test_build_match_query(self):
+        """测试查询表达式构造"""
+        assert build_match_query("二次函数") == '"二次 次函 函数" *'
+        assert build_match_query("函数 最值") == '"函数" AND "最值" *'
+        assert build_match_query("  ") is None
+        # 引号被转义，不会破坏表达式
+        assert build_match_query('a"b') == '"a b" *'
+    
+    def test_make_snippet_highlights_and_escapes(self):
+        """测试摘要高亮并转义HTML"""
+        snippet = make_snippet("若 a<b，求函数的最值", "函数")
+        assert "<b>函数</b>" in snippet
+        assert "a&lt;b" in snippet
+
+
+class TestFullTextSearch:
+    """测试DataManager.full_text_search"""
+    
+    def test_chinese_substring_match(self, data_manager):
+        """测试中文片段检索"""
+        qid = data_manager.add_question(
+            {'subject': '数学', 'content': '已知二次函数的图像，求顶点坐标'}
+        )
+        data_manager.add_question({'subject': '物理', 'content': '匀速直线运动的速度'})
+        
+        assert _ids(data_manager.full_text_search("函数")) == [qid]
+        assert _ids(data_manager.full_text_search("顶点坐标")) == [qid]
+        assert _ids(data_manager.full_text_search("点")) == [qid]
+        assert data_manager.full_text_search("化学") == []
+    
+    def test_searches_answer_explanation_and_subject(self, data_manager):
+        """测试答案、解析和科目也参与检索"""
+        qid = data_manager.add_question({
+            'subject': '英语', 'content': 'Choose the answer',
+            'answer': 'photosynthesis', 'explanation': '考查被动语态'
+        })
+        
+        assert _ids(data_manager.full_text_search("photo")) == [qid]
+        assert _ids(data_manager.full_text_search("被动语态")) == [qid]
+        assert _ids(data_manager.full_text_search("英语")) == [qid]
+    
+    def test_multiple_terms_are_and_joined(self, data_manager):
+        """测试多个关键词同时包含"""
+        both = data_manager.add_question({'subject': '数学', 'content': '三角函数的周期'})
+        data_manager.add_question({'subject': '数学', 'content': '三角形内角和'})
+        
+        assert _ids(data_manager.full_text_search("三角 周期")) == [both]
+    
+    def test_content_match_ranks_first(self, data_manager):
+        """测试题目内容命中排在解析命中之前"""
+        in_explanation = data_manager.add_question({
+            'subject': '数学', 'content': '求面积', 'explanation': '利用导数求解'
+        })
+        in_content = data_manager.add_question({'subject': '数学', 'content': '导数的几何意义'})
+        
+        assert _ids(data_manager.full_text_search("导数")) == [in_content, in_explanation]
+    
+    def test_limit_and_offset(self, data_manager):
+        """测试分页"""
+        for i in range(5):
+            data_manager.add_question({'subject': '数学', 'content': f'方程第{i}题'})
+        
+        first = data_manager.full_text_search("方程", limit=2)
+        rest = data_manager.full_text_search("方程", limit=10, offset=2)
+        assert len(first) == 2
+        assert len(rest) == 3
+        assert not set(_ids(first)) & set(_ids(rest))
+        assert len(data_manager.full_text_search("方程", limit=None)) == 5
+    
+    def test_index_follows_update_and_delete(self, data_manager):
+        """测试触发器同步更新和删除"""
+        qid = data_manager.add_question({'subject': '数学', 'content': '旧的内容'})
+        data_manager.update_question(qid, {'content': '新的题干'})
+        
+        assert data_manager.full_text_search("旧的") == []
+        assert _ids(data_manager.full_text_search("题干")) == [qid]
+        
+        data_manager.delete_question(qid)
+        assert data_manager.full_text_search("题干") == []
+    
+    def test_snippet_returned(self, data_manager):
+        """测试结果包含高亮摘要"""
+        data_manager.add_question({'subject': '数学', 'content': '求函数的单调区间'})
+        
+        hit = data_manager.full_text_search("单调")[0]
+        assert "<b>单调</b>" in hit['snippet']
+        assert hit['subject'] == '数学'
+    
+    def test_existing_rows_indexed_by_migration(self, tmp_path):
+        """测试迁移为已有题目建立索引"""
+        db_path = tmp_path / "legacy.db"
+        db_manager = DatabaseManager(db_path)
+        data_manager = DataManager(db_manager)
+        qid = data_manager.add_question({'subject': '数学', 'content': '等差数列求和'})
+        
+        # 模拟旧数据库：删除索引和版本记录后重新打开
+        with db_manager.engine.begin() as conn:
+            conn.exec_driver_sql("DROP TABLE questions_fts")
+            conn.exec_driver_sql("DELETE FROM schema_version WHERE version >= 3")
+        db_manager.dispose()
+        
+        reopened = DatabaseManager(db_path)
+        try:
+            assert _ids(DataManager(reopened).full_text_search("数列")) == [qid]
+        finally:
+            reopened.dispose()
+    
+    def test_external_writes_indexed_on_next_open(self, tmp_path):
+        """测试其他程序（未注册分词函数）可以写入题目，重新打开时建立索引"""
+        db_path = tmp_path / "external.db"
+        DatabaseManager(db_path).dispose()
+        
+        conn = sqlite3.connect(str(db_path))
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT INTO questions (subject, content, answer, created_at, updated_at) "
+                    "VALUES ('数学', '等比数列求和', '', datetime('now'), datetime('now'))"
+                )
+                conn.execute("UPDATE questions SET content = '等比数列通项'")
+        finally:
+            conn.close()
+        
+        reopened = DatabaseManager(db_path)
+        try:
+            data_manager = DataManager(reopened)
+            assert len(data_manager.full_text_search("通项")) == 1
+            assert data_manager.full_text_search("求和") == []
+        finally:
+            reopened.dispose()
+    
+    def test_external_writes_indexed_on_next_write(self, data_manager, tmp_path):
+        """测试其他程序写入的题目在本程序下次写入时建立索引"""
+        conn = sqlite3.connect(str(tmp_path / "test.db"))
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT INTO questions (subject, content, answer, created_at, updated_at) "
+                    "VALUES ('数学', '三角函数诱导公式', '', datetime('now'), datetime('now'))"
+                )
+        finally:
+            conn.close()
+        
+        data_manager.add_question({'subject': '物理', 'content': '牛顿第二定律'})
+        assert len(data_manager.full_text_search("诱导")) == 1
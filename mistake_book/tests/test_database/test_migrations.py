@@ -0,0 +1,158 @@
+"""数据库迁移测试"""
+
+import sqlite3
+import sys
+import pytest
+from pathlib import Path
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from mistake_book.database.db_manager import DatabaseManager
+from mistake_book.database.migrations import MIGRATIONS, Migration, MigrationRunner
+
+
+# 迁移系统引入之前的表结构
+LEGACY_SCHEMA = """
+CREATE TABLE questions (
+    id INTEGER PRIMARY KEY, subject VARCHAR(50) NOT NULL, question_type VARCHAR(20),
+    content TEXT NOT NULL, answer TEXT, my_answer TEXT, explanation TEXT,
+    difficulty INTEGER, image_path VARCHAR(500), mastery_level INTEGER,
+    easiness_factor FLOAT, repetitions INTEGER, interval INTEGER,
+    next_review_date DATETIME, created_at DATETIME, updated_at DATETIME
+);
+CREATE TABLE tags (id INTEGER PRIMARY KEY, name VARCHAR(50) NOT NULL UNIQUE, color VARCHAR(7));
+CREATE TABLE question_tags (
+    question_id INTEGER REFERENCES questions (id),
+    tag_id INTEGER REFERENCES tags (id)
+);
+CREATE TABLE review_records (
+    id INTEGER PRIMARY KEY, question_id INTEGER REFERENCES questions (id),
+    review_date DATETIME, result INTEGER, time_spent INTEGER
+);
+INSERT INTO questions (id, subject, question_type, content) VALUES (1, '数学', '选择题', '1+1=?');
+INSERT INTO tags (id, name) VALUES (1, '代数');
+INSERT INTO question_tags VALUES (1, 1);
+INSERT INTO question_tags VALUES (1, 1);
+INSERT INTO question_tags VALUES (NULL, 1);
+"""
+
+
+def _index_names(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'").fetchall()
+        return {row[0] for row in rows}
+    finally:
+        conn.close()
+
+
+def _latest_version():
+    return max(m.version for m in MIGRATIONS)
+
+
+class TestMigrationRunner:
+    """测试迁移执行器"""
+    
+    def test_fresh_database_is_at_latest_version(self, tmp_path):
+        """测试新建数据库记录了最新版本"""
+        manager = DatabaseManager(tmp_path / "fresh.db")
+        try:
+            runner = MigrationRunner(manager.engine)
+            assert runner.current_version() == _latest_version()
+            assert runner.pending() == []
+        finally:
+            manager.dispose()
+    
+    def test_fresh_database_has_indexes(self, tmp_path):
+        """测试新建数据库包含二级索引"""
+        db_path = tmp_path / "fresh.db"
+        DatabaseManager(db_path).dispose()
+        
+        indexes = _index_names(db_path)
+        assert "ix_questions_subject_type_due" in indexes
+        assert "ix_questions_mastery_level" in indexes
+        assert "ix_questions_next_review_date" in indexes
+        assert "ix_review_records_question_date" in indexes
+        assert "ix_question_tags_tag_id" in indexes
+        # 已被 (subject, question_type, next_review_date) 索引取代
+        assert "ix_questions_subject_type" not in indexes
+    
+    def test_legacy_database_is_upgraded(self, tmp_path):
+        """测试旧数据库升级后获得索引和复合主键"""
+        db_path = tmp_path / "legacy.db"
+        conn = sqlite3.connect(db_path)
+        conn.executescript(LEGACY_SCHEMA)
+        conn.close()
+        
+        DatabaseManager(db_path).dispose()
+        
+        indexes = _index_names(db_path)
+        assert "ix_questions_subject_type_due" in indexes
+        assert "ix_question_tags_tag_id" in indexes
+        assert "ix_review_records_client_token" in indexes
+        
+        conn = sqlite3.connect(db_path)
+        try:
+            pk = {row[1] for row in conn.execute("PRAGMA table_info(question_tags)") if row[5]}
+            assert pk == {"question_id", "tag_id"}
+            # 重复行和空行已被清理，原有数据保留
+            rows = conn.execute("SELECT question_id, tag_id FROM question_tags").fetchall()
+            assert rows == [(1, 1)]
+            assert conn.execute("SELECT COUNT(*) FROM questions").fetchone()[0] == 1
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(review_records)")}
+            assert "client_token" in columns
+        finally:
+            conn.close()
+    
+    def test_run_is_idempotent(self, tmp_path):
+        """测试重复执行不会再次应用迁移"""
+        manager = DatabaseManager(tmp_path / "test.db")
+        try:
+            assert MigrationRunner(manager.engine).run() == []
+        finally:
+            manager.dispose()
+    
+    def test_failed_migration_rolls_back(self, tmp_path):
+        """测试迁移失败时整体回滚，版本号不变"""
+        manager = DatabaseManager(tmp_path / "test.db")
+        version = _latest_version()
+        
+        def broken(conn):
+            conn.exec_driver_sql("CREATE TABLE half_done (id INTEGER)")
+            raise RuntimeError("迁移失败")
+        
+        runner = MigrationRunner(
+            manager.engine,
+            MIGRATIONS + [Migration(version + 1, "broken", broken)]
+        )
+        try:
+            with pytest.raises(RuntimeError):
+                runner.run()
+            
+            assert runner.current_version() == version
+            with manager.engine.connect() as conn:
+                exists = conn.exec_driver_sql(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'half_done'"
+                ).first()
+            assert exists is None
+        finally:
+            manager.dispose()
+    
+    def test_pending_migrations_applied_in_order(self, tmp_path):
+        """测试待执行迁移按版本顺序执行"""
+        manager = DatabaseManager(tmp_path / "test.db")
+        version = _latest_version()
+        calls = []
+        
+        extra = [
+            Migration(version + 2, "second", lambda conn: calls.append("second")),
+            Migration(version + 1, "first", lambda conn: calls.append("first")),
+        ]
+        try:
+            applied = MigrationRunner(manager.engine, MIGRATIONS + extra).run()
+            assert applied == [version + 1, version + 2]
+            assert calls == ["first", "second"]
+        finally:
+            manager.dispose()
@@ -1 +1 @@
-"""ģ"""
+"""测试模块"""
@@ -0,0 +1,201 @@
+"""按内容寻址的图片存储测试"""
+
+import hashlib
+import sys
+import pytest
+from pathlib import Path
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+# services 包导入通知模块，依赖 plyer
+pytest.importorskip("plyer")
+
+from mistake_book.core.data_manager import DataManager
+from mistake_book.database.db_manager import DatabaseManager
+from mistake_book.services.image_store import (
+    ImageStore, content_hash_of, is_content_path, migrate_legacy_images
+)
+from mistake_book.services.question_service import QuestionService
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"fake png body" * 100
+JPEG = b"\xff\xd8\xff\xe0" + b"fake jpeg body" * 100
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ImageStore(tmp_path / "images")
+
+
+@pytest.fixture
+def data_manager(tmp_path):
+    manager = DatabaseManager(tmp_path / "test.db")
+    yield DataManager(manager)
+    manager.dispose()
+
+
+@pytest.fixture
+def service(data_manager, store):
+    return QuestionService(data_manager, image_store=store)
+
+
+def _write(path: Path, data: bytes) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return path
+
+
+class TestImageStore:
+    """ImageStore测试类"""
+    
+    def test_add_is_content_addressed(self, tmp_path, store):
+        """测试按内容哈希分两级目录保存，扩展名由文件头决定，相同内容只保存一份"""
+        first = store.add(_write(tmp_path / "上传" / "截图.PNG", PNG))
+        second = store.add(_write(tmp_path / "other.jpeg", PNG))
+        
+        digest = hashlib.sha256(PNG).hexdigest()
+        assert first == second == f"{digest[:2]}/{digest[2:4]}/{digest}.png"
+        assert is_content_path(first) and content_hash_of(first) == digest
+        assert ImageStore.hash_of_path(store.full_path(first)) == digest
+        assert ImageStore.hash_of_path(tmp_path / "other.jpeg") is None
+        assert store.full_path(first).read_bytes() == PNG
+        assert store.disk_usage() == (1, len(PNG))
+        assert store.add(_write(tmp_path / "photo.bin", JPEG)).endswith(".jpg")
+    
+    def test_release_respects_references_and_pins(self, tmp_path, store):
+        """测试仍被引用或刚存入（保留中）的图片不会被删除"""
+        relative = store.add(_write(tmp_path / "a.png", PNG))
+        no_references = lambda paths: {}
+        
+        assert store.release_unreferenced([relative], no_references) == []
+        store.unpin(relative)
+        assert store.release_unreferenced([relative], lambda paths: {relative: 1}) == []
+        released = store.release_unreferenced([relative, "old_name.png", None], no_references)
+        assert released == [relative]
+        assert not store.full_path(relative).exists()
+        # 空的哈希前缀目录一并删除
+        assert [p.name for p in store.root.iterdir()] == [".incoming"]
+    
+    def test_collect_garbage(self, tmp_path, store):
+        """测试删除没有被引用的文件"""
+        kept = store.add(_write(tmp_path / "a.png", PNG))
+        dropped = store.add(_write(tmp_path / "b.jpg", JPEG))
+        store.unpin(kept)
+        store.unpin(dropped)
+        
+        assert store.collect_garbage({kept}) == [dropped]
+        assert list(store.iter_content_paths()) == [kept]
+
+
+class TestQuestionServiceImages:
+    """QuestionService 图片引用测试"""
+    
+    def test_duplicate_uploads_share_one_file(self, tmp_path, service, store, data_manager):
+        """测试重复上传共用一个文件，最后一个引用删除后文件才删除"""
+        ids = []
+        for name in ("a.png", "b.png"):
+            ok, _, question_id = service.create_question({
+                "subject": "数学", "content": f"题目{name}",
+                "image_path": str(_write(tmp_path / name, PNG))
+            })
+            assert ok
+            ids.append(question_id)
+        
+        path = data_manager.get_question(ids[0])["image_path"]
+        assert data_manager.get_question(ids[1])["image_path"] == path
+        assert data_manager.count_image_references([path]) == {path: 2}
+        assert service.get_image_full_path(path) == store.full_path(path)
+        
+        service.delete_question(ids[0])
+        assert store.full_path(path).exists()
+        service.delete_question(ids[1])
+        assert not store.full_path(path).exists()
+    
+    def test_replacing_image_releases_old_file(self, tmp_path, service, store, data_manager):
+        """测试更新题目图片后旧图片不再被引用时删除"""
+        _, _, question_id = service.create_question({
+            "subject": "数学", "content": "题目", "image_path": str(_write(tmp_path / "a.png", PNG))
+        })
+        old_path = data_manager.get_question(question_id)["image_path"]
+        
+        replacement = _write(tmp_path / "b.jpg", JPEG)
+        ok, _ = service.update_question(question_id, {"image_path": str(replacement)})
+        
+        new_path = data_manager.get_question(question_id)["image_path"]
+        assert ok and is_content_path(new_path) and new_path != old_path
+        assert store.full_path(new_path).exists()
+        assert not store.full_path(old_path).exists()
+    
+    def test_failed_insert_removes_new_image(self, tmp_path, service, store):
+        """测试题目写入失败时删除刚存入的图片"""
+        ok, _, _ = service.create_question({
+            "subject": "数学", "content": "题目", "no_such_column": 1,
+            "image_path": str(_write(tmp_path / "a.png", PNG))
+        })
+        
+        assert not ok
+        assert list(store.iter_content_paths()) == []
+    
+    def test_create_question_transcodes_photo(self, tmp_path, service, store, data_manager):
+        """测试保存题目时照片经入库处理（缩小、转为 WebP）后存入"""
+        Image = pytest.importorskip("PIL.Image")
+        photo = tmp_path / "photo.jpg"
+        Image.new("RGB", (3000, 2000), "white").save(photo, "JPEG", quality=95)
+        
+        _, _, question_id = service.create_question({
+            "subject": "数学", "content": "题目", "image_path": str(photo)
+        })
+        
+        path = data_manager.get_question(question_id)["image_path"]
+        assert is_content_path(path) and path.endswith(".webp")
+        with Image.open(store.full_path(path)) as stored:
+            assert max(stored.size) == service.ingest_options.max_dimension
+        assert store.full_path(path).stat().st_size < photo.stat().st_size
+    
+    def test_prepared_image_is_reused(self, tmp_path, service, monkeypatch):
+        """测试选择图片后在后台预先处理，保存时不再重复处理"""
+        Image = pytest.importorskip("PIL.Image")
+        photo = tmp_path / "photo.png"
+        Image.new("RGB", (2400, 1800), "white").save(photo)
+        calls = []
+        original = service.image_processor.prepare_for_storage
+        monkeypatch.setattr(service.image_processor, "prepare_for_storage",
+                            lambda *args: calls.append(args) or original(*args))
+        
+        service.prepare_image(str(photo))
+        service.prepare_image(str(photo))
+        ok, _, _ = service.create_question(
+            {"subject": "数学", "content": "题目", "image_path": str(photo)}
+        )
+        
+        assert ok and len(calls) == 1
+
+
+class TestLegacyMigration:
+    """旧图片迁移测试"""
+    
+    def test_migrate_rewrites_paths_and_dedupes(self, tmp_path, store, data_manager):
+        """测试旧文件名和绝对路径迁移为内容寻址路径，重复内容合并，旧文件删除"""
+        _write(store.root / "20240101_080000_a.png", PNG)
+        _write(store.root / "20240101_080000_b.png", PNG)
+        external = _write(tmp_path / "外部" / "c.jpg", JPEG)
+        image_paths = [
+            "20240101_080000_a.png", "20240101_080000_b.png", str(external), "missing.png"
+        ]
+        ids = [
+            data_manager.add_question({"subject": "数学", "content": str(i), "image_path": path})
+            for i, path in enumerate(image_paths, 1)
+        ]
+        
+        report = migrate_legacy_images(store, data_manager)
+        
+        paths = [data_manager.get_question(i)["image_path"] for i in ids]
+        assert (report.migrated, report.unique, report.removed) == (3, 2, 2)
+        assert report.missing == ["missing.png"]
+        assert paths[0] == paths[1] and is_content_path(paths[0]) and is_content_path(paths[2])
+        assert paths[3] == "missing.png"
+        assert store.full_path(paths[0]).read_bytes() == PNG
+        assert not (store.root / "20240101_080000_a.png").exists()
+        assert external.exists()
+        assert migrate_legacy_images(store, data_manager).migrated == 0
@@ -0,0 +1,179 @@
+"""OCR识别结果缓存测试"""
+
+import sys
+import pytest
+from pathlib import Path
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+# services 包导入通知模块，依赖 plyer
+pytest.importorskip("plyer")
+Image = pytest.importorskip("PIL.Image")
+
+from mistake_book.services.image_store import ImageStore
+from mistake_book.services.ocr_cache import OCRCache, image_content_hash
+from mistake_book.services.ocr_engine import OCRDetection, OCREngine
+from mistake_book.services.question_service import QuestionService
+
+SIGNATURE = {
+    "engine": "easyocr",
+    "version": "1.7.1",
+    "langs": ["ch_sim", "en"],
+    "params": {"min_size": 10},
+}
+HASH = "ab" * 32
+
+
+def _detections(*texts):
+    return [
+        OCRDetection(
+            box=[(0.0, i * 20.0), (100.0, i * 20.0), (100.0, i * 20.0 + 18), (0.0, i * 20.0 + 18)],
+            text=text,
+            confidence=0.9,
+        )
+        for i, text in enumerate(texts)
+    ]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = OCRCache(tmp_path / "ocr_cache.db")
+    yield cache
+    cache.close()
+
+
+class TestOCRCache:
+    """OCRCache测试类"""
+    
+    def test_round_trip_structured_result(self, tmp_path, cache):
+        """测试保存完整结果，重新打开缓存文件后仍能读取"""
+        detections = _detections("已知 x + 1 = 2", "求 x")
+        assert cache.get(HASH, SIGNATURE) is None
+        
+        cache.put(HASH, SIGNATURE, detections)
+        cache.put(HASH, SIGNATURE, [], {"preprocess": False})
+        cache.close()
+        
+        reopened = OCRCache(tmp_path / "ocr_cache.db")
+        assert reopened.get(HASH, SIGNATURE) == detections
+        assert reopened.get(HASH, SIGNATURE, {"preprocess": False}) == []
+        assert (reopened.hits, reopened.misses) == (2, 0)
+        reopened.close()
+    
+    def test_key_covers_engine_parameters(self, cache):
+        """测试语言、识别参数或识别方式不同时不命中，字典顺序无关"""
+        cache.put(HASH, SIGNATURE, _detections("a"), {"preprocess": True})
+        
+        assert cache.get(HASH, dict(reversed(list(SIGNATURE.items()))), {"preprocess": True})
+        assert cache.get(HASH, SIGNATURE, {"preprocess": False}) is None
+        assert cache.get(HASH, dict(SIGNATURE, langs=["en"]), {"preprocess": True}) is None
+        other_params = dict(SIGNATURE, params={"min_size": 20})
+        assert cache.get(HASH, other_params, {"preprocess": True}) is None
+        assert cache.get("cd" * 32, SIGNATURE, {"preprocess": True}) is None
+    
+    def test_engine_version_change_drops_old_results(self, tmp_path, cache):
+        """测试引擎版本变化后旧结果不命中并被删除"""
+        cache.put(HASH, SIGNATURE, _detections("a"))
+        cache.close()
+        
+        upgraded = OCRCache(tmp_path / "ocr_cache.db")
+        assert upgraded.get(HASH, dict(SIGNATURE, version="1.8.0")) is None
+        assert len(upgraded) == 0
+        upgraded.close()
+    
+    def test_size_cap_evicts_least_recently_used(self, tmp_path):
+        """测试总大小超过上限时淘汰最久未使用的结果"""
+        cache = OCRCache(tmp_path / "ocr_cache.db")
+        hashes = [f"{i:064x}" for i in range(3)]
+        for content_hash in hashes:
+            cache.put(content_hash, SIGNATURE, _detections("x" * 10))
+        cache.max_bytes = cache.total_bytes()  # 正好容纳三条
+        
+        cache.get(hashes[0], SIGNATURE)  # 最近使用过，不被淘汰
+        cache.put("f" * 64, SIGNATURE, _detections("y" * 10))
+        
+        assert cache.total_bytes() <= cache.max_bytes
+        assert cache.evictions == 1
+        assert cache.get(hashes[1], SIGNATURE) is None
+        assert cache.get(hashes[0], SIGNATURE) is not None
+        cache.close()
+    
+    def test_corrupt_file_is_recreated(self, tmp_path):
+        """测试缓存文件损坏时删除重建，不影响使用"""
+        path = tmp_path / "ocr_cache.db"
+        path.write_bytes(b"not a database" * 100)
+        cache = OCRCache(path)
+        
+        assert cache.get(HASH, SIGNATURE) is None
+        cache.put(HASH, SIGNATURE, _detections("a"))
+        assert cache.get(HASH, SIGNATURE) is not None
+        cache.close()
+    
+    def test_content_hash_independent_of_path(self, tmp_path):
+        """测试相同内容的文件、图片数据得到相同的哈希；存储中的文件不读取内容"""
+        first = tmp_path / "题目.png"
+        Image.new("RGB", (60, 40), "white").save(first)
+        second = tmp_path / "copy.png"
+        second.write_bytes(first.read_bytes())
+        
+        expected = image_content_hash(first.read_bytes())
+        assert image_content_hash(first) == image_content_hash(second) == expected
+        
+        store = ImageStore(tmp_path / "images")
+        stored = store.full_path(store.add(first))
+        stored.write_bytes(b"changed")  # 存储中的文件按路径中的哈希计算
+        assert image_content_hash(stored) == image_content_hash(second)
+
+
+class _CountingEngine(OCREngine):
+    """记录识别次数的引擎"""
+    
+    def __init__(self, texts=("x + 1 = 2",), version="1.0"):
+        self.texts = texts
+        self.version = version
+        self.calls = 0
+    
+    def is_available(self) -> bool:
+        return True
+    
+    def cache_signature(self):
+        return {"engine": "fake", "version": self.version, "langs": ["en"], "params": {}}
+    
+    def recognize(self, image) -> str:
+        raise AssertionError("启用缓存时应调用 recognize_detailed")
+    
+    def recognize_detailed(self, image):
+        self.calls += 1
+        return _detections(*self.texts)
+
+
+class TestRecognizeWithCache:
+    """QuestionService识别结果缓存测试类"""
+    
+    def test_second_recognition_uses_cache(self, tmp_path, cache):
+        """测试同一图片再次识别不调用引擎，引擎版本变化后重新识别"""
+        source = tmp_path / "a.png"
+        Image.new("RGB", (60, 40), "white").save(source)
+        engine = _CountingEngine()
+        service = QuestionService(None, engine, ocr_cache=cache)
+        
+        assert service.recognize_image_with_retry(source) == (True, "识别成功", "x + 1 = 2")
+        assert service.recognize_image_with_retry(source.read_bytes())[2] == "x + 1 = 2"
+        assert engine.calls == 1
+        
+        engine.version = "2.0"
+        service.recognize_image(source)
+        assert engine.calls == 2
+    
+    def test_empty_results_cached_for_both_attempts(self, tmp_path, cache):
+        """测试两次尝试都没有识别到文字时，再次识别不再调用引擎"""
+        source = tmp_path / "blank.png"
+        Image.new("RGB", (60, 40), "white").save(source)
+        engine = _CountingEngine(texts=())
+        service = QuestionService(None, engine, ocr_cache=cache)
+        
+        assert not service.recognize_image_with_retry(source)[0]
+        assert not service.recognize_image_with_retry(source)[0]
+        assert engine.calls == 2
@@ -0,0 +1,86 @@
+"""OCR内存输入测试"""
+
+import sys
+import pytest
+from pathlib import Path
+from unittest.mock import Mock
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+# services 包导入通知模块，依赖 plyer
+pytest.importorskip("plyer")
+Image = pytest.importorskip("PIL.Image")
+
+from mistake_book.services.ocr_engine import EasyOCREngine
+from mistake_book.services.question_service import QuestionService
+
+
+def _image(path: Path) -> Path:
+    Image.new("RGB", (120, 80), "white").save(path)
+    return path
+
+
+@pytest.fixture
+def ocr_engine():
+    engine = Mock()
+    engine.is_available.return_value = True
+    engine.recognize.return_value = "x + 1 = 2"
+    return engine
+
+
+class TestRecognizeImage:
+    """QuestionService.recognize_image测试类"""
+    
+    def test_preprocessed_image_passed_in_memory(self, tmp_path, ocr_engine):
+        """测试预处理后的图片直接交给引擎，不经过文件"""
+        service = QuestionService(Mock(), ocr_engine)
+        
+        success, _, text = service.recognize_image(_image(tmp_path / "题目.png"))
+        
+        assert success and text == "x + 1 = 2"
+        processed = ocr_engine.recognize.call_args.args[0]
+        assert isinstance(processed, Image.Image) and processed.mode == "L"
+    
+    def test_bytes_source(self, tmp_path, ocr_engine):
+        """测试剪贴板等来源的图片数据直接识别"""
+        service = QuestionService(Mock(), ocr_engine)
+        data = _image(tmp_path / "a.png").read_bytes()
+        
+        assert service.recognize_image_with_retry(data)[0]
+        assert isinstance(ocr_engine.recognize.call_args.args[0], Image.Image)
+        
+        service.recognize_image(data, preprocess=False)
+        assert ocr_engine.recognize.call_args.args[0] is data
+
+
+class TestEngineInput:
+    """EasyOCREngine输入转换测试类"""
+    
+    @pytest.fixture
+    def engine(self):
+        engine = EasyOCREngine()
+        engine.reader = Mock()
+        engine.reader.readtext.return_value = [([[0, 0]], "答案", 0.9)]
+        engine._init_attempted = engine._initialized = True
+        return engine
+    
+    @pytest.mark.parametrize("kind", ["path", "bytes", "image", "array"])
+    def test_sources_become_arrays(self, tmp_path, engine, kind):
+        """测试路径、图片数据、PIL 图片和数组都以 numpy 数组交给 EasyOCR"""
+        np = pytest.importorskip("numpy")
+        path = _image(tmp_path / "图片.png")
+        source = {
+            "path": path,
+            "bytes": path.read_bytes(),
+            "image": Image.open(path),
+            "array": np.zeros((80, 120, 3), dtype=np.uint8),
+        }[kind]
+        
+        assert engine.recognize(source) == "答案"
+        
+        array = engine.reader.readtext.call_args.args[0]
+        assert isinstance(array, np.ndarray) and array.shape == (80, 120, 3)
+        if kind == "array":
+            assert array is source
@@ -0,0 +1,128 @@
+"""OCR依赖按需加载测试"""
+
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+import pytest
+from pathlib import Path
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+# services 包导入通知模块，依赖 plyer
+pytest.importorskip("plyer")
+
+from mistake_book.services import ocr_loader
+from mistake_book.services.ocr_engine import EasyOCREngine, create_ocr_engine
+
+
+FAKE_EASYOCR = """
+import time
+IMPORT_COUNT = globals().get("IMPORT_COUNT", 0) + 1
+time.sleep(0.05)
+
+class Reader:
+    def __init__(self, langs, gpu=False, verbose=False, **kwargs):
+        self.langs = langs
+"""
+
+
+@pytest.fixture
+def fake_easyocr(tmp_path, monkeypatch):
+    """在临时目录中放一个假的 easyocr 包，并重置加载器状态"""
+    package = tmp_path / "easyocr"
+    package.mkdir()
+    (package / "__init__.py").write_text(FAKE_EASYOCR, encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "easyocr", raising=False)
+    monkeypatch.setattr(ocr_loader, "_easyocr", None)
+    monkeypatch.setattr(ocr_loader, "_import_error", None)
+    monkeypatch.setattr(ocr_loader, "_report", None)
+    monkeypatch.delenv("EASYOCR_MODULE_PATH", raising=False)
+    yield tmp_path
+    sys.modules.pop("easyocr", None)
+
+
+class TestOCRLoader:
+    def test_create_engine_does_not_import(self, fake_easyocr):
+        """测试创建引擎和检查可用性都不导入 easyocr"""
+        engine = create_ocr_engine()
+        
+        assert isinstance(engine, EasyOCREngine)
+        assert engine.is_available()
+        assert "easyocr" not in sys.modules
+        assert not ocr_loader.is_loaded()
+    
+    def test_import_once_across_threads(self, fake_easyocr):
+        """测试多个线程同时请求时只导入一次，并记录导入耗时"""
+        modules = []
+        threads = [
+            threading.Thread(target=lambda: modules.append(ocr_loader.import_ocr_stack()))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert len({id(module) for module in modules}) == 1
+        assert modules[0].IMPORT_COUNT == 1
+        assert "导入OCR依赖" in ocr_loader.import_report()
+    
+    def test_missing_easyocr(self, monkeypatch):
+        """测试未安装时 is_installed 为 False，导入失败后不再重试"""
+        monkeypatch.setattr(ocr_loader, "_easyocr", None)
+        monkeypatch.setattr(ocr_loader, "_import_error", None)
+        monkeypatch.setattr(ocr_loader.importlib.util, "find_spec", lambda name: None)
+        
+        assert not ocr_loader.is_installed()
+        assert create_ocr_engine() is None
+        
+        calls = []
+        
+        def failing_import(name):
+            calls.append(name)
+            raise ImportError(name)
+        
+        monkeypatch.setattr(ocr_loader.importlib, "import_module", failing_import)
+        for _ in range(2):
+            with pytest.raises(ImportError):
+                ocr_loader.import_ocr_stack()
+        assert calls == ["torch", "easyocr"]
+    
+    def test_preload_in_background(self, fake_easyocr):
+        """测试 preload 在后台线程导入并创建 reader，重复调用不重复加载"""
+        engine = create_ocr_engine()
+        engine.preload()
+        engine.preload()
+        
+        assert engine.wait_for_init(timeout=5)
+        assert not engine.is_initializing()
+        assert engine.reader.langs == ['ch_sim', 'en']
+        assert sys.modules["easyocr"].IMPORT_COUNT == 1
+
+
+def test_launch_path_skips_heavy_modules(tmp_path):
+    """测试导入主程序模块不会导入 torch / easyocr（即使它们可以导入）"""
+    pytest.importorskip("PyQt6")
+    for name in ("torch", "easyocr"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "__init__.py").write_text("", encoding="utf-8")
+    script = textwrap.dedent("""
+        import sys
+        import mistake_book.main
+        from mistake_book.utils.import_audit import loaded_heavy_modules
+        print(",".join(loaded_heavy_modules()))
+    """)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(project_root / "src"), str(tmp_path)]))
+    env.pop("MISTAKE_BOOK_EAGER_TORCH", None)
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True, text=True, env=env, cwd=tmp_path, timeout=60
+    )
+    
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().splitlines()[-1:] in ([], [""])
@@ -0,0 +1,232 @@
+"""查询结果缓存测试"""
+
+import sys
+import pytest
+from pathlib import Path
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+# services 包导入通知模块，依赖 plyer
+pytest.importorskip("plyer")
+
+from sqlalchemy import event
+
+from mistake_book.config.constants import ReviewResult
+from mistake_book.core.data_manager import DataManager
+from mistake_book.core.review_scheduler import ReviewScheduler
+from mistake_book.database.db_manager import DatabaseManager
+from mistake_book.services.query_cache import QueryCache
+from mistake_book.services.ui_service import UIService
+from mistake_book.ui.events.event_bus import EventBus
+from mistake_book.ui.events.events import (
+    QuestionAddedEvent,
+    QuestionUpdatedEvent,
+    QuestionDeletedEvent,
+    ReviewCompletedEvent
+)
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    """创建临时数据库"""
+    manager = DatabaseManager(tmp_path / "test.db")
+    yield manager
+    manager.dispose()
+
+
+@pytest.fixture
+def data_manager(db_manager):
+    """创建数据管理器，并添加几道题目"""
+    manager = DataManager(db_manager)
+    manager.add_questions([
+        {"subject": "数学", "content": f"题目{i}", "tags": ["代数"]} for i in range(5)
+    ])
+    return manager
+
+
+@pytest.fixture
+def event_bus():
+    bus = EventBus()
+    bus.clear()
+    yield bus
+    bus.clear()
+
+
+@pytest.fixture
+def cache(event_bus):
+    query_cache = QueryCache()
+    query_cache.bind(event_bus)
+    return query_cache
+
+
+@pytest.fixture
+def ui_service(data_manager, cache):
+    return UIService(data_manager, cache)
+
+
+@pytest.fixture
+def selects(db_manager):
+    """记录执行的 SELECT 语句"""
+    statements = []
+    
+    def capture(conn, cursor, statement, *args):
+        if statement.startswith("SELECT"):
+            statements.append(statement)
+    
+    event.listen(db_manager.engine, "before_cursor_execute", capture)
+    yield statements
+    event.remove(db_manager.engine, "before_cursor_execute", capture)
+
+
+def _refresh(ui_service):
+    """模拟主窗口一次刷新：列表、导航树、统计面板、筛选选项"""
+    ui_service.get_questions_page({}, page_size=50)
+    ui_service.get_navigation_data()
+    ui_service.get_statistics_summary()
+    ui_service.get_filter_options()
+
+
+class TestQueryCache:
+    def test_key_normalized(self):
+        """测试字典顺序、列表和元组不影响缓存键"""
+        assert QueryCache.make_key("q", {"a": 1, "b": [1, 2]}) == \
+            QueryCache.make_key("q", {"b": (1, 2), "a": 1})
+        assert QueryCache.make_key("q", {"a": 1}) != QueryCache.make_key("q", {"a": 2})
+    
+    def test_lru_eviction(self):
+        """测试超过条目上限时淘汰最久未使用的结果"""
+        cache = QueryCache(max_entries=2)
+        cache.get_or_load("a", lambda: 1)
+        cache.get_or_load("b", lambda: 2)
+        cache.get_or_load("a", lambda: 1)  # a 最近使用
+        cache.get_or_load("c", lambda: 3)
+        
+        calls = []
+        cache.get_or_load("a", lambda: calls.append("a"))
+        cache.get_or_load("b", lambda: calls.append("b"))
+        
+        assert calls == ["b"]
+        assert cache.evictions >= 1
+    
+    def test_memory_cap(self):
+        """测试估算内存占用不超过上限，过大的结果不缓存"""
+        cache = QueryCache(max_bytes=20_000)
+        for i in range(20):
+            cache.get_or_load(i, lambda: ["x" * 100] * 10)
+        assert cache.size_bytes <= 20_000
+        assert len(cache) < 20
+        
+        cache.get_or_load("big", lambda: "x" * 50_000)
+        assert "big" not in cache._entries
+    
+    def test_returns_copies(self):
+        """测试修改返回的结果不影响缓存"""
+        cache = QueryCache()
+        first = cache.get_or_load("k", lambda: [{"id": 1}])
+        first[0]["id"] = 99
+        first.append({"id": 2})
+        
+        assert cache.get_or_load("k", lambda: None) == [{"id": 1}]
+    
+    def test_invalidation_during_load_not_cached(self):
+        """测试查询期间发生失效时，结果不写入缓存"""
+        cache = QueryCache()
+        
+        def load():
+            cache.clear()
+            return "stale"
+        
+        cache.get_or_load("k", load)
+        assert len(cache) == 0
+
+
+class TestUIServiceCaching:
+    def test_unchanged_refresh_costs_no_queries(self, ui_service, selects):
+        """测试数据没有变化时，再次刷新不执行查询"""
+        _refresh(ui_service)
+        assert selects
+        
+        selects.clear()
+        _refresh(ui_service)
+        assert selects == []
+    
+    def test_statistics_shared_across_panels(self, ui_service, selects):
+        """测试导航树、统计面板和筛选选项共用一次统计查询"""
+        ui_service.get_navigation_data()
+        first = len(selects)
+        ui_service.get_statistics_summary()
+        ui_service.get_filter_options()
+        assert len(selects) == first
+    
+    def test_question_added_invalidates_lists(self, ui_service, data_manager, event_bus):
+        """测试添加题目后列表和统计重新查询"""
+        _refresh(ui_service)
+        question_id = data_manager.add_question({"subject": "物理", "content": "新题"})
+        event_bus.publish(QuestionAddedEvent(question_id=question_id, question_data={}))
+        
+        assert len(ui_service.get_all_questions()) == 6
+        assert ui_service.get_statistics_summary()["total_questions"] == 6
+        assert "物理" in ui_service.get_navigation_data()["subjects"]
+    
+    def test_question_updated_invalidates_only_that_detail(
+        self, ui_service, data_manager, event_bus, selects
+    ):
+        """测试更新题目只清除这道题目的详情"""
+        ui_service.get_question_detail(1)
+        ui_service.get_question_detail(2)
+        data_manager.update_question(1, {"content": "已修改"})
+        event_bus.publish(QuestionUpdatedEvent(question_id=1, updates={"content": "已修改"}))
+        
+        selects.clear()
+        ui_service.get_question_detail(2)
+        assert selects == []
+        assert ui_service.get_question_detail(1)["content"] == "已修改"
+        assert selects
+    
+    def test_question_deleted_invalidates(self, ui_service, data_manager, event_bus):
+        """测试删除题目后详情和列表都失效"""
+        assert ui_service.get_question_detail(3) is not None
+        ui_service.get_all_questions()
+        data_manager.delete_question(3)
+        event_bus.publish(QuestionDeletedEvent(question_id=3))
+        
+        assert ui_service.get_question_detail(3) is None
+        assert 3 not in [q["id"] for q in ui_service.get_all_questions()]
+    
+    def test_review_completed_invalidates(self, ui_service, data_manager, event_bus):
+        """测试复习完成后统计数据重新查询"""
+        assert ui_service.get_statistics_summary()["today_reviewed"] == 0
+        data_manager.record_reviews([(1, ReviewResult.GOOD)], ReviewScheduler())
+        event_bus.publish(ReviewCompletedEvent(reviewed_count=1))
+        
+        assert ui_service.get_statistics_summary()["today_reviewed"] == 1
+    
+    def test_search_cached_by_keyword(self, ui_service, selects):
+        """测试相同关键词的搜索复用结果"""
+        results = ui_service.search_questions("题目")
+        assert len(results) == 5
+        
+        selects.clear()
+        assert ui_service.search_questions(" 题目 ") == results
+        assert selects == []
+    
+    def test_question_summary_rechecks_filter(self, ui_service, data_manager, event_bus):
+        """测试单题摘要按当前筛选条件重新检查，更新后缓存失效"""
+        assert ui_service.get_question_summary(1, {'subject': '数学'})['id'] == 1
+        assert ui_service.get_question_summary(1, {'subject': '物理'}) is None
+        assert ui_service.get_question_summary(1, {'keyword': '题目'}) is not None
+        
+        data_manager.update_question(1, {"subject": "物理"})
+        event_bus.publish(QuestionUpdatedEvent(question_id=1, updates={"subject": "物理"}))
+        
+        assert ui_service.get_question_summary(1, {'subject': '数学'}) is None
+    
+    def test_without_cache(self, data_manager, selects):
+        """测试未配置缓存时每次都查询数据库"""
+        service = UIService(data_manager)
+        service.get_statistics_summary()
+        first = len(selects)
+        service.get_statistics_summary()
+        assert len(selects) == 2 * first
@@ -0,0 +1,281 @@
+"""复习作答后写队列测试"""
+
+import json
+import sys
+import threading
+import pytest
+from pathlib import Path
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+# services 包导入通知模块，依赖 plyer
+pytest.importorskip("plyer")
+
+from sqlalchemy import event
+
+from mistake_book.config.constants import ReviewResult
+from mistake_book.core.data_manager import DataManager
+from mistake_book.core.review_scheduler import ReviewScheduler
+from mistake_book.database.db_manager import DatabaseManager
+from mistake_book.database.models import ReviewRecord
+from mistake_book.services.review_journal import ReviewJournal
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    """创建临时数据库"""
+    manager = DatabaseManager(tmp_path / "test.db")
+    yield manager
+    manager.dispose()
+
+
+@pytest.fixture
+def data_manager(db_manager):
+    """创建数据管理器，并添加几道题目"""
+    manager = DataManager(db_manager)
+    manager.add_questions([{"subject": "数学", "content": str(i)} for i in range(5)])
+    return manager
+
+
+@pytest.fixture
+def journal_path(tmp_path):
+    return tmp_path / "review_journal.jsonl"
+
+
+def _record_count(db_manager):
+    with db_manager.session_scope() as session:
+        return session.query(ReviewRecord).count()
+
+
+class SlowDataManager(DataManager):
+    """写入前等待放行，模拟慢磁盘"""
+    
+    def __init__(self, db_manager):
+        super().__init__(db_manager)
+        self.release = threading.Event()
+    
+    def record_reviews(self, answers, scheduler, now=None):
+        self.release.wait(5)
+        return super().record_reviews(answers, scheduler, now)
+
+
+class FailingDataManager(DataManager):
+    """写入总是失败，模拟数据库被锁定或损坏"""
+    
+    def __init__(self, db_manager):
+        super().__init__(db_manager)
+        self.attempts = 0
+    
+    def record_reviews(self, answers, scheduler, now=None):
+        self.attempts += 1
+        raise RuntimeError("database is locked")
+
+
+class FlakyDataManager(DataManager):
+    """前 failures 次写入失败，之后正常写入"""
+    
+    def __init__(self, db_manager, failures):
+        super().__init__(db_manager)
+        self.failures = failures
+    
+    def record_reviews(self, answers, scheduler, now=None):
+        if self.failures > 0:
+            self.failures -= 1
+            raise RuntimeError("database is locked")
+        return super().record_reviews(answers, scheduler, now)
+
+
+class TestReviewJournal:
+    """测试后写队列"""
+    
+    def test_submit_returns_before_write(self, db_manager, data_manager, journal_path):
+        """测试提交不等待数据库写入，flush 后全部写入并清空日志"""
+        slow = SlowDataManager(db_manager)
+        journal = ReviewJournal(slow, ReviewScheduler(), journal_path)
+        journal.start()
+        try:
+            journal.submit(1, ReviewResult.GOOD, 12)
+            journal.submit(2, ReviewResult.AGAIN)
+            
+            # 数据库尚未写入，但作答已经在日志文件中
+            assert _record_count(db_manager) == 0
+            assert len(journal_path.read_text(encoding="utf-8").splitlines()) == 2
+            
+            slow.release.set()
+            journal.flush()
+            
+            assert _record_count(db_manager) == 2
+            assert not journal_path.exists()
+            assert data_manager.get_question(1)["repetitions"] == 1
+        finally:
+            slow.release.set()
+            journal.close()
+    
+    def test_group_commit(self, db_manager, journal_path):
+        """测试积压的作答合并为少量事务提交"""
+        slow = SlowDataManager(db_manager)
+        slow.add_questions([{"subject": "数学", "content": str(i)} for i in range(5)])
+        journal = ReviewJournal(slow, ReviewScheduler(), journal_path, max_batch=64)
+        journal.start()
+        commits = []
+        
+        def on_commit(conn):
+            commits.append(conn)
+        
+        event.listen(db_manager.engine, "commit", on_commit)
+        try:
+            for i in range(40):
+                journal.submit(i % 5 + 1, ReviewResult.GOOD)
+            slow.release.set()
+            journal.flush()
+        finally:
+            event.remove(db_manager.engine, "commit", on_commit)
+            journal.close()
+        
+        assert _record_count(db_manager) == 40
+        # 第一条作答单独提交，其余在等待期间积压，合并提交
+        assert len(commits) <= 3
+    
+    def test_close_drains_queue(self, db_manager, data_manager, journal_path):
+        """测试关闭时写入剩余作答"""
+        journal = ReviewJournal(data_manager, ReviewScheduler(), journal_path)
+        journal.start()
+        for question_id in range(1, 6):
+            journal.submit(question_id, ReviewResult.EASY)
+        journal.close()
+        
+        assert _record_count(db_manager) == 5
+        assert not journal_path.exists()
+    
+    def test_persistent_failure_does_not_block(self, db_manager, data_manager, journal_path):
+        """测试持续写入失败时重试有限次后放弃，flush 和 close 不阻塞，日志留给下次启动"""
+        failing = FailingDataManager(db_manager)
+        journal = ReviewJournal(
+            failing, ReviewScheduler(), journal_path, retry_delay=0.01, max_retries=2
+        )
+        journal.start()
+        journal.submit(1, ReviewResult.GOOD)
+        
+        assert journal.flush(timeout=5)
+        assert failing.attempts == 3
+        journal.submit(2, ReviewResult.EASY)
+        journal.close()
+        assert journal_path.exists()
+        
+        replay = ReviewJournal(data_manager, ReviewScheduler(), journal_path)
+        assert replay.start() == 2
+        replay.close()
+        assert _record_count(db_manager) == 2
+        assert not journal_path.exists()
+    
+    def test_later_answers_wait_for_failed_batch(self, db_manager, data_manager, journal_path):
+        """测试一批作答写入失败后，同一题目之后的作答也留给补写，补写按作答顺序计算"""
+        flaky = FlakyDataManager(db_manager, failures=1)
+        journal = ReviewJournal(flaky, ReviewScheduler(), journal_path, max_retries=0)
+        journal.start()
+        journal.submit(1, ReviewResult.AGAIN)
+        assert journal.flush(timeout=5)
+        journal.submit(1, ReviewResult.GOOD)
+        assert journal.flush(timeout=5)
+        journal.close()
+        
+        # 后一次作答没有先于失败的作答写入数据库
+        assert _record_count(db_manager) == 0
+        assert data_manager.get_question(1)["repetitions"] == 0
+        
+        replay = ReviewJournal(data_manager, ReviewScheduler(), journal_path)
+        assert replay.start() == 2
+        replay.close()
+        
+        expected = DataManager(DatabaseManager(journal_path.parent / "expected.db"))
+        try:
+            expected.add_questions([{"subject": "数学", "content": "0"}])
+            expected.record_reviews(
+                [(1, ReviewResult.AGAIN), (1, ReviewResult.GOOD)], ReviewScheduler()
+            )
+            question, reference = data_manager.get_question(1), expected.get_question(1)
+        finally:
+            expected.db.dispose()
+        assert _record_count(db_manager) == 2
+        for field in ("repetitions", "interval", "easiness_factor"):
+            assert question[field] == reference[field]
+        assert question["next_review_date"].date() == reference["next_review_date"].date()
+    
+    def test_flush_timeout(self, db_manager, data_manager, journal_path):
+        """测试 flush 超时返回 False，作答仍在日志中"""
+        slow = SlowDataManager(db_manager)
+        journal = ReviewJournal(slow, ReviewScheduler(), journal_path)
+        journal.start()
+        journal.submit(1, ReviewResult.GOOD)
+        
+        assert not journal.flush(timeout=0.05)
+        assert journal_path.exists()
+        slow.release.set()
+        assert journal.flush(timeout=5)
+        journal.close()
+        assert _record_count(db_manager) == 1
+    
+    def test_submit_before_start_rejected(self, data_manager, journal_path):
+        """测试未启动时提交会报错"""
+        journal = ReviewJournal(data_manager, ReviewScheduler(), journal_path)
+        with pytest.raises(RuntimeError):
+            journal.submit(1, ReviewResult.GOOD)
+
+
+class TestReplay:
+    """测试异常退出后的补写"""
+    
+    def test_replay_after_crash(self, db_manager, data_manager, journal_path):
+        """测试进程在写入数据库前退出，下次启动时补写"""
+        crashed = ReviewJournal(SlowDataManager(db_manager), ReviewScheduler(), journal_path)
+        crashed.start()
+        crashed.submit(1, ReviewResult.GOOD, 30)
+        crashed.submit(2, ReviewResult.HARD)
+        # 模拟崩溃：后台线程从未写入，日志文件保留
+        assert _record_count(db_manager) == 0
+        
+        journal = ReviewJournal(data_manager, ReviewScheduler(), journal_path)
+        assert journal.start() == 2
+        journal.close()
+        
+        assert _record_count(db_manager) == 2
+        assert not journal_path.exists()
+    
+    def test_replay_is_idempotent(self, db_manager, data_manager, journal_path):
+        """测试已写入数据库、但日志未清空的作答不会重复写入"""
+        journal = ReviewJournal(data_manager, ReviewScheduler(), journal_path)
+        journal.start()
+        journal.submit(1, ReviewResult.GOOD)
+        journal.flush()
+        journal.close()
+        
+        # 模拟在清空日志前崩溃：日志中仍有已提交的作答
+        with db_manager.session_scope() as session:
+            token = session.query(ReviewRecord.client_token).scalar()
+        journal_path.write_text(json.dumps({
+            "question_id": 1, "result": ReviewResult.GOOD.value, "time_spent": None,
+            "reviewed_at": "2024-05-10T09:00:00", "client_token": token,
+        }) + "\n", encoding="utf-8")
+        
+        replay = ReviewJournal(data_manager, ReviewScheduler(), journal_path)
+        replay.replay()
+        
+        assert _record_count(db_manager) == 1
+        assert data_manager.get_question(1)["repetitions"] == 1
+    
+    def test_partial_last_line_skipped(self, db_manager, data_manager, journal_path):
+        """测试崩溃时写了一半的最后一行被跳过"""
+        journal_path.write_text(
+            json.dumps({
+                "question_id": 1, "result": 2, "time_spent": 5,
+                "reviewed_at": "2024-05-10T09:00:00", "client_token": "a" * 32,
+            }) + "\n" + '{"question_id": 2, "res',
+            encoding="utf-8",
+        )
+        
+        ReviewJournal(data_manager, ReviewScheduler(), journal_path).replay()
+        
+        assert _record_count(db_manager) == 1
+        assert not journal_path.exists()
@@ -0,0 +1,112 @@
+"""缩略图缓存测试"""
+
+import sys
+import pytest
+from pathlib import Path
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+# services 包导入通知模块，依赖 plyer
+pytest.importorskip("plyer")
+Image = pytest.importorskip("PIL.Image")
+
+from mistake_book.services.image_store import ImageStore
+from mistake_book.services.thumbnail_service import (
+    THUMBNAIL_SIZES, ThumbnailStore, read_image_size, render_thumbnail
+)
+
+
+@pytest.fixture
+def thumbnails(tmp_path):
+    return ThumbnailStore(tmp_path / "thumbnails")
+
+
+def _photo(path: Path, size=(4000, 3000), orientation=None) -> Path:
+    """写入一张 JPEG 照片，可带 EXIF 方向"""
+    image = Image.new("RGB", size, "navy")
+    image.paste((255, 200, 0), (0, 0, size[0] // 2, size[1] // 4))
+    exif = Image.Exif()
+    if orientation:
+        exif[0x0112] = orientation
+    path.parent.mkdir(parents=True, exist_ok=True)
+    image.save(path, "JPEG", quality=80, exif=exif)
+    return path
+
+
+class TestRenderThumbnail:
+    """render_thumbnail测试类"""
+    
+    def test_downscales_into_box(self, tmp_path):
+        """测试按比例缩小到框内，不放大小图"""
+        photo = _photo(tmp_path / "photo.jpg")
+        
+        assert render_thumbnail(photo, THUMBNAIL_SIZES["preview"]).size == (373, 280)
+        assert render_thumbnail(photo, THUMBNAIL_SIZES["viewer"]).size == (1200, 900)
+        
+        small = tmp_path / "small.png"
+        Image.new("RGB", (100, 50), "red").save(small)
+        assert render_thumbnail(small, THUMBNAIL_SIZES["viewer"]).size == (100, 50)
+    
+    def test_applies_exif_orientation(self, tmp_path):
+        """测试按 EXIF 方向摆正（竖拍照片宽高互换）"""
+        photo = _photo(tmp_path / "portrait.jpg", orientation=6)
+        
+        assert render_thumbnail(photo, THUMBNAIL_SIZES["review"]).size == (300, 400)
+    
+    def test_transparent_image_on_white(self, tmp_path):
+        """测试透明背景合成为白色"""
+        source = tmp_path / "transparent.png"
+        Image.new("RGBA", (20, 20), (0, 0, 0, 0)).save(source)
+        
+        thumbnail = render_thumbnail(source, THUMBNAIL_SIZES["preview"])
+        
+        assert thumbnail.mode == "RGB"
+        assert thumbnail.getpixel((5, 5)) == (255, 255, 255)
+    
+    def test_read_image_size_rejects_non_images(self, tmp_path):
+        """测试只读文件头取得尺寸，非图片抛出 OSError"""
+        assert read_image_size(_photo(tmp_path / "photo.jpg")) == (4000, 3000)
+        
+        text = tmp_path / "note.txt"
+        text.write_text("not an image")
+        with pytest.raises(OSError):
+            read_image_size(text)
+
+
+class TestThumbnailStore:
+    """ThumbnailStore测试类"""
+    
+    def test_keyed_by_content_hash(self, tmp_path, thumbnails):
+        """测试图片存储中的文件从路径取得哈希，内容相同的文件共用缩略图"""
+        store = ImageStore(tmp_path / "images")
+        photo = _photo(tmp_path / "upload" / "photo.jpg")
+        relative = store.add(photo)
+        stored = store.full_path(relative)
+        
+        assert ThumbnailStore.cache_key(stored) == Path(relative).stem
+        assert ThumbnailStore.cache_key(photo) == Path(relative).stem
+        
+        thumbnails.load(photo, "review")
+        target = thumbnails.path_for(Path(relative).stem, "review")
+        assert target.exists()
+        assert thumbnails.load(stored, "review").size == (533, 400)
+        assert list(target.parent.iterdir()) == [target]
+    
+    def test_reuses_cached_file(self, tmp_path, thumbnails, monkeypatch):
+        """测试已生成的缩略图直接读取，不再解码原图"""
+        photo = _photo(tmp_path / "photo.jpg")
+        first = thumbnails.load(photo, "preview")
+        
+        import mistake_book.services.thumbnail_service as module
+        monkeypatch.setattr(module, "render_thumbnail", lambda *args: pytest.fail("重新解码原图"))
+        second = thumbnails.load(photo, "preview")
+        
+        assert second.size == first.size
+    
+    def test_missing_source_raises(self, tmp_path, thumbnails):
+        """测试原图不存在时抛出 OSError，不写入缩略图"""
+        with pytest.raises(OSError):
+            thumbnails.load(tmp_path / "missing.jpg", "preview")
+        assert not thumbnails.root.exists()
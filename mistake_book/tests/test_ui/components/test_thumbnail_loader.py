@@ -0,0 +1,96 @@
+"""ThumbnailLoader组件测试"""
+
+import sys
+import pytest
+from pathlib import Path
+from PIL import Image
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from mistake_book.services.thumbnail_service import ThumbnailStore
+from mistake_book.ui.components.thumbnail_loader import ThumbnailLoader
+
+
+@pytest.fixture
+def loader(qtbot, tmp_path):
+    loader = ThumbnailLoader(ThumbnailStore(tmp_path / "thumbnails"))
+    yield loader
+    loader.wait()
+
+
+def _image(path: Path, color="red", size=(1600, 1200)) -> Path:
+    Image.new("RGB", size, color).save(path)
+    return path
+
+
+def _request(qtbot, loader, source, size_name="preview"):
+    results = []
+    loader.request(source, size_name, lambda pixmap, error: results.append((pixmap, error)))
+    qtbot.waitUntil(lambda: bool(results), timeout=5000)
+    return results[0]
+
+
+class TestThumbnailLoader:
+    """ThumbnailLoader测试类"""
+    
+    def test_generates_in_background_then_hits_memory(self, qtbot, loader, tmp_path):
+        """测试首次请求后台生成，再次请求立即从内存返回"""
+        source = _image(tmp_path / "图片.png")
+        
+        pixmap, error = _request(qtbot, loader, source)
+        assert error == "" and (pixmap.width(), pixmap.height()) == (373, 280)
+        assert (loader.hits, loader.misses) == (0, 1)
+        
+        results = []
+        loader.request(source, "preview", lambda p, e: results.append(p))
+        assert results and results[0].cacheKey() == pixmap.cacheKey()
+        assert loader.hits == 1
+        assert loader.cached(source, "review") is None
+    
+    def test_concurrent_requests_generate_once(self, qtbot, loader, tmp_path):
+        """测试同一图片同一尺寸的并发请求只生成一次"""
+        source = _image(tmp_path / "a.png")
+        results = []
+        for _ in range(3):
+            loader.request(source, "review", lambda p, e: results.append(p))
+        
+        qtbot.waitUntil(lambda: len(results) == 3, timeout=5000)
+        assert loader.misses == 3
+        assert len({pixmap.cacheKey() for pixmap in results}) == 1
+    
+    def test_replaced_file_is_reloaded(self, qtbot, loader, tmp_path):
+        """测试文件内容被替换后不使用旧的缩略图"""
+        source = _image(tmp_path / "a.png", "red")
+        first, _ = _request(qtbot, loader, source)
+        
+        _image(source, "blue", size=(800, 800))
+        second, _ = _request(qtbot, loader, source)
+        
+        assert (second.width(), second.height()) == (280, 280)
+        assert first.toImage().pixelColor(1, 1).name() != second.toImage().pixelColor(1, 1).name()
+    
+    def test_memory_bounded(self, qtbot, tmp_path):
+        """测试内存缓存超过上限时淘汰最久未使用的缩略图"""
+        store = ThumbnailStore(tmp_path / "thumbnails")
+        loader = ThumbnailLoader(store, max_bytes=373 * 280 * 4 * 2)
+        colors = ("red", "green", "blue")
+        sources = [_image(tmp_path / f"{i}.png", color) for i, color in enumerate(colors)]
+        for source in sources:
+            _request(qtbot, loader, source)
+        
+        assert loader.memory_usage() <= loader.max_bytes
+        assert loader.cached(sources[0], "preview") is None
+        assert loader.cached(sources[2], "preview") is not None
+        loader.wait()
+    
+    def test_failure_reports_error(self, qtbot, loader, tmp_path):
+        """测试文件不存在或无法解码时回调 None 和错误信息"""
+        pixmap, error = _request(qtbot, loader, tmp_path / "missing.png")
+        assert pixmap is None and error
+        
+        broken = tmp_path / "broken.png"
+        broken.write_bytes(b"\x89PNG\r\n\x1a\n")
+        pixmap, error = _request(qtbot, loader, broken)
+        assert pixmap is None and error
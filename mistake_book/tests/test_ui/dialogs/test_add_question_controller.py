@@ -126,6 +126,25 @@ class TestImageSelectedHandler:
         assert controller._current_image_path == ""
 
 
+class TestPendingImage:
+    """测试保存前等待图片入库处理"""
+    
+    def test_returns_unfinished_ingest(self):
+        """测试图片仍在处理时返回 Future，已完成或没有图片时返回 None"""
+        from concurrent.futures import Future
+        service = Mock()
+        controller = AddQuestionController(service)
+        ingest = Future()
+        service.prepare_image.return_value = ingest
+        
+        assert controller.pending_image({'image_path': '/a.png'}) is ingest
+        service.prepare_image.assert_called_once_with('/a.png')
+        
+        ingest.set_result(None)
+        assert controller.pending_image({'image_path': '/a.png'}) is None
+        assert controller.pending_image({'image_path': None}) is None
+
+
 class TestOCRCompletedHandler:
     """测试OCR识别完成事件处理"""
     
@@ -438,6 +438,42 @@ class TestUIBehavior:
         # 按钮应该恢复可用
         assert dialog.save_btn.isEnabled()
         assert dialog.save_btn.text() == "💾 保存"
+    
+    
+    def test_save_waits_for_image_ingest(self, qtbot, dialog, mock_question_service):
+        """测试图片还在后台处理时不阻塞界面，处理完成后再保存"""
+        from concurrent.futures import Future
+        ingest = Future()
+        mock_question_service.prepare_image.return_value = ingest
+        dialog.question_form.set_data({'subject': '数学', 'content': '题目', 'answer': '答案'})
+        dialog.image_uploader._current_image_path = "/path/to/photo.jpg"
+        
+        with patch.object(dialog, 'accept') as mock_accept:
+            QTest.mouseClick(dialog.save_btn, Qt.MouseButton.LeftButton)
+            assert not mock_question_service.create_question.called
+            assert not dialog.save_btn.isEnabled()
+            
+            ingest.set_result(None)
+            qtbot.waitUntil(lambda: mock_accept.called, timeout=2000)
+        
+        created = mock_question_service.create_question.call_args[0][0]
+        assert created['image_path'] == "/path/to/photo.jpg"
+        assert dialog.save_btn.isEnabled()
+    
+    def test_pending_save_dropped_when_closed(self, qtbot, dialog, mock_question_service):
+        """测试等待图片处理时关闭对话框，不再保存"""
+        from concurrent.futures import Future
+        ingest = Future()
+        mock_question_service.prepare_image.return_value = ingest
+        dialog.question_form.set_data({'subject': '数学', 'content': '题目', 'answer': '答案'})
+        dialog.image_uploader._current_image_path = "/path/to/photo.jpg"
+        
+        QTest.mouseClick(dialog.save_btn, Qt.MouseButton.LeftButton)
+        dialog.reject()
+        ingest.set_result(None)
+        qtbot.wait(50)
+        
+        assert not mock_question_service.create_question.called
 
 
 class TestComponentInteraction:
@@ -21,12 +21,7 @@ class TestReviewDialogController:
     def mock_review_service(self):
         """创建mock ReviewService"""
         service = Mock()
-        service.process_review_result.return_value = (True, "成功", {
-            'interval': 1,
-            'repetitions': 1,
-            'easiness_factor': 2.5,
-            'mastery_level': 2
-        })
+        service.submit_review_result.return_value = (True, "成功")
         return service
     
     @pytest.fixture
@@ -97,7 +92,7 @@ class TestReviewDialogController:
         assert controller.current_index == 1
         
         # 验证调用了服务
-        mock_review_service.process_review_result.assert_called_once_with(
+        mock_review_service.submit_review_result.assert_called_once_with(
             1, ReviewResult.GOOD
         )
     
@@ -117,6 +112,17 @@ class TestReviewDialogController:
         assert controller.reviewed_count == 1
         assert controller.current_index == 3
     
+    def test_flushes_reviews_only_when_session_ends(self, mock_review_service, sample_questions):
+        """测试作答不等待写入，最后一题提交后才等待全部写入"""
+        controller = ReviewDialogController(mock_review_service, sample_questions)
+        
+        controller.submit_review(quality=ReviewResult.GOOD.value)
+        controller.submit_review(quality=ReviewResult.GOOD.value)
+        mock_review_service.flush_reviews.assert_not_called()
+        
+        controller.submit_review(quality=ReviewResult.GOOD.value)
+        mock_review_service.flush_reviews.assert_called_once()
+    
     def test_submit_review_publishes_event_when_complete(
         self, mock_review_service, sample_questions, mock_event_bus
     ):
@@ -158,6 +164,25 @@ class TestReviewDialogController:
         # 不应该发布事件
         mock_event_bus.publish.assert_not_called()
     
+    def test_finish_session_publishes_event_for_partial_session(
+        self, mock_review_service, sample_questions, mock_event_bus
+    ):
+        """测试中途结束会话时也发布事件，且同一批作答只发布一次"""
+        controller = ReviewDialogController(
+            mock_review_service,
+            sample_questions,
+            mock_event_bus
+        )
+        
+        controller.submit_review(quality=ReviewResult.GOOD.value)
+        controller.finish_session()
+        controller.finish_session()
+        
+        mock_event_bus.publish.assert_called_once()
+        event = mock_event_bus.publish.call_args[0][0]
+        assert isinstance(event, ReviewCompletedEvent)
+        assert event.reviewed_count == 1
+    
     def test_submit_review_invalid_quality(self, mock_review_service, sample_questions):
         """测试提交无效的质量评分"""
         controller = ReviewDialogController(
@@ -170,7 +195,7 @@ class TestReviewDialogController:
         
         assert has_next is False
         # 不应该调用服务
-        mock_review_service.process_review_result.assert_not_called()
+        mock_review_service.submit_review_result.assert_not_called()
     
     def test_submit_review_no_current_question(self, mock_review_service, sample_questions):
         """测试没有当前题目时提交"""
@@ -185,12 +210,12 @@ class TestReviewDialogController:
         has_next = controller.submit_review(quality=ReviewResult.GOOD.value)
         
         assert has_next is False
-        mock_review_service.process_review_result.assert_not_called()
+        mock_review_service.submit_review_result.assert_not_called()
     
     def test_submit_review_service_failure(self, mock_review_service, sample_questions):
         """测试服务层失败时仍然继续"""
         # 模拟服务失败
-        mock_review_service.process_review_result.return_value = (False, "失败", {})
+        mock_review_service.submit_review_result.return_value = (False, "失败")
         
         controller = ReviewDialogController(
             mock_review_service,
@@ -326,7 +351,7 @@ class TestReviewDialogController:
         测试控制器可以使用mock服务独立测试
         """
         mock_service = Mock()
-        mock_service.process_review_result.return_value = (True, "成功", {})
+        mock_service.submit_review_result.return_value = (True, "成功")
         
         questions = [{'id': 1, 'content': '测试'}]
         controller = ReviewDialogController(mock_service, questions)
@@ -340,7 +365,7 @@ class TestReviewDialogController:
         controller.submit_review(quality=ReviewResult.GOOD.value)
         
         # 验证调用了mock服务
-        mock_service.process_review_result.assert_called_once()
+        mock_service.submit_review_result.assert_called_once()
     
     def test_multiple_quality_levels(self, mock_review_service, sample_questions):
         """测试不同的质量评分"""
@@ -360,10 +385,10 @@ class TestReviewDialogController:
             controller.submit_review(quality=quality)
         
         # 验证所有调用
-        assert mock_review_service.process_review_result.call_count == 3
+        assert mock_review_service.submit_review_result.call_count == 3
         
         # 验证调用参数
-        calls = mock_review_service.process_review_result.call_args_list
+        calls = mock_review_service.submit_review_result.call_args_list
         assert calls[0][0][1] == ReviewResult.AGAIN
         assert calls[1][0][1] == ReviewResult.HARD
         assert calls[2][0][1] == ReviewResult.GOOD
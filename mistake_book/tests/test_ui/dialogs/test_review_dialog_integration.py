@@ -32,12 +32,7 @@ class TestReviewDialogIntegration:
     def mock_review_service(self):
         """创建mock ReviewService"""
         service = Mock()
-        service.process_review_result.return_value = (True, "成功", {
-            'interval': 1,
-            'repetitions': 1,
-            'easiness_factor': 2.5,
-            'mastery_level': 2
-        })
+        service.submit_review_result.return_value = (True, "成功")
         return service
     
     @pytest.fixture
@@ -329,7 +324,7 @@ class TestReviewDialogIntegration:
         assert controller.current_index == 1
         
         # 验证服务被调用
-        mock_review_service.process_review_result.assert_called_once_with(
+        mock_review_service.submit_review_result.assert_called_once_with(
             1, ReviewResult.GOOD
         )
         
@@ -339,7 +334,7 @@ class TestReviewDialogIntegration:
         """测试对话框处理服务失败的情况"""
         # 创建失败的服务
         mock_service = Mock()
-        mock_service.process_review_result.return_value = (False, "保存失败", {})
+        mock_service.submit_review_result.return_value = (False, "保存失败")
         
         controller = ReviewDialogController(mock_service, sample_questions)
         dialog = ReviewDialog(controller)
@@ -375,7 +370,7 @@ class TestReviewDialogIntegration:
             dialog._on_quality_selected(quality)
         
         # 验证所有评分都被提交
-        assert mock_review_service.process_review_result.call_count == 4
+        assert mock_review_service.submit_review_result.call_count == 4
         
         # 验证显示总结
         assert "复习完成" in dialog.progress_label.text()
@@ -423,3 +418,33 @@ class TestReviewDialogIntegration:
         assert min_size.height() == 700
         
         dialog.close()
+    
+    def test_dialog_displays_stored_image(
+        self, qtbot, mock_review_service, sample_questions, tmp_path
+    ):
+        """测试题目的相对图片路径通过QuestionService解析，显示缩略图"""
+        from PIL import Image
+        from PyQt6.QtWidgets import QLabel
+        from mistake_book.services.thumbnail_service import ThumbnailStore
+        from mistake_book.ui.components.thumbnail_loader import ThumbnailLoader
+        
+        image_file = tmp_path / "images" / "ab" / "cd" / "photo.png"
+        image_file.parent.mkdir(parents=True)
+        Image.new("RGB", (1600, 1600), "red").save(image_file)
+        question_service = Mock()
+        question_service.get_image_full_path.return_value = image_file
+        questions = [dict(sample_questions[0], image_path="ab/cd/photo.png")]
+        controller = ReviewDialogController(mock_review_service, questions, None, question_service)
+        loader = ThumbnailLoader(ThumbnailStore(tmp_path / "thumbnails"))
+        
+        dialog = ReviewDialog(controller, thumbnail_loader=loader)
+        qtbot.addWidget(dialog)
+        
+        question_service.get_image_full_path.assert_called_with("ab/cd/photo.png")
+        qtbot.waitUntil(lambda: any(
+            not label.pixmap().isNull() for label in dialog.content_widget.findChildren(QLabel)
+        ), timeout=5000)
+        pixmaps = [label.pixmap() for label in dialog.content_widget.findChildren(QLabel)
+                   if not label.pixmap().isNull()]
+        assert (pixmaps[0].width(), pixmaps[0].height()) == (400, 400)
+        loader.wait()
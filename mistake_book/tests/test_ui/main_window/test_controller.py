@@ -9,14 +9,25 @@ from unittest.mock import Mock, MagicMock, call
 project_root = Path(__file__).parent.parent.parent.parent
 sys.path.insert(0, str(project_root / "src"))
 
-from mistake_book.ui.main_window.controller import MainWindowController
+from mistake_book.ui.main_window.controller import MainWindowController, PAGE_SIZE, ViewDelta
 from mistake_book.ui.events.events import (
     QuestionAddedEvent,
     QuestionUpdatedEvent,
-    QuestionDeletedEvent
+    QuestionDeletedEvent,
+    ReviewCompletedEvent
 )
 
 
+def make_page(items, has_more=False, next_cursor=None):
+    """构造 get_questions_page 的返回值"""
+    return {'items': items, 'next_cursor': next_cursor, 'has_more': has_more}
+
+
+def page_filters(ui_service):
+    """取出 get_questions_page 最近一次调用的筛选条件"""
+    return ui_service.get_questions_page.call_args.args[0]
+
+
 @pytest.fixture
 def mock_services():
     """创建 mock 服务"""
@@ -65,7 +76,7 @@ class TestMainWindowControllerInitialization:
     def test_event_subscription(self, controller, mock_event_bus):
         """测试事件订阅"""
         # 验证订阅了正确的事件
-        assert mock_event_bus.subscribe.call_count == 3
+        assert mock_event_bus.subscribe.call_count == 4
         
         # 获取所有订阅调用
         calls = mock_event_bus.subscribe.call_args_list
@@ -74,6 +85,7 @@ class TestMainWindowControllerInitialization:
         assert QuestionAddedEvent in event_types
         assert QuestionUpdatedEvent in event_types
         assert QuestionDeletedEvent in event_types
+        assert ReviewCompletedEvent in event_types
 
 
 class TestLoadQuestions:
@@ -86,7 +98,7 @@ class TestLoadQuestions:
             {'id': 1, 'content': '题目1'},
             {'id': 2, 'content': '题目2'}
         ]
-        mock_services['ui_service'].get_all_questions.return_value = test_questions
+        mock_services['ui_service'].get_questions_page.return_value = make_page(test_questions)
         
         # 执行
         result = controller.load_questions()
@@ -96,11 +108,11 @@ class TestLoadQuestions:
         assert controller.current_view_type == "all"
         assert controller.current_filters == {}
         assert controller.current_questions == test_questions
-        mock_services['ui_service'].get_all_questions.assert_called_once()
+        mock_services['ui_service'].get_questions_page.assert_called_once()
     
     def test_load_questions_empty(self, controller, mock_services):
         """测试加载空题目列表"""
-        mock_services['ui_service'].get_all_questions.return_value = []
+        mock_services['ui_service'].get_questions_page.return_value = make_page([])
         
         result = controller.load_questions()
         
@@ -122,7 +134,9 @@ class TestSearch:
         assert controller.current_view_type == "search"
         assert controller.current_filters == {'keyword': '数学'}
         assert controller.current_questions == test_questions
-        mock_services['ui_service'].search_questions.assert_called_once_with("数学")
+        mock_services['ui_service'].search_questions.assert_called_once_with(
+            "数学", limit=PAGE_SIZE + 1
+        )
     
     def test_search_with_empty_keyword(self, controller, mock_services):
         """测试空关键词搜索（应返回所有题目）"""
@@ -130,18 +144,18 @@ class TestSearch:
             {'id': 1, 'content': '题目1'},
             {'id': 2, 'content': '题目2'}
         ]
-        mock_services['ui_service'].get_all_questions.return_value = all_questions
+        mock_services['ui_service'].get_questions_page.return_value = make_page(all_questions)
         
         result = controller.on_search("")
         
         assert result == all_questions
         assert controller.current_view_type == "all"
-        mock_services['ui_service'].get_all_questions.assert_called_once()
+        mock_services['ui_service'].get_questions_page.assert_called_once()
     
     def test_search_with_whitespace_keyword(self, controller, mock_services):
         """测试只有空格的关键词（应返回所有题目）"""
         all_questions = [{'id': 1, 'content': '题目1'}]
-        mock_services['ui_service'].get_all_questions.return_value = all_questions
+        mock_services['ui_service'].get_questions_page.return_value = make_page(all_questions)
         
         result = controller.on_search("   ")
         
@@ -155,7 +169,7 @@ class TestNavFilter:
     def test_nav_filter_by_subject(self, controller, mock_services):
         """测试按科目筛选"""
         test_questions = [{'id': 1, 'subject': '数学'}]
-        mock_services['ui_service'].filter_questions.return_value = test_questions
+        mock_services['ui_service'].get_questions_page.return_value = make_page(test_questions)
         
         result = controller.on_nav_filter_changed({
             'type': 'subject',
@@ -165,12 +179,13 @@ class TestNavFilter:
         assert result == test_questions
         assert controller.current_view_type == "nav_filter"
         assert controller.current_filters == {'subject': '数学'}
-        mock_services['ui_service'].filter_questions.assert_called_once_with({'subject': '数学'})
+        mock_services['ui_service'].get_questions_page.assert_called_once()
+        assert page_filters(mock_services['ui_service']) == {'subject': '数学'}
     
     def test_nav_filter_by_mastery(self, controller, mock_services):
         """测试按掌握度筛选"""
         test_questions = [{'id': 1, 'mastery_level': 2}]
-        mock_services['ui_service'].filter_questions.return_value = test_questions
+        mock_services['ui_service'].get_questions_page.return_value = make_page(test_questions)
         
         result = controller.on_nav_filter_changed({
             'type': 'mastery',
@@ -179,12 +194,13 @@ class TestNavFilter:
         
         assert result == test_questions
         assert controller.current_filters == {'mastery_level': 2}
-        mock_services['ui_service'].filter_questions.assert_called_once_with({'mastery_level': 2})
+        mock_services['ui_service'].get_questions_page.assert_called_once()
+        assert page_filters(mock_services['ui_service']) == {'mastery_level': 2}
     
     def test_nav_filter_by_tag(self, controller, mock_services):
         """测试按标签筛选"""
         test_questions = [{'id': 1, 'tags': ['重点']}]
-        mock_services['ui_service'].filter_questions.return_value = test_questions
+        mock_services['ui_service'].get_questions_page.return_value = make_page(test_questions)
         
         result = controller.on_nav_filter_changed({
             'type': 'tag',
@@ -193,7 +209,8 @@ class TestNavFilter:
         
         assert result == test_questions
         assert controller.current_filters == {'tags': ['重点']}
-        mock_services['ui_service'].filter_questions.assert_called_once_with({'tags': ['重点']})
+        mock_services['ui_service'].get_questions_page.assert_called_once()
+        assert page_filters(mock_services['ui_service']) == {'tags': ['重点']}
 
 
 class TestFilterPanel:
@@ -207,7 +224,7 @@ class TestFilterPanel:
             'mastery_level': 1
         }
         test_questions = [{'id': 1, 'subject': '数学', 'difficulty': 3}]
-        mock_services['ui_service'].filter_questions.return_value = test_questions
+        mock_services['ui_service'].get_questions_page.return_value = make_page(test_questions)
         
         result = controller.on_filter_changed(filters)
         
@@ -215,16 +232,18 @@ class TestFilterPanel:
         assert controller.current_view_type == "filter"
         assert controller.current_filters == filters
         assert controller.current_questions == test_questions
-        mock_services['ui_service'].filter_questions.assert_called_once_with(filters)
+        mock_services['ui_service'].get_questions_page.assert_called_once()
+        assert page_filters(mock_services['ui_service']) == filters
     
     def test_filter_with_empty_filters(self, controller, mock_services):
         """测试空筛选条件"""
-        mock_services['ui_service'].filter_questions.return_value = []
+        mock_services['ui_service'].get_questions_page.return_value = make_page([])
         
         result = controller.on_filter_changed({})
         
         assert result == []
-        mock_services['ui_service'].filter_questions.assert_called_once_with({})
+        mock_services['ui_service'].get_questions_page.assert_called_once()
+        assert page_filters(mock_services['ui_service']) == {}
 
 
 class TestRefreshView:
@@ -234,12 +253,12 @@ class TestRefreshView:
         """测试刷新"所有题目"视图"""
         controller.current_view_type = "all"
         test_questions = [{'id': 1}]
-        mock_services['ui_service'].get_all_questions.return_value = test_questions
+        mock_services['ui_service'].get_questions_page.return_value = make_page(test_questions)
         
         result = controller.refresh_current_view()
         
         assert result == test_questions
-        mock_services['ui_service'].get_all_questions.assert_called_once()
+        mock_services['ui_service'].get_questions_page.assert_called_once()
     
     def test_refresh_search_view(self, controller, mock_services):
         """测试刷新搜索视图"""
@@ -251,31 +270,155 @@ class TestRefreshView:
         result = controller.refresh_current_view()
         
         assert result == test_questions
-        mock_services['ui_service'].search_questions.assert_called_once_with('数学')
+        mock_services['ui_service'].search_questions.assert_called_once_with(
+            '数学', limit=PAGE_SIZE + 1
+        )
     
     def test_refresh_filter_view(self, controller, mock_services):
         """测试刷新筛选视图"""
         controller.current_view_type = "filter"
         controller.current_filters = {'subject': '数学'}
         test_questions = [{'id': 1}]
-        mock_services['ui_service'].filter_questions.return_value = test_questions
+        mock_services['ui_service'].get_questions_page.return_value = make_page(test_questions)
         
         result = controller.refresh_current_view()
         
         assert result == test_questions
-        mock_services['ui_service'].filter_questions.assert_called_once_with({'subject': '数学'})
+        mock_services['ui_service'].get_questions_page.assert_called_once()
+        assert page_filters(mock_services['ui_service']) == {'subject': '数学'}
     
     def test_refresh_nav_filter_view(self, controller, mock_services):
         """测试刷新导航筛选视图"""
         controller.current_view_type = "nav_filter"
         controller.current_filters = {'subject': '物理'}
         test_questions = [{'id': 2}]
-        mock_services['ui_service'].filter_questions.return_value = test_questions
+        mock_services['ui_service'].get_questions_page.return_value = make_page(test_questions)
         
         result = controller.refresh_current_view()
         
         assert result == test_questions
-        mock_services['ui_service'].filter_questions.assert_called_once_with({'subject': '物理'})
+        mock_services['ui_service'].get_questions_page.assert_called_once()
+        assert page_filters(mock_services['ui_service']) == {'subject': '物理'}
+
+
+class TestPagination:
+    """测试分页加载"""
+    
+    def test_first_page_uses_sort_and_page_size(self, controller, mock_services):
+        """测试第一页按当前排序和页大小请求"""
+        mock_services['ui_service'].get_questions_page.return_value = make_page([{'id': 1}])
+        
+        controller.load_questions()
+        
+        mock_services['ui_service'].get_questions_page.assert_called_once_with(
+            {}, sort_by="created_at", descending=True, cursor=None, page_size=PAGE_SIZE
+        )
+        assert controller.has_more is False
+    
+    def test_load_more_appends_next_page(self, controller, mock_services):
+        """测试加载下一页时传递游标并追加结果"""
+        cursor = {'value': '2024-01-01', 'id': 1}
+        ui_service = mock_services['ui_service']
+        ui_service.get_questions_page.side_effect = [
+            make_page([{'id': 2}, {'id': 1}], has_more=True, next_cursor=cursor),
+            make_page([{'id': 0}]),
+        ]
+        
+        controller.on_filter_changed({'subject': '数学'})
+        new_items = controller.load_more_questions()
+        
+        assert new_items == [{'id': 0}]
+        assert controller.current_questions == [{'id': 2}, {'id': 1}, {'id': 0}]
+        assert controller.has_more is False
+        second_call = ui_service.get_questions_page.call_args_list[1]
+        assert second_call.args[0] == {'subject': '数学'}
+        assert second_call.kwargs['cursor'] == cursor
+    
+    def test_load_more_without_more_pages(self, controller, mock_services):
+        """测试没有更多数据时不再请求"""
+        mock_services['ui_service'].get_questions_page.return_value = make_page([{'id': 1}])
+        controller.load_questions()
+        
+        assert controller.load_more_questions() == []
+        assert mock_services['ui_service'].get_questions_page.call_count == 1
+    
+    def test_search_view_has_no_more_pages(self, controller, mock_services):
+        """测试搜索结果不分页"""
+        mock_services['ui_service'].search_questions.return_value = [{'id': 1}]
+        
+        controller.on_search("数学")
+        
+        assert controller.has_more is False
+        assert controller.load_more_questions() == []
+        mock_services['ui_service'].get_questions_page.assert_not_called()
+    
+    def test_search_results_load_page_by_page(self, controller, mock_services):
+        """测试搜索结果超过一页时滚动加载下一页（按偏移量）"""
+        ui_service = mock_services['ui_service']
+        first = [{'id': i} for i in range(PAGE_SIZE + 1)]
+        ui_service.search_questions.side_effect = [first, [{'id': PAGE_SIZE}]]
+        
+        result = controller.on_search("数学")
+        
+        assert result == first[:PAGE_SIZE]
+        assert controller.has_more is True
+        
+        new_items = controller.load_more_questions()
+        
+        assert new_items == [{'id': PAGE_SIZE}]
+        assert len(controller.current_questions) == PAGE_SIZE + 1
+        assert controller.has_more is False
+        ui_service.search_questions.assert_called_with(
+            "数学", limit=PAGE_SIZE + 1, offset=PAGE_SIZE
+        )
+        ui_service.get_questions_page.assert_not_called()
+    
+    def test_search_delete_then_load_more(self, controller, mock_services):
+        """测试搜索视图删除一道已加载的题目后，下一页从前移一位的偏移量开始"""
+        ui_service = mock_services['ui_service']
+        first = [{'id': i} for i in range(PAGE_SIZE + 1)]
+        ui_service.search_questions.side_effect = [first, [{'id': PAGE_SIZE}]]
+        controller.on_search("数学")
+        
+        controller._on_question_deleted(QuestionDeletedEvent(question_id=0))
+        new_items = controller.load_more_questions()
+        
+        assert new_items == [{'id': PAGE_SIZE}]
+        ui_service.search_questions.assert_called_with(
+            "数学", limit=PAGE_SIZE + 1, offset=PAGE_SIZE - 1
+        )
+    
+    def test_search_insert_then_load_more(self, controller, mock_services):
+        """测试搜索视图新增的题目在翻页时再次查到不会重复显示"""
+        ui_service = mock_services['ui_service']
+        first = [{'id': i} for i in range(PAGE_SIZE + 1)]
+        added = {'id': 999}
+        ui_service.search_questions.side_effect = [first, [added, {'id': PAGE_SIZE}]]
+        ui_service.get_question_summary.return_value = added
+        controller.on_search("数学")
+        
+        controller._on_question_added(QuestionAddedEvent(question_id=999, question_data={}))
+        new_items = controller.load_more_questions()
+        
+        assert new_items == [{'id': PAGE_SIZE}]
+        assert [q['id'] for q in controller.current_questions].count(999) == 1
+        ui_service.search_questions.assert_called_with(
+            "数学", limit=PAGE_SIZE + 1, offset=PAGE_SIZE
+        )
+    
+    def test_set_sort_reloads_current_view(self, controller, mock_services):
+        """测试修改排序后重新加载第一页"""
+        controller.current_view_type = "nav_filter"
+        controller.current_filters = {'mastery_level': 0}
+        mock_services['ui_service'].get_questions_page.return_value = make_page([{'id': 3}])
+        
+        result = controller.set_sort("difficulty", False)
+        
+        assert result == [{'id': 3}]
+        mock_services['ui_service'].get_questions_page.assert_called_once_with(
+            {'mastery_level': 0}, sort_by="difficulty", descending=False,
+            cursor=None, page_size=PAGE_SIZE
+        )
 
 
 class TestDialogOperations:
@@ -346,48 +489,121 @@ class TestDeleteQuestion:
 
 
 class TestEventHandlers:
-    """测试事件处理器"""
+    """测试事件处理器：只修改当前列表中受影响的一项"""
+    
+    @pytest.fixture
+    def deltas(self, controller):
+        """记录控制器通知的列表变化"""
+        received = []
+        controller.add_view_listener(received.append)
+        return received
     
-    def test_on_question_added(self, controller, mock_services):
-        """测试题目添加事件处理"""
-        # 设置当前视图
+    @pytest.fixture
+    def loaded(self, controller):
+        """按创建时间降序加载了三道题目"""
         controller.current_view_type = "all"
-        test_questions = [{'id': 1}, {'id': 2}]
-        mock_services['ui_service'].get_all_questions.return_value = test_questions
+        controller.current_questions = [
+            {'id': 3, 'created_at': 30, 'subject': '数学'},
+            {'id': 2, 'created_at': 20, 'subject': '数学'},
+            {'id': 1, 'created_at': 10, 'subject': '数学'},
+        ]
+        return controller
+    
+    def ids(self, controller):
+        return [q['id'] for q in controller.current_questions]
+    
+    def test_on_question_added(self, loaded, mock_services, deltas):
+        """测试新题目插入到排序位置，不重新加载列表"""
+        question = {'id': 4, 'created_at': 40, 'subject': '数学'}
+        mock_services['ui_service'].get_question_summary.return_value = question
         
-        # 触发事件
-        event = QuestionAddedEvent(question_id=2, question_data={'content': '新题目'})
-        controller._on_question_added(event)
+        loaded._on_question_added(QuestionAddedEvent(question_id=4, question_data={}))
         
-        # 验证刷新了视图
-        mock_services['ui_service'].get_all_questions.assert_called_once()
-        assert controller.current_questions == test_questions
+        mock_services['ui_service'].get_questions_page.assert_not_called()
+        mock_services['ui_service'].get_question_summary.assert_called_once_with(4, {})
+        assert self.ids(loaded) == [4, 3, 2, 1]
+        assert deltas == [ViewDelta("insert", 0, question)]
     
-    def test_on_question_updated(self, controller, mock_services):
-        """测试题目更新事件处理"""
-        controller.current_view_type = "filter"
-        controller.current_filters = {'subject': '数学'}
-        test_questions = [{'id': 1, 'subject': '数学'}]
-        mock_services['ui_service'].filter_questions.return_value = test_questions
+    def test_added_question_not_matching_filter(self, loaded, mock_services, deltas):
+        """测试不符合当前筛选的新题目不插入"""
+        loaded.current_view_type = "filter"
+        loaded.current_filters = {'subject': '物理'}
+        mock_services['ui_service'].get_question_summary.return_value = None
+        
+        loaded._on_question_added(QuestionAddedEvent(question_id=4, question_data={}))
+        
+        mock_services['ui_service'].get_question_summary.assert_called_once_with(
+            4, {'subject': '物理'}
+        )
+        assert self.ids(loaded) == [3, 2, 1]
+        assert deltas == []
+    
+    def test_added_question_beyond_loaded_pages(self, loaded, mock_services, deltas):
+        """测试排在已加载页之后的新题目留给翻页加载"""
+        loaded.has_more = True
+        mock_services['ui_service'].get_question_summary.return_value = {'id': 4, 'created_at': 5}
         
-        event = QuestionUpdatedEvent(question_id=1, updates={'content': '更新内容'})
-        controller._on_question_updated(event)
+        loaded._on_question_added(QuestionAddedEvent(question_id=4, question_data={}))
         
-        mock_services['ui_service'].filter_questions.assert_called_once_with({'subject': '数学'})
-        assert controller.current_questions == test_questions
+        assert self.ids(loaded) == [3, 2, 1]
+        assert deltas == []
     
-    def test_on_question_deleted(self, controller, mock_services):
-        """测试题目删除事件处理"""
-        controller.current_view_type = "search"
-        controller.current_filters = {'keyword': '测试'}
-        test_questions = []
-        mock_services['ui_service'].search_questions.return_value = test_questions
+    def test_on_question_updated(self, loaded, mock_services, deltas):
+        """测试更新的题目原地替换"""
+        question = {'id': 2, 'created_at': 20, 'subject': '数学', 'difficulty': 5}
+        mock_services['ui_service'].get_question_summary.return_value = question
+        
+        loaded._on_question_updated(QuestionUpdatedEvent(question_id=2, updates={'difficulty': 5}))
+        
+        mock_services['ui_service'].get_questions_page.assert_not_called()
+        assert loaded.current_questions[1] == question
+        assert deltas == [ViewDelta("update", 1, question)]
+    
+    def test_updated_question_moves_with_sort(self, loaded, mock_services, deltas):
+        """测试排序字段变化时题目移动到新位置"""
+        loaded.sort_by = "difficulty"
+        loaded.sort_descending = True
+        for q, difficulty in zip(loaded.current_questions, (5, 3, 1)):
+            q['difficulty'] = difficulty
+        question = {'id': 1, 'created_at': 10, 'difficulty': 4}
+        mock_services['ui_service'].get_question_summary.return_value = question
+        
+        loaded._on_question_updated(QuestionUpdatedEvent(question_id=1, updates={'difficulty': 4}))
+        
+        assert self.ids(loaded) == [3, 1, 2]
+        assert deltas == [ViewDelta("remove", 2), ViewDelta("insert", 1, question)]
+    
+    def test_updated_question_leaves_filter(self, loaded, mock_services, deltas):
+        """测试不再符合筛选条件的题目被移除"""
+        loaded.current_view_type = "nav_filter"
+        loaded.current_filters = {'subject': '数学'}
+        mock_services['ui_service'].get_question_summary.return_value = None
+        
+        loaded._on_question_updated(
+            QuestionUpdatedEvent(question_id=3, updates={'subject': '物理'})
+        )
+        
+        assert self.ids(loaded) == [2, 1]
+        assert deltas == [ViewDelta("remove", 0)]
+    
+    def test_on_question_deleted(self, loaded, mock_services, deltas):
+        """测试删除的题目从列表中移除，不查询数据库"""
+        loaded._on_question_deleted(QuestionDeletedEvent(question_id=2))
+        
+        mock_services['ui_service'].get_question_summary.assert_not_called()
+        mock_services['ui_service'].get_questions_page.assert_not_called()
+        assert self.ids(loaded) == [3, 1]
+        assert deltas == [ViewDelta("remove", 1)]
+    
+    def test_on_review_completed_reloads(self, controller, mock_services, deltas):
+        """测试复习完成后重新加载当前视图"""
+        test_questions = [{'id': 1}]
+        mock_services['ui_service'].get_questions_page.return_value = make_page(test_questions)
         
-        event = QuestionDeletedEvent(question_id=1)
-        controller._on_question_deleted(event)
+        controller._on_review_completed(ReviewCompletedEvent(reviewed_count=3))
         
-        mock_services['ui_service'].search_questions.assert_called_once_with('测试')
         assert controller.current_questions == test_questions
+        assert deltas == [ViewDelta("reset")]
 
 
 class TestControllerWithMockServices:
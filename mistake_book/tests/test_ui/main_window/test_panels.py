@@ -14,6 +14,7 @@ from mistake_book.ui.main_window.panels import PanelFactory
 from mistake_book.ui.components.navigation_tree import NavigationTree
 from mistake_book.ui.components.filter_panel import FilterPanel
 from mistake_book.ui.components.statistics_panel import StatisticsPanel
+from mistake_book.ui.widgets.question_list import QuestionListView
 
 
 # 创建QApplication实例（PyQt测试需要）
@@ -90,17 +91,16 @@ class TestPanelFactory:
         
         # 验证面板包含必要的子组件
         assert hasattr(card_panel, 'search_input')
-        assert hasattr(card_panel, 'cards_container')
-        assert hasattr(card_panel, 'cards_layout')
-        assert hasattr(card_panel, 'scroll_area')
+        assert hasattr(card_panel, 'question_model')
+        assert hasattr(card_panel, 'question_list')
         
         # 验证搜索框
         assert isinstance(card_panel.search_input, QLineEdit)
         assert card_panel.search_input.placeholderText() == "🔍 搜索错题..."
         
-        # 验证卡片容器
-        assert isinstance(card_panel.cards_container, QWidget)
-        assert card_panel.cards_layout is not None
+        # 验证卡片列表使用模型/视图
+        assert isinstance(card_panel.question_list, QuestionListView)
+        assert card_panel.question_list.model() is card_panel.question_model
     
     def test_create_right_panel(self, panel_factory):
         """测试创建右侧面板"""
@@ -184,9 +184,24 @@ class TestPanelFactory:
         # 验证搜索框在顶部
         assert card_panel.search_input.parent() == card_panel
         
-        # 验证滚动区域存在
-        assert card_panel.scroll_area is not None
-        assert card_panel.scroll_area.widget() == card_panel.cards_container
+        # 验证卡片列表在面板中
+        assert card_panel.question_list.parent() == card_panel
+    
+    def test_card_list_fetches_next_page_from_controller(self, panel_factory, mock_controller):
+        """测试卡片列表通过控制器按需加载下一页"""
+        card_panel = panel_factory.create_card_panel()
+        model = card_panel.question_model
+        
+        mock_controller.has_more = False
+        assert not model.canFetchMore()
+        
+        mock_controller.has_more = True
+        mock_controller.load_more_questions.return_value = [{'id': 1}, {'id': 2}]
+        assert model.canFetchMore()
+        model.fetchMore()
+        
+        assert model.rowCount() == 2
+        assert model.question_at(1) == {'id': 2}
     
     def test_right_panel_layout(self, panel_factory):
         """测试右侧面板的布局结构"""
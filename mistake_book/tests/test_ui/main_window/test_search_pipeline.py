@@ -0,0 +1,130 @@
+"""测试 SearchPipeline"""
+
+import sys
+import threading
+import pytest
+from pathlib import Path
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from mistake_book.ui.main_window.search_pipeline import SearchPipeline
+
+
+class RecordingSearch:
+    """记录调用的查询函数，可以阻塞直到放行"""
+    
+    def __init__(self, blocking: bool = False):
+        self.calls = []
+        self.threads = []
+        self.release = threading.Event()
+        if not blocking:
+            self.release.set()
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+    
+    def __call__(self, keyword):
+        with self._lock:
+            self.calls.append(keyword)
+            self.threads.append(threading.get_ident())
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        self.release.wait(5)
+        with self._lock:
+            self.running -= 1
+        return [{'id': len(self.calls), 'keyword': keyword}]
+
+
+@pytest.fixture
+def search():
+    return RecordingSearch()
+
+
+@pytest.fixture
+def pipeline(qtbot, search):
+    pipe = SearchPipeline(search, delay_ms=50)
+    yield pipe
+    pipe.cancel()
+    pipe.wait()
+
+
+class TestSearchPipeline:
+    """SearchPipeline测试类"""
+    
+    def test_debounces_keystrokes(self, qtbot, pipeline, search):
+        """测试逐字输入10个字符只查询一次，且查询最终的关键词"""
+        keyword = "abcdefghij"
+        with qtbot.waitSignal(pipeline.results_ready, timeout=3000) as blocker:
+            for i in range(1, len(keyword) + 1):
+                pipeline.request(keyword[:i])
+        
+        assert search.calls == [keyword]
+        assert blocker.args[0] == keyword
+        qtbot.waitUntil(lambda: not pipeline.is_busy())
+    
+    def test_runs_off_ui_thread(self, qtbot, pipeline, search):
+        """测试查询在后台线程执行"""
+        with qtbot.waitSignal(pipeline.results_ready, timeout=3000):
+            pipeline.request("数学")
+        
+        assert search.threads[0] != threading.get_ident()
+    
+    def test_stale_results_dropped(self, qtbot):
+        """测试查询执行期间有新输入时，旧结果被丢弃，最后只执行最新关键词"""
+        search = RecordingSearch(blocking=True)
+        pipeline = SearchPipeline(search, delay_ms=10)
+        received = []
+        pipeline.results_ready.connect(lambda keyword, results: received.append(keyword))
+        
+        pipeline.request("旧")
+        qtbot.waitUntil(lambda: search.calls == ["旧"])
+        pipeline.request("新")
+        qtbot.wait(50)  # 计时结束时旧查询仍在执行
+        assert search.calls == ["旧"]
+        
+        search.release.set()
+        qtbot.waitUntil(lambda: received == ["新"], timeout=3000)
+        qtbot.waitUntil(lambda: not pipeline.is_busy())
+        
+        assert search.calls == ["旧", "新"]
+        assert search.max_running == 1
+    
+    def test_cancel(self, qtbot, pipeline, search):
+        """测试取消后不再发出结果"""
+        received = []
+        pipeline.results_ready.connect(lambda keyword, results: received.append(keyword))
+        
+        pipeline.request("数学")
+        pipeline.cancel()
+        qtbot.wait(150)
+        
+        assert search.calls == []
+        assert received == []
+        assert not pipeline.is_busy()
+    
+    def test_failure_reported(self, qtbot):
+        """测试查询异常时发出 search_failed"""
+        def failing(keyword):
+            raise RuntimeError("数据库错误")
+        
+        pipeline = SearchPipeline(failing, delay_ms=10)
+        with qtbot.waitSignal(pipeline.search_failed, timeout=3000) as blocker:
+            pipeline.request("数学")
+        
+        assert "数据库错误" in blocker.args[0]
+        pipeline.wait()
+    
+    def test_wait_without_timeout_until_finished(self, qtbot):
+        """测试不设超时的 wait 一直等到正在执行的查询结束"""
+        search = RecordingSearch(blocking=True)
+        pipeline = SearchPipeline(search, delay_ms=10)
+        pipeline.request("数学")
+        qtbot.waitUntil(lambda: search.calls == ["数学"])
+        
+        assert pipeline.wait(10) is False
+        threading.Timer(0.2, search.release.set).start()
+        pipeline.cancel()
+        assert pipeline.wait() is True
+        assert search.running == 0
@@ -0,0 +1,180 @@
+"""测试启动加载：窗口先显示骨架占位，首屏数据在后台加载后分块填充"""
+
+import sys
+import threading
+import pytest
+from pathlib import Path
+from unittest.mock import Mock
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from mistake_book.ui.main_window.window import MainWindow, SKELETON_CARDS
+from mistake_book.ui.main_window.controller import MainWindowController
+from mistake_book.ui.main_window.startup_loader import StartupLoader
+from mistake_book.ui.events.event_bus import EventBus
+from mistake_book.ui.widgets.question_list import QuestionListModel
+
+
+FIRST_PAGE = {
+    'items': [{'id': 1, 'subject': '数学', 'content': '题目1'}],
+    'next_cursor': None,
+    'has_more': False
+}
+NAV_DATA = {
+    'subjects': ['数学'],
+    'tags': [],
+    'mastery_levels': [{'name': '生疏', 'value': 0, 'count': 1}]
+}
+FILTER_OPTIONS = {
+    'subjects': ['全部', '数学'],
+    'difficulties': ['全部', '1星'],
+    'mastery_levels': ['全部', '生疏']
+}
+STATS = {'total_questions': 1, 'mastered': 0, 'learning': 1, 'due_count': 1, 'today_reviewed': 0}
+
+
+@pytest.fixture
+def release():
+    """放行首屏查询的开关，未放行时第一页查询阻塞"""
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+@pytest.fixture
+def controller(release):
+    """创建控制器，第一页查询等待放行"""
+    ui_service = Mock()
+
+    def get_page(*args, **kwargs):
+        release.wait(5)
+        return FIRST_PAGE
+
+    ui_service.get_questions_page = Mock(side_effect=get_page)
+    ui_service.get_navigation_data = Mock(return_value=NAV_DATA)
+    ui_service.get_filter_options = Mock(return_value=FILTER_OPTIONS)
+    ui_service.get_statistics_summary = Mock(return_value=STATS)
+
+    bus = EventBus()
+    bus.clear()
+    services = {'question_service': Mock(), 'review_service': Mock(), 'ui_service': ui_service}
+    return MainWindowController(services, Mock(), bus)
+
+
+@pytest.fixture
+def window(qtbot, controller):
+    win = MainWindow(controller)
+    qtbot.addWidget(win)
+    return win
+
+
+class TestStartupLoader:
+    """StartupLoader测试类"""
+
+    def test_emits_chunks_in_order(self, qtbot, controller, release):
+        """测试依次发出第一页、导航树、筛选选项和统计数据"""
+        release.set()
+        loader = StartupLoader(controller)
+        received = []
+        loader.first_page_ready.connect(lambda data: received.append(('page', data)))
+        loader.navigation_ready.connect(lambda data: received.append(('nav', data)))
+        loader.filter_options_ready.connect(lambda data: received.append(('filters', data)))
+        loader.statistics_ready.connect(lambda data: received.append(('stats', data)))
+
+        with qtbot.waitSignal(loader.finished, timeout=3000):
+            loader.start()
+        qtbot.waitUntil(lambda: len(received) == 4)
+
+        assert [name for name, _ in received] == ['page', 'nav', 'filters', 'stats']
+        assert received[0][1] == FIRST_PAGE
+        controller.ui_service.get_questions_page.assert_called_once()
+
+    def test_failure_reported(self, qtbot, controller):
+        """测试查询失败时发出 load_failed"""
+        controller.ui_service.get_questions_page = Mock(side_effect=RuntimeError("数据库错误"))
+        loader = StartupLoader(controller)
+
+        with qtbot.waitSignal(loader.load_failed, timeout=3000) as blocker:
+            loader.start()
+        loader.wait()
+
+        assert "数据库错误" in blocker.args[0]
+
+    def test_interruption_stops_after_current_chunk(self, qtbot, controller, release):
+        """测试请求中断后，当前查询完成即结束，不再查询后面的块"""
+        loader = StartupLoader(controller)
+        loader.start()
+        qtbot.waitUntil(lambda: controller.ui_service.get_questions_page.called)
+
+        loader.requestInterruption()
+        release.set()
+        assert loader.wait()
+
+        controller.ui_service.get_navigation_data.assert_not_called()
+        controller.ui_service.get_statistics_summary.assert_not_called()
+
+
+class TestWindowStartup:
+    """MainWindow 启动加载测试"""
+
+    def test_window_shows_skeleton_before_data(self, qtbot, window, release):
+        """测试数据返回前窗口已创建并显示骨架占位"""
+        model = window.card_panel.question_model
+        assert window.is_loading
+        assert model.is_placeholder
+        assert model.rowCount() == SKELETON_CARDS
+        assert not window.right_panel.filter_panel.isEnabled()
+        assert "…" in window.right_panel.stats_panel._total_label.text()
+
+        release.set()
+        qtbot.waitUntil(lambda: not window.is_loading, timeout=3000)
+
+        assert not model.is_placeholder
+        assert model.rowCount() == 1
+        assert window.controller.current_questions == FIRST_PAGE['items']
+        assert window.nav_tree._tree.topLevelItem(0).text(0) == '数学'
+        assert window.right_panel.filter_panel.isEnabled()
+        assert window.right_panel.filter_panel._subject_filter.count() == 2
+        assert window.right_panel.stats_panel._total_label.text() == "总题数: 1"
+
+    def test_user_view_change_wins_over_startup_page(self, qtbot, window, release):
+        """测试加载期间用户切换视图时，启动的第一页不覆盖当前视图"""
+        filtered = [{'id': 2, 'subject': '物理', 'content': '题目2'}]
+        window.controller.on_nav_filter_changed = Mock(return_value=filtered)
+        window._on_nav_filter_changed({'type': 'subject', 'value': '物理'})
+
+        release.set()
+        qtbot.waitUntil(lambda: not window.is_loading, timeout=3000)
+
+        assert window.card_panel.question_model.question_at(0)['id'] == 2
+        assert window.card_panel.question_model.rowCount() == 1
+
+    def test_failure_clears_skeleton(self, qtbot, controller):
+        """测试启动加载失败时清除骨架占位并提示"""
+        controller.ui_service.get_questions_page = Mock(side_effect=RuntimeError("数据库错误"))
+        win = MainWindow(controller)
+        qtbot.addWidget(win)
+        qtbot.waitUntil(lambda: not win.is_loading, timeout=3000)
+
+        assert win.card_panel.question_model.rowCount() == 0
+        assert "数据库错误" in win.statusBar().currentMessage()
+
+
+class TestPlaceholderModel:
+    """骨架占位模型测试"""
+
+    def test_placeholders_do_not_fetch_more(self, qtbot):
+        """测试显示骨架卡片时不加载下一页，插入题目时替换骨架"""
+        model = QuestionListModel(fetch_more=Mock(), can_fetch_more=lambda: True)
+        model.show_placeholders(3)
+
+        assert model.rowCount() == 3
+        assert model.question_at(0) is None
+        assert not model.canFetchMore()
+
+        model.insert_question(0, {'id': 1})
+        assert not model.is_placeholder
+        assert model.rowCount() == 1
+        assert model.canFetchMore()
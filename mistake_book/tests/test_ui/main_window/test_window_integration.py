@@ -6,7 +6,7 @@ from PyQt6.QtWidgets import QApplication
 from PyQt6.QtCore import Qt
 
 from mistake_book.ui.main_window.window import MainWindow
-from mistake_book.ui.main_window.controller import MainWindowController
+from mistake_book.ui.main_window.controller import MainWindowController, PAGE_SIZE
 from mistake_book.ui.events.event_bus import EventBus
 
 
@@ -48,7 +48,9 @@ def controller(mock_services, mock_dialog_factory, event_bus):
 def main_window(qtbot, controller):
     """创建主窗口"""
     # Mock UIService方法
-    controller.ui_service.get_all_questions = Mock(return_value=[])
+    controller.ui_service.get_questions_page = Mock(
+        return_value={'items': [], 'next_cursor': None, 'has_more': False}
+    )
     controller.ui_service.get_subjects = Mock(return_value=[])
     controller.ui_service.get_tags = Mock(return_value=[])
     controller.ui_service.get_statistics = Mock(return_value={
@@ -56,6 +58,10 @@ def main_window(qtbot, controller):
         'mastery_distribution': {},
         'due_today': 0
     })
+    controller.ui_service.get_statistics_summary = Mock(return_value={
+        'total_questions': 0,
+        'due_count': 0
+    })
     controller.ui_service.get_navigation_data = Mock(return_value={
         'subjects': [],
         'tags': [],
@@ -69,6 +75,8 @@ def main_window(qtbot, controller):
     
     window = MainWindow(controller)
     qtbot.addWidget(window)
+    # 等待后台启动加载完成
+    qtbot.waitUntil(lambda: not window.is_loading, timeout=3000)
     return window
 
 
@@ -89,7 +97,7 @@ class TestMainWindowIntegration:
         # 验证卡片面板存在
         assert main_window.card_panel is not None
         assert hasattr(main_window.card_panel, 'search_input')
-        assert hasattr(main_window.card_panel, 'cards_container')
+        assert hasattr(main_window.card_panel, 'question_list')
         
         # 验证右侧面板存在
         assert main_window.right_panel is not None
@@ -135,39 +143,85 @@ class TestMainWindowIntegration:
         # 显示题目
         main_window._display_questions(questions)
         
-        # 验证卡片数量
-        assert len(main_window.current_cards) == 2
+        # 验证列表行数
+        assert main_window.card_panel.question_model.rowCount() == 2
         
         # 验证状态栏
         assert "显示 2 个题目" in main_window.statusBar().currentMessage()
     
-    def test_clear_cards(self, main_window):
-        """测试清空卡片"""
-        # 先显示一些题目
-        questions = [
-            {'id': 1, 'subject': '数学', 'content': '题目1'}
-        ]
+    def test_view_delta_updates_single_row(self, main_window):
+        """测试列表变化只修改受影响的行"""
+        from mistake_book.ui.main_window.controller import ViewDelta
+        
+        model = main_window.card_panel.question_model
+        questions = [{'id': i, 'subject': '数学', 'content': f'题目{i}'} for i in range(3)]
         main_window._display_questions(questions)
-        assert len(main_window.current_cards) == 1
+        changed = []
+        model.dataChanged.connect(lambda top, bottom: changed.append((top.row(), bottom.row())))
+        
+        main_window._on_view_delta(ViewDelta("update", 1, {'id': 1, 'subject': '物理'}))
+        
+        assert changed == [(1, 1)]
+        assert model.question_at(1)['subject'] == '物理'
+        
+        main_window._on_view_delta(ViewDelta("insert", 0, {'id': 9, 'subject': '英语'}))
+        main_window._on_view_delta(ViewDelta("remove", 3))
+        
+        assert [model.question_at(row)['id'] for row in range(model.rowCount())] == [9, 0, 1]
+        assert "显示 3 个题目" in main_window.statusBar().currentMessage()
+    
+    def test_card_click_and_delete(self, main_window):
+        """测试点击卡片查看详情，点击删除按钮请求删除"""
+        from PyQt6.QtCore import QPoint
+        from PyQt6.QtTest import QTest
+        from mistake_book.ui.widgets.question_list import QuestionCardDelegate
+        
+        main_window._on_view_question = Mock()
+        main_window._on_delete_question = Mock()
+        main_window.show()
+        main_window._display_questions([{'id': 7, 'subject': '数学', 'content': '题目'}])
+        
+        view = main_window.card_panel.question_list
+        rect = view.visualRect(main_window.card_panel.question_model.index(0))
+        
+        QTest.mouseClick(
+            view.viewport(), Qt.MouseButton.LeftButton, pos=rect.center() - QPoint(100, 0)
+        )
+        main_window._on_view_question.assert_called_with(7)
         
-        # 清空卡片
-        main_window._clear_cards()
-        assert len(main_window.current_cards) == 0
+        delete_rect = QuestionCardDelegate.delete_button_rect(rect)
+        QTest.mouseClick(view.viewport(), Qt.MouseButton.LeftButton, pos=delete_rect.center())
+        main_window._on_delete_question.assert_called_with(7)
     
     def test_search_functionality(self, main_window, qtbot):
-        """测试搜索功能"""
+        """测试搜索功能：连续输入只在后台查询一次"""
         # Mock搜索结果
         search_results = [
             {'id': 1, 'subject': '数学', 'content': '搜索结果'}
         ]
-        main_window.controller.on_search = Mock(return_value=search_results)
+        main_window.controller.ui_service.search_questions = Mock(return_value=search_results)
         
-        # 输入搜索关键词
+        # 逐字输入搜索关键词
+        with qtbot.waitSignal(main_window.search_pipeline.results_ready, timeout=3000):
+            main_window.card_panel.search_input.setText("测")
+            main_window.card_panel.search_input.setText("测试")
+        
+        # 验证只查询了最终的关键词，结果显示在列表中
+        main_window.controller.ui_service.search_questions.assert_called_once_with(
+            "测试", limit=PAGE_SIZE + 1
+        )
+        assert main_window.controller.current_view_type == "search"
+        assert main_window.card_panel.question_model.rowCount() == 1
+    
+    def test_clear_search_shows_all_immediately(self, main_window):
+        """测试清空搜索框时取消搜索并立即显示全部题目"""
+        main_window.controller.ui_service.search_questions = Mock(return_value=[])
         main_window.card_panel.search_input.setText("测试")
-        qtbot.wait(100)  # 等待信号处理
+        main_window.card_panel.search_input.setText("")
         
-        # 验证搜索被调用
-        main_window.controller.on_search.assert_called_with("测试")
+        assert not main_window.search_pipeline.is_busy()
+        assert main_window.controller.current_view_type == "all"
+        main_window.controller.ui_service.search_questions.assert_not_called()
     
     def test_nav_filter_functionality(self, main_window):
         """测试导航筛选功能"""
@@ -246,10 +300,13 @@ class TestMainWindowIntegration:
         main_window.controller.refresh_current_view.assert_called_once()
     
     def test_view_question(self, main_window):
-        """测试查看题目详情"""
-        # 准备测试数据
-        question_data = {'id': 1, 'subject': '数学', 'content': '题目1'}
-        main_window.controller.current_questions = [question_data]
+        """测试查看题目详情（打开时读取完整数据）"""
+        # 准备测试数据：列表中只有摘要
+        main_window.controller.current_questions = [
+            {'id': 1, 'subject': '数学', 'content_preview': '题目1'}
+        ]
+        question_data = {'id': 1, 'subject': '数学', 'content': '题目1', 'answer': 'A'}
+        main_window.controller.ui_service.get_question_detail = Mock(return_value=question_data)
         
         # Mock对话框工厂
         mock_dialog = Mock()
@@ -261,10 +318,22 @@ class TestMainWindowIntegration:
         # 查看题目
         main_window._on_view_question(1)
         
-        # 验证对话框被创建和显示
-        main_window.controller.dialog_factory.create_detail_dialog.assert_called_once()
+        # 验证读取了完整数据，对话框被创建和显示
+        main_window.controller.ui_service.get_question_detail.assert_called_once_with(1)
+        main_window.controller.dialog_factory.create_detail_dialog.assert_called_once_with(
+            question_data, main_window
+        )
         mock_dialog.exec.assert_called_once()
     
+    def test_view_deleted_question(self, main_window):
+        """测试查看已被删除的题目时不打开对话框"""
+        main_window.controller.ui_service.get_question_detail = Mock(return_value=None)
+        main_window.controller.dialog_factory.create_detail_dialog = Mock()
+        
+        main_window._on_view_question(99)
+        
+        main_window.controller.dialog_factory.create_detail_dialog.assert_not_called()
+    
     def test_delete_question_confirmed(self, main_window, qtbot, monkeypatch):
         """测试删除题目（确认）"""
         from PyQt6.QtWidgets import QMessageBox
@@ -311,7 +380,7 @@ class TestMainWindowIntegration:
     def test_initial_data_load(self, main_window):
         """测试初始数据加载"""
         # 验证初始加载被调用
-        assert main_window.controller.ui_service.get_all_questions.called
+        assert main_window.controller.ui_service.get_questions_page.called
     
     def test_window_geometry(self, main_window):
         """测试窗口几何属性"""
@@ -0,0 +1,143 @@
+"""图片入库处理测试"""
+
+import io
+import sys
+import pytest
+from pathlib import Path
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from PIL import Image, ImageDraw
+
+from mistake_book.utils.image_processor import ImageProcessor, IngestOptions
+
+
+@pytest.fixture
+def processor():
+    return ImageProcessor()
+
+
+def _photo(path: Path, size=(3000, 4000), orientation=None, quality=95) -> Path:
+    """写入一张白底带文字和色块的 JPEG 照片，可带 EXIF 方向"""
+    image = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(image)
+    for i in range(40):
+        position = (size[0] // 4, size[1] // 5 + i * 40)
+        draw.text(position, "f(x) = x^2 + 2x + 1, x > 0" * 3, fill="black")
+    draw.rectangle((size[0] // 4, size[1] // 2, size[0] // 2, size[1] * 3 // 4), fill=(200, 30, 30))
+    exif = Image.Exif()
+    if orientation:
+        exif[0x0112] = orientation
+    image.save(path, "JPEG", quality=quality, exif=exif)
+    return path
+
+
+def _open(data: bytes) -> Image.Image:
+    image = Image.open(io.BytesIO(data))
+    image.load()
+    return image
+
+
+class TestPrepareForStorage:
+    """prepare_for_storage测试类"""
+    
+    def test_downscales_and_transcodes(self, tmp_path, processor):
+        """测试长边缩小到上限，重新编码为 WebP 并明显变小，不保留EXIF"""
+        photo = _photo(tmp_path / "照片.jpg")
+        
+        result = processor.prepare_for_storage(photo, IngestOptions(max_dimension=1600))
+        
+        image = _open(result.data)
+        assert result.transcoded and result.suffix == ".webp"
+        assert image.format == "WEBP" and image.size == result.size == (1200, 1600)
+        assert len(result.data) < result.original_bytes / 3
+        assert not image.getexif()
+    
+    def test_applies_exif_orientation(self, tmp_path, processor):
+        """测试按 EXIF 方向摆正后再缩小"""
+        photo = _photo(tmp_path / "rotated.jpg", size=(4000, 3000), orientation=6)
+        
+        options = IngestOptions(max_dimension=1000, format="JPEG")
+        result = processor.prepare_for_storage(photo, options)
+        
+        assert result.suffix == ".jpg"
+        assert _open(result.data).size == (750, 1000)
+    
+    def test_auto_crop_removes_white_margins(self, tmp_path, processor):
+        """测试裁掉四周空白，保留边距"""
+        source = tmp_path / "scan.png"
+        image = Image.new("RGB", (1000, 800), "white")
+        ImageDraw.Draw(image).rectangle((300, 200, 599, 499), fill="black")
+        image.save(source)
+        
+        options = IngestOptions(auto_crop=True, crop_border=10)
+        result = processor.prepare_for_storage(source, options)
+        
+        assert result.size == (320, 320)
+    
+    def test_respects_byte_budget(self, tmp_path, processor):
+        """测试超出大小上限时降低质量或缩小尺寸"""
+        source = tmp_path / "noise.png"
+        Image.effect_noise((1200, 900), 60).convert("RGB").save(source)
+        options = IngestOptions(max_bytes=60 * 1024)
+        
+        result = processor.prepare_for_storage(source, options)
+        
+        assert len(result.data) <= options.max_bytes
+        assert result.size[0] / result.size[1] == pytest.approx(1200 / 900, rel=0.01)
+    
+    def test_keeps_small_original(self, tmp_path, processor):
+        """测试不需要处理且重新编码不会更小的图片原样保存"""
+        source = tmp_path / "small.JPEG"
+        Image.effect_noise((200, 150), 60).convert("RGB").save(source, "JPEG", quality=20)
+        
+        result = processor.prepare_for_storage(source)
+        
+        assert not result.transcoded
+        assert result.data == source.read_bytes() and result.suffix == ".jpeg"
+    
+    def test_same_input_same_output(self, tmp_path, processor):
+        """测试相同输入得到相同的编码结果（图片存储按内容去重）"""
+        photo = _photo(tmp_path / "a.jpg", size=(1600, 1200))
+        
+        first = processor.prepare_for_storage(photo)
+        assert first.data == processor.prepare_for_storage(photo).data
+    
+    def test_rejects_non_image(self, tmp_path, processor):
+        """测试非图片文件抛出 OSError"""
+        text = tmp_path / "note.txt"
+        text.write_text("not an image")
+        
+        with pytest.raises(OSError):
+            processor.prepare_for_storage(text)
+
+
+class TestPreprocessForOCR:
+    """preprocess_for_ocr测试类"""
+    
+    def test_returns_image_without_temp_file(self, tmp_path, processor, monkeypatch):
+        """测试预处理结果留在内存中，不写临时文件"""
+        import tempfile
+        monkeypatch.setattr(tempfile, "tempdir", str(tmp_path / "tmp"))
+        (tmp_path / "tmp").mkdir()
+        photo = _photo(tmp_path / "题目.jpg", size=(800, 600))
+        
+        result = processor.preprocess_for_ocr(photo)
+        
+        assert isinstance(result, Image.Image)
+        assert result.mode == "L" and result.size == (800, 600)
+        assert list((tmp_path / "tmp").iterdir()) == []
+    
+    def test_accepts_bytes_and_images(self, tmp_path, processor):
+        """测试图片数据和已解码的图片与文件路径得到相同结果"""
+        photo = _photo(tmp_path / "a.png", size=(400, 300))
+        expected = processor.preprocess_for_ocr(photo, enhance=False).tobytes()
+        
+        assert processor.preprocess_for_ocr(photo.read_bytes(), enhance=False).tobytes() == expected
+        assert processor.preprocess_for_ocr(Image.open(photo), enhance=False).tobytes() == expected
+    
+    def test_failure_returns_source(self, processor):
+        """测试无法解码时返回原来源，交给OCR引擎处理"""
+        assert processor.preprocess_for_ocr(b"not an image") == b"not an image"